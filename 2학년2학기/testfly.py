@@ -1,5 +1,6 @@
 from codrone_edu.drone import *
 import time
+from instrument import Instrument
 
 # --- 1. 전진 속도용 칼만 필터 (X축) ---
 class KalmanFilterVelocityX:
@@ -69,6 +70,13 @@ SCALE_FLOW = 0.006
 # [핵심 수정] 고도 제어 게인 (KP 값 낮춤)
 ALTITUDE_KP = 0.7 
 
+# 계측 : 제어 루프 1회(sensor 읽기 / control 전송)의 시간과 실제 주기(dt)를 기록
+INSTRUMENT = False
+METRICS_LOG = None   # 예: "fly_metrics.csv" (또는 .jsonl)
+TRACE_PATH = None    # 예: "fly_trace.json" (chrome://tracing 에서 열기)
+inst = Instrument(enabled=INSTRUMENT or bool(METRICS_LOG or TRACE_PATH),
+                  log_path=METRICS_LOG, trace_path=TRACE_PATH)
+
 
 try:
     # 1. 캘리브레이션 (0점 잡기)
@@ -103,13 +111,14 @@ try:
         last_time = current_time
 
         # 1) 고도 필터링
-        raw_z = drone.get_height()
+        with inst.span("sensor"):
+            raw_z = drone.get_height()
+            raw_accel_x = drone.get_accel_x()
+            raw_flow_x = drone.get_flow_velocity_x()
         filtered_z = kf_h.update(raw_z)
 
         # 2) 전진 속도 계산 (X축)
-        raw_accel_x = drone.get_accel_x()
         calibrated_accel_x = (raw_accel_x - accel_offset_x) * SCALE_ACCEL
-        raw_flow_x = drone.get_flow_velocity_x()
         scaled_flow_x = raw_flow_x * SCALE_FLOW
         
         real_velocity_x = kf_vel_x.update(calibrated_accel_x, scaled_flow_x, dt)
@@ -123,10 +132,14 @@ try:
         pitch = 25 # 전진
         roll = 0   
 
-        drone.set_throttle(throttle)
-        drone.set_pitch(pitch)
-        drone.set_roll(roll)
-        drone.move()
+        with inst.span("control"):
+            drone.set_throttle(throttle)
+            drone.set_pitch(pitch)
+            drone.set_roll(roll)
+            drone.move()
+        inst.observe("dt_ms", dt * 1000.0)
+        inst.observe("height", filtered_z)
+        inst.frame_end()
         
         print(f"[1단계] 거리(X): {current_dist_x:.1f} / {target_dist_x} | 속도(X): {real_velocity_x:.1f} | 필터고도: {filtered_z:.1f} | Throttle: {throttle}")
         time.sleep(0.05)
@@ -150,13 +163,14 @@ try:
         last_time = current_time
 
         # 1) 고도 필터링
-        raw_z = drone.get_height()
+        with inst.span("sensor"):
+            raw_z = drone.get_height()
+            raw_accel_y = drone.get_accel_y()
+            raw_flow_y = drone.get_flow_velocity_y()
         filtered_z = kf_h.update(raw_z)
 
         # 2) 측면 속도 계산 (Y축)
-        raw_accel_y = drone.get_accel_y()
         calibrated_accel_y = (raw_accel_y - accel_offset_y) * SCALE_ACCEL
-        raw_flow_y = drone.get_flow_velocity_y()
         scaled_flow_y = raw_flow_y * SCALE_FLOW
         
         real_velocity_y = kf_vel_y.update(calibrated_accel_y, scaled_flow_y, dt)
@@ -170,10 +184,14 @@ try:
         pitch = 0  
         roll = 25  # 우측 이동 (Roll 양수)
 
-        drone.set_throttle(throttle)
-        drone.set_pitch(pitch)
-        drone.set_roll(roll)
-        drone.move()
+        with inst.span("control"):
+            drone.set_throttle(throttle)
+            drone.set_pitch(pitch)
+            drone.set_roll(roll)
+            drone.move()
+        inst.observe("dt_ms", dt * 1000.0)
+        inst.observe("height", filtered_z)
+        inst.frame_end()
 
         print(f"[2단계] 거리(Y): {current_dist_y:.1f} / {target_dist_y} | 속도(Y): {real_velocity_y:.1f} | 필터고도: {filtered_z:.1f} | Throttle: {throttle}")
         time.sleep(0.05)
@@ -194,4 +212,7 @@ except Exception as e:
     drone.land()
 
 finally:
-    drone.close()
\ No newline at end of file
+    drone.close()
+    if inst.enabled:
+        print(inst.summary())
+    inst.close() # 로그 닫기 + trace 저장
\ No newline at end of file
@@ -0,0 +1,167 @@
+'''
+bench_gesture의 Docstring
+
+제스처 인식 단계별 처리량 벤치마크 (웹캠 / 창 / 드론 없이 실행)
+
+이 코드의 목적:
+- 녹화된 손 영상(동영상 파일 또는 이미지 폴더)을 고정 입력으로 사용해서
+  gesture_stable_command.py / main_gesture_to_drone.py의 각 단계 처리 시간을 측정
+  1. cvt    : BGR → RGB 변환 (MediaPipe 입력)
+  2. hands  : hands.process (손 검출 + 21개 랜드마크)
+  3. count  : count_fingers (손이 검출된 프레임만)
+  4. total  : 1~3 합계 (프레임 1장 전체)
+- 손 검출 비율과 손가락 개수 분포도 함께 출력 (결과가 달라졌는지 커밋 사이 비교용)
+- 결과를 JSON으로 저장하고(--out), 다른 커밋의 결과와 비교(--compare)
+- --modes full,scale,crop,skip,adaptive : 손 인식 스케줄(hand_scheduler)별로
+  프레임당 CPU 시간, 카메라 FPS(--fps) 기준 CPU 사용률 / 유효 랜드마크 FPS,
+  손 검출 비율, full 모드와 손가락 개수가 같은 비율을 비교
+
+사용 예:
+    python bench_gesture.py recorded_hand.mp4
+    python bench_gesture.py frames/ --frames 300 --out bench_now.json --compare bench_base.json
+    python bench_gesture.py recorded_hand.mp4 --modes full,scale,crop,skip,adaptive --fps 30
+'''
+
+import argparse
+import time
+from collections import Counter
+
+import cv2
+import mediapipe as mp
+
+from bench_stats import StageTimer, compare, print_table, save_json
+from frame_source import open_source
+from hand_gesture import count_fingers
+from hand_scheduler import MODES, HandScheduler
+
+
+def load_frames(spec, count):
+    # 입력에서 최대 count장을 미리 읽어둠 (파일 디코딩 시간은 측정에서 제외)
+    cap = open_source(spec)
+    if not cap.isOpened():
+        raise SystemExit(f"입력을 열 수 없습니다: {spec}")
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def new_hands():
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+
+
+def run(frames, repeat):
+    timer = StageTimer()
+    gestures = Counter()
+    detected = 0
+
+    # 실시간 스크립트와 같은 설정 (static_image_mode=False : 추적 모드)
+    hands = new_hands()
+
+    for r in range(repeat):
+        for frame in frames:
+            gesture = None
+            with timer.stage("total"):
+                with timer.stage("cvt"):
+                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                with timer.stage("hands"):
+                    result = hands.process(rgb)
+                if result.multi_hand_landmarks:
+                    with timer.stage("count"):
+                        for hand_landmarks in result.multi_hand_landmarks:
+                            gesture = count_fingers(hand_landmarks, aspect=frame.shape[1] / frame.shape[0])
+
+            if r == 0:
+                detected += gesture is not None
+                gestures[gesture] += 1
+
+    hands.close()
+    stages = timer.summary()
+    stages.move_to_end("total")
+    return stages, detected / max(1, len(frames)), gestures
+
+
+def run_modes(frames, modes, fps):
+    # 스케줄 모드별 CPU 시간 / 유효 랜드마크 수 / 결과 일치율 (프레임 순서대로, 재생 시간 = 프레임 수 / fps)
+    rows = []
+    reference = None
+    for mode in modes:
+        hands = new_hands()
+        scheduler = HandScheduler(hands, **MODES[mode])
+        gestures = []
+        cpu0 = time.process_time()
+        for frame in frames:
+            result = scheduler.process(frame)
+            gesture = None
+            if result.multi_hand_landmarks:
+                gesture = count_fingers(result.multi_hand_landmarks[0], aspect=frame.shape[1] / frame.shape[0])
+            gestures.append(gesture)
+        cpu_ms = (time.process_time() - cpu0) * 1000.0 / len(frames)
+        hands.close()
+
+        if reference is None:
+            reference = gestures  # 첫 번째 모드(보통 full)를 기준으로
+        agree = sum(a == b for a, b in zip(gestures, reference)) / len(frames)
+        rows.append({"mode": mode, "cpu_ms": cpu_ms, "cpu_pct": cpu_ms * fps / 10.0,
+                     "landmark_fps": scheduler.updates / len(frames) * fps,
+                     "process_rate": scheduler.processed / len(frames),
+                     "detected": sum(g is not None for g in gestures) / len(frames), "agree": agree})
+
+    print(f"{'mode':<10} {'cpu ms/f':>9} {'cpu %':>7} {'lm fps':>7} {'process':>8} {'hand':>6} {'agree':>6}  (@{fps:g} fps)")
+    for r in rows:
+        print(f"{r['mode']:<10} {r['cpu_ms']:9.2f} {r['cpu_pct']:7.0f} {r['landmark_fps']:7.1f} "
+              f"{r['process_rate']:8.2f} {r['detected']:6.3f} {r['agree']:6.3f}")
+    print("cpu % : 한 코어 = 100, lm fps : 새로 계산된 랜드마크 / 초, process : 프레임당 hands.process 호출, "
+          f"agree : {modes[0]} 모드와 손가락 개수가 같은 프레임 비율")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="제스처 인식 단계별 벤치마크")
+    parser.add_argument("source", help="입력: 동영상 파일 / 이미지 폴더")
+    parser.add_argument("--frames", type=int, default=300, help="미리 읽을 최대 프레임 수")
+    parser.add_argument("--repeat", type=int, default=1, help="같은 프레임을 반복 측정할 횟수")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", default=None, help="비교할 기준 JSON 경로")
+    parser.add_argument("--modes", default=None, help="손 인식 스케줄 비교 (예: full,adaptive)")
+    parser.add_argument("--fps", type=float, default=30.0, help="--modes : 카메라 FPS 가정")
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.frames)
+    print(f"source={args.source} frames={len(frames)} repeat={args.repeat}")
+
+    if args.modes:
+        modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+        unknown = [m for m in modes if m not in MODES]
+        if unknown:
+            raise SystemExit(f"알 수 없는 모드: {unknown} (가능: {', '.join(MODES)})")
+        rows = run_modes(frames, modes, args.fps)
+        if args.out:
+            save_json(args.out, {}, config=vars(args), modes=rows)
+            print(f"saved: {args.out}")
+        return
+
+    stages, detect_rate, gestures = run(frames, args.repeat)
+    print_table(stages)
+    print(f"hand detected: {detect_rate:.3f}")
+    print("gestures: " + ", ".join(f"{k}={v}" for k, v in sorted(gestures.items(), key=str)))
+
+    if args.out:
+        save_json(args.out, stages, config=vars(args), detect_rate=detect_rate,
+                  gestures={str(k): v for k, v in gestures.items()})
+        print(f"saved: {args.out}")
+    if args.compare:
+        compare(stages, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import cv2
+from frame_source import open_from_cli
 
-# 웹캠 열기 (0번: 노트북 기본 카메라)
-cap = cv2.VideoCapture(0)
+# 웹캠 열기 (인자가 없으면 0번: 노트북 기본 카메라, 동영상 파일 / 이미지 폴더도 가능)
+cap, display = open_from_cli(description="카메라 테스트") # 입력(웹캠/영상/이미지 폴더) + 출력(창/headless)
 
 # 카메라가 열리지 않으면 종료
 if not cap.isOpened():
@@ -17,13 +18,13 @@ while True:
         print("프레임을 읽을 수 없습니다.")
         break
 
-    cv2.imshow("Camera Test", frame)
+    display.show("Camera Test", frame)
 
     # ESC 키(27) 누르면 종료
-    if cv2.waitKey(1) & 0xFF == 27:
+    if display.poll_key() == 27:
         print("종료합니다.")
         break
 
 # 자원 해제
 cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+display.close()
\ No newline at end of file
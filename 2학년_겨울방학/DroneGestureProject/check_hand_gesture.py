@@ -0,0 +1,260 @@
+'''
+check_hand_gesture의 Docstring
+
+hand_gesture 손가락 판별 정확도 검사 + 속도 벤치마크 (카메라 / MediaPipe 없이 실행)
+
+이 코드의 목적:
+- 녹화된 랜드마크(fixtures/*.npz)로 count_fingers의 정답률을 확인
+  · npz 형식 : points (N,21,3) float32 (MediaPipe 정규화 좌표), labels (N,) 펴진 손가락 개수,
+               aspect (선택, 화면 너비 / 높이, 기본 4/3)
+  · record_landmarks.py --names 0,1,2,3,4,5 로 녹화한 파일을 그대로 넣으면 됨 (names로 라벨 → 손가락 개수 변환)
+    예: python record_landmarks.py 0 --names 0,1,2,3,4,5 --out fixtures
+  · fixtures가 없으면 실패(종료 코드 2) : 녹화 데이터 없이 합성 손만으로 통과한 것처럼 보이지 않도록
+  · 저장소에는 기준 손(fixtures/reference_hands.npz, make_hand_fixture.py로 생성)이 들어 있어 기본 실행이 가능,
+    녹화 데이터가 아니므로 실제 카메라로 녹화한 npz를 fixtures에 추가해서 같이 검사할 것
+  · --synthetic : 합성 손(관절 각도로 만든 손 모양)을 고정 seed로 만들어 함께 검사 (fixtures가 없어도 실행)
+  · --make-fixture 경로 : 합성 손 데이터를 npz로 저장 (형식 예시용, 녹화 데이터를 대신하지 않음)
+- 손을 화면 안에서 돌린 각도(0 / ±45 / ±90 / 180도)별로 예전 y좌표 방식과 관절 각도 방식을 비교
+- 속도 : 예전 방식(랜드마크 객체 속성 접근) / 새 방식 1손(랜드마크 객체, (21,3) 배열) / 새 방식 묶음(N손 한 번에)의
+         손 1개당 처리 시간(µs)
+- 관절 각도 방식 정답률이 --min-acc보다 낮으면 종료 코드 1 (회귀 검사용)
+
+사용 예:
+    python check_hand_gesture.py                       # fixtures/*.npz 검사
+    python check_hand_gesture.py --fixtures fixtures --min-acc 0.95
+    python check_hand_gesture.py --synthetic           # 합성 손 검사 (녹화 데이터가 없을 때)
+    python check_hand_gesture.py --make-fixture fixtures/synthetic.npz --samples 500
+'''
+
+import argparse
+import glob
+import math
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_gesture import count_fingers, count_fingers_batch
+
+ROTATIONS = (0, 45, -45, 90, -90, 180)  # 화면 안에서 손을 돌린 각도(도)
+DEFAULT_ASPECT = 4 / 3                  # 640x480 카메라
+
+# 손가락을 펴는 조합 (펴진 손가락 개수 0~5) : [엄지, 검지, 중지, 약지, 소지]
+POSES = (
+    (0, 0, 0, 0, 0),
+    (0, 1, 0, 0, 0),
+    (0, 1, 1, 0, 0),
+    (0, 1, 1, 1, 0),
+    (1, 1, 1, 0, 0),
+    (0, 1, 1, 1, 1),
+    (1, 1, 1, 1, 1),
+    (1, 0, 0, 0, 0),
+    (1, 0, 0, 0, 1),
+)
+
+
+# =========================
+# 예전 방식 (y좌표 비교, 비교 기준으로만 사용)
+# =========================
+def legacy_count_fingers(hand_landmarks):
+    finger_tips = [8, 12, 16, 20]
+    count = 0
+    for tip in finger_tips:
+        if hand_landmarks.landmark[tip].y < hand_landmarks.landmark[tip - 2].y:
+            count += 1
+
+    thumb_tip = hand_landmarks.landmark[4]
+    thumb_base = hand_landmarks.landmark[2]
+    pinky_base = hand_landmarks.landmark[17]
+
+    def get_dist(p1, p2):
+        return math.hypot(p1.x - p2.x, p1.y - p2.y)
+
+    if get_dist(thumb_tip, pinky_base) > get_dist(thumb_base, pinky_base):
+        count += 1
+    return count
+
+def to_landmarks(points):
+    # (21,3) 배열 → MediaPipe 랜드마크 객체와 같은 모양 (hand.landmark[i].x / .y / .z)
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points])
+
+
+# =========================
+# 합성 손 (관절 각도로 만든 손 모양)
+# =========================
+def _rotate(v, axis, deg):
+    # 로드리게스 회전 : v를 axis 기준으로 deg만큼 회전
+    axis = axis / np.linalg.norm(axis)
+    t = math.radians(deg)
+    return v * math.cos(t) + np.cross(axis, v) * math.sin(t) + axis * np.dot(axis, v) * (1 - math.cos(t))
+
+def synth_hand(pose, rng, roll=0.0, aspect=DEFAULT_ASPECT):
+    '''
+    pose : [엄지, 검지, 중지, 약지, 소지] 펴짐(1) / 접힘(0) → (21,3) MediaPipe 정규화 좌표
+    - 손바닥이 카메라를 보는 오른손, 손가락은 화면 위쪽(-y) 방향에서 시작
+    - 접힌 손가락은 손바닥 쪽(카메라 방향 -z)으로 말림
+    - 손 전체를 앞뒤 / 좌우로 조금 기울이고(±25도), 화면 안에서 roll만큼 돌린 뒤 잡음 추가
+    '''
+    normal = np.array([0.0, 0.0, -1.0])  # 손바닥 → 카메라 방향
+    p = np.zeros((21, 3))
+    scale = rng.uniform(0.8, 1.2)
+
+    # 검지~소지 : 손목 → MCP → PIP → DIP → TIP
+    spread = (-12.0, -2.0, 8.0, 18.0)   # MCP 방향(위쪽 기준, 도)
+    palm = (0.095, 0.095, 0.09, 0.085)
+    bones = ((0.045, 0.027, 0.022), (0.050, 0.030, 0.024), (0.046, 0.028, 0.023), (0.036, 0.021, 0.020))
+    for f in range(4):
+        base = 5 + 4 * f
+        d = _rotate(np.array([0.0, -1.0, 0.0]), normal, spread[f] + rng.normal(0, 3))
+        p[base] = d * palm[f] * scale
+        if pose[f + 1]:
+            flex = rng.uniform(0, 15, 3)
+        else:
+            flex = (rng.uniform(60, 90), rng.uniform(80, 105), rng.uniform(35, 65))
+        for j in range(3):
+            d = _rotate(d, np.cross(normal, d), flex[j])  # 손바닥 쪽으로 접힘
+            p[base + j + 1] = p[base + j] + d * bones[f][j] * scale
+
+    # 엄지 : 손목 → CMC → MCP → IP → TIP (검지 바깥쪽, -x 방향)
+    d = _rotate(np.array([0.0, -1.0, 0.0]), normal, 50.0 + rng.normal(0, 5))
+    p[1] = d * 0.035 * scale
+    d = _rotate(d, normal, -10.0 + rng.normal(0, 5))
+    p[2] = p[1] + d * 0.04 * scale
+    if pose[0]:
+        flex = rng.uniform(0, 15, 2)
+        across = rng.uniform(-10, 5)
+    else:
+        flex = (rng.uniform(40, 60), rng.uniform(40, 70))
+        across = rng.uniform(55, 75)  # 손바닥을 가로질러 소지 쪽으로
+    d = _rotate(d, normal, -across)
+    d = _rotate(d, np.cross(normal, d), flex[0])
+    p[3] = p[2] + d * 0.032 * scale
+    d = _rotate(d, np.cross(normal, d), flex[1])
+    p[4] = p[3] + d * 0.028 * scale
+
+    # 손 전체 기울기 + 화면 안 회전 (손바닥 가운데 기준)
+    center = p[9] * 0.5
+    tilt_x, tilt_y = rng.uniform(-25, 25, 2)
+    for i in range(21):
+        v = p[i] - center
+        v = _rotate(v, np.array([1.0, 0.0, 0.0]), tilt_x)
+        v = _rotate(v, np.array([0.0, 1.0, 0.0]), tilt_y)
+        p[i] = _rotate(v, np.array([0.0, 0.0, 1.0]), roll)
+
+    p += rng.normal(0, 0.002, p.shape) * np.array([1.0, 1.0, 3.0])  # z(깊이)는 잡음이 큼
+    # 정사각 단위 → MediaPipe 정규화 좌표 (x는 화면 너비, z는 x와 같은 단위)
+    return np.column_stack((0.5 + p[:, 0] / aspect, 0.5 + p[:, 1], p[:, 2] / aspect)).astype(np.float32)
+
+def synth_set(samples, seed=0, aspect=DEFAULT_ASPECT):
+    # 회전 각도마다 samples개 → points (R*samples,21,3), labels, rolls
+    rng = np.random.default_rng(seed)
+    points, labels, rolls = [], [], []
+    for roll in ROTATIONS:
+        for i in range(samples):
+            pose = POSES[i % len(POSES)]
+            points.append(synth_hand(pose, rng, roll + rng.uniform(-10, 10), aspect))
+            labels.append(sum(pose))
+            rolls.append(roll)
+    return np.stack(points), np.array(labels), np.array(rolls)
+
+
+# =========================
+# fixtures 읽기
+# =========================
+def load_fixtures(folder):
+    sets = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.npz"))):
+        data = np.load(path)
+        labels = data["labels"]
+        if "names" in data:
+            # record_landmarks 형식 : labels는 names의 번호 → 이름("0"~"5")이 손가락 개수
+            names = [str(n) for n in data["names"]]
+            if not all(n.isdigit() for n in names):
+                raise SystemExit(f"{path}: 라벨 이름이 손가락 개수가 아닙니다 ({', '.join(names)})")
+            labels = np.array([int(names[i]) for i in labels])
+        aspect = float(data["aspect"]) if "aspect" in data else DEFAULT_ASPECT
+        rolls = data["rolls"] if "rolls" in data else np.zeros(len(labels), dtype=int)
+        sets.append((os.path.basename(path), data["points"].astype(np.float32), labels, rolls, aspect))
+    return sets
+
+
+# =========================
+# 정확도 / 속도
+# =========================
+def accuracy_table(name, points, labels, rolls, aspect):
+    new = count_fingers_batch(points, aspect)
+    old = np.array([legacy_count_fingers(to_landmarks(p)) for p in points])
+    print(f"[{name}] hands={len(points)} aspect={aspect:.3f}")
+    print(f"{'roll':>6} {'n':>5} {'legacy':>8} {'angle':>8}")
+    for roll in sorted(set(rolls.tolist()), key=abs):
+        m = rolls == roll
+        print(f"{roll:>6} {m.sum():5d} {np.mean(old[m] == labels[m]):8.3f} {np.mean(new[m] == labels[m]):8.3f}")
+    acc = float(np.mean(new == labels))
+    print(f"{'all':>6} {len(labels):5d} {np.mean(old == labels):8.3f} {acc:8.3f}")
+    return acc
+
+def bench(points, aspect, repeat):
+    hands = [to_landmarks(p) for p in points]
+
+    def per_hand_us(fn, n):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best / n * 1e6
+
+    legacy = per_hand_us(lambda: [legacy_count_fingers(h) for h in hands], len(hands))
+    single = per_hand_us(lambda: [count_fingers(h, aspect) for h in hands], len(hands))
+    array = per_hand_us(lambda: [count_fingers(p, aspect) for p in points], len(points))
+    batch = per_hand_us(lambda: count_fingers_batch(points, aspect), len(points))
+    print(f"µs/hand : legacy {legacy:.1f} | angle 1 hand (landmarks) {single:.1f} | angle 1 hand (21,3) {array:.1f} | "
+          f"angle batch x{len(points)} {batch:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="손가락 판별 정확도 / 속도 검사")
+    parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"),
+                        help="녹화된 랜드마크 npz 폴더")
+    parser.add_argument("--samples", type=int, default=180, help="합성 손 : 회전 각도별 개수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="속도 측정 반복 (최솟값 사용)")
+    parser.add_argument("--min-acc", type=float, default=0.95, help="관절 각도 방식 최소 정답률")
+    parser.add_argument("--synthetic", action="store_true", help="합성 손 데이터도 검사 (fixtures가 없어도 실행)")
+    parser.add_argument("--make-fixture", default=None, help="합성 손 데이터를 이 경로에 npz로 저장하고 종료")
+    args = parser.parse_args()
+
+    if args.make_fixture:
+        points, labels, rolls = synth_set(args.samples, args.seed)
+        os.makedirs(os.path.dirname(os.path.abspath(args.make_fixture)), exist_ok=True)
+        np.savez_compressed(args.make_fixture, points=points, labels=labels, rolls=rolls, aspect=DEFAULT_ASPECT)
+        print(f"saved {len(points)} hands -> {args.make_fixture}")
+        return
+
+    sets = load_fixtures(args.fixtures) if os.path.isdir(args.fixtures) else []
+    if args.synthetic:
+        points, labels, rolls = synth_set(args.samples, args.seed)
+        sets.append(("synthetic", points, labels, rolls, DEFAULT_ASPECT))
+    if not sets:
+        print(f"FAIL : {args.fixtures} 에 녹화 랜드마크(*.npz)가 없습니다")
+        print("  녹화 : python record_landmarks.py 0 --names 0,1,2,3,4,5 --out fixtures")
+        print("  합성 손으로만 검사 : python check_hand_gesture.py --synthetic")
+        raise SystemExit(2)
+
+    failed = []
+    for name, points, labels, rolls, aspect in sets:
+        acc = accuracy_table(name, points, labels, rolls, aspect)
+        if acc < args.min_acc:
+            failed.append(f"{name} ({acc:.3f})")
+    print()
+    bench(sets[0][1], sets[0][4], args.repeat)
+
+    if failed:
+        print(f"FAIL : 정답률 < {args.min_acc} : {', '.join(failed)}")
+        raise SystemExit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,29 +7,32 @@ drone_basic_test의 Docstring
 - 드론과 연결하여 이륙, 이동(roll, pitch, yaw, throttle), 호버링, 착륙을 제어
 - 축 제어 함수를 별도로 정의해 직관적으로 드론을 움직일 수 있도록 구성
 - 이동 시 관성 제어(Brake)를 추가하여 보다 안정적인 제어를 구현
+  (motion_control : 목표 속도로 이동, 측정 속도가 0이 될 때까지 브레이크, 속도 0 유지 호버)
 - 안전 초기화 루틴(safe_initialize)과 안전 착륙 루틴(safe_land)을 추가하여,
   예기치 못한 상황에서도 드론을 안전하게 제어할 수 있도록 함
 - 안전을 위해 예외 처리(KeyboardInterrupt, 일반 Exception) 시 즉시 착륙하도록 함
+- SIMULATE = True 이면 드론 없이 sim_drone.SimDrone(가상 시계)으로 같은 순서를 실행하고 최종 위치를 출력
 '''
 
 from time import sleep
 from e_drone.drone import *
 from e_drone.protocol import *
 
+from motion_control import MotionController
+
 # =========================
 # 튜닝 파라미터
 # =========================
-MOVE_POWER = 30       # 기본 이동 파워  
+MOVE_SPEED = 0.8      # 기본 이동 속도(m/s)
 MOVE_MS = 2000        # 이동 시간(ms)
 
-BRAKE_POWER = 20      # 관성 제어 세기
-BRAKE_MS = 500        # 관성 제어 시간
-
 HOVER_MS = 1000       # 호버링 유지 시간(ms)
 
 TRIM_ROLL = 5         # 드론 Roll 보정값
 TRIM_PITCH = 8        # 드론 Pitch 보정값
 
+SIMULATE = False      # True : 시뮬레이션 드론 (기체 쏠림 = 보정값의 반대)
+
 '''
 TRIM_ROLL / TRIM_PITCH 기록
 1차 : 10 / 12
@@ -39,52 +42,46 @@ TRIM_ROLL / TRIM_PITCH 기록
 # =========================
 # 기본 제어
 # control : 드론 제어 명령
-# hover : 드론 호버링 (보정값 적용)
+# hover : 드론 호버링 (속도 0 유지, 속도 정보가 없으면 보정값 적용)
+# brake : 관성 제어 (측정 속도가 0이 될 때까지)
 # =========================
+motion = None   # MotionController (드론 연결 후 생성)
+
 def control(drone, roll, pitch, yaw, throttle, duration_ms):
     drone.sendControlWhile(roll, pitch, yaw, throttle, duration_ms)
 
 def hover(drone, duration_ms):
-    control(drone, TRIM_ROLL, TRIM_PITCH, 0, 0, duration_ms)
+    motion.hold(duration_ms)
+
+def brake(drone):
+    settle = motion.stop()
+    print("Brake" if settle is None else f"Brake ({settle:.2f}s)")
 
 # =========================
 # 이동 + 관성 제어
 # =========================
 def move_forward(drone):
     print("Forward")
-    control(drone, 0, MOVE_POWER, 0, 0, MOVE_MS)
-
-    # 관성 제어 (반대 방향)
-    print("Brake")
-    control(drone, 0, -BRAKE_POWER, 0, 0, BRAKE_MS)
-
+    motion.move(forward=+MOVE_SPEED, duration_ms=MOVE_MS)
+    brake(drone)
     hover(drone, HOVER_MS)
 
 def move_backward(drone):
     print("Backward")
-    control(drone, 0, -MOVE_POWER, 0, 0, MOVE_MS)
-
-    print("Brake")
-    control(drone, 0, BRAKE_POWER, 0, 0, BRAKE_MS)
-
+    motion.move(forward=-MOVE_SPEED, duration_ms=MOVE_MS)
+    brake(drone)
     hover(drone, HOVER_MS)
 
 def move_left(drone):
     print("Left")
-    control(drone, -MOVE_POWER, 0, 0, 0, MOVE_MS)
-
-    print("Brake")
-    control(drone, BRAKE_POWER, 0, 0, 0, BRAKE_MS)
-
+    motion.move(right=-MOVE_SPEED, duration_ms=MOVE_MS)
+    brake(drone)
     hover(drone, HOVER_MS)
 
 def move_right(drone):
     print("Right")
-    control(drone, MOVE_POWER, 0, 0, 0, MOVE_MS)
-
-    print("Brake")
-    control(drone, -BRAKE_POWER, 0, 0, 0, BRAKE_MS)
-
+    motion.move(right=+MOVE_SPEED, duration_ms=MOVE_MS)
+    brake(drone)
     hover(drone, HOVER_MS)
 
 # =========================
@@ -100,8 +97,8 @@ def safe_initialize(drone):
     # 혹시 공중 상태로 남아있을 가능성 대비
     safe_land(drone)
 
-    # 제어값 0으로 덮어쓰기 (호버 명령으로 제어값 초기화)
-    hover(drone, 500)
+    # 제어값 0으로 덮어쓰기
+    control(drone, 0, 0, 0, 0, 500)
     sleep(0.5)
 
     print("[INIT] Reset complete.")
@@ -124,7 +121,13 @@ def safe_land(drone):
 
 if __name__ == '__main__':
 
-    drone = Drone() # 드론 객체 생성
+    if SIMULATE:
+        from sim_drone import SimDrone
+        drone = SimDrone(speed=0.0, drift_roll=-TRIM_ROLL, drift_pitch=-TRIM_PITCH)
+        sleep = drone.sleep # 이 파일의 sleep도 가상 시계로
+    else:
+        drone = Drone() # 드론 객체 생성
+    motion = MotionController(drone, trim=(TRIM_ROLL, TRIM_PITCH))
 
     # 드론 연결 시도
     if drone.open():
@@ -142,6 +145,7 @@ if __name__ == '__main__':
         print("TakeOff")
         drone.sendTakeOff()
         sleep(3)
+        motion.reset()
 
         print("Hover 5s")
         hover(drone, 5000)
@@ -183,4 +187,7 @@ if __name__ == '__main__':
         print("Closing connection")
         for _ in range(3):
             drone.close()
-            sleep(0.5)
\ No newline at end of file
+            sleep(0.5)
+
+        if SIMULATE:
+            print(drone.summary())
\ No newline at end of file
@@ -4,13 +4,31 @@ drone_missions의 Docstring
 이 코드의 목적:
 - 드론과 연결하여 기본적인 축 제어(roll, pitch, yaw, throttle, hover)를 수행
 - 특정 미션 동작(이륙, 착륙, 전진, 후진, 좌측 이동, 우측 이동)을 함수로 정의
+- 학습된 제스처 모델(gesture_model)용 추가 미션 : 상승, 하강, 좌 / 우 회전(yaw), 호버 (6~10번)
 - 손 제스처의 숫자 입력(gesture_number)에 따라 해당 미션을 실행할 수 있도록 매핑
 - 비행 상태 플래그(is_flying)를 두어 중복 명령을 방지하고, 안전한 제어를 구현
+
+[취소 가능한 미션]
+- 미션은 mission_executor의 별도 스레드에서 실행되고, 그동안 제스처 루프는 계속 동작
+- control()은 sendControlWhile을 CONTROL_CHUNK_MS 단위로 나눠 보내고, 대기(wait)도 WAIT_CHUNK_SEC 단위로 나눠서
+  조각 사이마다 취소 요청(request_cancel)을 확인 → 취소되면 MissionCancelled 발생
+- 착륙(mission_land) / 안전 초기화는 취소 확인을 하지 않음 (항상 끝까지 실행)
+
+[속도 피드백 이동 (motion_control)]
+- 이동 / 브레이크 / 호버는 motion_control.MotionController를 같이 사용 (드론 1대당 1개)
+  · move : 목표 속도(MOVE_SPEED m/s)로 정해진 시간 이동
+  · brake : 고정 세기 / 시간 펄스 대신, 측정 속도가 0이 될 때까지 브레이크 (걸린 시간 출력)
+  · hover : 속도 0 유지 (TRIM은 시작값, 드론 / 배터리에 따라 적분값이 맞춰감)
+- 조정값은 motion_control의 게인 (KP, KI, KFF), MOTION_GAINS로 덮어쓰기 가능 (sim_missions.py --sweep)
+- 속도 정보가 없는 드론(MockDrone 등)에서는 기존처럼 TRIM 호버 + 반대 방향 브레이크 펄스
 '''
 
+import threading
 from time import sleep
-from e_drone.drone import *
-from e_drone.protocol import *
+
+# e_drone은 import하지 않음 : 미션은 전달받은 drone 객체의 메서드만 사용
+# → Drone / MockDrone / SimDrone 모두 같은 코드로 실행 (sim_missions.py는 e_drone 없이 동작)
+from motion_control import MotionController
 
 # =========================
 # 튜닝 파라미터 
@@ -23,27 +41,85 @@ TRIM_PITCH = 12  # 호버링 시, Pitch 보정값
 
 TAKEOFF_STABILIZE_SEC = 3.0 # 이륙 후 안정화 대기 시간(sec)
 
+CONTROL_CHUNK_MS = 100  # 제어 명령을 나눠 보내는 단위(ms) : 취소 반응 시간
+WAIT_CHUNK_SEC = 0.1    # 대기를 나누는 단위(sec)
+
+MOVE_SPEED = 0.8        # 전진 / 후진 / 좌 / 우 이동 목표 속도(m/s)
+MOTION_GAINS = {}       # 제어기 게인 덮어쓰기 (예 : {"kp": 30, "ki": 10}), 비우면 motion_control 기본값
+
 # =========================
 # 비행 상태 (중복 명령 방지)
 # =========================
 is_flying = False   # 현재 드론이 비행 중인지 여부
 
+# =========================
+# 취소 (mission_executor에서 사용)
+# =========================
+class MissionCancelled(Exception):
+    pass
+
+_cancel = threading.Event()
+
+def request_cancel():
+    # 실행 중인 미션을 다음 조각 경계에서 중단
+    _cancel.set()
+
+def clear_cancel():
+    _cancel.clear()
+
+def check_cancel():
+    if _cancel.is_set():
+        raise MissionCancelled()
+
+def wait(sec):
+    # sleep(sec)과 같지만, WAIT_CHUNK_SEC마다 취소 확인
+    remaining = sec
+    while remaining > 1e-9:
+        check_cancel()
+        step = min(WAIT_CHUNK_SEC, remaining)
+        sleep(step)
+        remaining -= step
+    check_cancel()
+
 # =========================
 # 기본 제어
-# control : TRIM 없이 순수 제어값 전달 (호버링/이동/브레이크에 사용)
-# hover : TRIM 보정값 만 적용
-# brake : 관성 제거용 브레이크 (반대 방향으로 짧게)
+# control : TRIM 없이 순수 제어값 전달 (초기화에 사용)
+# move : 목표 속도로 이동 (속도 피드백)
+# brake : 관성 제거용 브레이크 (측정 속도가 0이 될 때까지)
+# hover : 제자리 유지 (속도 0 유지, 속도 정보가 없으면 TRIM 보정값)
 # =========================
+_motion = None
+
+def motion(drone):
+    # 드론마다 MotionController 1개 (적분값 = 학습된 TRIM을 미션 사이에 유지)
+    global _motion
+    if _motion is None or _motion.drone is not drone:
+        _motion = MotionController(drone, trim=(TRIM_ROLL, TRIM_PITCH), check=check_cancel, **MOTION_GAINS)
+    return _motion
+
 def control(drone, roll, pitch, yaw, throttle, duration_ms):
-    drone.sendControlWhile(roll, pitch, yaw, throttle, duration_ms)
+    # CONTROL_CHUNK_MS 단위로 나눠 보내면서 조각 사이마다 취소 확인
+    remaining = duration_ms
+    while remaining > 0:
+        check_cancel()
+        step = min(CONTROL_CHUNK_MS, remaining)
+        drone.sendControlWhile(roll, pitch, yaw, throttle, step)
+        remaining -= step
+
+def stop_motion(drone):
+    # 취소된 미션이 남긴 제어값 제거 (취소 확인 없이 0 제어값을 짧게 전송)
+    drone.sendControlWhile(0, 0, 0, 0, 200)
+
+def move(drone, forward, right, duration_ms, yaw=0, throttle=0):
+    motion(drone).move(forward, right, duration_ms, yaw, throttle)
 
 def hover(drone, duration_ms):
     print("Hover")
-    control(drone, TRIM_ROLL, TRIM_PITCH, 0, 0, duration_ms)
+    motion(drone).hold(duration_ms)
 
-def brake(drone, roll, pitch, duration_ms):
-    print("Brake")
-    control(drone, roll, pitch, 0, 0, duration_ms)
+def brake(drone):
+    settle = motion(drone).stop()
+    print("Brake" if settle is None else f"Brake ({settle:.2f}s)")
 
 # =========================
 # 미션 (이동 -> 브레이크 -> 호버)
@@ -56,11 +132,12 @@ def mission_takeoff(drone):
 
     print("TakeOff")
     drone.sendTakeOff()
-    sleep(TAKEOFF_STABILIZE_SEC)
+    is_flying = True  # 이륙 명령 이후에는 공중에 있다고 보고, 취소되어도 착륙 대상이 되도록
+    motion(drone).reset()
+    wait(TAKEOFF_STABILIZE_SEC)
 
     # 이륙 직후 안정화
     hover(drone, 1000)
-    is_flying = True
 
 def mission_land(drone):
     global is_flying
@@ -78,8 +155,8 @@ def mission_forward(drone):
         return
 
     print("Forward")
-    control(drone, 0, 40, 0, 0, 3000)
-    brake(drone, 0, -15, 500)
+    move(drone, +MOVE_SPEED, 0, 3000)
+    brake(drone)
     hover(drone, HOVER_MS)
 
 def mission_backward(drone):
@@ -88,8 +165,8 @@ def mission_backward(drone):
         return
 
     print("Backward")
-    control(drone, 0, -30, 0, 0, 2000)
-    brake(drone, 0, +10, 300)
+    move(drone, -MOVE_SPEED, 0, 2000)
+    brake(drone)
     hover(drone, HOVER_MS)
 
 def mission_left(drone):
@@ -98,8 +175,8 @@ def mission_left(drone):
         return
 
     print("Left")
-    control(drone, -30, 0, 0, 0, 1500)
-    brake(drone, +10, 0, 200)
+    move(drone, 0, -MOVE_SPEED, 1500)
+    brake(drone)
     hover(drone, HOVER_MS)
 
 def mission_right(drone):
@@ -108,10 +185,59 @@ def mission_right(drone):
         return
 
     print("Right")
-    control(drone, +30, 10, 0, 0, 1500)
-    brake(drone, -10, 0, 700)
+    move(drone, 0, +MOVE_SPEED, 1500)
+    brake(drone)
     hover(drone, HOVER_MS)
 
+# =========================
+# 추가 미션 (학습된 제스처 모델용)
+# 상승 / 하강 : throttle, 회전 : yaw (+ : 왼쪽(반시계) 회전)
+# =========================
+def mission_up(drone):
+    if not is_flying:
+        print("[SKIP] not flying (up ignored)")
+        return
+
+    print("Up")
+    move(drone, 0, 0, 800, throttle=+40)
+    hover(drone, HOVER_MS)
+
+def mission_down(drone):
+    if not is_flying:
+        print("[SKIP] not flying (down ignored)")
+        return
+
+    print("Down")
+    move(drone, 0, 0, 600, throttle=-30)
+    hover(drone, HOVER_MS)
+
+def mission_yaw_left(drone):
+    if not is_flying:
+        print("[SKIP] not flying (yaw left ignored)")
+        return
+
+    print("Yaw Left")
+    move(drone, 0, 0, 1000, yaw=+50)
+    hover(drone, HOVER_MS)
+
+def mission_yaw_right(drone):
+    if not is_flying:
+        print("[SKIP] not flying (yaw right ignored)")
+        return
+
+    print("Yaw Right")
+    move(drone, 0, 0, 1000, yaw=-50)
+    hover(drone, HOVER_MS)
+
+def mission_hover(drone):
+    if not is_flying:
+        print("[SKIP] not flying (hover ignored)")
+        return
+
+    # 제자리 유지 (이전 이동의 관성을 멈추고 속도 0 유지)
+    brake(drone)
+    hover(drone, 2 * HOVER_MS)
+
 # =========================
 # 안전 초기화 루틴
 # 방법 : 
@@ -144,6 +270,11 @@ def safe_initialize(drone):
 # 3 : 후진
 # 4 : 좌측
 # 5 : 우측
+# 6 : 상승       (6~10 : 학습된 제스처 모델 전용, gesture_model.GESTURES와 같은 번호)
+# 7 : 하강
+# 8 : 좌 회전
+# 9 : 우 회전
+# 10 : 호버
 # =========================
 def execute_mission(drone, gesture_number):
     if gesture_number == 0:
@@ -158,5 +289,15 @@ def execute_mission(drone, gesture_number):
         mission_left(drone)
     elif gesture_number == 5:
         mission_right(drone)
+    elif gesture_number == 6:
+        mission_up(drone)
+    elif gesture_number == 7:
+        mission_down(drone)
+    elif gesture_number == 8:
+        mission_yaw_left(drone)
+    elif gesture_number == 9:
+        mission_yaw_right(drone)
+    elif gesture_number == 10:
+        mission_hover(drone)
     else:
         print("[NO MAP] gesture:", gesture_number)
\ No newline at end of file
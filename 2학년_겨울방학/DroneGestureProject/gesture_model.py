@@ -0,0 +1,122 @@
+'''
+gesture_model의 Docstring
+
+손 랜드마크(21x3) → 학습된 제스처 분류 (NumPy만으로 추론하는 작은 MLP / k-NN)
+
+이 코드의 목적:
+- hand_gesture.count_fingers는 "펴진 손가락 개수(0~5)"만 알 수 있어서 드론 명령이 6개로 제한됨
+- 녹화한 랜드마크(record_landmarks.py)로 학습한 모델(train_gesture.py)을 .npz로 저장하고,
+  실시간 루프에서는 TensorFlow 없이 NumPy 행렬 곱 몇 번으로 분류 (손 1개당 수십 µs)
+  → 상승 / 하강 / 좌우 회전(yaw) / 호버 등 명령을 늘려도 프레임당 지연은 거의 그대로
+- 모델 종류
+  · mlp : 63 → hidden(ReLU) → 클래스 수(softmax), 입력 표준화(mean / std)까지 npz에 포함
+  · knn : 학습 특징 벡터를 그대로 저장, 가장 가까운 k개의 투표 비율을 확률로 사용
+
+[입력 정규화 (normalize)]
+- x / z에 화면 비율(aspect)을 곱해 y와 같은 단위로 맞춤 (hand_gesture와 같은 규칙)
+- 손목(0번)을 원점으로 옮기고, 손목 → 중지 뿌리(9번) 길이로 나눔 → 화면 위치 / 손 크기와 무관
+- 회전은 정규화하지 않음 : "위를 가리킴(상승) / 아래를 가리킴(하강)"처럼 방향 자체가 제스처이기 때문
+
+[npz 형식]
+- kind ("mlp" / "knn"), names (클래스 이름)
+- mlp : mean, std, w1, b1, w2, b2
+- knn : feats (M,63), labels (M,), k
+
+사용법:
+    model = GestureModel.load("gesture_model.npz")
+    name, prob = model.predict(points, aspect=4/3)         # points : (21,3)
+    ids, probs = model.predict_batch(sequence, aspect=4/3)  # sequence : (N,21,3)
+'''
+
+import numpy as np
+
+# 기본 제스처 이름 (번호 = drone_missions.execute_mission 미션 번호)
+GESTURES = (
+    "land",       # 0
+    "takeoff",    # 1
+    "forward",    # 2
+    "backward",   # 3
+    "left",       # 4
+    "right",      # 5
+    "up",         # 6
+    "down",       # 7
+    "yaw_left",   # 8
+    "yaw_right",  # 9
+    "hover",      # 10
+)
+
+FEATURES = 63   # 21 랜드마크 x (x, y, z)
+
+
+# =========================
+# 입력 정규화
+# =========================
+def normalize(points, aspect=1.0):
+    '''
+    (...,21,3) MediaPipe 정규화 좌표 → (...,63) float32 특징 벡터
+    '''
+    p = np.asarray(points, dtype=np.float32)
+    if aspect != 1.0:
+        p = p * np.array([aspect, 1.0, aspect], dtype=np.float32)
+    p = p - p[..., :1, :]                                   # 손목 기준
+    size = np.sqrt((p[..., 9, :] ** 2).sum(axis=-1))        # 손목 → 중지 뿌리 길이
+    p = p / (size[..., None, None] + 1e-6)
+    return p.reshape(p.shape[:-2] + (FEATURES,))
+
+
+# =========================
+# 추론 모델
+# =========================
+class GestureModel:
+    def __init__(self, kind, names, params):
+        if kind not in ("mlp", "knn"):
+            raise ValueError(f"unknown model kind: {kind}")
+        self.kind = kind
+        self.names = tuple(names)
+        self.params = {k: np.asarray(v, dtype=np.float32) if k not in ("labels", "k") else np.asarray(v)
+                       for k, v in params.items()}
+        if kind == "knn":
+            feats = self.params["feats"]
+            self.params["sq"] = (feats * feats).sum(axis=1)  # 거리 계산용 |f|^2 미리 계산
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        kind = str(data["kind"])
+        params = {k: data[k] for k in data.files if k not in ("kind", "names")}
+        return cls(kind, [str(n) for n in data["names"]], params)
+
+    def save(self, path):
+        params = {k: v for k, v in self.params.items() if k != "sq"}
+        np.savez(path, kind=self.kind, names=np.array(self.names), **params)
+
+    def probs(self, feats):
+        # (N,63) 특징 → (N,클래스) 확률
+        if self.kind == "mlp":
+            p = self.params
+            x = (feats - p["mean"]) / p["std"]
+            h = np.maximum(x @ p["w1"] + p["b1"], 0.0)
+            z = h @ p["w2"] + p["b2"]
+            z = np.exp(z - z.max(axis=1, keepdims=True))
+            return z / z.sum(axis=1, keepdims=True)
+
+        # knn : |a-b|^2 = |a|^2 - 2ab + |b|^2 (|a|^2는 순위에 영향 없음)
+        p = self.params
+        k = int(p["k"])
+        d = p["sq"][None, :] - 2.0 * feats @ p["feats"].T
+        nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+        votes = p["labels"][nearest]
+        out = np.zeros((len(feats), len(self.names)), dtype=np.float32)
+        np.add.at(out, (np.arange(len(feats))[:, None], votes), 1.0 / k)
+        return out
+
+    def predict_batch(self, points, aspect=1.0):
+        # (N,21,3) → (N,) 클래스 번호, (N,) 확률
+        pr = self.probs(normalize(points, aspect).reshape(-1, FEATURES))
+        ids = pr.argmax(axis=1)
+        return ids, pr[np.arange(len(ids)), ids]
+
+    def predict(self, points, aspect=1.0):
+        # (21,3) → (이름, 확률)
+        ids, probs = self.predict_batch(points[None], aspect)
+        return self.names[ids[0]], float(probs[0])
@@ -0,0 +1,55 @@
+'''
+gesture_stability의 Docstring
+
+제스처 안정성 판단 (같은 제스처가 일정 시간 유지되면 한 번만 확정)
+
+이 코드의 목적:
+- main_gesture_to_drone.py 루프 안에 있던 안정성 로직(후보 / 시작 시간 / 실행 잠금)을 클래스로 분리해서,
+  실시간 루프와 녹화 로그 재생기(replay_gestures.py)가 같은 코드로 판단하도록 함
+- 시간(now)을 인자로 받으므로, 재생할 때는 녹화된 시각을 넣으면 실행 속도와 관계없이 같은 결과
+
+[판단 규칙 (Edge Trigger)]
+- 새로운 제스처 등장 → 후보 갱신, 시간 측정 시작
+- 같은 제스처가 stable_time 이상 유지 + 아직 잠금 전 → 확정, 후보 초기화, 잠금
+- 손이 안 보이면(None) → 후보 초기화, 잠금 해제 (손을 내렸다 다시 올려야 다음 명령)
+'''
+
+STABLE_TIME = 1.0   # 같은 제스처 1초 유지 시 확정
+
+
+class GestureStabilizer:
+    def __init__(self, stable_time=STABLE_TIME):
+        self.stable_time = stable_time
+        self.reset()
+
+    def reset(self):
+        self.candidate = None       # 현재 후보 제스처
+        self.candidate_start = 0.0  # 후보 시작 시간
+        self.active = False         # 제스처 실행 잠금 플래그
+        self.last_latency = None    # 마지막 확정의 (확정 시각 - 후보 시작 시각)
+
+    def update(self, gesture, now):
+        # 이번 프레임의 제스처(None : 손 없음) → 확정된 제스처 또는 None
+        if gesture is None:
+            self.candidate = None
+            self.active = False
+            return None
+
+        if self.candidate is None or gesture != self.candidate:
+            self.candidate = gesture
+            self.candidate_start = now
+            return None
+
+        if now - self.candidate_start >= self.stable_time and not self.active:
+            self.last_latency = now - self.candidate_start
+            self.candidate = None
+            self.candidate_start = 0.0
+            self.active = True
+            return gesture
+        return None
+
+    def elapsed(self, now):
+        # 화면 표시용 : 현재 후보가 유지된 시간 (후보가 없으면 None)
+        if self.candidate is None:
+            return None
+        return now - self.candidate_start
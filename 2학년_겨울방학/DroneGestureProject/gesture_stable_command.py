@@ -32,7 +32,10 @@ MediaPipe를 이용한 손가락 개수 기반 제스처 인식 프로그램
 import cv2
 import mediapipe as mp
 import time
-import math
+
+from frame_source import open_from_cli
+from hand_gesture import count_fingers # 손가락 개수 계산 (관절 각도, 손을 돌려도 동작)
+from hand_scheduler import MODES, HandScheduler # 손 인식 스케줄 (축소 / 잘라내기 / 건너뛰기)
 
 mp_hands = mp.solutions.hands
 mp_draw = mp.solutions.drawing_utils
@@ -44,7 +47,10 @@ hands = mp_hands.Hands(
     min_tracking_confidence=0.7
 )
 
-cap = cv2.VideoCapture(0)
+HAND_MODE = "full"          # 성능이 낮은 노트북 : "adaptive"
+scheduler = HandScheduler(hands, **MODES[HAND_MODE])
+
+cap, display = open_from_cli(description="제스처 안정성 테스트") # 입력(웹캠/영상/이미지 폴더) + 출력(창/headless)
 
 if not cap.isOpened():
     print("카메라를 열 수 없습니다.")
@@ -56,34 +62,6 @@ candidate_start_time = 0.0  # 후보 제스처가 유지되기 시작한 시간
 STABLE_TIME = 3.0           # 같은 제스처가 3초 유지되어야 확정
 
 
-def count_fingers(hand_landmarks):
-    # 1. 나머지 네 손가락 (y좌표 비교)
-    finger_tips = [8, 12, 16, 20]
-    count = 0
-    for tip in finger_tips:
-        if hand_landmarks.landmark[tip].y < hand_landmarks.landmark[tip - 2].y:
-            count += 1
-
-    # 2. 엄지 판별 로직 개선 (상대적 거리 이용)
-    # 엄지 끝(4번)과 소지 뿌리(17번) 사이의 거리를 측정
-    # 이 거리가 엄지 뿌리(2번)와 소지 뿌리(17번) 사이의 거리보다 멀면 펴진 것으로 간주
-    
-    thumb_tip = hand_landmarks.landmark[4]
-    thumb_base = hand_landmarks.landmark[2]
-    pinky_base = hand_landmarks.landmark[17]
-
-    # 거리 계산 함수 (유클리드 거리)
-    def get_dist(p1, p2):
-        return math.hypot(p1.x - p2.x, p1.y - p2.y)
-
-    dist_tip_to_pinky = get_dist(thumb_tip, pinky_base)
-    dist_base_to_pinky = get_dist(thumb_base, pinky_base)
-
-    if dist_tip_to_pinky > dist_base_to_pinky:
-        count += 1
-
-    return count
-
 print("제스처 안정성 테스트 시작 (ESC 종료)")
 
 while True:
@@ -91,8 +69,7 @@ while True:
     if not ret:
         break
 
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(rgb)
+    result = scheduler.process(frame)
 
     gesture = None # 현재 프레임에서 인식된 제스처
 
@@ -104,7 +81,7 @@ while True:
                 mp_hands.HAND_CONNECTIONS
             )
             # 손가락 개수 계산 -> 제스처 숫자
-            gesture = count_fingers(hand_landmarks)
+            gesture = count_fingers(hand_landmarks, aspect=frame.shape[1] / frame.shape[0])
 
     now = time.time() # 현재 시간
 
@@ -144,11 +121,12 @@ while True:
         candidate_gesture = None # 손이 인식되지 않으면 후보 초기화
 
     # 결과 화면 출력
-    cv2.imshow("Gesture Stable Command", frame)
+    display.show("Gesture Stable Command", frame)
 
     # ESC 키 입력 시 종료
-    if cv2.waitKey(1) & 0xFF == 27:
+    if display.poll_key() == 27:
         break
 
 cap.release()
-cv2.destroyAllWindows()
+display.close()
+print(f"[{HAND_MODE}]", scheduler.summary())
@@ -11,12 +11,17 @@ MediaPipe 소개 :
 - 웹캠으로 입력된 영상을 기반으로 MediaPipe Hands 모듈을 사용해 손을 인식
 - 손의 랜드마크(관절 위치)를 검출하고, 화면에 시각적으로 표시
 - ESC 키를 누르면 프로그램을 종료
+- HAND_MODE로 손 인식 스케줄(hand_scheduler : full / scale / crop / skip / adaptive)을 바꿔서
+  모드별 유효 랜드마크 FPS / CPU 사용률을 종료 시 출력
 
 '''
 
 import cv2
 import mediapipe as mp
 
+from frame_source import open_from_cli
+from hand_scheduler import MODES, HandScheduler # 축소 / 잘라내기 / 건너뛰기 + RGB 버퍼 재사용
+
 # MediaPipe 손 인식 초기화
 mp_hands = mp.solutions.hands # 손의 21개 관절(랜드마크)을 찾는 핵심 모델
 mp_draw = mp.solutions.drawing_utils # 좌표를 화면에 잘 그려주는 도구
@@ -34,8 +39,12 @@ hands = mp_hands.Hands(
     min_tracking_confidence=0.7     # 검출된 손을 계속 따라갈 때의 신뢰도 기준
 )
 
+# 손 인식 스케줄 (성능이 낮은 노트북 : "adaptive")
+HAND_MODE = "full"
+scheduler = HandScheduler(hands, **MODES[HAND_MODE])
+
 # 웹캠 열기
-cap = cv2.VideoCapture(0)
+cap, display = open_from_cli(description="MediaPipe 손 인식 테스트") # 입력(웹캠/영상/이미지 폴더) + 출력(창/headless)
 
 if not cap.isOpened():
     print("카메라를 열 수 없습니다.")
@@ -49,11 +58,9 @@ while True:
         print("프레임을 읽을 수 없습니다.")
         break
 
-    # BGR → RGB (MediaPipe는 RGB 필수)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
     # 손 인식 : 손의 위치와 21개 관절 좌표 계산
-    result = hands.process(rgb)
+    # (BGR → RGB 변환은 스케줄러가 미리 할당한 버퍼에, MediaPipe는 RGB 필수)
+    result = scheduler.process(frame)
 
     # 손 랜드마크가 검출된 경우
     '''
@@ -70,10 +77,11 @@ while True:
                 mp_hands.HAND_CONNECTIONS   # 랜드마크 연결선
             )
 
-    cv2.imshow("Hand Debug", frame)
+    display.show("Hand Debug", frame)
 
-    if cv2.waitKey(1) & 0xFF == 27:
+    if display.poll_key() == 27:
         break
 
 cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+display.close()
+print(f"[{HAND_MODE}]", scheduler.summary())
\ No newline at end of file
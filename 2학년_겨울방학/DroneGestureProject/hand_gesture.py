@@ -0,0 +1,193 @@
+'''
+hand_gesture의 Docstring
+
+손 랜드마크 → 제스처(펴진 손가락 개수) 계산 모듈
+
+이 코드의 목적:
+- gesture_stable_command.py와 main_gesture_to_drone.py에 복사되어 있던 count_fingers를
+  한 곳으로 모아서, 두 스크립트와 벤치마크가 같은 함수를 사용하도록 함
+- MediaPipe 랜드마크 객체를 프레임마다 한 번만 (21,3) float32 배열로 바꾸고(landmarks_to_array),
+  손가락 5개의 펴짐 여부를 NumPy 벡터 연산으로 한 번에 계산 (손가락별 파이썬 반복 없음)
+- 손 1개 (21,3), 여러 손 / 녹화된 랜드마크 시퀀스 (N,21,3) 모두 같은 함수로 처리
+- 손 1개는 NumPy 호출 비용(호출마다 수 µs)이 계산보다 커서 따로 처리 :
+  판별에 쓰는 랜드마크 11개만 꺼내 파이썬 float 연산으로 계산 (같은 판별식, 반복문 / 함수 호출 없이 풀어 씀)
+  → MediaPipe 객체를 바로 넘기면 배열 변환도 생략
+
+[손가락 판별 방법 : 관절 각도]
+- 예전 방법(손가락 끝 y < 두 마디 아래 y)은 손이 옆으로 / 거꾸로 돌아가면 틀림
+- 손가락마다 "손바닥 방향(손목 → 손가락 뿌리)"과 "손가락 방향(뿌리 → 끝)" 사이 각도를 계산
+  → 손가락이 펴지면 두 방향이 거의 같아서 각도가 작고, 접히면 끝이 손바닥 쪽으로 돌아와서 각도가 큼
+  → 3차원 각도라서 손을 화면 안에서 돌리거나 조금 기울여도 값이 거의 변하지 않음
+- 관절 하나하나(PIP / DIP)의 각도를 더하는 방식보다 긴 마디(뿌리 → 끝)를 써서 랜드마크 흔들림에 강함
+- 검지/중지/약지/소지 : 손목(0) → MCP → TIP 각도 < FINGER_BEND_DEG 이면 펴짐
+- 엄지 : 손목(0) → 엄지 MCP(2) → 엄지 끝(4) 각도 < THUMB_BEND_DEG 이고,
+         엄지 끝(4번)-소지 뿌리(17번) 거리가 엄지 뿌리(2번)-소지 뿌리(17번) 거리보다 멀면 펴짐
+         (엄지를 곧게 편 채로 손바닥 위로 가로지르는 경우를 거리 조건으로 구분, 기존 거리 방식 유지)
+- MediaPipe의 x / y는 화면 너비 / 높이로 정규화되어 있으므로, 각도를 계산할 때는
+  aspect(너비 / 높이)를 곱해 x를 y와 같은 단위로 맞춤 (640x480 → 4/3)
+
+사용법:
+    points = landmarks_to_array(hand_landmarks)     # (21,3)
+    count_fingers(points, aspect=4/3)                # 0~5
+    count_fingers(hand_landmarks, aspect=4/3)        # MediaPipe 객체도 그대로 (배열 변환 없음)
+    finger_states(sequence)                          # (N,21,3) → (N,5) bool [엄지, 검지, 중지, 약지, 소지]
+
+정확도 / 속도 확인 : python check_hand_gesture.py (fixtures/*.npz 녹화 랜드마크, --synthetic : 합성 손)
+'''
+
+import numpy as np
+
+FINGER_BEND_DEG = 60.0   # 검지~소지 : 손바닥 방향과 손가락 방향 사이 각도가 이보다 작으면 펴짐
+THUMB_BEND_DEG = 55.0    # 엄지 : 같은 각도 기준 (거리 조건과 함께)
+THUMB_DIST_RATIO = 1.0   # 엄지 끝-소지 뿌리 거리 > 엄지 뿌리-소지 뿌리 거리 × 이 값
+
+# 손가락별 [손목, 뿌리(MCP), 끝(TIP)] 랜드마크 번호
+JOINTS = np.array([
+    [0, 2, 4],    # 엄지 (엄지는 1번 CMC가 손목에 붙어 있어서 2번 MCP를 뿌리로 사용)
+    [0, 5, 8],    # 검지
+    [0, 9, 12],   # 중지
+    [0, 13, 16],  # 약지
+    [0, 17, 20],  # 소지
+])
+
+FINGER_NAMES = ("thumb", "index", "middle", "ring", "pinky")
+
+
+# =========================
+# 랜드마크 → 배열
+# =========================
+def landmarks_to_array(hand_landmarks, out=None):
+    '''
+    MediaPipe NormalizedLandmarkList(21개) → (21,3) float32 [x, y, z]
+    out : 재사용할 (21,3) 배열 (매 프레임 새 배열을 만들지 않으려면 전달)
+    '''
+    flat = np.fromiter((v for p in hand_landmarks.landmark for v in (p.x, p.y, p.z)),
+                       dtype=np.float32, count=63)
+    if out is None:
+        return flat.reshape(21, 3)
+    out[...] = flat.reshape(21, 3)
+    return out
+
+def hands_to_array(multi_hand_landmarks):
+    # result.multi_hand_landmarks (손 N개) → (N,21,3)
+    return np.stack([landmarks_to_array(h) for h in multi_hand_landmarks])
+
+
+# =========================
+# 손가락 상태 (벡터 연산)
+# =========================
+def _scaled(points, aspect):
+    # x / z에 aspect를 곱해 y와 같은 단위로 (z는 x와 같은 단위)
+    p = np.asarray(points, dtype=np.float32)
+    if aspect != 1.0:
+        p = p * np.array([aspect, 1.0, aspect], dtype=np.float32)
+    return p
+
+def _bend_cos(p):
+    # (...,21,3) → (...,5) 손바닥 방향과 손가락 방향 사이 cos (1 : 곧게 펴짐)
+    v = np.diff(p[..., JOINTS, :], axis=-2)            # (...,5,2,3) [손목 → 뿌리, 뿌리 → 끝]
+    dot = (v[..., 0, :] * v[..., 1, :]).sum(axis=-1)
+    return dot / np.sqrt((v * v).sum(axis=-1).prod(axis=-1) + 1e-12)
+
+def finger_bend(points, aspect=1.0):
+    '''
+    (...,21,3) → (...,5) 손가락별 굽힘 각도(도) : 손바닥 방향(손목 → 뿌리)과 손가락 방향(뿌리 → 끝) 사이
+    - 0도 : 곧게 펴짐, 클수록 많이 접힘 (확인 / 디버그용, 판별은 finger_states)
+    '''
+    return np.degrees(np.arccos(np.clip(_bend_cos(_scaled(points, aspect)), -1.0, 1.0)))
+
+# 각도 대신 cos으로 비교 (arccos 생략) : cos > cos(기준 각도) 이면 펴짐
+_COS_TH = np.cos(np.radians([THUMB_BEND_DEG] + [FINGER_BEND_DEG] * 4)).astype(np.float32)
+
+def finger_states(points, aspect=1.0):
+    '''
+    (21,3) → (5,) bool, (N,21,3) → (N,5) bool : [엄지, 검지, 중지, 약지, 소지] 펴짐 여부
+    '''
+    if np.ndim(points) == 2:
+        return np.array(_finger_states_one(_pick_array(points), aspect * aspect))
+    p = _scaled(points, aspect)
+    states = _bend_cos(p) > _COS_TH
+
+    # 엄지 거리 조건 (화면 평면 x / y, 제곱 거리로 비교)
+    xy = p[..., (4, 2), :2] - p[..., 17:18, :2]         # [엄지 끝, 엄지 뿌리] - 소지 뿌리
+    d2 = (xy * xy).sum(axis=-1)
+    states[..., 0] &= d2[..., 0] > d2[..., 1] * THUMB_DIST_RATIO ** 2
+    return states
+
+def count_fingers_batch(points, aspect=1.0):
+    # (N,21,3) → (N,) 펴진 손가락 개수
+    return finger_states(points, aspect).sum(axis=-1)
+
+
+# =========================
+# 손 1개 (파이썬 float 연산)
+# =========================
+# 판별에 쓰는 랜드마크 : 손목, [엄지, 검지, 중지, 약지, 소지] × [뿌리, 끝]
+_USED = (0, 2, 4, 5, 8, 9, 12, 13, 16, 17, 20)
+_USED_FLAT = np.array([[3 * i, 3 * i + 1, 3 * i + 2] for i in _USED]).ravel()   # (21,3).take → x, y, z 33개
+_TH0, _TH1, _TH2, _TH3, _TH4 = (_COS_TH.astype(np.float64) ** 2).tolist()       # 손가락별 cos² 기준
+_DIST_RATIO2 = THUMB_DIST_RATIO ** 2
+
+def _pick_array(points):
+    # (21,3) 배열 → _USED 순서의 x, y, z 33개 (파이썬 float)
+    return np.asarray(points).take(_USED_FLAT).tolist()
+
+def _pick_landmarks(hand_landmarks):
+    # MediaPipe 랜드마크 객체 → _USED 순서의 x, y, z 33개 (배열을 만들지 않고 필요한 속성만 읽음)
+    lm = hand_landmarks.landmark
+    w, tb, tt, ib, it, mb, mt, rb, rt, pb, pt = (lm[0], lm[2], lm[4], lm[5], lm[8], lm[9],
+                                                 lm[12], lm[13], lm[16], lm[17], lm[20])
+    return (w.x, w.y, w.z, tb.x, tb.y, tb.z, tt.x, tt.y, tt.z, ib.x, ib.y, ib.z, it.x, it.y, it.z,
+            mb.x, mb.y, mb.z, mt.x, mt.y, mt.z, rb.x, rb.y, rb.z, rt.x, rt.y, rt.z,
+            pb.x, pb.y, pb.z, pt.x, pt.y, pt.z)
+
+def _finger_states_one(c, k):
+    '''
+    c : _USED 순서의 x, y, z 33개, k : aspect² → [엄지, 검지, 중지, 약지, 소지] bool
+    - finger_states와 같은 판별식 : x / z에 aspect를 곱하는 대신 제곱합에서 k(= aspect²)를 곱하고,
+      cos 나눗셈 대신 양변을 제곱해서 비교 (dot > 0 이고 dot² > cos² × |a|² × |b|²)
+    - 손가락 5개를 반복문 없이 풀어 씀 (손 1개에서는 반복 / 함수 호출 비용이 계산만큼 큼)
+    '''
+    (wx, wy, wz, tbx, tby, tbz, ttx, tty, ttz, ibx, iby, ibz, itx, ity, itz,
+     mbx, mby, mbz, mtx, mty, mtz, rbx, rby, rbz, rtx, rty, rtz, pbx, pby, pbz, ptx, pty, ptz) = c
+
+    # 엄지 : 거리 조건(화면 평면, 소지 뿌리 기준)을 먼저 보고, 통과할 때만 각도 계산
+    thumb = (k * (ttx - pbx) ** 2 + (tty - pby) ** 2 >
+             (k * (tbx - pbx) ** 2 + (tby - pby) ** 2) * _DIST_RATIO2)
+    if thumb:
+        ax, ay, az, bx, by, bz = tbx - wx, tby - wy, tbz - wz, ttx - tbx, tty - tby, ttz - tbz
+        dot = k * (ax * bx + az * bz) + ay * by
+        thumb = dot > 0 and dot * dot > _TH0 * (k * (ax * ax + az * az) + ay * ay) * (k * (bx * bx + bz * bz) + by * by)
+
+    ax, ay, az, bx, by, bz = ibx - wx, iby - wy, ibz - wz, itx - ibx, ity - iby, itz - ibz
+    dot = k * (ax * bx + az * bz) + ay * by
+    index = dot > 0 and dot * dot > _TH1 * (k * (ax * ax + az * az) + ay * ay) * (k * (bx * bx + bz * bz) + by * by)
+
+    ax, ay, az, bx, by, bz = mbx - wx, mby - wy, mbz - wz, mtx - mbx, mty - mby, mtz - mbz
+    dot = k * (ax * bx + az * bz) + ay * by
+    middle = dot > 0 and dot * dot > _TH2 * (k * (ax * ax + az * az) + ay * ay) * (k * (bx * bx + bz * bz) + by * by)
+
+    ax, ay, az, bx, by, bz = rbx - wx, rby - wy, rbz - wz, rtx - rbx, rty - rby, rtz - rbz
+    dot = k * (ax * bx + az * bz) + ay * by
+    ring = dot > 0 and dot * dot > _TH3 * (k * (ax * ax + az * az) + ay * ay) * (k * (bx * bx + bz * bz) + by * by)
+
+    ax, ay, az, bx, by, bz = pbx - wx, pby - wy, pbz - wz, ptx - pbx, pty - pby, ptz - pbz
+    dot = k * (ax * bx + az * bz) + ay * by
+    pinky = dot > 0 and dot * dot > _TH4 * (k * (ax * ax + az * az) + ay * ay) * (k * (bx * bx + bz * bz) + by * by)
+
+    return [thumb, index, middle, ring, pinky]
+
+
+# =========================
+# 손가락 개수 계산 (기존 함수 이름 유지)
+# =========================
+def count_fingers(hand_landmarks, aspect=1.0):
+    '''
+    hand_landmarks : MediaPipe 랜드마크 객체 또는 (21,3) 배열 → 펴진 손가락 개수(int)
+    - 손 1개용 (여러 손 / 시퀀스는 count_fingers_batch)
+    '''
+    if isinstance(hand_landmarks, np.ndarray):
+        c = _pick_array(hand_landmarks)
+    else:
+        c = _pick_landmarks(hand_landmarks)
+    return sum(_finger_states_one(c, aspect * aspect))
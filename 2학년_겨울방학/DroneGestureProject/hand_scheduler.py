@@ -0,0 +1,210 @@
+'''
+hand_scheduler의 Docstring
+
+MediaPipe 손 인식 호출 스케줄러 (축소 / 손 주변 잘라내기 / 정지 시 건너뛰기 / RGB 버퍼 재사용)
+
+이 코드의 목적:
+- 기존 스크립트는 매 프레임 원본 해상도 그대로 cv2.cvtColor(새 배열 할당) + hands.process를 실행해서,
+  성능이 낮은 노트북에서 드론 통신과 같이 돌리면 CPU가 부족했음
+- process(frame) 한 줄로 바꾸면 아래 방법을 골라서 적용 (결과 랜드마크는 항상 원본 프레임 기준 좌표)
+  1. max_side : 긴 변이 max_side를 넘으면 축소해서 인식 (정규화 좌표라서 결과 변환 필요 없음)
+  2. crop     : 직전 손 영역 + 여백(crop_margin)만 잘라서 인식 → 결과 좌표를 원본 기준으로 되돌림
+                손이 창 안쪽에 있는 동안은 창을 고정 (창이 자주 바뀌면 MediaPipe 추적이 끊김),
+                잘라낸 영역에서 손을 놓치면 같은 프레임을 원본 전체로 다시 인식
+  3. skip     : 손이 거의 움직이지 않으면(still_thresh, 손 크기 대비) 인식을 건너뛰고 직전 결과를 재사용
+                정지가 계속되면 건너뛰는 프레임 수를 max_skip까지 늘리고, 움직이면 바로 0으로
+                손이 없을 때는 idle_skip 프레임마다 한 번만 인식
+  4. RGB 버퍼 : cvtColor / resize 결과를 미리 할당한 배열에 씀 (프레임마다 새 배열 할당 없음)
+- summary() : 유효 랜드마크 FPS(새로 계산된 랜드마크 / 초)와 프로세스 CPU 사용률(time.process_time)
+
+모드 (MODES) : full / scale / crop / skip / adaptive(모두 사용)
+
+사용법:
+    scheduler = HandScheduler(hands, **MODES["adaptive"])
+    result = scheduler.process(frame)     # hands.process(rgb)와 같은 결과 객체
+    scheduler.fresh                       # 이번 프레임에서 새로 인식했으면 True (False : 직전 결과 재사용)
+    print(scheduler.summary())
+'''
+
+import time
+
+import cv2
+import numpy as np
+
+MODES = {
+    "full": dict(),
+    "scale": dict(max_side=320),
+    "crop": dict(crop=True),
+    "skip": dict(skip=True),
+    "adaptive": dict(max_side=320, crop=True, skip=True),
+}
+
+
+class _NoHands:
+    # 인식을 건너뛴 프레임에서 손이 없을 때 돌려주는 빈 결과
+    multi_hand_landmarks = None
+    multi_handedness = None
+
+
+class HandScheduler:
+    def __init__(self, hands, max_side=None, crop=False, crop_margin=0.35, min_crop=96,
+                 skip=False, still_thresh=0.02, max_skip=3, idle_skip=2):
+        self.hands = hands
+        self.max_side = max_side
+        self.crop = crop
+        self.crop_margin = crop_margin
+        self.min_crop = min_crop
+        self.skip = skip
+        self.still_thresh = still_thresh
+        self.max_skip = max_skip
+        self.idle_skip = idle_skip
+
+        self._rgb = None            # 미리 할당한 RGB 버퍼 (크기가 바뀔 때만 새로 할당)
+        self._small = None          # 축소용 BGR 버퍼
+        self._window = None         # 잘라낼 영역 (x0, y0, x1, y1), None : 전체
+        self._last = _NoHands()
+        self._last_points = None    # 직전 인식 랜드마크 (21,2) 픽셀
+        self._skip_budget = 0       # 앞으로 건너뛸 프레임 수
+        self._still_run = 0         # 연속 정지 횟수
+        self.fresh = False
+
+        self.frames = 0
+        self.processed = 0          # hands.process 호출 수 (다시 인식 포함)
+        self.updates = 0            # 새로 계산된 손 랜드마크 수
+        self.cropped = 0
+        self.retries = 0
+        self._wall0 = None
+        self._cpu0 = None
+
+    # =========================
+    # 메인 호출
+    # =========================
+    def process(self, frame):
+        if self._wall0 is None:
+            self._wall0 = time.perf_counter()
+            self._cpu0 = time.process_time()
+        self.frames += 1
+
+        if self.skip and self._skip_budget > 0:
+            self._skip_budget -= 1
+            self.fresh = False
+            return self._last
+
+        h, w = frame.shape[:2]
+        window = self._window if self.crop else None
+        result = self._run(frame, window)
+        if window is not None:
+            self.cropped += 1
+            if not result.multi_hand_landmarks:
+                # 잘라낸 영역에서 손을 놓침 → 같은 프레임을 전체로 다시
+                self.retries += 1
+                self._window = None
+                result = self._run(frame, None)
+
+        self.fresh = True
+        self._last = result
+        if result.multi_hand_landmarks:
+            self.updates += 1
+            pts = np.array([(p.x * w, p.y * h) for p in result.multi_hand_landmarks[0].landmark], dtype=np.float32)
+            self._update_window(pts, w, h)
+            self._update_skip(pts)
+            self._last_points = pts
+        else:
+            self._window = None
+            self._last_points = None
+            self._still_run = 0
+            self._skip_budget = self.idle_skip - 1 if self.skip else 0
+        return result
+
+    def _run(self, frame, window):
+        # (잘라내기) → (축소) → RGB 버퍼 → hands.process → 원본 좌표로 되돌림
+        image = frame
+        if window is not None:
+            x0, y0, x1, y1 = window
+            image = frame[y0:y1, x0:x1]
+        ih, iw = image.shape[:2]
+        if self.max_side and max(ih, iw) > self.max_side:
+            s = self.max_side / max(ih, iw)
+            size = (max(1, int(iw * s)), max(1, int(ih * s)))
+            if self._small is None or self._small.shape[:2] != (size[1], size[0]):
+                self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            cv2.resize(image, size, dst=self._small, interpolation=cv2.INTER_AREA)
+            image = self._small
+
+        if self._rgb is None or self._rgb.shape != image.shape:
+            self._rgb = np.empty(image.shape, dtype=np.uint8)
+        self._rgb.flags.writeable = True
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        self._rgb.flags.writeable = False   # MediaPipe가 복사 없이 참조하도록
+        result = self.hands.process(self._rgb)
+        self.processed += 1
+
+        if window is not None and result.multi_hand_landmarks:
+            fh, fw = frame.shape[:2]
+            x0, y0, x1, y1 = window
+            cw, ch = x1 - x0, y1 - y0
+            for hand in result.multi_hand_landmarks:
+                for p in hand.landmark:
+                    p.x = (p.x * cw + x0) / fw
+                    p.y = (p.y * ch + y0) / fh
+                    p.z = p.z * cw / fw     # z는 입력 너비 기준 단위
+        return result
+
+    # =========================
+    # 잘라내기 영역 / 건너뛰기
+    # =========================
+    def _update_window(self, pts, w, h):
+        if not self.crop:
+            return
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        if self._window is not None:
+            x0, y0, x1, y1 = self._window
+            pad = 0.25 * self.crop_margin * (hi - lo).max()
+            if lo[0] - pad >= x0 and lo[1] - pad >= y0 and hi[0] + pad <= x1 and hi[1] + pad <= y1:
+                return  # 아직 창 안쪽 → 창 유지
+        side = max(self.min_crop, (hi - lo).max() * (1 + 2 * self.crop_margin))
+        cx, cy = (lo + hi) / 2
+        x0 = int(max(0, min(w - side, cx - side / 2)))
+        y0 = int(max(0, min(h - side, cy - side / 2)))
+        x1, y1 = int(min(w, x0 + side)), int(min(h, y0 + side))
+        # 창이 프레임 대부분이면 잘라내는 의미가 없으므로 전체 사용
+        self._window = None if (x1 - x0) * (y1 - y0) > 0.6 * w * h else (x0, y0, x1, y1)
+
+    def _update_skip(self, pts):
+        if not self.skip:
+            return
+        if self._last_points is None:
+            self._still_run = 0
+            return
+        size = np.linalg.norm(pts[9] - pts[0]) + 1e-6   # 손목 → 중지 뿌리 길이
+        motion = np.abs(pts - self._last_points).mean() / size
+        if motion < self.still_thresh:
+            self._still_run = min(self._still_run + 1, self.max_skip)
+            self._skip_budget = self._still_run
+        else:
+            self._still_run = 0
+            self._skip_budget = 0
+
+    # =========================
+    # 통계
+    # =========================
+    def stats(self):
+        wall = time.perf_counter() - self._wall0 if self._wall0 is not None else 0.0
+        cpu = time.process_time() - self._cpu0 if self._cpu0 is not None else 0.0
+        return {
+            "frames": self.frames,
+            "processed": self.processed,
+            "updates": self.updates,
+            "fps": self.frames / wall if wall else 0.0,
+            "landmark_fps": self.updates / wall if wall else 0.0,
+            "cpu_pct": 100.0 * cpu / wall if wall else 0.0,     # 한 코어 = 100%
+            "cpu_ms_per_frame": 1000.0 * cpu / self.frames if self.frames else 0.0,
+            "crop_rate": self.cropped / max(1, self.processed),
+            "retries": self.retries,
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (f"frames {s['frames']} ({s['fps']:.1f} fps) | hands.process {s['processed']} | "
+                f"landmark fps {s['landmark_fps']:.1f} | cpu {s['cpu_pct']:.0f}% "
+                f"({s['cpu_ms_per_frame']:.1f} ms/frame) | crop {s['crop_rate']:.0%} retries {s['retries']}")
@@ -0,0 +1,107 @@
+'''
+landmark_log의 Docstring
+
+손 랜드마크 / 확정 제스처 스트림 이진 로그 (NumPy structured array 레코드)
+
+이 코드의 목적:
+- main_gesture_to_drone.py를 디버깅하려면 웹캠 앞에 사람이 서고 드론도 연결해야 했음
+- 실시간 루프가 프레임마다 (시각, 손 랜드마크 21x3, 분류한 제스처)와 확정 이벤트를 기록하면,
+  replay_gestures.py가 같은 입력을 안정성 판단 / 미션 실행에 다시 넣어서 결과를 재현할 수 있음
+- 레코드는 고정 크기(RECORD, 263 bytes)라서 기록은 tobytes() 한 번,
+  읽기는 np.frombuffer 한 번으로 전체를 (N,) 배열로 가져옴 (프로그램이 중간에 죽어서 잘린 마지막 레코드는 버림)
+
+[파일 형식]
+- MAGIC(6 bytes) + 헤더 길이(uint32, little endian) + 헤더 JSON(utf-8) + RECORD 반복
+- 헤더 : version, created(시작 시각), aspect(화면 너비 / 높이), stable_time, classifier 등 (meta)
+- RECORD : t(시작 후 초), kind(FRAME / CONFIRM), hand(손 검출 여부), gesture(-1 : 없음), points (21,3)
+  · FRAME   : 프레임마다 1개 (손이 없으면 points = 0)
+  · CONFIRM : 안정성 판단이 제스처를 확정한 시점 (gesture = 확정 제스처)
+
+사용법:
+    log = LandmarkLogWriter("session.lmlog", stable_time=1.0)
+    log.frame(time.time(), points, gesture, aspect)    # points : (21,3) 또는 None
+    log.confirm(time.time(), gesture)
+    log.close()
+
+    meta, records = read_log("session.lmlog")          # records["t"], records["points"] ...
+'''
+
+import json
+import struct
+import time
+
+import numpy as np
+
+MAGIC = b"LMLOG\x01"
+VERSION = 1
+
+FRAME = 0
+CONFIRM = 1
+NO_GESTURE = -1
+
+RECORD = np.dtype([
+    ("t", "<f8"),              # 로그 시작 후 시간(초)
+    ("kind", "u1"),            # FRAME / CONFIRM
+    ("hand", "u1"),            # 손 검출 여부
+    ("gesture", "i1"),         # 분류 / 확정 제스처 (-1 : 없음)
+    ("points", "<f4", (21, 3)),
+])
+
+
+class LandmarkLogWriter:
+    def __init__(self, path, flush_every=30, **meta):
+        self.path = path
+        self.flush_every = flush_every
+        self.meta = dict(meta, version=VERSION, created=time.time())
+        self._f = open(path, "wb")
+        self._header_written = False
+        self._t0 = None
+        self._rec = np.zeros(1, dtype=RECORD)   # 레코드 버퍼 재사용
+        self.count = 0
+
+    def _write_header(self):
+        header = json.dumps(self.meta, ensure_ascii=False).encode("utf-8")
+        self._f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._header_written = True
+
+    def _write(self, now, kind, gesture, points=None):
+        if not self._header_written:
+            self._write_header()
+        if self._t0 is None:
+            self._t0 = now
+        rec = self._rec[0]
+        rec["t"] = now - self._t0
+        rec["kind"] = kind
+        rec["hand"] = points is not None
+        rec["gesture"] = NO_GESTURE if gesture is None else gesture
+        rec["points"] = 0.0 if points is None else points
+        self._f.write(self._rec.tobytes())
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._f.flush()
+
+    def frame(self, now, points, gesture, aspect=None):
+        # aspect는 첫 프레임에서 헤더에 기록 (헤더는 첫 레코드 직전에 씀)
+        if not self._header_written and aspect is not None:
+            self.meta["aspect"] = aspect
+        self._write(now, FRAME, gesture, points)
+
+    def confirm(self, now, gesture):
+        self._write(now, CONFIRM, gesture)
+
+    def close(self):
+        if not self._header_written:
+            self._write_header()
+        self._f.close()
+
+
+def read_log(path):
+    # 로그 파일 → (헤더 dict, RECORD 배열)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"not a landmark log: {path}")
+        (size,) = struct.unpack("<I", f.read(4))
+        meta = json.loads(f.read(size).decode("utf-8"))
+        data = f.read()
+    n = len(data) // RECORD.itemsize
+    return meta, np.frombuffer(data[:n * RECORD.itemsize], dtype=RECORD)
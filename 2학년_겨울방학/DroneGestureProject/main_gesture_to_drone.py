@@ -5,22 +5,40 @@ MediaPipe 손 제스처 기반 드론 제어 프로그램
 
 이 코드의 목적:
 - 웹캠으로 손을 인식하고, 손가락 개수를 계산하여 제스처를 숫자로 변환
-- 같은 제스처가 일정 시간(1초) 동안 유지되면 '확정'으로 판단
+- 같은 제스처가 일정 시간(1초) 동안 유지되면 '확정'으로 판단 (gesture_stability.GestureStabilizer)
 - 확정된 제스처 숫자를 드론 미션 함수에 매핑하여 자동으로 드론을 제어
 - 안전을 위해 시작 시 착륙 명령 및 제어값 초기화를 진행하고, 종료 시에는 착륙 후 연결을 종료
+- 미션은 mission_executor 스레드에서 실행 → 드론이 나는 동안에도 손 인식 / 화면은 계속 동작
+  (0 = 착륙은 실행 중인 미션을 취소하고 바로 실행, 종료 시 비행 중이면 착륙)
+- GESTURE_MODEL에 학습된 모델(train_gesture.py → .npz)을 지정하면 손가락 개수 대신 모델로 분류
+  → 상승 / 하강 / 회전 / 호버 명령(6~10)까지 사용 (확률이 MODEL_MIN_PROB보다 낮으면 제스처 없음으로 처리)
+- HAND_MODE로 손 인식 스케줄 선택 (hand_scheduler, 성능이 낮은 노트북 : "adaptive")
+  → 종료 시 유효 랜드마크 FPS / CPU 사용률 출력
+- LANDMARK_LOG를 지정하면 프레임별 손 랜드마크 / 분류 제스처 / 확정 이벤트를 이진 로그로 저장
+  → replay_gestures.py로 웹캠 / 드론 없이 같은 입력을 다시 실행 (landmark_log)
+- INSTRUMENT = True 이면 단계별(capture / hands / count) 시간을 화면 HUD로 표시하고,
+  METRICS_LOG / TRACE_PATH를 지정하면 프레임 단위 로그와 Chrome trace를 저장 (instrument)
 
 '''
 
 import cv2
 import mediapipe as mp
+import numpy as np
 import time
-import math
 from time import sleep
 
 from e_drone.drone import *
 from e_drone.protocol import *
 
 import drone_missions
+from mission_executor import LAND, MissionExecutor # 미션을 별도 스레드에서 실행 (착륙 우선)
+from frame_source import open_from_cli
+from hand_gesture import count_fingers, landmarks_to_array # 손가락 개수 계산 (관절 각도, NumPy 벡터 연산)
+from gesture_model import GESTURES, GestureModel # 학습된 제스처 분류 (NumPy 추론)
+from instrument import Instrument
+from hand_scheduler import MODES, HandScheduler # 손 인식 스케줄 (축소 / 잘라내기 / 건너뛰기 + RGB 버퍼 재사용)
+from gesture_stability import GestureStabilizer # 같은 제스처 유지 시간 → 확정 (재생기와 같은 코드)
+from landmark_log import LandmarkLogWriter # 랜드마크 / 확정 제스처 녹화 (replay_gestures.py로 재생)
 
 # =========================
 # MediaPipe 설정
@@ -35,42 +53,51 @@ hands = mp_hands.Hands(
     min_tracking_confidence=0.7
 )
 
+HAND_MODE = "full"         # full / scale / crop / skip / adaptive
+scheduler = HandScheduler(hands, **MODES[HAND_MODE])
+
 # =========================
-# 손가락 개수 계산 (엄지 개선 버전)
+# 제스처 분류 설정
 # =========================
-def count_fingers(hand_landmarks):
-    # 1) 검지/중지/약지/소지 (y좌표 비교)
-    finger_tips = [8, 12, 16, 20]
-    count = 0
-    for tip in finger_tips:
-        if hand_landmarks.landmark[tip].y < hand_landmarks.landmark[tip - 2].y:
-            count += 1
-
-    # 2) 엄지(거리 기반)
-    thumb_tip = hand_landmarks.landmark[4]
-    thumb_base = hand_landmarks.landmark[2]
-    pinky_base = hand_landmarks.landmark[17]
-
-    def get_dist(p1, p2):
-        return math.hypot(p1.x - p2.x, p1.y - p2.y)
+GESTURE_MODEL = None       # 예: "gesture_model.npz" (None : 손가락 개수 0~5 사용)
+MODEL_MIN_PROB = 0.8       # 모델 확률이 이보다 낮으면 제스처 없음
 
-    dist_tip_to_pinky = get_dist(thumb_tip, pinky_base)
-    dist_base_to_pinky = get_dist(thumb_base, pinky_base)
+model = GestureModel.load(GESTURE_MODEL) if GESTURE_MODEL else None
 
-    if dist_tip_to_pinky > dist_base_to_pinky:
-        count += 1
-
-    return count
+def classify(points, aspect):
+    # (21,3) → 미션 번호 (0~10) 또는 None
+    if model is None:
+        return count_fingers(points, aspect=aspect)
+    name, prob = model.predict(points, aspect=aspect)
+    if prob < MODEL_MIN_PROB or name not in GESTURES:
+        return None
+    return GESTURES.index(name)
 
 # =========================
 # 안정성 판단 설정
 # =========================
 STABLE_TIME = 1.0          # 같은 제스처 1초 유지 시 확정
 
-candidate_gesture = None   # 현재 후보 제스처
-candidate_start_time = 0.0 # 후보 시작 시간
+stabilizer = GestureStabilizer(STABLE_TIME) # 후보 제스처 / 시작 시간 / 실행 잠금
+exit_after_land = False    # 0(착륙) 확정 후, 착륙이 끝나면 종료
 
-gesture_active = False     # 제스처 실행 잠금 플래그
+# =========================
+# 랜드마크 로그 (재생용)
+# =========================
+LANDMARK_LOG = None        # 예: "session.lmlog" (python replay_gestures.py session.lmlog)
+
+landmark_log = LandmarkLogWriter(LANDMARK_LOG, stable_time=STABLE_TIME, hand_mode=HAND_MODE,
+                                 gesture_model=GESTURE_MODEL, model_min_prob=MODEL_MIN_PROB) if LANDMARK_LOG else None
+
+# =========================
+# 계측 설정
+# =========================
+INSTRUMENT = False         # True : 단계별 p50/p95 ms HUD 표시
+METRICS_LOG = None         # 예: "gesture_metrics.jsonl" (또는 .csv)
+TRACE_PATH = None          # 예: "gesture_trace.json" (chrome://tracing 에서 열기)
+
+inst = Instrument(enabled=INSTRUMENT or bool(METRICS_LOG or TRACE_PATH),
+                  log_path=METRICS_LOG, trace_path=TRACE_PATH)
 
 # =========================
 # 드론 연결
@@ -87,10 +114,13 @@ else:
 # 안전 초기화 호출
 drone_missions.safe_initialize(drone)
 
+# 미션 실행기 (이후 드론 제어는 실행기 스레드에서만)
+executor = MissionExecutor(drone)
+
 # =========================
 # 카메라 시작
 # =========================
-cap = cv2.VideoCapture(0)
+cap, display = open_from_cli(description="제스처 기반 드론 제어") # 입력(웹캠/영상/이미지 폴더) + 출력(창/headless)
 if not cap.isOpened():
     print("카메라를 열 수 없습니다.")
     for _ in range(2):
@@ -98,18 +128,22 @@ if not cap.isOpened():
         sleep(0.5)
     exit()
 
+points = np.empty((21, 3), dtype=np.float32) # 손 랜드마크 배열 버퍼
+
 print("Gesture -> Drone control started (ESC 종료)")
 
 try:
     while True:
-        ret, frame = cap.read()
+        with inst.span("capture"):
+            ret, frame = cap.read()
         if not ret:
             break
 
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb)
+        with inst.span("hands"):
+            result = scheduler.process(frame)
 
         gesture = None
+        hand_found = bool(result.multi_hand_landmarks)
         
         # =========================
         # 손 인식
@@ -118,84 +152,99 @@ try:
             for hand_landmarks in result.multi_hand_landmarks:
                 # 손 랜드마크 그리기
                 mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                # 손가락 개수 계산
-                gesture = count_fingers(hand_landmarks)
+                # 제스처 분류 (랜드마크 → (21,3) 배열 변환은 프레임당 1번, 버퍼 재사용)
+                with inst.span("count"):
+                    landmarks_to_array(hand_landmarks, out=points)
+                    gesture = classify(points, frame.shape[1] / frame.shape[0])
 
-        # 0 ~ 5만 인정 (그 외는 무시)
-        if gesture is not None and (gesture < 0 or gesture > 5) :
+        # 미션 번호(0 ~ 10)만 인정 (그 외는 무시)
+        if gesture is not None and (gesture < 0 or gesture >= len(GESTURES)) :
             gesture = None
 
         now = time.time()
 
+        if landmark_log is not None:
+            landmark_log.frame(now, points if hand_found else None, gesture, aspect=frame.shape[1] / frame.shape[0])
+
         # =========================
         # 화면 표시 영역
         # =========================
 
         # 1. 드론 상태 표시 (FLYING / LANDED)
         flight_text = "FLYING" if drone_missions.is_flying else "LANDED"
-        cv2.putText(frame, f"Drone State: {flight_text}",
+        cv2.putText(frame, f"Drone State: {flight_text} | {executor.status_text()}",
                             (10, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 0), 2)
         
         # 2. 현재 인식된 제스처
-        gesture_text = "NONE" if gesture is None else str(gesture)
+        gesture_text = "NONE" if gesture is None else f"{gesture} {GESTURES[gesture]}"
         cv2.putText( frame, f"Gesture Now : {gesture_text}",
                             (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2) 
         
         # =========================
         # 안정성 로직 (Edge Trigger)
         # =========================
-        if gesture is not None:
-             # 새로운 제스처 등장 시 후보 갱신
-            if candidate_gesture is None or gesture != candidate_gesture:
-                candidate_gesture = gesture
-                candidate_start_time = now
-            else:
-                elapsed = now - candidate_start_time
-
-                cv2.putText( frame, f"Stable Time : {elapsed:.1f}s",
-                                        (10, 105), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-
-                # 안정성 만족 + 아직 실행 안했을 때만 실행
-                if elapsed >= STABLE_TIME and not gesture_active:
-                    print(f"[CONFIRMED] {gesture}")
-                    drone_missions.execute_mission(drone, gesture) # 제스처 숫자 -> 드론 미션 실행
-
-                    # 실행 직후 후보 리셋
-                    candidate_gesture = None
-                    candidate_start_time = 0.0
-                    gesture_active = True # 실행 후 잠금
-
-                    # 0번 : 착륙 후 종료
-                    if gesture == 0 :
-                        break
-
-        # ===== 손이 안 보이면, 잠금 해제 =====                    
-        else:
-            candidate_gesture = None
-            gesture_active = False
+        # 같은 후보가 유지되는 중이면 유지 시간 표시
+        if gesture is not None and gesture == stabilizer.candidate:
+            cv2.putText( frame, f"Stable Time : {stabilizer.elapsed(now):.1f}s",
+                                    (10, 105), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
+
+        # 새 제스처 → 후보 갱신, 안정성 만족 + 잠금 전 → 확정 후 잠금, 손이 안 보이면 잠금 해제
+        confirmed = stabilizer.update(gesture, now)
+        if confirmed is not None:
+            print(f"[CONFIRMED] {confirmed}")
+            inst.count("confirmed")
+            if landmark_log is not None:
+                landmark_log.confirm(now, confirmed)
+            # 제스처 숫자 -> 드론 미션 (큐에 넣고 바로 반환, 실행 중이면 대기 또는 무시)
+            if not executor.submit(confirmed):
+                print(f"[BUSY] mission {confirmed} ignored ({executor.status_text()})")
+
+            # 0번 : 착륙이 끝나면 종료
+            if confirmed == LAND:
+                exit_after_land = True
+
+        inst.frame_end()
+        inst.draw_hud(frame, origin=(10, 140))
 
         # 결과 화면 출력
-        cv2.imshow("Gesture Control", frame)
+        display.show("Gesture Control", frame)
+
+        if exit_after_land and not executor.busy:
+            break
 
         # ESC 키 입력 시 종료
-        if cv2.waitKey(1) & 0xFF == 27:
+        if display.poll_key() == 27:
             break
 
 # 사용자가 Ctrl+C 누르면, 즉시 착륙
 except KeyboardInterrupt:
     print("\n[STOP] Emergency Landing (KeyboardInterrupt)")
-    drone_missions.mission_land(drone)
+    executor.submit(LAND) # 실행 중인 미션을 취소하고 착륙
 
 # 그 외 모든 에러 발생 시, 즉시 착륙
 except Exception as e:
     print(f"[ERROR] {e}")
-    drone_missions.mission_land(drone)
+    executor.submit(LAND)
 
 finally:
     print("Closing connection")
 
+    # ESC 등으로 종료할 때 아직 비행 중이면 착륙, 착륙이 끝날 때까지 기다린 뒤 실행기 종료
+    if drone_missions.is_flying:
+        executor.submit(LAND)
+    executor.close()
+    print(executor.summary())
+    print(f"[{HAND_MODE}]", scheduler.summary())
+
     cap.release()
-    cv2.destroyAllWindows()
+    display.close()
+
+    if inst.enabled:
+        print(inst.summary())
+    inst.close() # 로그 닫기 + trace 저장
+    if landmark_log is not None:
+        landmark_log.close()
+        print(f"landmark log: {landmark_log.count} records -> {LANDMARK_LOG}")
     
     for _ in range(2):
         drone.close()
@@ -0,0 +1,182 @@
+'''
+make_hand_fixture의 Docstring
+
+check_hand_gesture.py 기본 검사용 기준 손 랜드마크(fixtures/reference_hands.npz) 생성 도구
+
+이 코드의 목적:
+- 카메라 / MediaPipe 없이도 check_hand_gesture.py가 기본으로(fixtures) 돌아가도록,
+  record_landmarks.py와 같은 형식의 작은 기준 데이터를 저장소에 같이 둠
+- 녹화 데이터가 아니므로 MediaPipe 녹화(record_landmarks.py)를 대신하지 않음
+  · 실제 녹화 : python record_landmarks.py 0 --names 0,1,2,3,4,5 --out fixtures (fixtures의 *.npz를 모두 검사)
+- check_hand_gesture.py의 합성 손(synth_hand)과 만드는 방법을 일부러 다르게 함
+  (판별 기준을 맞춘 생성기로 다시 검사하는 순환 검사를 피하기 위해)
+  · 손 모양 : MediaPipe가 정면 손바닥에서 내는 랜드마크 배치를 손목 기준 mm 좌표로 옮긴 기준 손 1개 +
+              사람별 손 크기 / 손가락 길이 / 벌림 차이
+  · 손가락 길이 : 손가락 마디 길이 평균 비율(검지 40 / 22 / 16 mm, 중지 45 / 26 / 17 mm, ...)
+  · 접힘 : 손가락마다 "뿌리에서의 방향"과 "손바닥 법선(카메라 방향)"이 만드는 평면 안에서 마디 각도를 누적
+  · 엄지 : 접으면 손바닥을 가로질러 약지 뿌리 쪽으로, 펴면 검지와 벌어진 방향으로
+  · 화면 좌우 반전(거울) 손 : 합성 손과 반대쪽에 엄지가 오도록 (카메라 화면을 뒤집어 쓰는 경우)
+  · 같은 손 모양을 몇 프레임 이어서 찍은 것처럼 프레임마다 작은 흔들림 (seq로 묶음)
+- 저장 형식 : record_landmarks.py와 같음 (points, labels, seq, t, names "0"~"5", aspect) + rolls (화면 안 회전 각도)
+
+사용 예:
+    python make_hand_fixture.py                     # fixtures/reference_hands.npz 다시 생성 (고정 seed)
+    python make_hand_fixture.py --hands 5 --frames 6 --out fixtures/reference_big.npz
+'''
+
+import argparse
+import math
+import os
+
+import numpy as np
+
+ASPECT = 4 / 3                         # 640x480 카메라
+ROTATIONS = (0, 45, -45, 90, -90, 180) # 화면 안에서 손을 돌린 각도(도)
+MM = 0.0024                            # 1mm → 화면 높이 단위 (손 길이 약 19cm가 화면 높이의 45%)
+
+# 손목(0) 기준 손가락 뿌리(MCP) 위치 [x, y] mm : 정면 손바닥, 손가락이 화면 위쪽(-y), 엄지는 +x 쪽
+MCP = {
+    "index": (22.0, -86.0),
+    "middle": (2.0, -90.0),
+    "ring": (-17.0, -84.0),
+    "pinky": (-33.0, -74.0),
+}
+# 마디 길이 mm [MCP→PIP, PIP→DIP, DIP→TIP]
+BONES = {
+    "index": (40.0, 22.0, 16.0),
+    "middle": (45.0, 26.0, 17.0),
+    "ring": (41.0, 26.0, 17.0),
+    "pinky": (33.0, 18.0, 16.0),
+}
+FINGERS = ("index", "middle", "ring", "pinky")
+THUMB_CMC = (18.0, -24.0)              # 엄지 CMC(1번)
+THUMB_BONES = (34.0, 32.0, 25.0)       # CMC→MCP, MCP→IP, IP→TIP
+
+# 손가락 개수별 손 모양 [엄지, 검지, 중지, 약지, 소지]
+POSES = {
+    0: ((0, 0, 0, 0, 0),),
+    1: ((0, 1, 0, 0, 0),),
+    2: ((0, 1, 1, 0, 0),),
+    3: ((0, 1, 1, 1, 0), (1, 1, 1, 0, 0)),
+    4: ((0, 1, 1, 1, 1),),
+    5: ((1, 1, 1, 1, 1),),
+}
+
+
+def _unit(v):
+    return v / np.linalg.norm(v)
+
+def _chain(start, direction, normal, bones, flex):
+    # 방향(direction)과 법선(normal) 평면 안에서 마디 각도를 누적하며 관절 위치 계산
+    points, p, total = [], np.asarray(start, dtype=float), 0.0
+    for length, angle in zip(bones, flex):
+        total += math.radians(angle)
+        p = p + (direction * math.cos(total) + normal * math.sin(total)) * length
+        points.append(p)
+    return points
+
+def reference_hand(pose, person, rng):
+    '''
+    pose : [엄지, 검지, 중지, 약지, 소지] 펴짐(1) / 접힘(0), person : 사람별 차이 dict
+    → (21,3) 손목 기준 mm 좌표 (z : 음수가 카메라 쪽)
+    '''
+    normal = np.array([0.0, 0.0, -1.0])   # 손바닥 → 카메라
+    p = np.zeros((21, 3))
+    fan = np.array([0.0, 12.0, 0.0])       # 손가락 방향이 퍼져 나가는 중심 (손목 약간 아래)
+
+    for f, name in enumerate(FINGERS):
+        base = 5 + 4 * f
+        mcp = np.array([*MCP[name], 0.0]) * person["palm"]
+        if name in ("middle", "ring"):
+            mcp[2] = -3.0                   # 가운데 손가락 뿌리가 조금 앞으로 (손바닥 아치)
+        p[base] = mcp
+        direction = _unit(mcp - fan)
+        spread = math.radians(person["spread"] * (f - 1.5) + rng.normal(0, 2))
+        c, s = math.cos(spread), math.sin(spread)
+        direction = _unit(np.array([c * direction[0] - s * direction[1], s * direction[0] + c * direction[1], 0.0]))
+        if pose[f + 1]:
+            flex = rng.uniform(-5, 10), rng.uniform(0, 12), rng.uniform(0, 10)
+        else:
+            flex = rng.uniform(70, 90), rng.uniform(85, 110), rng.uniform(40, 65)
+        bones = np.array(BONES[name]) * person["finger"]
+        p[base + 1:base + 4] = _chain(mcp, direction, normal, bones, flex)
+
+    # 엄지 : CMC → MCP는 손바닥 바깥쪽 위로, 그 다음 마디는 펴짐 / 접힘에 따라 방향이 바뀜
+    cmc = np.array([*THUMB_CMC, -6.0]) * person["palm"]
+    p[1] = cmc
+    out = _unit(np.array([0.75, -1.0, -0.35]))
+    p[2] = cmc + out * THUMB_BONES[0] * person["finger"]
+    if pose[0]:
+        direction = _unit(np.array([0.55 + rng.uniform(-0.1, 0.1), -1.0, -0.3]))
+        flex = rng.uniform(0, 10), rng.uniform(0, 15)
+    else:
+        target = p[13] + np.array([0.0, 18.0, -12.0])   # 약지 뿌리 앞쪽 (손바닥을 가로지름)
+        direction = _unit(target - p[2])
+        flex = rng.uniform(15, 30), rng.uniform(30, 55)
+    side = _unit(np.cross(direction, np.array([0.0, 0.0, 1.0])))   # 엄지가 손바닥 쪽으로 굽는 방향
+    bend_normal = normal if pose[0] else _unit(normal + 0.3 * side)
+    p[3:5] = _chain(p[2], direction, bend_normal, np.array(THUMB_BONES[1:]) * person["finger"], flex)
+    return p
+
+def _rotation(roll, tilt_x, tilt_y):
+    rx, ry, rz = (math.radians(a) for a in (tilt_x, tilt_y, roll))
+    mx = np.array([[1, 0, 0], [0, math.cos(rx), -math.sin(rx)], [0, math.sin(rx), math.cos(rx)]])
+    my = np.array([[math.cos(ry), 0, math.sin(ry)], [0, 1, 0], [-math.sin(ry), 0, math.cos(ry)]])
+    mz = np.array([[math.cos(rz), -math.sin(rz), 0], [math.sin(rz), math.cos(rz), 0], [0, 0, 1]])
+    return mz @ my @ mx
+
+def to_normalized(p_mm, rot, size, center, aspect):
+    # 손목 기준 mm → MediaPipe 정규화 좌표 (x : 화면 너비, y : 화면 높이, z : 손목 기준, x와 같은 단위)
+    q = (p_mm - p_mm[9] * 0.5) @ rot.T * MM * size
+    q = q - q[0] * [0, 0, 1]                # z는 손목 기준
+    x = center[0] + q[:, 0] / aspect
+    y = center[1] + q[:, 1]
+    return np.column_stack((x, y, q[:, 2] / aspect))
+
+def make_set(hands, frames, seed=0, aspect=ASPECT):
+    # 사람 hands명 × 손가락 개수별 손 모양 × 회전 각도 → 프레임 frames개씩 (seq 하나)
+    rng = np.random.default_rng(seed)
+    people = [dict(palm=rng.uniform(0.88, 1.12), finger=rng.uniform(0.9, 1.1), spread=rng.uniform(2, 7))
+              for _ in range(hands)]
+    points, labels, seqs, rolls, times = [], [], [], [], []
+    seq, t = 0, 0.0
+    for person in people:
+        for count, poses in POSES.items():
+            for pose in poses:
+                for roll in ROTATIONS:
+                    hand = reference_hand(pose, person, rng)
+                    rot = _rotation(roll + rng.uniform(-8, 8), rng.uniform(-20, 20), rng.uniform(-20, 20))
+                    size = rng.uniform(0.8, 1.25)
+                    center = rng.uniform(0.4, 0.6, 2)
+                    for _ in range(frames):
+                        jitter = rng.normal(0, 1.2, hand.shape) * [1.0, 1.0, 2.5]   # 프레임마다 흔들림 (z가 큼)
+                        points.append(to_normalized(hand + jitter, rot, size, center, aspect))
+                        labels.append(count)
+                        seqs.append(seq)
+                        rolls.append(roll)
+                        times.append(t)
+                        t += 1 / 30
+                    seq += 1
+    return (np.stack(points).astype(np.float32), np.array(labels), np.array(seqs),
+            np.array(rolls), np.array(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check_hand_gesture 기준 손 랜드마크 생성")
+    parser.add_argument("--hands", type=int, default=3, help="사람(손 크기 / 손가락 길이) 수")
+    parser.add_argument("--frames", type=int, default=4, help="손 모양 하나당 프레임 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                      "fixtures", "reference_hands.npz"))
+    args = parser.parse_args()
+
+    points, labels, seqs, rolls, times = make_set(args.hands, args.frames, args.seed)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    # labels는 names의 번호 (record_landmarks.py 형식), names "0"~"5" = 펴진 손가락 개수
+    np.savez_compressed(args.out, points=points, labels=labels, seq=seqs, t=times,
+                        names=np.array([str(n) for n in POSES]), aspect=ASPECT, rolls=rolls)
+    print(f"saved {len(points)} frames ({seqs[-1] + 1} seq) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+'''
+mission_executor의 Docstring
+
+드론 미션을 별도 스레드에서 실행하는 실행기 (명령 큐 + 취소 + 착륙 우선)
+
+이 코드의 목적:
+- 기존에는 제스처 루프가 drone_missions.execute_mission()을 직접 호출해서,
+  미션이 끝날 때까지(전진은 최대 4.5초) 화면 / 손 인식이 멈추고 중간에 멈출 방법도 없었음
+- submit(gesture)는 명령을 큐에 넣고 바로 반환 → 제스처 루프는 드론이 나는 동안에도 계속 동작
+- 미션은 실행기 스레드 1개에서 순서대로 실행 (드론 객체는 이 스레드에서만 사용)
+- 착륙(0)은 항상 우선 : 대기 중인 명령을 모두 지우고, 실행 중인 미션을 취소한 뒤 바로 착륙
+  (미션은 drone_missions의 제어 / 대기 조각 사이마다 취소를 확인하므로 약 0.1초 안에 중단됨)
+- 실행 중에 들어온 다른 명령은 max_pending개까지만 대기, 넘으면 버림 (오래된 제스처가 쌓이지 않도록)
+- cancel() : 대기 명령을 지우고 실행 중인 미션만 중단 (착륙하지 않음, 제어값은 0으로 정리)
+
+사용법:
+    executor = MissionExecutor(drone)
+    executor.submit(2)          # 바로 반환 (받아들였으면 True)
+    executor.status_text()      # 화면 표시용 "RUN 2 (1.3s)" / "IDLE"
+    executor.close()            # 대기 명령 취소, 실행 중인 착륙은 끝까지 기다린 뒤 종료
+'''
+
+import threading
+import time
+from collections import deque
+
+import drone_missions
+
+LAND = 0
+MAX_PENDING = 1     # 미션 실행 중에 대기시킬 수 있는 명령 수
+
+
+class MissionExecutor:
+    def __init__(self, drone, max_pending=MAX_PENDING):
+        self.drone = drone
+        self.max_pending = max_pending
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._stop = False
+        self.current = None          # 실행 중인 제스처 번호
+        self.current_start = 0.0
+
+        self.completed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.last_result = None      # (제스처, "done" / "cancelled" / "error", 걸린 시간)
+        self.history = []            # (제스처, 결과, 받은 시각, 시작 시각, 끝난 시각) : 대기 시간 분석용
+
+        self._thread = threading.Thread(target=self._run, name="mission-executor", daemon=True)
+        self._thread.start()
+
+    # =========================
+    # 제스처 루프에서 호출 (바로 반환)
+    # =========================
+    def submit(self, gesture):
+        with self._cond:
+            if gesture == LAND:
+                # 착륙 우선 : 대기 명령 삭제 + 실행 중인 미션 취소
+                self._queue.clear()
+                if self.current is not None and self.current != LAND:
+                    drone_missions.request_cancel()
+                if self.current != LAND:
+                    self._queue.append((LAND, time.time()))
+                self._cond.notify_all()
+                return True
+
+            if self.current == LAND or self._queued(LAND):
+                self.rejected += 1  # 착륙 중에는 다른 명령 무시
+                return False
+            # 큐 맨 앞 명령은 아직 스레드가 꺼내지 않았을 뿐 곧 실행될 명령이므로 대기 수에서 제외
+            waiting = len(self._queue) if self.current is not None else max(0, len(self._queue) - 1)
+            if waiting >= self.max_pending:
+                self.rejected += 1
+                return False
+            self._queue.append((gesture, time.time()))
+            self._cond.notify_all()
+            return True
+
+    def _queued(self, gesture):
+        return any(g == gesture for g, _ in self._queue)
+
+    def cancel(self):
+        # 대기 명령 삭제 + 실행 중인 미션 중단 (착륙은 중단하지 않음)
+        with self._cond:
+            self._queue.clear()
+            if self.current is not None and self.current != LAND:
+                drone_missions.request_cancel()
+
+    @property
+    def busy(self):
+        with self._cond:
+            return self.current is not None or bool(self._queue)
+
+    def wait_idle(self, timeout=None):
+        with self._cond:
+            return self._cond.wait_for(lambda: self.current is None and not self._queue, timeout)
+
+    def status_text(self):
+        with self._cond:
+            if self.current is None:
+                pending = f" (queued {[g for g, _ in self._queue]})" if self._queue else ""
+                return "IDLE" + pending
+            pending = f" +{len(self._queue)}" if self._queue else ""
+            return f"RUN {self.current} ({time.time() - self.current_start:.1f}s){pending}"
+
+    # =========================
+    # 실행기 스레드
+    # =========================
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stop)
+                if not self._queue:
+                    break  # stop 요청 + 남은 명령 없음
+                gesture, submitted = self._queue.popleft()
+                self.current = gesture
+                self.current_start = time.time()
+                drone_missions.clear_cancel()
+
+            result = "done"
+            try:
+                drone_missions.execute_mission(self.drone, gesture)
+                self.completed += 1
+            except drone_missions.MissionCancelled:
+                result = "cancelled"
+                self.cancelled += 1
+                print(f"[CANCEL] mission {gesture}")
+                drone_missions.stop_motion(self.drone)
+            except Exception as e:
+                # 미션 중 오류 → 공중에 있으면 착륙
+                result = "error"
+                print(f"[ERROR] mission {gesture}: {e}")
+                if drone_missions.is_flying and gesture != LAND:
+                    with self._cond:
+                        self._queue.clear()
+                        self._queue.append((LAND, time.time()))
+
+            with self._cond:
+                self.last_result = (gesture, result, time.time() - self.current_start)
+                self.history.append((gesture, result, submitted, self.current_start, time.time()))
+                self.current = None
+                self._cond.notify_all()
+
+    def close(self, timeout=10.0):
+        '''
+        대기 명령 / 실행 중인 미션 취소 후 스레드 종료
+        - 착륙이 실행 중이거나 대기 중이면 끝까지 실행
+        '''
+        with self._cond:
+            landing = self.current == LAND or self._queued(LAND)
+            self._queue = deque([(LAND, time.time())]) if landing and self.current != LAND else deque()
+            if self.current is not None and self.current != LAND:
+                drone_missions.request_cancel()
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def summary(self):
+        return (f"missions: completed {self.completed}, cancelled {self.cancelled}, "
+                f"rejected {self.rejected}, last {self.last_result}")
@@ -0,0 +1,78 @@
+'''
+mock_drone의 Docstring
+
+드론 없이 drone_missions를 실행하기 위한 가짜 Drone (e_drone.drone.Drone과 같은 메서드)
+
+이 코드의 목적:
+- replay_gestures.py에서 녹화된 제스처로 미션을 실행할 때, 실제 드론 대신 명령을 기록만 함
+- sendControlWhile(..., ms)은 실제 드론처럼 ms 동안 멈춘 뒤 반환 (speed배 빠르게, speed=0 이면 바로 반환)
+- calls : (경과 시간, 메서드 이름, 인자) 목록 → 어떤 미션이 어떤 순서로 명령을 보냈는지 비교 / 출력
+
+사용법:
+    drone = MockDrone(speed=10)
+    drone_missions.sleep = drone.sleep     # 미션 안의 대기도 같은 배속으로
+    drone_missions.execute_mission(drone, 1)
+    print(drone.summary())
+'''
+
+import threading
+import time
+from collections import Counter
+
+
+class MockDrone:
+    def __init__(self, speed=1.0, verbose=False):
+        self.speed = speed
+        self.verbose = verbose
+        self.calls = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self.opened = False
+
+    def sleep(self, sec):
+        # 배속 적용 대기 (speed=0 : 대기 없음)
+        if self.speed > 0:
+            time.sleep(sec / self.speed)
+
+    def now(self):
+        # 기록에 쓰는 경과 시간 (sim_drone.SimDrone은 가상 시계로 바꿈)
+        return time.perf_counter() - self._t0
+
+    def _record(self, name, *args):
+        t = self.now()
+        with self._lock:
+            self.calls.append((t, name, args))
+        if self.verbose:
+            print(f"[MOCK {t:7.3f}s] {name}{args}")
+
+    # =========================
+    # e_drone.drone.Drone과 같은 이름의 메서드
+    # =========================
+    def open(self, port_name=None):
+        self.opened = True
+        self._record("open")
+        return True
+
+    def close(self):
+        self.opened = False
+        self._record("close")
+
+    def sendTakeOff(self):
+        self._record("sendTakeOff")
+
+    def sendLanding(self):
+        self._record("sendLanding")
+
+    def sendStop(self):
+        self._record("sendStop")
+
+    def sendControl(self, roll, pitch, yaw, throttle):
+        self._record("sendControl", roll, pitch, yaw, throttle)
+
+    def sendControlWhile(self, roll, pitch, yaw, throttle, time_ms):
+        self._record("sendControlWhile", roll, pitch, yaw, throttle, time_ms)
+        self.sleep(time_ms / 1000.0)
+
+    def summary(self):
+        counts = Counter(name for _, name, _ in self.calls)
+        return "mock drone calls: " + ", ".join(f"{k}={v}" for k, v in counts.items())
@@ -0,0 +1,315 @@
+'''
+motion_control의 Docstring
+
+속도 피드백 이동 / 정지 (drone_missions, drone_basic_test가 같이 쓰는 모션 기본 동작)
+
+이 코드의 목적:
+- 기존 미션은 "control(0, 40, 0, 0, 3000) → brake(0, -15, 500) → hover" 처럼 시간과 세기를 정해 두고 보냈음
+  → 브레이크 세기 / 시간, TRIM 값이 드론마다, 배터리 상태마다 달라서 계속 다시 맞춰야 했음
+- MotionController는 TICK_MS(50ms, 20Hz)마다
+  1. 드론 위치 / 자세(Position, Attitude)를 요청하고, 위치를 축마다 칼만 필터(VelocityKalman)에 넣어
+     기체 기준 속도(앞 / 오른쪽, m/s)를 추정 (위치 차분 / 짧은 구간 기울기보다 잡음에 강함)
+  2. 목표 속도와의 차이로 roll / pitch 입력을 계산 (PI 제어 + 목표 속도 비례 입력)
+  3. sendControlWhile(…, TICK_MS)로 보냄 → 제어 명령이 항상 같은 간격으로 나감
+- move(앞, 오른쪽 m/s, 시간) : 목표 속도로 이동 (배터리가 약해도 속도를 맞추므로 이동 거리가 일정)
+- stop() : 목표 속도 0으로 제어하면서 추정 속도가 stop_speed 아래로 STOP_HOLD_MS 동안 유지될 때까지 브레이크
+  → 걸린 시간(settle)을 last_settle에 기록 (sim_missions.py에서 비교)
+- hold(시간) : 속도 0 유지 (기존 TRIM 호버 대신, 적분값이 기체 쏠림을 스스로 찾음)
+- 조정값은 브레이크 세기 / 시간 대신 제어기 게인 (KP, KI, KFF) 3개
+
+[속도 정보가 없을 때]
+- MockDrone처럼 요청 메서드가 없거나, 실제 드론에서 TELEMETRY_TIMEOUT 동안 응답이 없으면
+  기존 방식(목표 속도 비례 입력, 반대 방향 FALLBACK_BRAKE 펄스, TRIM 호버)으로 동작
+
+[속도 추정 / 정지 기준]
+- 2학년2학기/testfly.py의 KalmanFilterVelocity와 같은 예측 → 보정 순서, 상태는 (위치, 속도) 2개
+  · 예측 잡음 : 모르는 가속도 ACCEL_NOISE(m/s^2), 측정 잡음 : 위치 잡음 POSITION_NOISE(m)
+- 위치 잡음 1cm에서 2개 위치 차분의 속도 잡음은 약 0.14 m/s → 고정 기준 0.05 m/s로는 멈춰도 정지로 판단 못 함
+- 그래서 정지 기준은 필터가 멈춘 기체에서 내는 속도 잡음(velocity_noise)의 STOP_SIGMA배로 계산
+  (POSITION_NOISE 1cm, ACCEL_NOISE 1 m/s^2 → 속도 잡음 약 0.04 m/s, 정지 기준 약 0.13 m/s)
+- 다른 드론 / 센서에서는 POSITION_NOISE만 맞추면 정지 기준이 같이 바뀜
+
+[좌표]
+- Position : x 앞(이륙 때 기수 방향), y 왼쪽, z 위 (m) / Attitude.yaw : 도, + 왼쪽(반시계) 회전
+- 제어 입력 : pitch + 앞, roll + 오른쪽
+
+사용법:
+    motion = MotionController(drone, trim=(TRIM_ROLL, TRIM_PITCH), check=check_cancel)
+    motion.move(forward=0.8, right=0.0, duration_ms=3000)
+    motion.stop()                   # 멈출 때까지 브레이크 → 걸린 시간(초)
+    motion.hold(1000)
+'''
+
+import math
+import time
+
+try:
+    from e_drone.protocol import DataType, DeviceType
+except ImportError:
+    # e_drone이 없는 PC(시뮬레이션 / CI) : 여기서 쓰는 값만 같은 이름 / 번호로 정의
+    # (SimDrone은 요청을 이름으로 구분하므로 e_drone 값과 섞여도 동작)
+    from enum import Enum
+
+    class DeviceType(Enum):
+        Drone = 0x10
+
+    class DataType(Enum):
+        Attitude = 0x41
+        Position = 0x42
+
+# =========================
+# 제어기 게인 / 파라미터
+# =========================
+TICK_MS = 50            # 제어 주기(ms) : 20Hz
+
+KFF = 30.0              # 목표 속도 1 m/s 당 입력 (이 입력으로 정속이면 목표 속도)
+KP = 60.0               # 속도 오차 1 m/s 당 입력
+KI = 20.0               # 속도 오차 적분(m) 1 당 입력 : 기체 쏠림 / 배터리 변화 보정
+INTEGRAL_LIMIT = 25.0   # 적분 입력 최대 크기
+MAX_INPUT = 60          # roll / pitch 입력 최대 크기
+
+POSITION_NOISE = 0.01   # 위치 측정 잡음 표준편차(m) : 칼만 필터 측정 잡음 / 정지 기준 계산
+ACCEL_NOISE = 1.0       # 등속 모델이 설명하지 못하는 가속도 표준편차(m/s^2) : 클수록 빠르게 따라가고 잡음↑
+INITIAL_SPEED_STD = 1.0 # 필터 시작 시 속도 불확실성(m/s)
+MIN_FILTER_NOISE = 0.002  # 필터 측정 잡음 최소값(m) : 0이면 속도 추정이 매 주기 진동함
+
+STOP_SIGMA = 3.0        # 정지 기준 = 추정 속도 잡음 × STOP_SIGMA
+STOP_SPEED_MIN = 0.05   # 정지 기준 최소값(m/s) (잡음이 아주 작은 센서)
+STOP_HOLD_MS = 200      # 정지 기준 아래를 이만큼 유지하면 정지 완료
+STOP_TIMEOUT_MS = 2000  # 정지 최대 시간
+
+TELEMETRY_TIMEOUT = 0.5 # 이 시간(초) 동안 새 위치가 없으면 속도 정보 없음으로 봄
+
+FALLBACK_BRAKE = 15     # 속도 정보가 없을 때 : 반대 방향 브레이크 세기
+FALLBACK_BRAKE_MS = 400 # 속도 정보가 없을 때 : 브레이크 시간
+
+
+class VelocityKalman:
+    '''
+    한 축의 위치 측정 → (위치, 속도) 추정 (등속 모델 칼만 필터)
+    - update(위치, dt) : 예측(위치 += 속도 × dt) → 측정으로 보정, 추정 속도 반환
+    - P : 추정 오차 공분산 [[위치, 위치-속도], [위치-속도, 속도]]
+    '''
+
+    def __init__(self, position, position_noise=POSITION_NOISE, accel_noise=ACCEL_NOISE):
+        self.R = max(position_noise, MIN_FILTER_NOISE) ** 2
+        self.Q = accel_noise ** 2
+        self.position = position
+        self.velocity = 0.0
+        self.P = [[self.R, 0.0], [0.0, INITIAL_SPEED_STD ** 2]]
+
+    def update(self, measurement, dt):
+        # 예측 : 모르는 가속도만큼 불확실성 증가
+        (p00, p01), (_, p11) = self.P
+        p00 += 2 * dt * p01 + dt * dt * p11 + self.Q * dt ** 4 / 4
+        p01 += dt * p11 + self.Q * dt ** 3 / 2
+        p11 += self.Q * dt * dt
+        pred = self.position + self.velocity * dt
+
+        # 보정 : 위치 측정과의 차이를 칼만 이득만큼 반영
+        k0 = p00 / (p00 + self.R)
+        k1 = p01 / (p00 + self.R)
+        error = measurement - pred
+        self.position = pred + k0 * error
+        self.velocity += k1 * error
+        self.P = [[(1 - k0) * p00, (1 - k0) * p01], [(1 - k0) * p01, p11 - k1 * p01]]
+        return self.velocity
+
+
+def velocity_noise(dt, position_noise=POSITION_NOISE, accel_noise=ACCEL_NOISE, steps=200):
+    '''
+    멈춘 기체에서 위치 잡음만 들어올 때, VelocityKalman 추정 속도의 표준편차(m/s)
+    - 일정 간격 dt로 정상 상태가 된 칼만 이득 k를 구하고,
+      추정 오차 e' = A e + k × 잡음 (A = (I - kH)F)의 정상 상태 공분산에서 속도 성분을 계산
+    '''
+    if position_noise <= 0:
+        return 0.0
+    kf = VelocityKalman(0.0, position_noise, accel_noise)
+    for _ in range(steps):
+        kf.update(0.0, dt)
+    (p00, p01), _ = kf.P
+    # 정상 상태 이득 (update 안의 보정 직전 값으로 다시 계산)
+    p00 += 2 * dt * p01 + dt * dt * kf.P[1][1] + kf.Q * dt ** 4 / 4
+    p01 += dt * kf.P[1][1] + kf.Q * dt ** 3 / 2
+    k0, k1 = p00 / (p00 + kf.R), p01 / (p00 + kf.R)
+    a = [[1 - k0, (1 - k0) * dt], [-k1, 1 - k1 * dt]]
+    s = [[0.0, 0.0], [0.0, 0.0]]
+    for _ in range(steps):
+        # s = A s A^T + k k^T R
+        as_ = [[sum(a[i][m] * s[m][j] for m in range(2)) for j in range(2)] for i in range(2)]
+        s = [[sum(as_[i][m] * a[j][m] for m in range(2)) + (k0, k1)[i] * (k0, k1)[j] * kf.R
+              for j in range(2)] for i in range(2)]
+    return math.sqrt(s[1][1])
+
+
+class Telemetry:
+    '''
+    Position / Attitude 응답 → 기체 기준 속도 (앞, 오른쪽) m/s
+    - 위치는 축마다(x 앞, y 왼쪽) VelocityKalman으로 거르고, 속도를 yaw로 기체 기준으로 돌림
+    '''
+
+    def __init__(self, drone, clock=None, position_noise=POSITION_NOISE):
+        self.drone = drone
+        self.clock = clock or getattr(drone, "now", time.perf_counter)
+        self.available = hasattr(drone, "sendRequest") and hasattr(drone, "setEventHandler")
+        self.position_noise = position_noise
+        self.yaw = 0.0
+        self._filters = None    # (x, y_left) VelocityKalman
+        self._last_t = None     # 마지막 위치 시각
+        self._updates = 0       # 필터 시작 후 보정 횟수
+        self.samples = 0
+        if self.available:
+            drone.setEventHandler(DataType.Position, self._on_position)
+            drone.setEventHandler(DataType.Attitude, self._on_attitude)
+
+    def _on_position(self, position):
+        t = self.clock()
+        if self._last_t is not None:
+            dt = t - self._last_t
+            if dt <= 0:
+                return
+            if dt > TELEMETRY_TIMEOUT:
+                self._filters = None    # 오래 끊겼던 값에서 이어 가지 않고 필터를 다시 시작
+        if self._filters is None:
+            self._filters = (VelocityKalman(position.x, self.position_noise),
+                             VelocityKalman(position.y, self.position_noise))
+            self._updates = 0
+        else:
+            self._filters[0].update(position.x, dt)
+            self._filters[1].update(position.y, dt)
+            self._updates += 1
+        self._last_t = t
+        self.samples += 1
+
+    def _on_attitude(self, attitude):
+        self.yaw = attitude.yaw
+
+    def request(self):
+        # 응답은 실제 드론에서는 수신 스레드에서, SimDrone에서는 바로 핸들러로 들어옴
+        if self.available:
+            self.drone.sendRequest(DeviceType.Drone, DataType.Attitude)
+            self.drone.sendRequest(DeviceType.Drone, DataType.Position)
+
+    def velocity(self):
+        # 기체 기준 (앞, 오른쪽) m/s, 최근 값이 없거나 필터가 막 시작했으면 None
+        if (self._filters is None or self._updates < 2
+                or self.clock() - self._last_t > TELEMETRY_TIMEOUT):
+            return None
+        vx, vy_left = self._filters[0].velocity, self._filters[1].velocity
+        h = math.radians(self.yaw)
+        forward = vx * math.cos(h) + vy_left * math.sin(h)
+        left = -vx * math.sin(h) + vy_left * math.cos(h)
+        return forward, -left
+
+
+class MotionController:
+    def __init__(self, drone, trim=(0, 0), kp=KP, ki=KI, kff=KFF, check=None, position_noise=POSITION_NOISE):
+        self.drone = drone
+        self.trim = trim                # (roll, pitch) : 적분 시작값, 속도 정보가 없을 때 호버 입력
+        self.kp, self.ki, self.kff = kp, ki, kff
+        self.check = check              # 주기마다 호출 (drone_missions.check_cancel)
+        self.telemetry = Telemetry(drone, position_noise=position_noise)
+        # 정지 기준(m/s) : 멈춘 기체의 추정 속도 잡음 × STOP_SIGMA
+        self.stop_speed = max(STOP_SPEED_MIN, STOP_SIGMA * velocity_noise(TICK_MS / 1000.0, position_noise))
+        self.last_settle = None         # 마지막 stop()의 정지까지 걸린 시간(초), 속도 정보가 없으면 None
+        self._last_target = (0.0, 0.0)  # 마지막 move()의 목표 속도 : 속도 정보가 없을 때 브레이크 방향
+        self.reset()
+
+    def reset(self):
+        # 이륙할 때 : 적분값을 TRIM으로 되돌림
+        self._integral = [float(self.trim[0]), float(self.trim[1])]
+        self._stale_ms = 0
+
+    # =========================
+    # 한 주기
+    # =========================
+    def _tick(self, target_right, target_forward, yaw=0, throttle=0):
+        # 속도를 읽고 입력을 계산해서 TICK_MS 동안 전송 → 측정 속도 (없으면 None)
+        if self.check is not None:
+            self.check()
+        self.telemetry.request()
+        v = self.telemetry.velocity()
+        if v is None:
+            self._stale_ms += TICK_MS
+            roll = self.trim[0] + self.kff * target_right
+            pitch = self.trim[1] + self.kff * target_forward
+        else:
+            self._stale_ms = 0
+            roll = self._axis(0, target_right, v[1])
+            pitch = self._axis(1, target_forward, v[0])
+        self.drone.sendControlWhile(int(round(roll)), int(round(pitch)), yaw, throttle, TICK_MS)
+        return v
+
+    def _axis(self, i, target, measured):
+        error = target - measured
+        dt = TICK_MS / 1000.0
+        self._integral[i] = max(-INTEGRAL_LIMIT, min(INTEGRAL_LIMIT, self._integral[i] + self.ki * error * dt))
+        command = self._integral[i] + self.kff * target + self.kp * error
+        return max(-MAX_INPUT, min(MAX_INPUT, command))
+
+    @property
+    def closed_loop(self):
+        # 속도 정보를 쓰고 있는지 (TELEMETRY_TIMEOUT 넘게 응답이 없으면 False)
+        return self.telemetry.available and self._stale_ms < TELEMETRY_TIMEOUT * 1000
+
+    # =========================
+    # 기본 동작
+    # =========================
+    def move(self, forward=0.0, right=0.0, duration_ms=1000, yaw=0, throttle=0):
+        # 목표 속도(m/s)로 이동 (yaw / throttle은 그대로 전달, 수평 속도는 제어)
+        elapsed = 0
+        while elapsed < duration_ms:
+            self._tick(right, forward, yaw, throttle)
+            elapsed += TICK_MS
+        self._last_target = (forward, right)
+
+    def stop(self, timeout_ms=STOP_TIMEOUT_MS):
+        # 측정 속도가 0이 될 때까지 브레이크 → 걸린 시간(초)
+        direction = self._last_target
+        self._last_target = (0.0, 0.0)
+        if not self.closed_loop:
+            return self._fallback_brake(direction)
+
+        elapsed = still = 0
+        while elapsed < timeout_ms:
+            v = self._tick(0.0, 0.0)
+            elapsed += TICK_MS
+            if v is None:
+                if not self.closed_loop:
+                    return self._fallback_brake(direction)
+                continue
+            if math.hypot(v[0], v[1]) < self.stop_speed:
+                still += TICK_MS
+                if still >= STOP_HOLD_MS:
+                    break
+            else:
+                still = 0
+        else:
+            print(f"[MOTION] stop timeout ({timeout_ms} ms)")
+        self.last_settle = elapsed / 1000.0
+        return self.last_settle
+
+    def hold(self, duration_ms):
+        # 제자리 유지 (속도 0 제어, 속도 정보가 없으면 TRIM 호버)
+        elapsed = 0
+        while elapsed < duration_ms:
+            self._tick(0.0, 0.0)
+            elapsed += TICK_MS
+
+    def _fallback_brake(self, direction):
+        # 속도 정보 없음 : 마지막 이동 방향의 반대로 짧게
+        forward, right = direction
+        roll = self.trim[0] - FALLBACK_BRAKE * _sign(right)
+        pitch = self.trim[1] - FALLBACK_BRAKE * _sign(forward)
+        elapsed = 0
+        while elapsed < FALLBACK_BRAKE_MS:
+            if self.check is not None:
+                self.check()
+            self.drone.sendControlWhile(roll, pitch, 0, 0, TICK_MS)
+            elapsed += TICK_MS
+        self.last_settle = None
+        return None
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
@@ -0,0 +1,125 @@
+'''
+record_landmarks의 Docstring
+
+제스처 학습용 손 랜드마크 녹화 도구 (hands.process 결과 → 라벨이 붙은 시퀀스 .npz)
+
+이 코드의 목적:
+- train_gesture.py로 학습할 데이터를 모으기 위해,
+  MediaPipe가 찾은 21개 랜드마크를 프레임마다 (21,3) 배열로 저장하고 제스처 라벨을 붙임
+- 키를 누를 때마다 새 "시퀀스"가 시작됨 (같은 동작을 이어서 찍은 프레임 묶음)
+  → 학습 시 검증 데이터를 시퀀스 단위로 나눠서, 거의 같은 프레임이 학습 / 검증에 섞이지 않도록 함
+- 저장 형식 (npz) : points (N,21,3) float32, labels (N,), seq (N,), t (N,) 초,
+                    names (라벨 이름), aspect (화면 너비 / 높이)
+  · names가 "0"~"5"(손가락 개수)이면 check_hand_gesture.py의 fixtures로도 그대로 사용 가능
+
+조작 (창 모드):
+- 라벨 키 (0~9, a, b, ...) : 해당 라벨 녹화 시작 (같은 키 / SPACE : 녹화 멈춤)
+- ESC : 저장 후 종료
+
+한 가지 제스처만 찍은 영상 / 창 없이 :
+    python record_landmarks.py up.mp4 --headless --label up
+    python record_landmarks.py 0 --names land,takeoff,up,down --out recordings
+'''
+
+import argparse
+import os
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from frame_source import add_source_arguments, open_from_args
+from gesture_model import GESTURES
+from hand_gesture import landmarks_to_array
+
+KEYS = "0123456789abcdefghijklmnopqrstuvwxyz"   # 라벨 번호 → 키
+
+
+def main():
+    parser = add_source_arguments(argparse.ArgumentParser(description="제스처 랜드마크 녹화"))
+    parser.add_argument("--names", default=",".join(GESTURES), help="라벨 이름 (쉼표로 구분, 순서 = 키 0,1,2,...)")
+    parser.add_argument("--label", default=None, help="처음부터 이 라벨로 모든 프레임 녹화 (headless / 영상 입력용)")
+    parser.add_argument("--out", default="recordings", help="저장 폴더")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.names.split(",") if n.strip()]
+    if len(names) > len(KEYS):
+        raise SystemExit(f"라벨은 최대 {len(KEYS)}개")
+    if args.label is not None and args.label not in names:
+        raise SystemExit(f"--label {args.label} 이 --names에 없습니다")
+
+    cap, display = open_from_args(args)
+    if not cap.isOpened():
+        raise SystemExit("입력을 열 수 없습니다.")
+
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+    mp_draw = mp.solutions.drawing_utils
+
+    points, labels, seqs, times = [], [], [], []
+    label = None if args.label is None else names.index(args.label)
+    seq = 0 if label is not None else -1
+    aspect = None
+    start = time.time()
+
+    print("라벨 키 :", ", ".join(f"{KEYS[i]}={n}" for i, n in enumerate(names)), "| SPACE 멈춤 | ESC 저장/종료")
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if aspect is None:
+            aspect = frame.shape[1] / frame.shape[0]
+
+        result = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if result.multi_hand_landmarks:
+            hand_landmarks = result.multi_hand_landmarks[0]
+            mp_draw.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+            if label is not None:
+                points.append(landmarks_to_array(hand_landmarks))
+                labels.append(label)
+                seqs.append(seq)
+                times.append(time.time() - start)
+
+        status = "PAUSED" if label is None else f"REC {names[label]} (seq {seq})"
+        cv2.putText(frame, f"{status} | frames {len(points)}", (10, 35),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255) if label is not None else (255, 255, 255), 2)
+        display.show("Record Landmarks", frame)
+
+        key = display.poll_key()
+        if key == 27:
+            break
+        if key == ord(" "):
+            label = None
+        elif key != 255 and chr(key) in KEYS[:len(names)]:
+            pressed = KEYS.index(chr(key))
+            if pressed == label:
+                label = None            # 같은 키 : 멈춤
+            else:
+                label = pressed         # 새 시퀀스 시작
+                seq += 1
+
+    cap.release()
+    display.close()
+    hands.close()
+
+    if not points:
+        print("녹화된 프레임이 없습니다.")
+        return
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, time.strftime("landmarks_%Y%m%d_%H%M%S.npz"))
+    labels = np.array(labels)
+    np.savez_compressed(path, points=np.stack(points), labels=labels, seq=np.array(seqs),
+                        t=np.array(times), names=np.array(names), aspect=aspect)
+    counts = ", ".join(f"{names[i]}={int((labels == i).sum())}" for i in np.unique(labels))
+    print(f"saved {len(points)} frames ({seq + 1} seq) -> {path} [{counts}]")
+
+
+if __name__ == "__main__":
+    main()
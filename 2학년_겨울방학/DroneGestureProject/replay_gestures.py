@@ -0,0 +1,176 @@
+'''
+replay_gestures의 Docstring
+
+녹화된 랜드마크 로그(landmark_log) → 안정성 판단 → 미션 실행(가짜 드론) 재생기
+
+이 코드의 목적:
+- main_gesture_to_drone.py가 LANDMARK_LOG로 남긴 로그를 웹캠 / 드론 없이 다시 실행
+  1. 프레임마다 녹화된 제스처(또는 --reclassify : 녹화된 랜드마크로 다시 분류)를 GestureStabilizer에 넣음
+     → 녹화된 시각으로 판단하므로 재생 속도와 관계없이 확정 결과가 항상 같음 (결정 회귀 검사)
+  2. 확정된 제스처는 MissionExecutor + MockDrone으로 drone_missions.execute_mission까지 실행
+     (--speed 1 : 실제 시간, 10 : 10배 빠르게, 0 : 기다리지 않음 / --no-missions : 판단만)
+     --sim : MockDrone 대신 sim_drone.SimDrone (물리 모델, 재생 후 최종 위치 출력)
+     speed 0 에서는 미션 하나가 끝난 뒤 다음 프레임으로 넘어감 (미션 순서가 항상 같음, 착륙 끼어들기는 없음)
+- 출력 : 확정 제스처 목록(시각, 후보 시작 → 확정까지 걸린 시간), 녹화 당시 확정과의 비교,
+         미션별 대기(확정 → 실행 시작) / 실행 시간, 가짜 드론 명령 개수
+- --check : 녹화 당시와 확정 결과(순서 / 제스처 / 시각 ±--tolerance)가 다르면 종료 코드 1
+
+사용 예:
+    python replay_gestures.py session.lmlog
+    python replay_gestures.py session.lmlog --speed 0 --no-missions --check
+    python replay_gestures.py session.lmlog --reclassify --stable-time 0.8 --speed 10
+'''
+
+import argparse
+import time
+
+import numpy as np
+
+from gesture_stability import STABLE_TIME, GestureStabilizer
+from landmark_log import CONFIRM, FRAME, read_log
+
+
+def make_classifier(meta, model_path):
+    # 녹화된 랜드마크 → 제스처 번호 (main_gesture_to_drone.classify와 같은 규칙)
+    if model_path is None:
+        from hand_gesture import count_fingers
+        return lambda points, aspect: count_fingers(points, aspect=aspect)
+
+    from gesture_model import GESTURES, GestureModel
+    model = GestureModel.load(model_path)
+    min_prob = meta.get("model_min_prob", 0.8)
+
+    def classify(points, aspect):
+        name, prob = model.predict(points, aspect=aspect)
+        if prob < min_prob or name not in GESTURES:
+            return None
+        return GESTURES.index(name)
+    return classify
+
+
+def replay(records, meta, stabilizer, speed=0.0, classify=None, executor=None):
+    '''
+    FRAME 레코드를 순서대로 재생 → 확정 목록 [(t, 제스처, 후보 시작 → 확정 시간)], 분류가 달라진 프레임 수
+    '''
+    frames = records[records["kind"] == FRAME]
+    aspect = meta.get("aspect") or 1.0
+    decided = []
+    changed = 0
+    start = time.perf_counter()
+
+    for rec in frames:
+        t = float(rec["t"])
+        if speed > 0:
+            delay = start + t / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        recorded = None if rec["gesture"] < 0 else int(rec["gesture"])
+        gesture = recorded
+        if classify is not None:
+            gesture = classify(rec["points"], aspect) if rec["hand"] else None
+            changed += gesture != recorded
+
+        confirmed = stabilizer.update(gesture, t)
+        if confirmed is None:
+            continue
+        decided.append((t, confirmed, stabilizer.last_latency))
+
+        if executor is not None:
+            if not executor.submit(confirmed):
+                print(f"  [BUSY] {t:8.3f}s mission {confirmed} ignored ({executor.status_text()})")
+            if speed <= 0:
+                executor.wait_idle()
+
+    return decided, changed
+
+
+def compare_decisions(decided, expected, tolerance):
+    # 확정 목록 비교 → 다른 줄 목록
+    diffs = []
+    for i in range(max(len(decided), len(expected))):
+        got = decided[i][:2] if i < len(decided) else None
+        exp = expected[i] if i < len(expected) else None
+        if got is None or exp is None or got[1] != exp[1] or abs(got[0] - exp[0]) > tolerance:
+            diffs.append((i, got, exp))
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="랜드마크 로그 재생 (안정성 판단 + 가짜 드론 미션)")
+    parser.add_argument("log", help="main_gesture_to_drone.py LANDMARK_LOG 파일")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (0 : 기다리지 않음)")
+    parser.add_argument("--stable-time", type=float, default=None, help="안정성 시간 (기본 : 로그 헤더 값)")
+    parser.add_argument("--reclassify", action="store_true", help="녹화된 랜드마크로 제스처를 다시 분류")
+    parser.add_argument("--model", default=None, help="--reclassify : 학습된 제스처 모델(npz), 없으면 손가락 개수")
+    parser.add_argument("--no-missions", action="store_true", help="미션 실행 없이 판단만")
+    parser.add_argument("--verbose", action="store_true", help="가짜 드론 명령 출력")
+    parser.add_argument("--sim", action="store_true", help="시뮬레이션 드론(물리 모델) 사용")
+    parser.add_argument("--check", action="store_true", help="녹화 당시 확정 결과와 다르면 종료 코드 1")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="확정 시각 허용 오차(초)")
+    args = parser.parse_args()
+
+    meta, records = read_log(args.log)
+    frames = records[records["kind"] == FRAME]
+    expected = [(float(r["t"]), int(r["gesture"])) for r in records[records["kind"] == CONFIRM]]
+    stable_time = args.stable_time if args.stable_time is not None else meta.get("stable_time", STABLE_TIME)
+    duration = float(frames["t"][-1]) if len(frames) else 0.0
+    print(f"log={args.log} frames={len(frames)} ({duration:.1f}s, hand {np.mean(frames['hand']):.2f}) "
+          f"confirmed={len(expected)} stable_time={stable_time} speed={args.speed}")
+
+    classify = make_classifier(meta, args.model) if args.reclassify else None
+
+    executor = drone = None
+    if not args.no_missions:
+        import drone_missions
+        from mission_executor import MissionExecutor
+        from mock_drone import MockDrone
+        if args.sim:
+            from sim_drone import SimDrone
+            drone = SimDrone(speed=args.speed, verbose=args.verbose)
+        else:
+            drone = MockDrone(speed=args.speed, verbose=args.verbose)
+        drone_missions.sleep = drone.sleep     # 미션 안의 대기도 같은 배속으로
+        drone_missions.is_flying = False
+        executor = MissionExecutor(drone)
+
+    wall = time.perf_counter()
+    decided, changed = replay(records, meta, GestureStabilizer(stable_time), args.speed, classify, executor)
+    if executor is not None:
+        executor.wait_idle()
+        executor.close()
+    wall = time.perf_counter() - wall
+
+    print(f"{'#':>3} {'t (s)':>8} {'gesture':>7} {'hold (s)':>8}  recorded")
+    for i, (t, g, hold) in enumerate(decided):
+        exp = f"{expected[i][1]} @ {expected[i][0]:.3f}" if i < len(expected) else "-"
+        print(f"{i:3d} {t:8.3f} {g:7d} {hold:8.3f}  {exp}")
+    if classify is not None:
+        print(f"reclassified frames different from recorded: {changed}")
+    if executor is not None and executor.history:
+        # 미션별 대기(확정 → 실행 시작, 앞 미션이 끝나기를 기다린 시간 포함) / 실행 시간 (재생 시간 기준)
+        wait_ms = np.array([start - sub for _, _, sub, start, _ in executor.history]) * 1000.0
+        run_s = np.array([end - start for _, _, _, start, end in executor.history])
+        print(f"missions : wait ms p50 {np.percentile(wait_ms, 50):.2f} max {wait_ms.max():.2f} | "
+              f"run s mean {run_s.mean():.2f} (재생 배속 기준)")
+        for gesture, result, _, _, _ in executor.history:
+            if result != "done":
+                print(f"  mission {gesture}: {result}")
+    if executor is not None:
+        print(executor.summary())
+        print(drone.summary())
+    print(f"replayed {duration:.1f}s of log in {wall:.2f}s")
+
+    diffs = compare_decisions(decided, expected, args.tolerance)
+    if diffs:
+        print(f"decisions differ from recording : {len(diffs)}")
+        for i, got, exp in diffs[:10]:
+            print(f"  #{i}: replay {got} / recorded {exp}")
+        if args.check:
+            raise SystemExit(1)
+    else:
+        print("decisions match recording")
+
+
+if __name__ == "__main__":
+    main()
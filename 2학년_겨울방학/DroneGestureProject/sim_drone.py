@@ -0,0 +1,217 @@
+'''
+sim_drone의 Docstring
+
+e_drone Drone 대신 쓰는 시뮬레이션 드론 (질점 물리 모델 + 가상 시계)
+
+이 코드의 목적:
+- drone_missions.py / drone_basic_test.py는 실제 드론이 있어야 미션 순서나 브레이크 값을 확인할 수 있었음
+- SimDrone은 sendTakeOff / sendLanding / sendControlWhile 등 같은 이름의 메서드를 제공하고(mock_drone.MockDrone 확장),
+  입력(roll, pitch, yaw, throttle)을 간단한 질점 모델에 적용해서 위치 / 속도 / 방향을 계산
+- speed=0 (가상 시계) : sendControlWhile(…, 3000)이나 sleep(3)이 실제로 기다리지 않고 물리만 3초 진행
+  → 미션 수백 개를 몇 초 안에 돌려서 브레이크 / 보정값을 한꺼번에 비교 (sim_missions.py)
+  speed=1 : 실제 시간과 같이 진행 (화면 / 제스처 루프와 같이 확인할 때)
+
+[물리 모델 (한 축마다)]
+- 수평 : 가속도 = ACCEL_PER_INPUT × power × (입력 + 기체 쏠림) - DRAG × 속도
+  · pitch → 앞(기수 방향), roll → 오른쪽, 기수 방향은 yaw로 회전
+  · 기체 쏠림(drift_roll / drift_pitch) : 실제 기체가 입력 0에서도 한쪽으로 흐르는 값
+    기본값은 drone_missions의 TRIM_ROLL / TRIM_PITCH를 정확히 상쇄하는 값 (-TRIM)
+  · power : 배터리 상태 (1.0 = 완충, ReadMe의 "같은 값인데 이동 거리가 달라짐" 재현용)
+- yaw : 회전 속도(도/초) = YAW_RATE_PER_INPUT × 입력 (+ : 왼쪽 회전)
+- 고도 : 목표 상승 속도 = CLIMB_PER_INPUT × throttle, 시간 상수 VERTICAL_TAU로 따라감
+- 이륙 : TAKEOFF_HEIGHT까지 상승 후 비행, 착륙 : LAND_SPEED로 내려와 바닥에서 정지
+- 제어 명령은 보낸 시간 동안만 유지, 끝나면 입력 0 (실제 드론은 명령이 끊기면 입력을 0으로 봄)
+
+[텔레메트리]
+- setEventHandler / sendRequest(DeviceType.Drone, DataType.Position / Attitude) : 요청하면 바로 핸들러 호출
+  · Position : x 앞, y 왼쪽, z 위 (e_drone 좌표, position_noise(m) 만큼 잡음) / Attitude.yaw : 기수 방향(도)
+    position_noise 기본값은 motion_control.POSITION_NOISE (1cm, 실제 드론 위치 잡음 수준) → 0이면 잡음 없음
+  · telemetry=False : 요청에 응답하지 않음 (속도 정보 없는 드론 → motion_control 개루프 동작 확인용)
+
+사용법:
+    drone = SimDrone(speed=0)             # 가상 시계
+    drone_missions.sleep = drone.sleep    # 미션 안의 sleep / wait도 가상 시계로
+    drone_missions.execute_mission(drone, 1)
+    drone.state()                         # {"t", "x", "y", "z", "vx", "vy", "vz", "heading", "flying"}
+'''
+
+import math
+import random
+import time
+from types import SimpleNamespace
+
+from mock_drone import MockDrone
+from motion_control import POSITION_NOISE
+
+DT = 0.01                   # 물리 적분 간격(초)
+
+ACCEL_PER_INPUT = 0.04      # 입력 1당 수평 가속도(m/s^2) → 입력 40 : 1.6 m/s^2
+DRAG = 1.2                  # 공기 저항 (1/s) → 입력 40 정속 ≈ 1.3 m/s
+YAW_RATE_PER_INPUT = 1.8    # 입력 1당 회전 속도(도/초)
+CLIMB_PER_INPUT = 0.012     # throttle 1당 목표 상승 속도(m/s)
+VERTICAL_TAU = 0.3          # 상승 속도 응답 시간 상수(초)
+
+TAKEOFF_HEIGHT = 0.8        # 이륙 후 고도(m)
+TAKEOFF_SPEED = 0.5         # 이륙 상승 속도(m/s)
+LAND_SPEED = 0.6            # 착륙 하강 속도(m/s) : mission_land(1.5초) 안에 바닥까지
+
+TRACE_SEC = 0.05            # 궤적 기록 간격(초)
+
+
+class SimDrone(MockDrone):
+    def __init__(self, speed=0.0, drift_roll=None, drift_pitch=None, power=1.0, verbose=False,
+                 telemetry=True, position_noise=POSITION_NOISE, seed=None):
+        super().__init__(speed=speed, verbose=verbose)
+        if drift_roll is None or drift_pitch is None:
+            import drone_missions   # 기본 쏠림 = drone_missions 보정값의 반대
+            drift_roll = -drone_missions.TRIM_ROLL if drift_roll is None else drift_roll
+            drift_pitch = -drone_missions.TRIM_PITCH if drift_pitch is None else drift_pitch
+        self.drift_roll = drift_roll
+        self.drift_pitch = drift_pitch
+        self.power = power
+        self.telemetry = telemetry
+        self.position_noise = position_noise
+        self._rng = random.Random(seed)
+        self._handlers = {}
+
+        self.t = 0.0                            # 가상 시계(초)
+        self.x = self.y = self.z = 0.0          # 위치(m) : x 앞(처음 기수 방향), y 오른쪽, z 위
+        self.vx = self.vy = self.vz = 0.0
+        self.heading = 0.0                      # 기수 방향(도, + : 왼쪽)
+        self.mode = "landed"                    # landed / takeoff / flying / landing
+        self._input = (0, 0, 0, 0)              # 현재 (roll, pitch, yaw, throttle)
+        self.trace = []                         # (t, x, y, z, vx, vy, heading)
+        self._next_trace = 0.0
+
+    # =========================
+    # 시간 진행
+    # =========================
+    def now(self):
+        return self.t
+
+    def sleep(self, sec):
+        # 물리를 sec만큼 진행 (speed > 0 이면 실제로도 sec / speed 만큼 대기)
+        start = time.perf_counter()
+        self.advance(sec)
+        if self.speed > 0:
+            remaining = sec / self.speed - (time.perf_counter() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def advance(self, sec):
+        steps = int(round(sec / DT))
+        for _ in range(steps):
+            self._step(DT)
+
+    def _step(self, dt):
+        roll, pitch, yaw, throttle = self._input
+        if self.mode == "landed":
+            self.vx = self.vy = self.vz = 0.0
+        elif self.mode in ("takeoff", "landing"):
+            self.vz = TAKEOFF_SPEED if self.mode == "takeoff" else -LAND_SPEED
+            self._horizontal(0, 0, dt)
+            self.z += self.vz * dt
+            if self.mode == "takeoff" and self.z >= TAKEOFF_HEIGHT:
+                self.z, self.vz, self.mode = TAKEOFF_HEIGHT, 0.0, "flying"
+            elif self.mode == "landing" and self.z <= 0.0:
+                self.z, self.mode = 0.0, "landed"
+                self.vx = self.vy = self.vz = 0.0
+        else:
+            self._horizontal(roll, pitch, dt)
+            self.heading += YAW_RATE_PER_INPUT * yaw * dt
+            target_vz = CLIMB_PER_INPUT * throttle * self.power
+            self.vz += (target_vz - self.vz) * dt / VERTICAL_TAU
+            self.z = max(0.0, self.z + self.vz * dt)
+
+        self.t += dt
+        if self.t >= self._next_trace:
+            self.trace.append((self.t, self.x, self.y, self.z, self.vx, self.vy, self.heading))
+            self._next_trace = self.t + TRACE_SEC
+
+    def _horizontal(self, roll, pitch, dt):
+        # 기체 기준 입력(+ 쏠림) → 세계 좌표 가속도
+        forward = ACCEL_PER_INPUT * self.power * (pitch + self.drift_pitch)
+        right = ACCEL_PER_INPUT * self.power * (roll + self.drift_roll)
+        h = math.radians(self.heading)
+        ax = forward * math.cos(h) + right * math.sin(h)
+        ay = -forward * math.sin(h) + right * math.cos(h)
+        self.vx += (ax - DRAG * self.vx) * dt
+        self.vy += (ay - DRAG * self.vy) * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+    # =========================
+    # e_drone.drone.Drone과 같은 이름의 메서드
+    # =========================
+    def sendTakeOff(self):
+        super().sendTakeOff()
+        if self.mode == "landed":
+            self.mode = "takeoff"
+
+    def sendLanding(self):
+        super().sendLanding()
+        if self.mode != "landed":
+            self.mode = "landing"
+
+    def sendStop(self):
+        super().sendStop()
+        self.mode = "landed"        # 모터 정지 : 바로 바닥 (시뮬레이션에서는 낙하 생략)
+        self.z = 0.0
+
+    def sendControl(self, roll, pitch, yaw, throttle):
+        super().sendControl(roll, pitch, yaw, throttle)
+        self._input = (roll, pitch, yaw, throttle)
+
+    def sendControlWhile(self, roll, pitch, yaw, throttle, time_ms):
+        self._record("sendControlWhile", roll, pitch, yaw, throttle, time_ms)
+        self._input = (roll, pitch, yaw, throttle)
+        self.sleep(time_ms / 1000.0)
+        self._input = (0, 0, 0, 0)
+
+    # =========================
+    # 텔레메트리 (e_drone 이벤트 핸들러 방식)
+    # =========================
+    def setEventHandler(self, dataType, eventHandler):
+        self._handlers[getattr(dataType, "name", dataType)] = eventHandler
+
+    def sendRequest(self, target, dataType):
+        name = getattr(dataType, "name", dataType)
+        handler = self._handlers.get(name)
+        if not self.telemetry or handler is None:
+            return
+        if name == "Position":
+            noise = self.position_noise
+            handler(SimpleNamespace(x=self.x + self._rng.gauss(0.0, noise) if noise else self.x,
+                                    y=-self.y + self._rng.gauss(0.0, noise) if noise else -self.y,
+                                    z=self.z))
+        elif name == "Attitude":
+            handler(SimpleNamespace(roll=0.0, pitch=0.0, yaw=self.heading))
+
+    # =========================
+    # 상태
+    # =========================
+    @property
+    def flying(self):
+        return self.mode != "landed"
+
+    @property
+    def speed_xy(self):
+        return math.hypot(self.vx, self.vy)
+
+    def clone(self):
+        # 물리 상태만 복사한 새 SimDrone (가상 시계, 기록 없음) : "지금부터 계속 호버하면?" 같은 예측용
+        other = SimDrone(speed=0.0, drift_roll=self.drift_roll, drift_pitch=self.drift_pitch, power=self.power,
+                         telemetry=False)
+        for name in ("t", "x", "y", "z", "vx", "vy", "vz", "heading", "mode", "_input"):
+            setattr(other, name, getattr(self, name))
+        other._next_trace = float("inf")
+        return other
+
+    def state(self):
+        return {"t": self.t, "x": self.x, "y": self.y, "z": self.z, "vx": self.vx, "vy": self.vy,
+                "vz": self.vz, "heading": self.heading, "flying": self.flying}
+
+    def summary(self):
+        return (f"sim t={self.t:.2f}s pos=({self.x:+.2f}, {self.y:+.2f}, {self.z:.2f}) m "
+                f"speed={self.speed_xy:.2f} m/s heading={self.heading:+.0f}° mode={self.mode} | "
+                + super().summary())
@@ -0,0 +1,191 @@
+'''
+sim_missions의 Docstring
+
+시뮬레이션 드론(sim_drone)으로 drone_missions 미션 순서 / 속도 제어기 게인을 한꺼번에 평가 (드론 없이, CI용)
+
+이 코드의 목적:
+- 가상 시계(SimDrone speed=0)로 drone_missions.execute_mission을 그대로 실행해서 미션별로
+  이동 거리(출발 기수 방향 기준 앞 / 오른쪽), 고도 / 방향 변화, 걸린 시간, 끝났을 때 남은 속도,
+  brake(motion_control 정지까지 걸린 시간),
+  settle(끝난 뒤 호버를 계속할 때 속도가 SETTLE_SPEED 아래로 내려가기까지의 시간)을 출력
+- --runs N : 배터리 상태(power)를 --power-min ~ 1.0 사이에서, 기체 쏠림을 TRIM ± --drift-spread 사이에서
+  바꿔 N번 실행 → 이동 거리 평균 / 표준편차
+  (ReadMe의 "같은 제어값인데 이동 거리가 달라짐" 문제를 숫자로 확인)
+- --open-loop : 시뮬레이션 드론이 위치 / 자세 요청에 응답하지 않음 → 속도 정보 없는 기존 방식과 비교
+- --noise : 위치 측정 잡음(m), 기본 motion_control.POSITION_NOISE (1cm) → 0이면 잡음 없는 이상적인 센서
+  (motion_control의 칼만 필터 / 정지 기준도 같은 값으로 설정)
+- --sweep forward : 해당 미션을 제어기 게인(KP, KI) 격자로 바꿔가며 브레이크 시간 / 남은 속도 / 밀림 거리 비교
+  (drone_missions.MOTION_GAINS를 덮어써서 미션 코드는 그대로 사용)
+- e_drone SDK 없이 실행 가능 (numpy만 필요, motion_control은 e_drone이 없으면 같은 이름의 값을 직접 정의)
+
+사용 예:
+    python sim_missions.py
+    python sim_missions.py --sequence 1,2,8,6,3,0 --runs 20 --power-min 0.8 --drift-spread 5
+    python sim_missions.py --runs 20 --open-loop
+    python sim_missions.py --noise 0.02
+    python sim_missions.py --sweep forward --kps 20,30,40,60 --kis 0,10,20,40
+'''
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+import drone_missions
+from motion_control import POSITION_NOISE
+from sim_drone import SimDrone
+
+SETTLE_SPEED = 0.05     # 이 속도(m/s) 아래면 멈춘 것으로 봄
+SETTLE_MAX_SEC = 5.0
+
+MISSION_NAMES = {0: "land", 1: "takeoff", 2: "forward", 3: "backward", 4: "left", 5: "right",
+                 6: "up", 7: "down", 8: "yaw_left", 9: "yaw_right", 10: "hover"}
+SWEEP_MISSIONS = {"forward": 2, "backward": 3, "left": 4, "right": 5}
+
+
+def settle_time(drone):
+    # 지금부터 호버(TRIM) 입력을 계속 줄 때 멈추기까지의 시간 (복사본으로 계산, 원래 드론은 그대로)
+    sim = drone.clone()
+    if not sim.flying:
+        return 0.0
+    sim._input = (drone_missions.TRIM_ROLL, drone_missions.TRIM_PITCH, 0, 0)
+    elapsed = 0.0
+    while sim.speed_xy >= SETTLE_SPEED and elapsed < SETTLE_MAX_SEC:
+        sim.advance(0.05)
+        elapsed += 0.05
+    return elapsed
+
+
+def run_mission(drone, gesture):
+    # 미션 1개 실행 → 측정값 dict
+    motion = drone_missions.motion(drone)
+    motion.last_settle = None
+    before = drone.state()
+    with contextlib.redirect_stdout(io.StringIO()):
+        drone_missions.execute_mission(drone, gesture)
+    after = drone.state()
+    h = np.radians(before["heading"])
+    dx, dy = after["x"] - before["x"], after["y"] - before["y"]
+    return {
+        "gesture": gesture,
+        "forward": dx * np.cos(h) - dy * np.sin(h),   # 출발 기수 방향 기준
+        "right": dx * np.sin(h) + dy * np.cos(h),
+        "dz": after["z"] - before["z"],
+        "dheading": after["heading"] - before["heading"],
+        "sec": after["t"] - before["t"],
+        "end_speed": drone.speed_xy,
+        "brake": motion.last_settle,
+        "settle": settle_time(drone),
+    }
+
+
+def run_sequence(sequence, power=1.0, drift=(0.0, 0.0), telemetry=True, noise=POSITION_NOISE, seed=None):
+    # drift : drone_missions TRIM과 실제 기체 쏠림의 차이 (roll, pitch 입력 단위)
+    drone = SimDrone(speed=0.0, power=power,
+                     drift_roll=-drone_missions.TRIM_ROLL + drift[0], drift_pitch=-drone_missions.TRIM_PITCH + drift[1],
+                     telemetry=telemetry, position_noise=noise, seed=seed)
+    drone_missions.sleep = drone.sleep     # 미션 안의 sleep / wait도 가상 시계로
+    drone_missions.is_flying = False
+    drone_missions.clear_cancel()
+    return drone, [run_mission(drone, g) for g in sequence]
+
+
+@contextlib.contextmanager
+def override_gains(**gains):
+    # drone_missions.MOTION_GAINS를 잠시 바꿈 (새 드론의 MotionController부터 적용)
+    original = drone_missions.MOTION_GAINS
+    drone_missions.MOTION_GAINS = dict(original, **gains)
+    try:
+        yield
+    finally:
+        drone_missions.MOTION_GAINS = original
+
+
+def fmt_brake(value, width):
+    return f"{'-':>{width}}" if value is None else f"{value:{width}.2f}"
+
+
+def print_missions(rows):
+    print(f"{'mission':<10} {'fwd m':>7} {'right m':>8} {'dz m':>6} {'dyaw':>6} {'sec':>6} "
+          f"{'end m/s':>8} {'brake s':>8} {'settle s':>9}")
+    for r in rows:
+        print(f"{MISSION_NAMES.get(r['gesture'], r['gesture']):<10} {r['forward']:7.2f} {r['right']:8.2f} "
+              f"{r['dz']:6.2f} {r['dheading']:6.0f} {r['sec']:6.2f} {r['end_speed']:8.3f} "
+              f"{fmt_brake(r['brake'], 8)} {r['settle']:9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시뮬레이션 드론으로 미션 평가")
+    parser.add_argument("--sequence", default="1,2,3,4,5,6,7,8,9,10,0", help="미션 번호 순서")
+    parser.add_argument("--runs", type=int, default=1, help="배터리 상태를 바꿔 반복 실행할 횟수")
+    parser.add_argument("--power-min", type=float, default=0.85, help="--runs : 최소 배터리 상태 (1.0 = 완충)")
+    parser.add_argument("--drift-spread", type=float, default=0.0, help="--runs : 기체 쏠림 - TRIM 차이 최대(입력 단위)")
+    parser.add_argument("--open-loop", action="store_true", help="속도 정보 없이 (기존 TRIM / 브레이크 펄스)")
+    parser.add_argument("--noise", type=float, default=POSITION_NOISE, help="위치 측정 잡음 표준편차(m)")
+    parser.add_argument("--sweep", default=None, choices=tuple(SWEEP_MISSIONS), help="제어기 게인 격자 탐색")
+    parser.add_argument("--kps", default="10,20,30,40,60,80", help="--sweep : KP 목록")
+    parser.add_argument("--kis", default="0,10,20,40", help="--sweep : KI 목록")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    wall = time.perf_counter()
+    simulated = 0.0
+    options = dict(telemetry=not args.open_loop, noise=args.noise, seed=args.seed)
+    # 속도 추정 필터 / 정지 기준도 같은 잡음으로 설정 (실제 드론에서는 POSITION_NOISE를 센서에 맞춤)
+    drone_missions.MOTION_GAINS = dict(drone_missions.MOTION_GAINS, position_noise=args.noise)
+
+    if args.sweep:
+        gesture = SWEEP_MISSIONS[args.sweep]
+        results = []
+        for kp in [float(v) for v in args.kps.split(",")]:
+            for ki in [float(v) for v in args.kis.split(",")]:
+                with override_gains(kp=kp, ki=ki):
+                    drone, rows = run_sequence([1, gesture], **options)
+                simulated += drone.t
+                r = rows[1]
+                # 브레이크 시간(정지까지) → 남은 속도 순 (정지 못 하면 STOP_TIMEOUT_MS로 끝남)
+                results.append((r["brake"] if r["brake"] is not None else float("inf"),
+                                r["end_speed"], kp, ki, r["settle"], r["forward"], r["right"]))
+        results.sort()
+        print(f"gain sweep : {args.sweep} (brake s = motion_control stop time)")
+        print(f"{'kp':>6} {'ki':>6} {'brake s':>8} {'end m/s':>8} {'settle s':>9} {'fwd m':>7} {'right m':>8}")
+        for brake_s, end_speed, kp, ki, settle, fwd, right in results[:10]:
+            print(f"{kp:6.0f} {ki:6.0f} {brake_s:8.2f} {end_speed:8.3f} {settle:9.2f} {fwd:7.2f} {right:8.2f}")
+        drone, rows = run_sequence([1, gesture], **options)
+        r = rows[1]
+        print(f"{'current':>13} {fmt_brake(r['brake'], 8)} {r['end_speed']:8.3f} {r['settle']:9.2f} "
+              f"{r['forward']:7.2f} {r['right']:8.2f}")
+    else:
+        sequence = [int(v) for v in args.sequence.split(",")]
+        rng = np.random.default_rng(args.seed)
+        all_rows = []
+        for i in range(args.runs):
+            power = 1.0 if args.runs == 1 else rng.uniform(args.power_min, 1.0)
+            drift = rng.uniform(-args.drift_spread, args.drift_spread, 2) if args.runs > 1 else (0.0, 0.0)
+            drone, rows = run_sequence(sequence, power, tuple(drift), **options)
+            simulated += drone.t
+            all_rows.append(rows)
+        if args.runs == 1:
+            print_missions(all_rows[0])
+            print(drone.summary())
+        else:
+            print(f"{args.runs} runs, power {args.power_min:.2f} ~ 1.00, drift ±{args.drift_spread:g}, "
+                  f"{'open loop' if args.open_loop else 'closed loop'}")
+            print(f"{'mission':<10} {'fwd mean':>9} {'fwd std':>8} {'right mean':>11} {'right std':>10} "
+                  f"{'brake max':>10} {'settle max':>11}")
+            for j, g in enumerate(sequence):
+                fwd = np.array([rows[j]["forward"] for rows in all_rows])
+                right = np.array([rows[j]["right"] for rows in all_rows])
+                brakes = [rows[j]["brake"] for rows in all_rows if rows[j]["brake"] is not None]
+                settle = max(rows[j]["settle"] for rows in all_rows)
+                print(f"{MISSION_NAMES.get(g, g):<10} {fwd.mean():9.2f} {fwd.std():8.3f} {right.mean():11.2f} "
+                      f"{right.std():10.3f} {fmt_brake(max(brakes) if brakes else None, 10)} {settle:11.2f}")
+
+    wall = time.perf_counter() - wall
+    print(f"simulated {simulated:.1f}s in {wall:.2f}s ({simulated / wall:.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
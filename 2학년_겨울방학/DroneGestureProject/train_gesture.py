@@ -0,0 +1,235 @@
+'''
+train_gesture의 Docstring
+
+녹화한 손 랜드마크로 제스처 분류 모델(MLP / k-NN) 학습 → NumPy 추론용 .npz 저장
+
+이 코드의 목적:
+- record_landmarks.py로 녹화한 npz 파일들을 합쳐서 (라벨 이름 기준으로 통합)
+  gesture_model.normalize 특징(63차원)으로 작은 분류기를 학습
+  · mlp : 63 → hidden(ReLU) → 클래스, NumPy로 직접 학습 (Adam, 클래스별 가중치, L2)
+          학습할 때만 랜드마크에 작은 회전(±ROTATE_DEG) / 크기 / 흔들림을 더해서 데이터 보강
+  · knn : 학습 특징을 그대로 저장 (학습 시간 0, 데이터가 많아지면 추론이 느려짐)
+- 검증 데이터는 "시퀀스" 단위로 나눔 (연속 프레임은 거의 같아서 프레임 단위로 나누면 정확도가 부풀려짐)
+- 결과 : 검증 정확도, 클래스별 정확도 / 혼동 행렬, 저장한 모델의 손 1개 / 묶음 추론 시간(µs)
+- TensorFlow / MediaPipe 없이 NumPy만 필요
+
+사용 예:
+    python train_gesture.py recordings/
+    python train_gesture.py recordings/ --kind knn --k 5 --out gesture_knn.npz
+    python train_gesture.py a.npz b.npz --hidden 64 --epochs 300
+'''
+
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+
+from gesture_model import FEATURES, GestureModel, normalize
+
+ROTATE_DEG = 15.0   # 데이터 보강 : 화면 안 회전 범위 (±)
+SCALE = 0.1         # 데이터 보강 : 크기 변화 (±10%)
+JITTER = 0.01       # 데이터 보강 : 랜드마크 흔들림 (손 크기 대비)
+
+
+# =========================
+# 데이터 읽기
+# =========================
+def load_recordings(paths):
+    '''
+    npz 파일 / 폴더 목록 → points (N,21,3) (aspect 반영), labels (N,), groups (N,) 시퀀스 번호, names
+    '''
+    files = []
+    for path in paths:
+        files += sorted(glob.glob(os.path.join(path, "*.npz"))) if os.path.isdir(path) else [path]
+    if not files:
+        raise SystemExit("녹화 파일(npz)이 없습니다")
+
+    names, points, labels, groups = [], [], [], []
+    group_offset = 0
+    for path in files:
+        data = np.load(path)
+        file_names = [str(n) for n in data["names"]]
+        for n in file_names:
+            if n not in names:
+                names.append(n)
+        remap = np.array([names.index(n) for n in file_names])
+        aspect = float(data["aspect"]) if "aspect" in data else 1.0
+        seq = data["seq"] if "seq" in data else np.zeros(len(data["labels"]), dtype=int)
+
+        points.append(data["points"].astype(np.float32) * np.array([aspect, 1.0, aspect], dtype=np.float32))
+        labels.append(remap[data["labels"]])
+        groups.append(seq + group_offset)
+        group_offset += int(seq.max()) + 1
+        print(f"  {path}: {len(seq)} frames, {len(np.unique(seq))} seq")
+
+    return np.concatenate(points), np.concatenate(labels), np.concatenate(groups), names
+
+def split_by_sequence(labels, groups, val_ratio, rng):
+    # 클래스마다 시퀀스의 val_ratio를 검증용으로 (시퀀스가 1개뿐인 클래스는 모두 학습용)
+    val = np.zeros(len(labels), dtype=bool)
+    for c in np.unique(labels):
+        seqs = np.unique(groups[labels == c])
+        if len(seqs) < 2:
+            continue
+        n_val = max(1, int(round(len(seqs) * val_ratio)))
+        val |= np.isin(groups, rng.choice(seqs, n_val, replace=False)) & (labels == c)
+    return ~val, val
+
+
+# =========================
+# 데이터 보강 (학습할 때만)
+# =========================
+def augment(points, rng):
+    n = len(points)
+    t = np.radians(rng.uniform(-ROTATE_DEG, ROTATE_DEG, n))
+    c, s = np.cos(t), np.sin(t)
+    rot = np.zeros((n, 3, 3), dtype=np.float32)
+    rot[:, 0, 0], rot[:, 0, 1], rot[:, 1, 0], rot[:, 1, 1], rot[:, 2, 2] = c, -s, s, c, 1.0
+    p = points - points[:, :1, :]
+    p = np.einsum("nij,nkj->nki", rot, p) * rng.uniform(1 - SCALE, 1 + SCALE, (n, 1, 1))
+    size = np.linalg.norm(p[:, 9, :], axis=-1)[:, None, None]
+    return (p + rng.normal(0, JITTER, p.shape) * size).astype(np.float32)
+
+
+# =========================
+# 학습
+# =========================
+def train_mlp(points, labels, n_classes, hidden, epochs, lr, l2, rng, batch=64):
+    feats = normalize(points)
+    mean = feats.mean(axis=0)
+    std = feats.std(axis=0) + 1e-3
+
+    w1 = (rng.normal(0, np.sqrt(2.0 / FEATURES), (FEATURES, hidden))).astype(np.float32)
+    b1 = np.zeros(hidden, dtype=np.float32)
+    w2 = (rng.normal(0, np.sqrt(1.0 / hidden), (hidden, n_classes))).astype(np.float32)
+    b2 = np.zeros(n_classes, dtype=np.float32)
+    params = [w1, b1, w2, b2]
+    m = [np.zeros_like(p) for p in params]
+    v = [np.zeros_like(p) for p in params]
+
+    # 클래스별 가중치 : 프레임 수가 적은 클래스도 같은 비중으로
+    counts = np.bincount(labels, minlength=n_classes).astype(np.float32)
+    class_w = np.where(counts > 0, counts.sum() / (n_classes * np.maximum(counts, 1)), 0.0).astype(np.float32)
+
+    step = 0
+    for epoch in range(epochs):
+        order = rng.permutation(len(points))
+        total = 0.0
+        for i in range(0, len(order), batch):
+            idx = order[i:i + batch]
+            x = (normalize(augment(points[idx], rng)) - mean) / std
+            y = labels[idx]
+            wy = class_w[y]
+
+            h_pre = x @ w1 + b1
+            h = np.maximum(h_pre, 0.0)
+            z = h @ w2 + b2
+            z = np.exp(z - z.max(axis=1, keepdims=True))
+            prob = z / z.sum(axis=1, keepdims=True)
+            total += float(-(wy * np.log(prob[np.arange(len(y)), y] + 1e-9)).sum())
+
+            # 역전파 (가중 cross entropy + L2)
+            dz = prob
+            dz[np.arange(len(y)), y] -= 1.0
+            dz *= (wy / wy.sum())[:, None]
+            dh = (dz @ w2.T) * (h_pre > 0)
+            grads = [x.T @ dh + l2 * w1, dh.sum(axis=0), h.T @ dz + l2 * w2, dz.sum(axis=0)]
+
+            # Adam
+            step += 1
+            for p, g, mi, vi in zip(params, grads, m, v):
+                mi *= 0.9
+                mi += 0.1 * g
+                vi *= 0.999
+                vi += 0.001 * g * g
+                p -= lr * (mi / (1 - 0.9 ** step)) / (np.sqrt(vi / (1 - 0.999 ** step)) + 1e-8)
+
+        if (epoch + 1) % max(1, epochs // 5) == 0:
+            print(f"  epoch {epoch + 1}/{epochs} loss {total / len(points):.4f}")
+
+    return {"mean": mean, "std": std, "w1": w1, "b1": b1, "w2": w2, "b2": b2}
+
+def train_knn(points, labels, k):
+    return {"feats": normalize(points), "labels": labels, "k": np.int64(k)}
+
+
+# =========================
+# 평가
+# =========================
+def evaluate(model, points, labels, names):
+    pred, _ = model.predict_batch(points)
+    acc = float(np.mean(pred == labels))
+    n = len(names)
+    confusion = np.zeros((n, n), dtype=int)
+    np.add.at(confusion, (labels, pred), 1)
+    width = max(len(s) for s in names)
+    print(f"  {'':<{width}} " + " ".join(f"{i:>4}" for i in range(n)) + "   acc")
+    for i, name in enumerate(names):
+        row = confusion[i]
+        print(f"  {name:<{width}} " + " ".join(f"{c:4d}" for c in row) +
+              (f"  {row[i] / row.sum():.3f}" if row.sum() else "     -"))
+    return acc
+
+def time_inference(model, points, repeat=200):
+    one = points[0]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.predict(one)
+    single = (time.perf_counter() - start) / repeat * 1e6
+    batch = points[:256]
+    start = time.perf_counter()
+    for _ in range(20):
+        model.predict_batch(batch)
+    per_hand = (time.perf_counter() - start) / 20 / len(batch) * 1e6
+    return single, per_hand
+
+
+def main():
+    parser = argparse.ArgumentParser(description="제스처 분류 모델 학습 (MLP / k-NN)")
+    parser.add_argument("recordings", nargs="+", help="record_landmarks.py 녹화 파일(npz) / 폴더")
+    parser.add_argument("--kind", default="mlp", choices=("mlp", "knn"))
+    parser.add_argument("--hidden", type=int, default=32, help="mlp 은닉층 크기")
+    parser.add_argument("--epochs", type=int, default=60)
+    parser.add_argument("--lr", type=float, default=3e-3)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--k", type=int, default=5, help="knn 이웃 수")
+    parser.add_argument("--val", type=float, default=0.2, help="검증용 시퀀스 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="gesture_model.npz")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    points, labels, groups, names = load_recordings(args.recordings)
+    train, val = split_by_sequence(labels, groups, args.val, rng)
+    print(f"classes {len(names)} : {', '.join(names)}")
+    print(f"frames train {train.sum()} / val {val.sum()} (sequences {len(np.unique(groups))})")
+
+    start = time.time()
+    if args.kind == "mlp":
+        params = train_mlp(points[train], labels[train], len(names), args.hidden,
+                           args.epochs, args.lr, args.l2, rng)
+    else:
+        params = train_knn(points[train], labels[train], args.k)
+    print(f"trained {args.kind} in {time.time() - start:.1f}s")
+
+    model = GestureModel(args.kind, names, params)
+    model.save(args.out)
+    model = GestureModel.load(args.out)  # 저장한 파일 그대로 평가 / 시간 측정
+
+    print("train:")
+    train_acc = evaluate(model, points[train], labels[train], names)
+    if val.any():
+        print("val:")
+        val_acc = evaluate(model, points[val], labels[val], names)
+    else:
+        val_acc = float("nan")
+    single, per_hand = time_inference(model, points)
+    print(f"accuracy train {train_acc:.3f} / val {val_acc:.3f}")
+    print(f"inference : 1 hand {single:.1f} µs | batch {per_hand:.2f} µs/hand | "
+          f"model {os.path.getsize(args.out) / 1024:.1f} KB -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
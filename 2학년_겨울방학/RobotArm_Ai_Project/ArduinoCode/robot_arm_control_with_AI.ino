@@ -6,6 +6,19 @@
 - 숫자(0~9)에 대응하는 포즈 테이블을 미리 정의해두고, 입력된 숫자에 따라 로봇팔을 해당 위치로 이동시킴
 - 각도 제한을 두어 서보모터가 물리적으로 무리하지 않도록 보호
 - 이동 시 부드럽게 각도를 변화시켜 자연스러운 동작을 구현
+- 이동은 loop()를 멈추지 않음 : 받은 숫자는 이동 큐(MOVE_QUEUE개)에 넣고, updateMotion()이 millis()로
+  10ms마다 1도씩 움직임 → 팔이 움직이는 동안에도 다음 명령을 받고 바로 ACK 가능
+  (ACK = 이동 큐에 넣었음, 이동이 끝났다는 뜻은 아님)
+- PC(serial_channel.py)와 "<seq>:<명령>" 한 줄 단위로 통신하고, 큐에 넣자마자 "ACK <seq>"로 응답
+  (같은 seq가 다시 오면 ACK만 다시 보내고 이동하지 않음 → 재전송되어도 두 번 움직이지 않음)
+  큐에 자리가 없으면 "BUSY <seq>" (PC는 잠시 뒤 같은 seq로 다시 보냄)
+- ":"가 없는 입력은 예전처럼 숫자 문자만 읽어서 이동 (serial_test.py 이전 방식 / 시리얼 모니터 입력)
+- 0xA5로 시작하는 입력은 바이너리 프레임 (arm_protocol.py)
+  [0xA5][LEN][SEQ][CMD][DATA][CRC8] → CRC가 맞으면 이동 큐에 넣고 ACK 프레임으로 응답 (큐가 차면 상태 BUSY)
+  DIGITS(숫자들) / BATCH(여러 명령) / BAUD(통신 속도 변경) / PING
+- PING : ACK 후 lastFrameSeq를 지움 (PC가 연결할 때마다 첫 명령 전에 보냄,
+  프레임 번호가 1바이트라서 PC 프로그램만 다시 켜면 첫 명령 번호가 이전 번호와 겹칠 수 있음)
+- BAUD : ACK를 보낸 뒤 새 속도로 바꾸고, 1초 안에 올바른 프레임이 오지 않으면 9600으로 복귀
 */
 
 #include <Servo.h>
@@ -54,36 +67,230 @@ int clampAngle(int idx, int ang) {
   return ang;
 }
 
-// ===== 부드럽게 이동 =====
-// 현재 위치에서 목표 위치까지 1도씩 이동하며 자연스럽게 움직임
-void servoMove(int num, int target) {
-  target = clampAngle(num, target); // 안전 범위 제한 적용
+// ===== 이동 큐 =====
+// 받은 숫자를 순서대로 보관 (loop가 이동 때문에 멈추지 않도록)
+#define MOVE_QUEUE 32
+uint8_t moveQueue[MOVE_QUEUE];
+int queueHead = 0;
+int queueCount = 0;
 
-  // 현재 각도가 목표보다 크면 감소 방향으로 이동
-  if (preVal[num] > target) {
-    for (int a = preVal[num]; a > target; a--) {
-      servo[num].write(a);
-      delay(10);
+// n개가 모두 들어갈 자리가 있을 때만 넣음 (명령 일부만 실행되지 않도록)
+bool queueDigits(const uint8_t *d, int n) {
+  if (queueCount + n > MOVE_QUEUE) return false;
+  for (int i = 0; i < n; i++) {
+    moveQueue[(queueHead + queueCount) % MOVE_QUEUE] = d[i];
+    queueCount++;
+  }
+  return true;
+}
+
+// ===== 부드럽게 이동 (멈추지 않는 방식) =====
+// loop()마다 호출 : 10ms마다 현재 관절을 1도씩 목표로 이동, 관절 사이 20ms 간격
+// bottom → arm1 → arm2 순서 (grip은 고정)
+int curDigit = -1;            // 이동 중인 숫자 (-1 : 없음)
+int curJoint = 0;             // 이동 중인 관절 (0~2)
+unsigned long nextStepMs = 0; // 다음 1도 이동 시각
+
+void updateMotion() {
+  if ((long)(millis() - nextStepMs) < 0) return;
+
+  if (curDigit < 0) {
+    if (queueCount == 0) return;
+    curDigit = moveQueue[queueHead];
+    queueHead = (queueHead + 1) % MOVE_QUEUE;
+    queueCount--;
+    curJoint = 0;
+    Serial.print("Move to digit: ");
+    Serial.println(curDigit);
+  }
+
+  int target = clampAngle(curJoint, pose[curDigit][curJoint]); // 안전 범위 제한 적용
+  if (preVal[curJoint] != target) {
+    preVal[curJoint] += (preVal[curJoint] < target) ? 1 : -1;
+    servo[curJoint].write(preVal[curJoint]);
+    nextStepMs = millis() + 10;
+    return;
+  }
+
+  // 현재 관절 도착 → 다음 관절 (관절 간 이동 간격)
+  curJoint++;
+  nextStepMs = millis() + 20;
+  if (curJoint >= 3) curDigit = -1;
+}
+
+bool moving() {
+  return curDigit >= 0 || queueCount > 0;
+}
+
+// ===== 명령 수신 =====
+char line[24];        // 한 줄 버퍼 ("<seq>:<명령>")
+int lineLen = 0;
+long lastSeq = -1;    // 마지막으로 실행한 명령 번호 (재전송 중복 방지)
+
+// 숫자 문자들을 왼쪽부터 순서대로 이동 큐에 넣음 ("371" → 3 → 7 → 1), 자리가 없으면 false
+bool runDigits(const char *p) {
+  uint8_t d[sizeof(line)];
+  int n = 0;
+  for (; *p; p++) {
+    if (*p >= '0' && *p <= '9') {
+      d[n++] = *p - '0'; // 문자에서 정수로 변환
     }
-  } 
-  // 현재 각도가 목표보다 작으면 증가 방향으로 이동
-  else if (preVal[num] < target) {
-    for (int a = preVal[num]; a < target; a++) {
-      servo[num].write(a);
-      delay(10);
+  }
+  return queueDigits(d, n);
+}
+
+void handleLine() {
+  line[lineLen] = '\0';
+  char *colon = strchr(line, ':');
+  if (colon == NULL) {
+    if (!runDigits(line)) Serial.println("Busy"); // 번호 없는 예전 방식
+    return;
+  }
+
+  *colon = '\0';
+  long seq = atol(line);
+  if (seq != lastSeq) {
+    if (!runDigits(colon + 1)) {
+      // 이동 큐가 가득 참 : ACK 대신 BUSY (PC가 잠시 뒤 같은 seq로 다시 보냄)
+      Serial.print("BUSY ");
+      Serial.println(seq);
+      return;
     }
+    lastSeq = seq;
+  }
+  // 큐에 넣자마자 ACK (재전송된 명령이면 이미 넣었으므로 ACK만)
+  Serial.print("ACK ");
+  Serial.println(seq);
+}
+
+// ===== 바이너리 프레임 (arm_protocol.py와 같은 값) =====
+#define FRAME_START 0xA5
+#define MAX_BODY    32
+#define CMD_DIGITS  0x01
+#define CMD_BATCH   0x02
+#define CMD_BAUD    0x03
+#define CMD_PING    0x04
+#define CMD_ACK     0x80
+#define STATUS_OK   0
+#define STATUS_BAD  1
+#define STATUS_BUSY 2
+
+const long BOOT_BAUD = 9600;
+const unsigned long BAUD_FALLBACK_MS = 1000;
+
+uint8_t frame[MAX_BODY + 2];  // LEN + (SEQ, CMD, DATA) + CRC
+int frameLen = -1;            // -1 : 프레임 수신 중 아님, 0 이상 : 모은 바이트 수
+int lastFrameSeq = -1;        // 마지막으로 실행한 프레임 번호 (재전송 중복 방지)
+unsigned long baudDeadline = 0;  // 속도 변경 후 확인을 기다리는 시각 (0 : 없음)
+
+// CRC-8 (다항식 0x07, 초기값 0)
+uint8_t crc8(const uint8_t *data, int n) {
+  uint8_t crc = 0;
+  for (int i = 0; i < n; i++) {
+    crc ^= data[i];
+    for (int b = 0; b < 8; b++) {
+      crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0x07) : (uint8_t)(crc << 1);
+    }
+  }
+  return crc;
+}
+
+void sendAck(uint8_t seq, uint8_t status) {
+  uint8_t out[7] = {FRAME_START, 4, 0, CMD_ACK, seq, status, 0};
+  out[6] = crc8(out + 1, 5);
+  Serial.write(out, 7);
+}
+
+bool validBaud(long baud) {
+  return baud == 9600 || baud == 19200 || baud == 38400 || baud == 57600 || baud == 115200;
+}
+
+// DIGITS / BATCH 데이터의 숫자 개수 (validCommands로 확인한 뒤 사용)
+int countDigits(uint8_t cmd, const uint8_t *data, int n) {
+  if (cmd == CMD_DIGITS) return n;
+  int count = 0;
+  for (int i = 0; i < n; i += 2 + data[i + 1]) count += data[i + 1];
+  return count;
+}
+
+// 실행 전에 BATCH / DIGITS 형식 확인 (잘못된 프레임은 일부만 실행하지 않도록)
+bool validCommands(uint8_t cmd, const uint8_t *data, int n) {
+  if (cmd == CMD_DIGITS) {
+    for (int i = 0; i < n; i++) if (data[i] > 9) return false;
+    return true;
+  }
+  if (cmd != CMD_BATCH) return false;
+  int i = 0;
+  while (i < n) {
+    if (i + 2 > n || i + 2 + data[i + 1] > n) return false;
+    if (!validCommands(data[i], data + i + 2, data[i + 1]) || data[i] == CMD_BATCH) return false;
+    i += 2 + data[i + 1];
   }
-  preVal[num] = target; // 최종 위치 갱신
+  return true;
 }
 
-// ===== 숫자에 해당하는 위치로 이동 =====
-void moveToDigit(int d) {
-  if (d < 0 || d > 9) return; // 유효 범위 체크
+void handleFrame() {
+  int n = frame[0];
+  uint8_t seq = frame[1];
+  uint8_t cmd = frame[2];
+  const uint8_t *data = frame + 3;
+  int dataLen = n - 2;
+  baudDeadline = 0; // 새 속도에서 올바른 프레임을 받음
 
-  // bottom, arm1, arm2만 이동 (grip은 고정)
-  for (int j = 0; j < 3; j++) {
-    servoMove(j, pose[d][j]);
-    delay(20); // 관절 간 이동 간격
+  if (cmd == CMD_BAUD) {
+    long baud = dataLen == 4 ? (long)data[0] | ((long)data[1] << 8) | ((long)data[2] << 16) | ((long)data[3] << 24) : 0;
+    bool ok = validBaud(baud);
+    sendAck(seq, ok ? STATUS_OK : STATUS_BAD);
+    if (ok) {
+      Serial.flush(); // ACK를 모두 보낸 뒤 속도 변경
+      Serial.end();
+      Serial.begin(baud);
+      baudDeadline = millis() + BAUD_FALLBACK_MS;
+    }
+    return;
+  }
+  if (cmd == CMD_PING) {
+    lastFrameSeq = -1; // 새 연결 : 이전 연결의 마지막 번호와 같은 번호가 와도 실행
+    sendAck(seq, STATUS_OK);
+    return;
+  }
+
+  if (!validCommands(cmd, data, dataLen)) {
+    sendAck(seq, STATUS_BAD);
+    return;
+  }
+  if (seq == lastFrameSeq) { // 재전송된 프레임 : 이미 큐에 넣음
+    sendAck(seq, STATUS_OK);
+    return;
+  }
+  if (queueCount + countDigits(cmd, data, dataLen) > MOVE_QUEUE) {
+    sendAck(seq, STATUS_BUSY); // 이동 큐가 가득 참 : PC가 잠시 뒤 다시 보냄
+    return;
+  }
+  lastFrameSeq = seq;
+
+  if (cmd == CMD_DIGITS) {
+    queueDigits(data, dataLen);
+  } else {
+    for (int i = 0; i < dataLen; i += 2 + data[i + 1]) {
+      queueDigits(data + i + 2, data[i + 1]);
+    }
+  }
+  sendAck(seq, STATUS_OK); // 큐에 넣자마자 ACK
+}
+
+// 프레임 바이트 1개 처리 : LEN → 나머지 → CRC 확인
+void feedFrame(uint8_t b) {
+  frame[frameLen++] = b;
+  if (frameLen == 1 && (b < 2 || b > MAX_BODY)) {
+    frameLen = -1; // 잘못된 길이 : 버리고 다음 시작 바이트를 기다림
+    return;
+  }
+  if (frameLen > 1 && frameLen == frame[0] + 2) {
+    if (crc8(frame, frame[0] + 1) == frame[frameLen - 1]) {
+      handleFrame();
+    }
+    frameLen = -1;
   }
 }
 
@@ -97,23 +304,39 @@ void setup() {
     servo[i].write(preVal[i]);  // 초기 위치 이동
   }
 
-  // 시작은 HOME 포즈
-  moveToDigit(0);
+  // 시작은 HOME 포즈 (Ready 전에 도착할 때까지 이동)
+  uint8_t home = 0;
+  queueDigits(&home, 1);
+  while (moving()) updateMotion();
   Serial.println("Ready. Send digit 0~9.");
 }
 
 // ===== loop =====
 void loop() {
-  // 시리얼 입력이 있을 때
-  if (Serial.available()) {
-    char c = Serial.read(); // 입력 문자 읽기
-    
-    // 숫자 문자 입력일 경우
-    if (c >= '0' && c <= '9') {
-      int d = c - '0'; // 문자에서 정수로 변환
-      Serial.print("Move to digit: ");
-      Serial.println(d);
-      moveToDigit(d); // 해당 숫자 포즈로 이동
+  // 이동 큐 처리 (10ms마다 1도, 기다리지 않고 바로 반환)
+  updateMotion();
+
+  // 속도 변경 후 확인 프레임이 오지 않으면 원래 속도로 복귀
+  if (baudDeadline != 0 && (long)(millis() - baudDeadline) > 0) {
+    Serial.end();
+    Serial.begin(BOOT_BAUD);
+    baudDeadline = 0;
+  }
+
+  // 시리얼 입력이 있을 때 : 바이너리 프레임 / 텍스트 줄 구분해서 처리
+  while (Serial.available()) {
+    int b = Serial.read(); // 입력 바이트 읽기
+    char c = (char)b;
+
+    if (frameLen >= 0) {
+      feedFrame((uint8_t)b);
+    } else if (b == FRAME_START && lineLen == 0) {
+      frameLen = 0; // 바이너리 프레임 시작
+    } else if (c == '\n') {
+      handleLine();
+      lineLen = 0;
+    } else if (c != '\r' && lineLen < (int)sizeof(line) - 1) {
+      line[lineLen++] = c;
     }
   }
 }
\ No newline at end of file
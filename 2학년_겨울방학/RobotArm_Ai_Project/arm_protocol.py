@@ -0,0 +1,165 @@
+'''
+arm_protocol의 Docstring
+
+로봇팔 명령용 바이너리 프레임 (시작 바이트 + 길이 + 번호 + 명령 + 데이터 + CRC8)
+
+이 코드의 목적:
+- 텍스트 방식 "12:371\\n"은 읽기 쉽지만, 줄이 깨지거나 잡음이 섞여도 알아낼 방법이 없고
+  명령 1개마다 ACK를 기다려야 함
+- 바이너리 프레임은 CRC8로 깨진 프레임을 버리고, 시작 바이트로 다시 동기를 맞춤
+- BATCH 명령 : 큐에 쌓인 여러 명령을 프레임 1개로 보내고 ACK도 1번만 받음
+- BAUD 명령 : 9600으로 연결한 뒤 더 빠른 속도로 바꾸자고 요청 (serial_channel에서 협상)
+
+프레임 구조 (바이트):
+    [0xA5][LEN][SEQ][CMD][DATA ... (LEN-2 바이트)][CRC8]
+    - LEN  : SEQ + CMD + DATA 바이트 수 (2 ~ MAX_BODY)
+    - SEQ  : 명령 번호 0~255 (재전송된 프레임은 같은 번호 → 아두이노가 두 번 실행하지 않음)
+    - CRC8 : LEN부터 DATA 끝까지의 CRC-8 (다항식 0x07, 초기값 0)
+
+명령 (CMD):
+    DIGITS 0x01 : DATA = 숫자들 (예: [3, 7, 1] → 3 → 7 → 1 순서로 이동)
+    BATCH  0x02 : DATA = (CMD, 길이, DATA) 반복 (여러 명령을 순서대로 실행)
+    BAUD   0x03 : DATA = 새 통신 속도 (uint32 little endian)
+    PING   0x04 : DATA 없음 (왕복 시간 측정 / 새 속도 확인)
+                  아두이노는 마지막으로 실행한 SEQ를 지움 → PC는 연결할 때마다 첫 명령 전에 보냄
+                  (SEQ가 1바이트라서 프로그램만 다시 켜면 이전 번호와 겹칠 수 있음)
+    ACK    0x80 : 아두이노 → PC, DATA = [받은 SEQ, 상태(0 = OK, 1 = 잘못된 명령, 2 = 이동 큐가 가득 참)]
+                  OK는 이동 큐에 넣었다는 뜻 (이동은 아두이노가 loop()를 멈추지 않고 이어서 진행)
+
+아두이노 쪽 구현 : ArduinoCode/robot_arm_control_with_AI.ino (텍스트 방식과 함께 사용 가능)
+'''
+
+import struct
+
+START = 0xA5
+MAX_BODY = 32          # SEQ + CMD + DATA 최대 바이트 (아두이노 버퍼 크기와 같게)
+
+CMD_DIGITS = 0x01
+CMD_BATCH = 0x02
+CMD_BAUD = 0x03
+CMD_PING = 0x04
+CMD_ACK = 0x80
+
+STATUS_OK = 0
+STATUS_BAD = 1         # 알 수 없는 명령 / 잘못된 데이터
+STATUS_BUSY = 2        # 이동 큐가 가득 참 (PC가 잠시 뒤 같은 번호로 다시 보냄)
+
+BAUD_RATES = (9600, 19200, 38400, 57600, 115200)
+
+
+def _crc8_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+CRC8_TABLE = _crc8_table()
+
+def crc8(data, crc=0):
+    for b in data:
+        crc = CRC8_TABLE[crc ^ b]
+    return crc
+
+
+# =========================
+# 만들기 (PC → 아두이노)
+# =========================
+def encode(seq, cmd, data=b""):
+    body = bytes((seq & 0xFF, cmd)) + bytes(data)
+    if len(body) > MAX_BODY:
+        raise ValueError(f"프레임이 너무 깁니다: {len(body)} > {MAX_BODY} 바이트")
+    head = bytes((len(body),)) + body
+    return bytes((START,)) + head + bytes((crc8(head),))
+
+def digits_data(command):
+    # "371" → b"\x03\x07\x01" (숫자가 아닌 문자는 무시)
+    return bytes(int(c) for c in str(command) if c.isdigit())
+
+def encode_commands(seq, commands):
+    '''
+    명령 문자열 목록 → 프레임 1개
+    - 1개면 DIGITS, 여러 개면 BATCH (아두이노는 BATCH 안의 명령을 순서대로 실행)
+    '''
+    if len(commands) == 1:
+        return encode(seq, CMD_DIGITS, digits_data(commands[0]))
+    data = b"".join(bytes((CMD_DIGITS, len(d))) + d for d in map(digits_data, commands))
+    return encode(seq, CMD_BATCH, data)
+
+def batch_fits(commands):
+    # 이 명령들을 BATCH 프레임 1개에 담을 수 있는지
+    size = 2 + sum(2 + len(digits_data(c)) for c in commands) if len(commands) > 1 \
+        else 2 + len(digits_data(commands[0]))
+    return size <= MAX_BODY
+
+def encode_baud(seq, baud):
+    return encode(seq, CMD_BAUD, struct.pack("<I", baud))
+
+def encode_ack(seq, status=STATUS_OK):
+    return encode(0, CMD_ACK, bytes((seq & 0xFF, status)))
+
+
+# =========================
+# 읽기 (바이트 흐름 → 프레임)
+# =========================
+class FrameDecoder:
+    '''
+    시리얼에서 읽은 바이트를 조금씩 넣으면 완성된 프레임 (seq, cmd, data) 목록을 돌려줌
+    - 시작 바이트가 아닌 바이트(아두이노의 텍스트 로그 등)는 건너뜀
+    - 길이가 이상하거나 CRC가 틀리면 그 시작 바이트만 버리고 다음 0xA5부터 다시 찾음
+    '''
+
+    def __init__(self):
+        self._buf = bytearray()
+        self.frames = 0
+        self.crc_errors = 0
+        self.skipped = 0       # 프레임이 아닌 바이트 수
+
+    def feed(self, data):
+        self._buf += data
+        out = []
+        buf = self._buf
+        while True:
+            i = buf.find(START)
+            if i < 0:
+                self.skipped += len(buf)
+                buf.clear()
+                break
+            if i:
+                self.skipped += i
+                del buf[:i]
+            if len(buf) < 2:
+                break
+            n = buf[1]
+            if n < 2 or n > MAX_BODY:
+                del buf[:1]
+                self.crc_errors += 1
+                continue
+            if len(buf) < n + 3:
+                break
+            if crc8(buf[1:n + 2]) != buf[n + 2]:
+                del buf[:1]
+                self.crc_errors += 1
+                continue
+            out.append((buf[2], buf[3], bytes(buf[4:n + 2])))
+            self.frames += 1
+            del buf[:n + 3]
+        return out
+
+
+def parse_batch(data):
+    # BATCH DATA → [(cmd, data), ...] (형식이 잘못되면 ValueError)
+    items, i = [], 0
+    while i < len(data):
+        if i + 2 > len(data) or i + 2 + data[i + 1] > len(data):
+            raise ValueError("잘못된 BATCH 데이터")
+        items.append((data[i], data[i + 2:i + 2 + data[i + 1]]))
+        i += 2 + data[i + 1]
+    return items
+
+
+def wire_ms(nbytes, baud):
+    # nbytes를 보내는 데 걸리는 시간(ms) : 1바이트 = 10비트 (start + 8 data + stop)
+    return nbytes * 10.0 / baud * 1000.0
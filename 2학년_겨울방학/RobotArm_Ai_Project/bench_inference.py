@@ -0,0 +1,67 @@
+'''
+bench_inference의 Docstring
+
+추론 백엔드 마이크로 벤치마크
+
+이 코드의 목적:
+- inference_engine의 백엔드(keras / tf_function / tflite / numpy)를 같은 입력으로 실행해서
+  1회 호출당 지연 시간(평균, p50, p95)을 비교
+- 모든 백엔드의 출력이 Keras 결과와 같은지(최대 오차)도 함께 출력
+- 실시간 인식(digit_predict_live_stable.py)은 매 프레임 1장씩 예측하므로 batch=1이 기본값
+
+사용 예:
+    python bench_inference.py
+    python bench_inference.py --model mnist_cnn.h5 --runs 500 --batch 1 4 16
+'''
+
+import argparse
+import time
+
+import numpy as np
+
+from inference_engine import BACKENDS, create_backend, load_keras_model
+
+
+def measure(backend, x, runs, warmup=10):
+    # 호출마다 걸린 시간(ms) 목록
+    for _ in range(warmup):
+        backend.predict(x)
+    times = np.empty(runs)
+    for i in range(runs):
+        start = time.perf_counter()
+        backend.predict(x)
+        times[i] = (time.perf_counter() - start) * 1000.0
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MNIST CNN 추론 백엔드 지연 시간 비교")
+    parser.add_argument("--model", default="mnist_cnn.h5", help="Keras 모델 경로")
+    parser.add_argument("--runs", type=int, default=200, help="백엔드별 측정 횟수")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1], help="측정할 배치 크기들")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), help="측정할 백엔드")
+    args = parser.parse_args()
+
+    model = load_keras_model(args.model)
+    rng = np.random.default_rng(0)
+
+    print(f"{'backend':<12} {'batch':>5} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max err':>9}")
+    for batch in args.batch:
+        x = rng.random((batch, 28, 28, 1), dtype=np.float32)
+        reference = model(x, training=False).numpy()
+
+        for name in args.backends:
+            try:
+                backend = create_backend(name, model=model)
+            except Exception as e:
+                print(f"{name:<12} {batch:>5}   사용 불가 ({e})")
+                continue
+
+            err = float(np.max(np.abs(backend.predict(x) - reference)))
+            times = measure(backend, x, args.runs)
+            print(f"{name:<12} {batch:>5} {times.mean():9.3f} {np.percentile(times, 50):9.3f} "
+                  f"{np.percentile(times, 95):9.3f} {err:9.1e}")
+
+
+if __name__ == "__main__":
+    main()
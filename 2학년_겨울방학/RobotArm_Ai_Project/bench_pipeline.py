@@ -0,0 +1,215 @@
+'''
+bench_pipeline의 Docstring
+
+숫자 인식 파이프라인 단계별 처리량 벤치마크 (웹캠 / 창 없이 실행)
+
+이 코드의 목적:
+- digit_predict_live_stable.py의 각 단계가 초당 몇 프레임을 처리할 수 있는지 측정
+  1. preprocess : Grayscale → Blur → Otsu → Close → Dilate
+  2. contour    : findContours + 숫자 박스 선택
+  3. roi        : ROI → 28x28 정규화 (RoiNormalizer)
+  4. predict    : CNN 추론 (inference_engine)
+  5. stability  : 안정성 판단 (--decider : gate / ewma / bayes, digit_stability)
+  6. total      : 1~5 합계 (프레임 1장 전체)
+  (--track : 1~2 대신 detect = ROI 추적(digit_tracker), 전체 탐색 / 추적 비율도 출력)
+  (--cache : predict에 예측 캐시(prediction_cache) 적용, 적중률 / 절약 시간도 출력)
+  (--decider : 확정 판단기 선택, 결정 지연(후보 시작 → 확정) p50 / max와 잘못된 확정 수도 출력)
+- 입력 프레임은 측정 전에 모두 메모리에 읽어두므로, 파일 디코딩 시간은 포함되지 않음
+- 합성 입력(synthetic)은 정답(label)을 알고 있으므로 인식 정확도와 확정 결과도 함께 출력
+- 결과를 JSON으로 저장하고(--out), 다른 커밋의 결과와 비교(--compare)
+- --decider-cases : 모델 / 영상 없이, 미리 정한 확률 흐름(깨끗한 입력 / 낮은 conf / 낮은 margin /
+  두 숫자가 번갈아 보이는 입력 / 가끔 틀리는 입력)을 모든 판단기에 넣어 전송 수와 잘못된 전송 수를 비교
+  (합성 숫자 화면은 거의 항상 깨끗하므로 CONF_TH / MARGIN_TH가 거부해야 하는 입력은 여기서 확인)
+
+사용 예:
+    python bench_pipeline.py
+    python bench_pipeline.py recorded.mp4 --frames 500 --out bench_now.json
+    python bench_pipeline.py --multi --compare bench_base.json
+    python bench_pipeline.py --track --compare bench_base.json
+    python bench_pipeline.py --decider bayes
+    python bench_pipeline.py --decider-cases
+'''
+
+import argparse
+import statistics
+
+from bench_stats import StageTimer, compare, print_table, save_json
+from digit_preprocess import RoiNormalizer, binarize, find_digit_boxes, top2_margin
+from digit_stability import DECIDERS, make_decider
+from digit_tracker import RoiTracker
+from prediction_cache import CachedEngine
+from frame_source import open_source
+from inference_engine import load_engine
+
+import numpy as np
+
+FRAME_DT = 1.0 / 30.0   # 안정성 판단에 쓰는 가상 프레임 간격 (30 FPS 카메라 가정)
+CASE_SEC = 6.0          # --decider-cases : 경우마다 입력 길이(초)
+
+
+def _frame_probs(top, conf, second=None, second_conf=0.0):
+    # 숫자 1개짜리 (1,10) 확률 : top에 conf, second에 second_conf, 나머지는 고르게
+    p = np.zeros((1, 10))
+    p[0, top] = conf
+    if second is not None:
+        p[0, second] = second_conf
+    rest = [d for d in range(10) if d not in (top, second)]
+    p[0, rest] = (1.0 - p.sum()) / len(rest)
+    return p
+
+# 이름 → (i번째 프레임의 확률을 만드는 함수(rng, i), 정답 : 이 문자열 외의 전송은 잘못된 전송, None이면 모든 전송이 잘못)
+DECIDER_CASES = {
+    "clean":       (lambda rng, i: _frame_probs(3, 0.97, 8, 0.01), "3"),
+    "low_conf":    (lambda rng, i: _frame_probs(3, 0.80, 8, 0.15), None),
+    "low_margin":  (lambda rng, i: _frame_probs(3, 0.55, 8, 0.40), None),
+    "confusable":  (lambda rng, i: _frame_probs(3, 0.90, 8, 0.05) if i % 2 else _frame_probs(8, 0.90, 3, 0.05), None),
+    "flicker":     (lambda rng, i: _frame_probs(8, 0.90, 3, 0.05) if rng.random() < 0.15
+                    else _frame_probs(3, rng.uniform(0.88, 0.99), 8, 0.01), "3"),
+}
+
+
+def run_decider_cases(seed=0):
+    # 모든 판단기 × 모든 경우 → [(경우, 판단기, 전송 목록, 잘못된 전송 수)]
+    rows = []
+    for case, (make_probs, expected) in DECIDER_CASES.items():
+        for decider in DECIDERS:
+            gate = make_decider(decider)
+            rng = np.random.default_rng(seed)
+            sent = []
+            for i in range(int(CASE_SEC / FRAME_DT)):
+                probs = make_probs(rng, i)
+                digits, confs, margins = top2_margin(probs)
+                _, send = gate.update(digits, confs, margins, now=i * FRAME_DT, probs=probs)
+                if send is not None:
+                    sent.append((round(i * FRAME_DT, 2), send))
+            rows.append((case, decider, sent, sum(s != expected for _, s in sent)))
+    return rows
+
+
+def load_frames(spec, count):
+    # 입력에서 count장을 미리 읽어 (프레임, 정답) 목록으로 반환 (정답을 모르면 None)
+    cap = open_source(spec, loop=True)
+    if not cap.isOpened():
+        raise SystemExit(f"입력을 열 수 없습니다: {spec}")
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append((frame, getattr(cap, "label", None)))
+    cap.release()
+    return frames
+
+
+def run(frames, engine, multi, repeat, tracker=None, decider="gate"):
+    timer = StageTimer()
+    normalizer = RoiNormalizer()
+    gate = make_decider(decider)
+    correct = labeled = 0
+    sent = []
+    false_sends = 0
+
+    for r in range(repeat):
+        for i, (frame, label) in enumerate(frames):
+            now = (r * len(frames) + i) * FRAME_DT
+
+            with timer.stage("total"):
+                if tracker is not None:
+                    with timer.stage("detect"):
+                        binary, boxes = tracker.process(frame)
+                else:
+                    with timer.stage("preprocess"):
+                        binary = binarize(frame)
+                    with timer.stage("contour"):
+                        boxes = find_digit_boxes(binary, multi=multi)
+
+                digits, confs, margins, probs = [], [], [], None
+                if boxes:
+                    with timer.stage("roi"):
+                        batch = normalizer.normalize_batch(binary, boxes)
+                    with timer.stage("predict"):
+                        probs = engine.predict(batch)
+                    digits, confs, margins = top2_margin(probs)
+
+                with timer.stage("stability"):
+                    _, send = gate.update(digits, confs, margins, now=now, probs=probs)
+
+            if send is not None:
+                sent.append((round(now, 3), send))
+                # 정답을 아는 입력에서 지금 보이는 숫자와 다른 확정 = 잘못된 전송
+                false_sends += label is not None and send != label
+            if r == 0 and label is not None:
+                labeled += 1
+                correct += "".join(str(int(d)) for d in digits) == label
+
+    # 표에서 total이 마지막에 오도록
+    stages = timer.summary()
+    stages.move_to_end("total")
+    latency = {"decider": gate.name, "false_sends": false_sends,
+               "p50_sec": statistics.median(gate.latencies) if gate.latencies else None,
+               "max_sec": max(gate.latencies) if gate.latencies else None}
+    return stages, (correct / labeled if labeled else None), sent, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="숫자 인식 파이프라인 단계별 벤치마크")
+    parser.add_argument("source", nargs="?", default="synthetic:3,7,1,0",
+                        help="입력: 동영상 파일 / 이미지 폴더 / synthetic[:3,7,371]")
+    parser.add_argument("--frames", type=int, default=600, help="미리 읽을 프레임 수 (합성 입력은 항목당 150장)")
+    parser.add_argument("--repeat", type=int, default=1, help="같은 프레임을 반복 측정할 횟수")
+    parser.add_argument("--multi", action="store_true", help="여러 자리 숫자 모드")
+    parser.add_argument("--track", action="store_true", help="ROI 추적 사용 (digit_tracker)")
+    parser.add_argument("--redetect", type=int, default=15, help="--track 전체 탐색 주기(프레임)")
+    parser.add_argument("--cache", action="store_true", help="예측 캐시 사용 (prediction_cache)")
+    parser.add_argument("--decider", default="gate", choices=DECIDERS, help="확정 판단기 (digit_stability)")
+    parser.add_argument("--model", default="mnist_cnn.h5", help="모델 경로 (.h5 / .tflite / SavedModel 폴더 / .npz)")
+    parser.add_argument("--backend", default="auto", help="auto / tf_function / tflite / numpy / keras")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", default=None, help="비교할 기준 JSON 경로")
+    parser.add_argument("--decider-cases", action="store_true", help="판단기별 잘못된 전송 비교만 실행 (모델 불필요)")
+    args = parser.parse_args()
+
+    if args.decider_cases:
+        rows = run_decider_cases()
+        print(f"{'case':<12} {'decider':<8} {'sends':>6} {'false':>6}  first send")
+        for case, decider, sent, false_sends in rows:
+            first = f"{sent[0][1]} @ {sent[0][0]:.2f}s" if sent else "-"
+            print(f"{case:<12} {decider:<8} {len(sent):6d} {false_sends:6d}  {first}")
+        false_total = sum(r[3] for r in rows)
+        print(f"false sends total: {false_total}")
+        if args.out:
+            save_json(args.out, {}, decider_cases=[{"case": c, "decider": d, "sent": s, "false_sends": f}
+                                                   for c, d, s, f in rows])
+        raise SystemExit(1 if false_total else 0)
+
+    frames = load_frames(args.source, args.frames)
+    engine = load_engine(args.model, backend=args.backend, verbose=False)
+    if args.cache:
+        engine = CachedEngine(engine)
+    print(f"source={args.source} frames={len(frames)} repeat={args.repeat} "
+          f"multi={args.multi} track={args.track} backend={engine.name}")
+
+    tracker = RoiTracker(multi=args.multi, redetect_every=args.redetect) if args.track else None
+    stages, accuracy, sent, latency = run(frames, engine, args.multi, args.repeat, tracker, args.decider)
+    print_table(stages)
+    if tracker is not None:
+        print(f"roi {tracker.summary()}")
+    if args.cache:
+        print(engine.cache.summary())
+    if accuracy is not None:
+        print(f"frame accuracy: {accuracy:.3f}")
+    print(f"confirmed: {sent}")
+    if latency["p50_sec"] is not None:
+        print(f"decision latency ({latency['decider']}): p50 {latency['p50_sec']:.2f}s, "
+              f"max {latency['max_sec']:.2f}s, false sends {latency['false_sends']}")
+
+    if args.out:
+        save_json(args.out, stages, config=vars(args), backend=engine.name,
+                  accuracy=accuracy, confirmed=sent, decision=latency)
+        print(f"saved: {args.out}")
+    if args.compare:
+        compare(stages, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+'''
+bench_roi_normalize의 Docstring
+
+ROI → 28x28 정규화 벤치마크 (기존 함수 vs RoiNormalizer)
+
+이 코드의 목적:
+- 매 프레임 실행되는 ROI 정규화 구간을 따로 떼어서 비교
+  - 기존   : make_square → center_by_mass → copyMakeBorder → resize → / 255.0
+  - 새 방식 : RoiNormalizer (moments + warpAffine 1회 + 버퍼 재사용)
+- 호출 1회당 시간(us), 호출 1회 동안 새로 할당된 임시 메모리(tracemalloc 기준 피크 bytes),
+  두 방식 결과의 최대 차이를 출력
+- 웹캠 없이 실행되도록 ROI는 cv2.putText로 그린 숫자를 이진화해서 만듦
+
+사용 예:
+    python bench_roi_normalize.py
+    python bench_roi_normalize.py --runs 5000 --batch 3
+'''
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from digit_preprocess import RoiNormalizer, roi_to_input
+
+
+def make_rois(count, rng):
+    # 크기와 숫자가 다른 이진 ROI 목록 (숫자 흰색, 배경 검정)
+    rois = []
+    for i in range(count):
+        h = int(rng.integers(60, 220))
+        w = int(h * rng.uniform(0.4, 0.9))
+        roi = np.zeros((h, w), dtype=np.uint8)
+        cv2.putText(roi, str(i % 10), (w // 8, h - h // 8), cv2.FONT_HERSHEY_SIMPLEX,
+                    h / 40.0, 255, max(2, h // 15))
+        rois.append(roi)
+    return rois
+
+
+def time_per_call(fn, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def peak_alloc_per_call(fn, runs=50):
+    # tracemalloc으로 호출 1회 동안의 최대 임시 할당량(bytes) 측정
+    # (NumPy 배열과 OpenCV 결과 배열은 NumPy 할당기를 거치므로 함께 잡힘)
+    fn()  # 처음 한 번은 버퍼 준비 등이 포함되므로 제외
+    tracemalloc.start()
+    peak = 0
+    for _ in range(runs):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, p = tracemalloc.get_traced_memory()
+        peak = max(peak, p - base)
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROI 정규화 시간/할당 비교")
+    parser.add_argument("--runs", type=int, default=2000, help="측정 반복 횟수")
+    parser.add_argument("--batch", type=int, default=1, help="한 번에 정규화할 ROI 개수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rois = make_rois(args.batch, rng)
+
+    # 여러 ROI를 한 프레임에 놓았다고 가정 (가로로 이어 붙이기)
+    height = max(r.shape[0] for r in rois)
+    binary = np.zeros((height, sum(r.shape[1] for r in rois)), dtype=np.uint8)
+    boxes, x = [], 0
+    for r in rois:
+        binary[:r.shape[0], x:x + r.shape[1]] = r
+        boxes.append((x, 0, x + r.shape[1], r.shape[0]))
+        x += r.shape[1]
+
+    normalizer = RoiNormalizer(max_batch=args.batch)
+
+    def legacy():
+        return np.stack([roi_to_input(binary[y0:y1, x0:x1]) for x0, y0, x1, y1 in boxes])
+
+    def fast():
+        return normalizer.normalize_batch(binary, boxes)
+
+    diff = float(np.max(np.abs(legacy() - fast())))
+
+    print(f"batch={args.batch}, runs={args.runs}")
+    print(f"{'method':<14} {'us/call':>10} {'peak alloc bytes':>17}")
+    for name, fn in (("legacy", legacy), ("RoiNormalizer", fast)):
+        us = time_per_call(fn, args.runs)
+        peak = peak_alloc_per_call(fn)
+        print(f"{name:<14} {us:10.1f} {peak:17d}")
+    print(f"max |legacy - fast| = {diff:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+'''
+bench_serial의 Docstring
+
+아두이노 명령 전송 방식별 왕복 시간 / 처리량 벤치마크 (serial_channel + arm_protocol)
+
+이 코드의 목적:
+- text("12:371\\n") / binary(프레임 1개 = 명령 1개) / binary + batch(여러 명령을 프레임 1개로) 비교
+  1. rtt        : 명령 1개를 보내고 ACK를 기다리는 왕복 시간 p50 / p95 (ms)
+  2. throughput : 명령 n개를 한꺼번에 send()했을 때 모두 ACK될 때까지의 초당 명령 수
+  3. bytes/cmd  : 명령 1개당 보낸 바이트 → 9600 / 115200 baud에서의 전송 시간(ms)으로 환산
+- 기본은 가짜 아두이노(fake_arduino, pty)로 측정
+  ※ pty는 baud 설정과 상관없이 바로 전달되므로, 실제 선로 시간은 bytes/cmd 환산값으로 비교
+- --port COM6 / auto 를 주면 실제 보드로 측정 (펌웨어의 이동 시간이 포함됨)
+
+사용 예:
+    python bench_serial.py
+    python bench_serial.py --commands 200 --fast-baud 115200
+    python bench_serial.py --port auto --commands 20
+'''
+
+import argparse
+import time
+
+from arm_protocol import wire_ms
+from serial_channel import SerialChannel
+
+CONFIGS = (
+    ("text", dict(protocol="text")),
+    ("binary", dict(protocol="binary", max_batch=1)),
+    ("binary+batch", dict(protocol="binary")),
+)
+
+
+def measure(port, name, options, commands, fast_baud):
+    if options["protocol"] == "binary" and fast_baud:
+        options = dict(options, fast_baud=fast_baud)
+    channel = SerialChannel(port, max_queue=len(commands) + 1, ready_timeout=1.0, **options)
+    if not channel.connected.wait(5.0):
+        channel.close()
+        raise SystemExit(f"{port}에 연결할 수 없습니다")
+
+    # 1) 왕복 시간 : 1개씩 보내고 기다림
+    for command in commands[:50]:
+        channel.wait(channel.send(command), timeout=5.0)
+    rtt = channel.rtt_ms()
+    bytes_per_cmd = channel.bytes_sent / channel.sent
+
+    # 2) 처리량 : 한꺼번에 넣고 마지막 명령의 ACK까지
+    start = time.perf_counter()
+    seqs = [channel.send(c) for c in commands]
+    ok = channel.wait(seqs[-1], timeout=30.0)
+    elapsed = time.perf_counter() - start
+    frames = channel.sent
+
+    channel.close()
+    return {"name": name, "rtt_p50": rtt[0], "rtt_p95": rtt[1], "bytes_per_cmd": bytes_per_cmd,
+            "cmd_per_sec": len(commands) / elapsed if ok else 0.0, "frames": frames,
+            "failed": channel.failed, "baud": channel.active_baud}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="아두이노 명령 전송 방식별 벤치마크")
+    parser.add_argument("--port", default=None, help="실제 보드 포트 / auto (기본 : 가짜 아두이노)")
+    parser.add_argument("--commands", type=int, default=100, help="처리량 측정 명령 수")
+    parser.add_argument("--fast-baud", type=int, default=None, help="binary 방식에서 협상할 속도")
+    parser.add_argument("--move-sec", type=float, default=0.0, help="가짜 아두이노 숫자 1개 이동 시간(초)")
+    args = parser.parse_args()
+
+    board = None
+    port = args.port
+    if port is None:
+        from fake_arduino import FakeArduino
+        board = FakeArduino(move_sec=args.move_sec)
+        port = board.link
+
+    commands = [str(i % 10) for i in range(args.commands)]
+    results = []
+    try:
+        for name, options in CONFIGS:
+            results.append(measure(port, name, options, commands, args.fast_baud))
+            if board is not None:
+                board.unplug()  # 다음 방식은 리셋된 보드에서 시작 (seq / 속도 초기화)
+                board.plug()
+    finally:
+        if board is not None:
+            board.close()
+
+    print(f"port={args.port or 'fake (pty)'} commands={args.commands}")
+    print(f"{'protocol':<14} {'rtt p50':>8} {'rtt p95':>8} {'cmd/s':>9} {'frames':>7} {'bytes/cmd':>10} "
+          f"{'ms@9600':>8} {'ms@115200':>10} {'baud':>7}")
+    for r in results:
+        print(f"{r['name']:<14} {r['rtt_p50']:8.2f} {r['rtt_p95']:8.2f} {r['cmd_per_sec']:9.1f} {r['frames']:7d} "
+              f"{r['bytes_per_cmd']:10.1f} {wire_ms(r['bytes_per_cmd'], 9600):8.2f} "
+              f"{wire_ms(r['bytes_per_cmd'], 115200):10.3f} {r['baud']:>7}")
+    print("bytes/cmd, ms@baud : 명령 1개(1개씩 보낼 때)의 선로 전송 시간, frames : 재전송 포함 보낸 프레임 수")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+'''
+bench_stats의 Docstring
+
+벤치마크 공통 도구 (단계별 지연 시간 통계 + JSON 저장/비교)
+
+이 코드의 목적:
+- 여러 단계(전처리, 외곽선, ROI, 예측 ...)의 처리 시간을 모아서 p50 / p95 / p99 / 평균 / FPS를 계산
+- 결과를 JSON으로 저장하고, 다른 커밋에서 저장한 JSON과 단계별로 비교
+- JSON에는 커밋 번호, 파이썬 / OpenCV / NumPy 버전, CPU 정보를 함께 기록해서
+  "어느 환경에서 잰 숫자인지" 알 수 있도록 함
+'''
+
+import json
+import platform
+import subprocess
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class StageTimer:
+    '''
+    단계별 처리 시간 기록기
+
+        timer = StageTimer()
+        with timer.stage("preprocess"):
+            ...
+        timer.summary()   # {단계: {count, mean_ms, p50_ms, p95_ms, p99_ms, fps}}
+    '''
+
+    def __init__(self):
+        self.samples = OrderedDict()    # 단계 이름 → 시간 목록(초), 처음 기록된 순서 유지
+
+    def record(self, name, seconds):
+        self.samples.setdefault(name, []).append(seconds)
+
+    def stage(self, name):
+        timer = self
+
+        class _Stage:
+            def __enter__(self):
+                self.start = time.perf_counter()
+                return self
+
+            def __exit__(self, *exc):
+                timer.record(name, time.perf_counter() - self.start)
+                return False
+
+        return _Stage()
+
+    def summary(self):
+        result = OrderedDict()
+        for name, values in self.samples.items():
+            ms = np.asarray(values) * 1000.0
+            mean = float(ms.mean())
+            result[name] = {
+                "count": int(ms.size),
+                "mean_ms": mean,
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "p99_ms": float(np.percentile(ms, 99)),
+                "fps": 1000.0 / mean if mean > 0 else 0.0,
+            }
+        return result
+
+
+def environment():
+    # 측정 환경 정보 (JSON에 함께 저장)
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except Exception:
+        commit = None
+
+    info = {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+    }
+    try:
+        import cv2
+        info["opencv"] = cv2.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def print_table(stages):
+    print(f"{'stage':<14} {'count':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'fps':>9}")
+    for name, s in stages.items():
+        print(f"{name:<14} {s['count']:>6} {s['mean_ms']:9.3f} {s['p50_ms']:9.3f} "
+              f"{s['p95_ms']:9.3f} {s['p99_ms']:9.3f} {s['fps']:9.1f}")
+
+
+def save_json(path, stages, **extra):
+    data = {"env": environment(), "stages": stages}
+    data.update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def compare(stages, baseline_path):
+    # 기준 JSON과 단계별 p50 / p95 비교 (ratio < 1 이면 지금이 더 빠름)
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"compare with {baseline_path} (commit {baseline.get('env', {}).get('commit')})")
+    print(f"{'stage':<14} {'p50 base':>9} {'p50 now':>9} {'ratio':>7} {'p95 base':>9} {'p95 now':>9} {'ratio':>7}")
+    for name, s in stages.items():
+        b = baseline["stages"].get(name)
+        if b is None:
+            print(f"{name:<14} (기준 결과에 없음)")
+            continue
+        r50 = s["p50_ms"] / b["p50_ms"] if b["p50_ms"] > 0 else float("nan")
+        r95 = s["p95_ms"] / b["p95_ms"] if b["p95_ms"] > 0 else float("nan")
+        print(f"{name:<14} {b['p50_ms']:9.3f} {s['p50_ms']:9.3f} {r50:7.2f} "
+              f"{b['p95_ms']:9.3f} {s['p95_ms']:9.3f} {r95:7.2f}")
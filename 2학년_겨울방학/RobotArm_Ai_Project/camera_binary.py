@@ -14,8 +14,9 @@ camera_binary의 Docstring
 '''
 
 import cv2
+from frame_source import open_from_cli
 
-cap = cv2.VideoCapture(0)
+cap, display = open_from_cli(description="웹캠 영상 전처리(이진화)") # 입력(웹캠/영상/합성) + 출력(창/headless)
 
 if not cap.isOpened():
     print("카메라를 열 수 없습니다.")
@@ -50,11 +51,11 @@ while True:
     # Otsu 알고리즘: 영상의 히스토그램을 분석해 최적의 임계값을 자동으로 선택(조명 변화에 대응)
     # → 손글씨 숫자를 더 뚜렷하게 분리
 
-    cv2.imshow("Original", frame)
-    cv2.imshow("Binary", binary)
+    display.show("Original", frame)
+    display.show("Binary", binary)
 
-    if cv2.waitKey(1) & 0xFF == 27:  # ESC
+    if display.poll_key() == 27:  # ESC
         break
 
 cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+display.close()
\ No newline at end of file
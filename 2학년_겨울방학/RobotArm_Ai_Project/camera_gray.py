@@ -13,8 +13,9 @@ camer_gray의 Docstring
 '''
 
 import cv2
+from frame_source import open_from_cli
 
-cap = cv2.VideoCapture(0)
+cap, display = open_from_cli(description="웹캠 컬러/흑백 비교") # 입력(웹캠/영상/합성) + 출력(창/headless)
 
 if not cap.isOpened():
     print("카메라를 열 수 없습니다.")
@@ -31,11 +32,11 @@ while True:
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
     # 원본과 변환된 결과를 동시에 출력하여 비교
-    cv2.imshow("Original", frame)
-    cv2.imshow("Grayscale", gray)
+    display.show("Original", frame)
+    display.show("Grayscale", gray)
 
-    if cv2.waitKey(1) & 0xFF == 27:  # ESC
+    if display.poll_key() == 27:  # ESC
         break
 
 cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+display.close()
\ No newline at end of file
@@ -6,11 +6,12 @@ camera_test의 Docstring
 
 # 0. OpenCV 라이브러리를 불러오기
 import cv2
+from frame_source import open_from_cli # 입력(웹캠/영상/합성) + 출력(창/headless) 선택
 
 # 1. 카메라 열기
-# VideoCapture 객체를 생성
-# 인자 '0'은 기본 웹캠을 의미
-cap = cv2.VideoCapture(0)  
+# VideoCapture와 같은 방식(read/isOpened/release)으로 쓰는 입력 객체를 생성
+# 인자가 없으면 '0' = 기본 웹캠 (예: python camera_test.py video.mp4 --headless)
+cap, display = open_from_cli(description="카메라 테스트")
 
 # 카메라를 열 수 없는 경우
 # cap.isOpened()는 카메라가 정상적으로 열렸는지 확인
@@ -33,14 +34,14 @@ while True:
 
     # 읽어온 프레임을 화면에 출력(frame)
     # 창 제목은 "Camera Test - ESC to exit" 
-    cv2.imshow("Camera Test - ESC to exit", frame)  
+    display.show("Camera Test - ESC to exit", frame)
 
     # 카메라 테스트 종료 : ESC 버튼 누르기
-    # waitKey(1): 키 입력을 1ms 동안 기다림.
+    # poll_key(): 키 입력을 1ms 동안 기다림 (cv2.waitKey(1), headless에서는 바로 반환)
     # => 정리 : 1ms 동안 ESC 입력이 없으면, 다음 루프로 넘어가 새로운 프레임 띄움
-    if cv2.waitKey(1) & 0xFF == 27:  # ESC 키 입력 확인
+    if display.poll_key() == 27:  # ESC 키 입력 확인
         break  
 
 # 3. 카메라와 창 닫기
 cap.release() # 카메라 연결 해제 (독점 해제) 
-cv2.destroyAllWindows() # OpenCV에서 생성한 모든 창을 닫음(리소스 정리)
\ No newline at end of file
+display.close() # OpenCV에서 생성한 모든 창을 닫음(리소스 정리)
\ No newline at end of file
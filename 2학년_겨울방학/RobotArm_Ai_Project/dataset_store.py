@@ -0,0 +1,236 @@
+'''
+dataset_store의 Docstring
+
+28x28 숫자 이미지 데이터셋 저장소 (메모리 매핑 .npy + 라벨 / 메타데이터 인덱스)
+
+이 코드의 목적:
+- mnist_train.py는 실행할 때마다 mnist.npz 압축을 풀어 메모리에 올렸고,
+  실시간 인식 중에 모은 웹캠 ROI는 저장할 곳이 없었음
+- 데이터셋 1개 = 폴더 1개
+    images.npy  : uint8 (capacity, 28, 28)  ← np.load(mmap_mode)로 열어서 복사 없이 사용
+    labels.npy  : int16 (capacity,)          (라벨을 모르면 -1)
+    meta.jsonl  : 샘플 1개당 1줄 메타데이터 (출처, 시각, conf 등)
+    index.json  : count(유효한 샘플 수) / capacity / shape / 생성 정보
+- 추가(append)만 가능 : 새 샘플을 파일 끝에 쓰고 flush 한 뒤 index.json의 count를 마지막에 갱신
+  → 중간에 프로그램이 꺼져도 count 이후의 반쯤 쓴 데이터는 무시됨
+- 공간이 부족하면 capacity를 2배로 늘린 새 파일로 옮김 (자주 일어나지 않도록 미리 크게 잡음)
+- MNIST는 처음 한 번만 변환해서 저장(cache_mnist) → 이후에는 인터넷 / 압축 해제 없이 바로 사용
+
+사용법:
+    train, test = cache_mnist("datasets")            # datasets/mnist_train, datasets/mnist_test
+    x, y = train.images, train.labels                 # memmap view (복사 없음)
+
+    webcam = DatasetStore.open_or_create("datasets/webcam")
+    webcam.append(batch, labels=[3], meta={"source": "live", "conf": 0.97})   # float 0~1도 가능
+
+주의 (Windows):
+- capacity를 늘릴 때 파일을 교체하므로, 그 전에 꺼내 둔 images / labels view는 더 이상 사용하지 말 것
+'''
+
+import json
+import os
+import time
+
+import numpy as np
+
+INDEX = "index.json"
+IMAGES = "images.npy"
+LABELS = "labels.npy"
+META = "meta.jsonl"
+
+SHAPE = (28, 28)
+DEFAULT_CAPACITY = 1024
+
+
+def to_uint8(images: np.ndarray) -> np.ndarray:
+    # float 0~1 (RoiNormalizer / 모델 입력) 또는 uint8 → uint8 (N,28,28)
+    images = np.asarray(images)
+    if images.dtype != np.uint8:
+        images = np.clip(np.rint(images * 255.0), 0, 255).astype(np.uint8)
+    if images.ndim == 4:
+        images = images[..., 0]  # (N,28,28,1) → (N,28,28)
+    if images.ndim == 2:
+        images = images[np.newaxis]
+    return images
+
+
+class DatasetStore:
+    def __init__(self, path, mode="r"):
+        '''
+        - mode="r" : 읽기 전용 (학습)
+        - mode="a" : 추가 가능 (수집)
+        '''
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, INDEX), encoding="utf-8") as f:
+            self.index = json.load(f)
+        self._open_arrays()
+
+    def _open_arrays(self):
+        mmap_mode = "r" if self.mode == "r" else "r+"
+        self._images = np.load(os.path.join(self.path, IMAGES), mmap_mode=mmap_mode)
+        self._labels = np.load(os.path.join(self.path, LABELS), mmap_mode=mmap_mode)
+
+    @classmethod
+    def create(cls, path, capacity=DEFAULT_CAPACITY, shape=SHAPE, **info):
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, INDEX)):
+            raise FileExistsError(f"이미 데이터셋이 있습니다: {path}")
+
+        images = np.lib.format.open_memmap(os.path.join(path, IMAGES), mode="w+",
+                                           dtype=np.uint8, shape=(capacity,) + tuple(shape))
+        labels = np.lib.format.open_memmap(os.path.join(path, LABELS), mode="w+",
+                                           dtype=np.int16, shape=(capacity,))
+        labels[:] = -1
+        del images, labels
+        open(os.path.join(path, META), "w", encoding="utf-8").close()
+
+        index = {"count": 0, "capacity": capacity, "shape": list(shape),
+                 "created": time.strftime("%Y-%m-%d %H:%M:%S"), "info": info}
+        _write_json(os.path.join(path, INDEX), index)
+        return cls(path, mode="a")
+
+    @classmethod
+    def open_or_create(cls, path, capacity=DEFAULT_CAPACITY, **info):
+        if os.path.exists(os.path.join(path, INDEX)):
+            return cls(path, mode="a")
+        return cls.create(path, capacity, **info)
+
+    # =========================
+    # 읽기 (복사 없음)
+    # =========================
+    def __len__(self):
+        return self.index["count"]
+
+    @property
+    def images(self) -> np.ndarray:
+        return self._images[:len(self)]
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self._labels[:len(self)]
+
+    def metadata(self):
+        # 샘플별 메타데이터 목록 (i번째 줄 = i번째 샘플)
+        with open(os.path.join(self.path, META), encoding="utf-8") as f:
+            return [json.loads(line) for _, line in zip(range(len(self)), f)]
+
+    # =========================
+    # 추가 (append only)
+    # =========================
+    def append(self, images, labels=None, meta=None):
+        '''
+        images : (28,28) / (N,28,28) / (N,28,28,1), uint8 또는 float 0~1
+        labels : 숫자 1개 또는 길이 N 목록 (None이면 -1 = 라벨 없음)
+        meta   : 모든 샘플에 공통으로 기록할 dict, 또는 샘플별 dict 목록
+        반환값 : 새로 추가된 샘플의 번호 범위 (range)
+        '''
+        if self.mode == "r":
+            raise PermissionError("읽기 전용으로 연 데이터셋입니다 (mode='a'로 열기)")
+
+        images = to_uint8(images)
+        n = len(images)
+        labels = np.full(n, -1, dtype=np.int16) if labels is None else \
+            np.broadcast_to(np.asarray(labels, dtype=np.int16), (n,))
+        metas = meta if isinstance(meta, (list, tuple)) else [meta or {}] * n
+
+        start = len(self)
+        self._reserve(start + n)
+        self._images[start:start + n] = images
+        self._labels[start:start + n] = labels
+        self._images.flush()
+        self._labels.flush()
+
+        with open(os.path.join(self.path, META), "a", encoding="utf-8") as f:
+            now = round(time.time(), 3)
+            for i, m in enumerate(metas):
+                f.write(json.dumps(dict({"i": start + i, "label": int(labels[i]), "time": now}, **m)) + "\n")
+
+        # count는 데이터를 모두 쓴 뒤 마지막에 갱신 (commit)
+        self.index["count"] = start + n
+        self.index["updated"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        _write_json(os.path.join(self.path, INDEX), self.index)
+        return range(start, start + n)
+
+    def _reserve(self, needed):
+        capacity = self.index["capacity"]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        count = len(self)
+
+        for name, old in ((IMAGES, self._images), (LABELS, self._labels)):
+            tmp = os.path.join(self.path, name + ".tmp")
+            grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=old.dtype,
+                                              shape=(new_capacity,) + old.shape[1:])
+            grown[:count] = old[:count]
+            if name == LABELS:
+                grown[count:] = -1
+            grown.flush()
+            del grown
+
+        # 기존 memmap을 닫아야 파일을 교체할 수 있음 (Windows)
+        self._images = self._labels = None
+        for name in (IMAGES, LABELS):
+            os.replace(os.path.join(self.path, name + ".tmp"), os.path.join(self.path, name))
+
+        self.index["capacity"] = new_capacity
+        _write_json(os.path.join(self.path, INDEX), self.index)
+        self._open_arrays()
+
+    def summary(self):
+        labels = self.labels
+        counts = np.bincount(labels[labels >= 0], minlength=10) if len(labels) else np.zeros(10, int)
+        return f"{self.path}: {len(self)} samples (capacity {self.index['capacity']}), per digit {counts.tolist()}"
+
+
+def _write_json(path, data):
+    # 임시 파일에 쓴 뒤 교체 → 쓰는 도중에 꺼져도 index.json이 깨지지 않음
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# =========================
+# MNIST 캐시
+# =========================
+def cache_mnist(root="datasets", npz_path=None):
+    '''
+    MNIST를 root/mnist_train, root/mnist_test 저장소로 한 번만 변환 → (train, test) 읽기 전용
+    - 이미 있으면 바로 열기 (인터넷 / TensorFlow 불필요)
+    - 없으면 npz_path(mnist.npz) 또는 tf.keras.datasets.mnist.load_data()에서 가져옴
+    '''
+    train_path = os.path.join(root, "mnist_train")
+    test_path = os.path.join(root, "mnist_test")
+    if not (os.path.exists(os.path.join(train_path, INDEX)) and os.path.exists(os.path.join(test_path, INDEX))):
+        if npz_path is not None:
+            with np.load(npz_path) as data:
+                splits = {"train": (data["x_train"], data["y_train"]), "test": (data["x_test"], data["y_test"])}
+        else:
+            import tensorflow as tf
+            (x_train, y_train), (x_test, y_test) = tf.keras.datasets.mnist.load_data()
+            splits = {"train": (x_train, y_train), "test": (x_test, y_test)}
+
+        for split, (x, y) in splits.items():
+            path = os.path.join(root, f"mnist_{split}")
+            if os.path.exists(os.path.join(path, INDEX)):
+                continue
+            store = DatasetStore.create(path, capacity=len(x), source="mnist", split=split)
+            store.append(x, y, meta={"source": "mnist"})
+
+    return DatasetStore(train_path), DatasetStore(test_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="데이터셋 저장소 만들기 / 확인")
+    parser.add_argument("paths", nargs="*", help="확인할 데이터셋 폴더 (없으면 MNIST 캐시)")
+    parser.add_argument("--root", default="datasets")
+    parser.add_argument("--npz", default=None, help="MNIST mnist.npz 경로 (오프라인 변환용)")
+    args = parser.parse_args()
+
+    stores = [DatasetStore(p) for p in args.paths] if args.paths else cache_mnist(args.root, args.npz)
+    for store in stores:
+        print(store.summary())
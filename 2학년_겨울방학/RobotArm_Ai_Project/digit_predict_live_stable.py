@@ -8,212 +8,394 @@ digit_predict_live_stable의 Docstring
 - 인식된 숫자가 일정 시간(3.5초) 동안 안정적으로 유지될 때만 '확정'으로 판단
 - 확정된 숫자를 아두이노로 시리얼 통신을 통해 전송
 - 숫자가 0으로 확정되면 시스템을 중단한다 (STOP_ON_ZERO)
+- MULTI_DIGIT 모드 : 종이에 쓴 "3 7 1"처럼 여러 숫자를 한 번에 읽어서
+  왼쪽부터 순서대로 "371" 명령 문자열로 전송 (모든 ROI를 배치로 묶어 CNN 1회 호출)
+
+[스레드 구조]
+- 캡처 스레드 : cap.read()만 반복, 가장 최신 프레임 1장만 유지 (frame_pipeline.CaptureThread)
+- 추론 스레드 : 전처리 → ROI → CNN 예측(inference_engine) → 3.5초 안정성 판단 → 아두이노 전송
+- 메인 스레드 : 화면 표시 (cv2.imshow / waitKey는 메인 스레드에서 호출해야 안전)
+- 단계 사이는 LatestQueue(최신 값 1개)로 연결되어, 느린 predict가 캡처를 막지 않음
+  (동영상 / 이미지 폴더 / 합성 입력은 --realtime이 아니면 BlockingQueue로 연결해서 모든 프레임을 처리)
+- 화면에 단계별 FPS와 end-to-end 지연(캡처 → 결정)을 표시하고,
+  [SEND] 로그에 "전송 판단에 쓰인 프레임이 몇 ms 전에 찍혔는지"를 함께 출력
+
+[ROI 추적]
+- TRACK_ROI = True : 숫자를 찾은 뒤에는 직전 박스 주변 창만 전처리하고,
+  추적 실패 시 / REDETECT_EVERY 프레임마다 전체 화면을 다시 탐색 (digit_tracker.RoiTracker)
+- 3.5초 동안 숫자가 거의 움직이지 않으므로 대부분의 프레임에서 전처리 면적이 크게 줄어듦
+
+[예측 캐시]
+- PREDICT_CACHE = True : 정규화된 28x28 입력이 직전 입력들과 거의 같으면 CNN을 다시 실행하지 않고
+  저장된 확률을 재사용 (prediction_cache.CachedEngine, 적중률 / 절약 시간은 화면과 종료 로그에 표시)
+
+[데이터 수집]
+- COLLECT_DIR을 지정하면 확정된 프레임의 28x28 입력을 확정 숫자 라벨과 함께 저장 (dataset_store, 추가만 가능)
+  → mnist_train.py --data-root datasets --extra webcam 으로 학습에 사용
+- HARD_EXAMPLE_DIR을 지정하면 숫자는 보이지만 conf / margin 조건을 통과하지 못한 입력을 확률과 함께
+  비동기로 저장하고, 곧이어 확정된 숫자를 라벨로 붙임 (hard_examples) → finetune.py로 모델 보강
+
+[빠른 시작]
+- 카메라 열기 / 모델 로드 / 시리얼 연결을 동시에 진행 (startup.StartupTimer.run_parallel)
+- 아두이노는 고정 2초 대기 대신 "Ready" 응답이 오는 즉시 준비 완료 (startup.wait_for_board)
+
+[아두이노 전송]
+- 추론 스레드는 ser.write() 대신 serial_channel.SerialChannel.send()로 명령을 큐에 넣고 바로 돌아감
+- 채널 스레드가 "<seq>:<명령>" 형식으로 보내고 "ACK <seq>"를 기다림 (없으면 재전송)
+- USB가 빠져도 추론 / 화면은 계속 동작하고, 다시 연결되면 남은 명령부터 이어서 전송
+- PROTOCOL = "binary" : CRC8 바이너리 프레임 + 쌓인 명령 묶어 보내기 + FAST_BAUD로 속도 협상 (arm_protocol)
+- PORT = "auto" : USB 장치 목록에서 아두이노 포트를 찾음 (COM 번호를 코드에 적지 않아도 됨)
+- 하드웨어 없이 : python fake_arduino.py 로 채널 점검, python bench_serial.py 로 방식별 비교
+- 모델은 로드 직후 더미 입력으로 한 번 예측해서(warm-up) 첫 프레임 예측이 느려지지 않게 함
+- 첫 예측이 나오면 "시작 → 첫 예측" 단계별 시간표를 출력
+
+[웹캠 없이 실행]
+- 입력은 웹캠 / 동영상 / 이미지 폴더 / 합성 숫자 화면 중 선택 (frame_source)
+- 예: python digit_predict_live_stable.py synthetic:3,7,0 --headless --port none
+  (--port none : 아두이노 없이 [SEND] 로그만 출력)
+
+[확정 판단기]
+- DECIDER / --decider 로 선택 (digit_stability.make_decider)
+  gate  : 기존 방식, 모든 프레임이 STABLE_SEC 동안 조건을 통과해야 확정
+  ewma  : 프레임별 확률의 지수 이동 평균이 CONF_TH / MARGIN_TH를 넘으면 확정
+  bayes : 프레임별 로그 확률을 누적한 사후 확률이 기준을 넘으면 확정
+  → ewma / bayes는 깨끗한 입력에서 1초 이내에 확정되고, 흔들린 프레임 1장에 처음부터 다시 시작하지 않음
+- [SEND] 로그에 결정 지연(후보 시작 → 확정)을 함께 출력
+
+[계측]
+- --profile : 단계별(preprocess / contour / roi / predict / stability) p50/p95 ms HUD 표시 (instrument)
+- --metrics-log metrics.jsonl (또는 .csv) : 프레임 단위 로그, --trace trace.json : Chrome trace 저장
+- 옵션을 주지 않으면 계측 코드는 거의 비용 없이 건너뜀
 
 ** 주의사항 : 노트북에 전원 연결하고, 외부 전원은 연결하지 않은 상태로 진행 **
 '''
 
+import time # 시간 측정용
+T_LAUNCH = time.perf_counter() # 프로그램 시작 시각 (시작 시간 측정 기준)
+
 import cv2 # 카메라 열기, 이미지 처리용
 import numpy as np # 이미지 배열 계산용
-import tensorflow as tf # 학습된 cnn 모델 불러와서 예측하는 용도
-import serial, time # 통신 및 시간 측정용
+import threading # 캡처/추론 스레드 분리용
+import argparse # 입력 선택 / headless 옵션
+
+from frame_pipeline import BlockingQueue, CaptureThread, LatestQueue, StageStats
+from inference_engine import load_engine # 학습된 cnn 모델을 가장 빠른 백엔드로 실행 (TensorFlow는 이 안에서 필요할 때 import)
+from startup import StartupTimer
+from serial_channel import SerialChannel # 백그라운드 전송 + ACK / 재전송 / 재연결
+from digit_preprocess import RoiNormalizer, binarize, find_digit_boxes, top2_margin
+from frame_source import add_source_arguments, open_from_args
+from digit_stability import DECIDERS, make_decider
+from digit_tracker import RoiTracker
+from prediction_cache import CachedEngine
+from dataset_store import DatasetStore
+from hard_examples import HardExampleQueue
+from instrument import Instrument
+
+startup = StartupTimer(T_LAUNCH)
+startup.mark("imports")
 
 # =========================
 # 1) 설정값
 # =========================
-PORT = "COM6"          # 아두이노 포트
-BAUD = 9600            # 통신 속도 (baud rate)
+PORT = "auto"          # 아두이노 포트 (auto : USB 장치 목록에서 자동 탐색, 예: "COM6")
+BAUD = 9600            # 통신 속도 (baud rate), 연결 직후 속도
+PROTOCOL = "binary"    # text : "<seq>:<명령>" 줄 / binary : CRC8 프레임 (arm_protocol)
+FAST_BAUD = 115200     # binary에서 연결 후 협상할 속도 (None : BAUD 그대로)
+BOARD_READY_TIMEOUT = 3.0  # 아두이노 "Ready" 응답 최대 대기 시간(초)
 
 CONF_TH = 0.85        # 신뢰도 임계값 (예측 확률이 이 이상이어야 인정)(0.80~0.95 조절)
 MARGIN_TH = 0.2       # top1 - top2 확률 차이 (구분이 확실해야 인정)(0.15~0.25 조절)
 
-STABLE_SEC = 3.5       # 3.5초 동안 숫자가 변하지 않아야 '확정'
+STABLE_SEC = 3.5       # 3.5초 동안 숫자가 변하지 않아야 '확정' (DECIDER = "gate"일 때)
+DECIDER = "gate"       # gate / ewma / bayes : 확정 판단 방식 (ewma / bayes는 확률 누적으로 더 빨리 확정)
 COOLDOWN_SEC = 1.0     # 최소 전송 간격 (너무 자주 보내면, 로봇이 계속 움직이므로)
-STOP_ON_ZERO = True    # 0 확정 시 시스템 중단
-
-# =========================
-# 2) 모델 로드 / 시리얼 연결
-# =========================
-# 학습된 CNN 모델 불러오기
-model = tf.keras.models.load_model("mnist_cnn.h5")
-
-# 아두이노 시리얼 연결
-ser = serial.Serial(PORT, BAUD, timeout=1)
-time.sleep(2)  # Arduino reset 대기
-
-cap = cv2.VideoCapture(0) # 웹캠 열기
-
-# ROI를 정사각형으로 패딩하는 함수
-# 숫자 붙이는 방법 : 박스 기준으로 중앙에 배치
-def make_square(img: np.ndarray) -> np.ndarray:
-    h, w = img.shape
-    size = max(h, w)
-    sq = np.zeros((size, size), dtype=np.uint8)
-    y0 = (size - h) // 2
-    x0 = (size - w) // 2
-    sq[y0:y0+h, x0:x0+w] = img
-    return sq
-
-# ROI를 질량 중심(픽셀 평균 위치) 기준으로 중앙 정렬하는 함수
-'''
-흰색 픽셀(숫자 부분)의 평균 위치를 계산해서
-그 평균이 이미지 중앙으로 오도록 이미지를 '평행이동' 함
-=> 숫자 붙이는 방법 : 숫자 모양 자체 중심으로 중앙에 배치
-'''
-def center_by_mass(img: np.ndarray) -> np.ndarray:
-    ys, xs = np.where(img > 0) # 숫자 픽셀 좌표 모으기
-    if len(xs) == 0 or len(ys) == 0:
-        return img
-
-    # 평균 위치 구하기
-    cy = int(np.mean(ys))
-    cx = int(np.mean(xs))
-
-    # 중앙으로 옮기기 위한 이동량 계산
-    h, w = img.shape
-    shift_y = (h // 2) - cy
-    shift_x = (w // 2) - cx
-
-    # 이미지 이동(빈곳은 검정으로 채움)
-    M = np.float32([[1, 0, shift_x], [0, 1, shift_y]])
-    shifted = cv2.warpAffine(img, M, (w, h), borderValue=0)
-    return shifted
-
-# =========================
-# 3) "3.5초 안정성"을 위한 상태 변수들
-# =========================
-candidate_digit = None      # 지금 "후보로 관찰 중인 숫자"
-candidate_start = 0.0       # 그 후보가 처음 관찰된 시작 시간
-
-confirmed_digit = None      # 마지막으로 확정해서 전송한 숫자(중복 전송 방지)
-last_send_time = 0.0        # 마지막 전송 시간(쿨다운용)
-
-stopped = False             # 0 확정 시 중단 플래그
-
-# 전처리 커널(획연결/굵게 만들 때 사용)
-kernel = np.ones((3,3), np.uint8)
-
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    # ---------- (A) 영상 전처리 + ROI 추출 ----------
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (5,5), 0)
+STOP_ON_ZERO = True    # 0 확정 시 시스템 중단 (MULTI_DIGIT에서는 마지막 숫자가 0일 때)
 
-    # 이진화(배경/숫자 분리)
-    _, binary = cv2.threshold(
-        blur, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU
-    )
+MULTI_DIGIT = False    # True : 면적 기준을 넘는 숫자를 모두 읽어 왼쪽부터 한 문자열로 전송
 
-    # morphology(끊긴 획 복원)
-    # 7/8/9 특징(가로획/고리) 보존을 위해 연결/굵기 보강
-    # MORPH_CLOSE : 작은 구멍 메우기 + 끊어진 획 연결
-    # dilate : 흰색(숫자)을 약간 두껍게 
-    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
-    binary = cv2.dilate(binary, kernel, iterations=1)
+TRACK_ROI = True       # True : 직전 숫자 주변 창만 전처리 (전체 탐색은 처음 / 추적 실패 / 주기적으로)
+REDETECT_EVERY = 15    # 추적 중에도 이 프레임 수마다 한 번은 전체 화면 탐색
 
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+COLLECT_DIR = None     # 예: "datasets/webcam" → 확정된 숫자의 28x28 입력을 라벨과 함께 저장 (dataset_store)
+HARD_EXAMPLE_DIR = None  # 예: "datasets/hard" → 조건 미달 입력 + 확률을 비동기로 저장 (finetune.py 입력)
 
-    vis = frame.copy()
+SHOW_PIPELINE_STATS = True  # 화면에 단계별 FPS / 지연 시간 표시
+INSTRUMENT = False           # True : --profile 없이도 단계별 계측 HUD 표시
 
-    # 화면에 표시할 텍스트
-    pred_text = "No digit"
-    status_text = ""
+MODEL_PATH = "mnist_cnn.h5"  # 학습된 CNN 모델 (export_model.py 결과 .tflite / SavedModel 폴더 / .npz도 가능)
+INFER_BACKEND = "auto"       # auto / tf_function / tflite / numpy / keras (auto : 가장 빠른 백엔드)
+PREDICT_CACHE = True         # True : 거의 같은 ROI는 이전 예측 결과 재사용
+CACHE_TOLERANCE = 0.03       # 7x7 지문 평균 밝기 차이 허용값 (클수록 적중률↑, 숫자 변화 감지↓)
 
-    # 예측 결과 저장 변수
-    digit = None
-    conf = 0.0
-    margin = 0.0  # top1-top2 차이
+# 명령줄 인자 : 입력 선택(웹캠/영상/합성), headless, 시리얼 포트
+parser = add_source_arguments(argparse.ArgumentParser(description="실시간 손글씨 숫자 인식 + 아두이노 전송"))
+parser.add_argument("--port", default=PORT, help="아두이노 포트 (auto : 자동 탐색, none : 시리얼 없이 실행)")
+parser.add_argument("--model", default=MODEL_PATH, help="모델 경로 (.h5 / .tflite / SavedModel 폴더 / .npz)")
+parser.add_argument("--decider", default=DECIDER, choices=DECIDERS, help="확정 판단 방식")
+parser.add_argument("--profile", action="store_true", help="단계별 계측 HUD 표시")
+parser.add_argument("--metrics-log", default=None, help="프레임 단위 계측 로그 (.jsonl / .csv)")
+parser.add_argument("--trace", default=None, help="종료 시 Chrome trace 저장 경로 (.json)")
+args = parser.parse_args()
 
-    if contours and not stopped:
-        cnt = max(contours, key=cv2.contourArea)
-        if cv2.contourArea(cnt) > 800:
-            x, y, w, h = cv2.boundingRect(cnt) #숫자를 감싸는 사각형
+# 로그 / trace 경로를 주면 자동으로 계측을 켬
+inst = Instrument(enabled=INSTRUMENT or args.profile or bool(args.metrics_log or args.trace),
+                  log_path=args.metrics_log, trace_path=args.trace)
 
-            # ROI 잘림 방지를 위해 마진 부여
-            m = 10
-            x0 = max(0, x - m)
-            y0 = max(0, y - m)
-            x1 = min(binary.shape[1], x + w + m)
-            y1 = min(binary.shape[0], y + h + m)
+# =========================
+# 2) 모델 로드 / 시리얼 연결 / 웹캠 열기 (동시 진행)
+# =========================
+# 학습된 CNN 모델 불러오기 (model.predict 대신 가벼운 추론 엔진 사용)
+def open_engine():
+    engine = load_engine(args.model, backend=INFER_BACKEND, verbose=False)
+    # warm-up : 첫 호출에만 생기는 준비 비용을 미리 처리
+    engine.predict(np.zeros((1,28,28,1), dtype=np.float32))
+    if PREDICT_CACHE:
+        engine = CachedEngine(engine, tolerance=CACHE_TOLERANCE)
+    return engine
 
-            cv2.rectangle(vis, (x0,y0), (x1,y1), (0,255,0), 2)
+# 아두이노 시리얼 연결
+def open_serial():
+    if args.port.lower() == "none":
+        return None # 아두이노 없이 실행 ([SEND] 로그만 출력)
+
+    # 연결 / "Ready" 대기 / 재연결은 채널 스레드가 처리
+    channel = SerialChannel(args.port, BAUD, ready_timeout=BOARD_READY_TIMEOUT,
+                            protocol=PROTOCOL, fast_baud=FAST_BAUD)
+    # 시작 시에는 연결될 때까지 잠시 기다림 (연결이 안 되어도 명령은 큐에 쌓였다가 연결되면 전송)
+    if not channel.connected.wait(BOARD_READY_TIMEOUT + 1.0):
+        print(f"[STARTUP] board {args.port} not connected yet, commands will be queued")
+    return channel
+
+def open_camera():
+    return open_from_args(args) # 웹캠 열기 (또는 동영상 / 이미지 폴더 / 합성 입력) + 출력 창
+
+opened = startup.run_parallel({
+    "load_model": open_engine,
+    "open_serial": open_serial,
+    "open_camera": open_camera,
+})
+engine, channel = opened["load_model"], opened["open_serial"]
+cap, display = opened["open_camera"]
+print(f"[STARTUP] inference backend: {engine.name}")
 
-            roi = binary[y0:y1, x0:x1] # 숫자만 잘라낸 이미지 조각
-            sq = make_square(roi) # 정사각형으로 패딩
-            sq = center_by_mass(sq) # 질량 중심 중앙 정렬
-            
-            # MNIST처럼 바깥 여백을 추가 (도메인 갭 완화)
-            sq = cv2.copyMakeBorder(sq, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=0)
+# =========================
+# 3) "3.5초 안정성"을 위한 상태
+# =========================
+# 후보 숫자 / 후보 시작 시간 / 마지막 확정 숫자 / 마지막 전송 시간은 판단기(gate / ewma / bayes) 안에서 관리
+gate = make_decider(args.decider, CONF_TH, MARGIN_TH, STABLE_SEC, COOLDOWN_SEC)
+print(f"[STARTUP] decider: {gate.name}")
 
-            #28 x 28 리사이즈 + 정규화 => CNN이 요구하는 입력 형태로 변환 완료
-            digit_28 = cv2.resize(sq, (28,28)) / 255.0
-            digit_28 = digit_28.reshape(1,28,28,1)
+stopped = False             # 0 확정 시 중단 플래그
 
-            # ---------- (A-2) 예측: top2 + margin ----------
-            pred = model.predict(digit_28, verbose=0)[0]  #길이 10짜리 확률 배열
-            top2 = np.argsort(pred)[-2:] # 확률값을 오름차순으로 정렬 후, 상위 2개 추출
-            best = int(top2[-1]) # 1등 숫자
-            second = int(top2[-2]) # 2등 숫자
+# =========================
+# 4) 파이프라인 (캡처 → 추론 → 표시)
+# =========================
+# 실시간 입력(웹캠, --realtime) : 최신 값 1개만 유지 / 파일·합성 입력 : 버리지 않고 모두 처리
+queue_type = LatestQueue if getattr(cap, "live", True) else BlockingQueue
+frame_queue = queue_type()      # 캡처 → 추론 : 최신 프레임
+result_queue = queue_type()     # 추론 → 표시 : 최신 결과
+stop_event = threading.Event()  # ESC 입력 시 모든 스레드 종료
+
+roi_normalizer = RoiNormalizer()  # ROI → 28x28 float32 (버퍼 재사용, 추론 스레드 전용)
+tracker = RoiTracker(multi=MULTI_DIGIT, redetect_every=REDETECT_EVERY)  # 추론 스레드 전용
+collect_store = DatasetStore.open_or_create(COLLECT_DIR, source="webcam") if COLLECT_DIR else None
+hard_queue = HardExampleQueue(HARD_EXAMPLE_DIR) if HARD_EXAMPLE_DIR else None
+
+capture_stats = StageStats("capture")
+infer_stats = StageStats("infer")     # latency = 캡처 → 추론 완료
+display_stats = StageStats("display") # latency = 캡처 → 화면 표시
+
+# ---------- (A) 영상 전처리 + ROI 추출 + 예측 ----------
+def predict_frame(frame):
+    '''
+    프레임 1장을 전처리하고 CNN으로 예측
+
+    반환값 : (binary, boxes, batch, probs, digits, confs, margins)
+    - boxes : 화면에 그릴 ROI 사각형 목록 [(x0, y0, x1, y1), ...] (왼쪽 → 오른쪽)
+    - batch / probs : CNN에 넣은 (N,28,28,1) 입력(정규화기 버퍼 view)과 (N,10) 확률, 숫자가 없으면 None
+    - digits / confs / margins : 박스별 예측 숫자 / 1등 확률 / 1등-2등 차이 (숫자가 없으면 빈 배열)
+    '''
+    if TRACK_ROI:
+        # 직전 박스 주변 창만 전처리 (필요할 때만 전체 화면)
+        with inst.span("detect"):
+            binary, boxes = tracker.process(frame)
+        inst.count(tracker.mode)
+    else:
+        with inst.span("preprocess"):
+            binary = binarize(frame) # Grayscale → Blur → Otsu → Close → Dilate
+        with inst.span("contour"):
+            boxes = find_digit_boxes(binary, multi=MULTI_DIGIT) # 숫자를 감싸는 사각형(마진 포함)
+
+    if not boxes:
+        empty = np.empty(0)
+        return binary, boxes, None, None, empty.astype(int), empty, empty
+
+    # 모든 ROI를 (N,28,28,1) 배치로 묶어서 한 번에 예측
+    # 정사각형 패딩 → 질량 중심 정렬 → 여백 → 28x28 → 0~1 정규화를 한 번의 warpAffine으로 처리
+    with inst.span("roi"):
+        batch = roi_normalizer.normalize_batch(binary, boxes)
+
+    # ---------- (A-2) 예측: top2 + margin ----------
+    with inst.span("predict"):
+        probs = engine.predict(batch) # (N,10) 확률 배열
+    digits, confs, margins = top2_margin(probs)
+    inst.observe("conf", min(confs))
+
+    return binary, boxes, batch, probs, digits, confs, margins
+
+# ---------- (B) 3.5초 안정성 판단 로직 ----------
+def update_stability(digits, confs, margins, frame_age, frame_t, batch=None, probs=None):
+    '''
+    현재 프레임의 예측 결과로 후보/확정 상태를 갱신하고, 화면에 표시할 상태 문장을 반환
+    - 후보는 숫자들을 왼쪽부터 이어 붙인 문자열 (1개 모드에서는 "3"처럼 한 자리)
+    - 확정 여부는 판단기가 결정 (digit_stability, gate는 conf / margin, ewma / bayes는 probs 누적)
+    frame_age : 판단에 사용된 프레임이 캡처된 뒤 지난 시간(초) → [SEND] 로그에 함께 출력
+    frame_t : 프레임 시각(Frame.t_source, 동영상 / 합성 입력은 재생 위치) → 판단기 / 어려운 입력 큐의 시각
+              (처리 시각이 아니라 프레임 시각으로 판단하므로, 파일을 빨리 돌려도 "3.5초 유지"가 같게 동작)
+    batch : 이 프레임의 28x28 입력 → 확정되면 확정 숫자를 라벨로 웹캠 데이터셋에 저장 (COLLECT_DIR)
+            conf / margin 조건을 통과하지 못하면 probs와 함께 어려운 입력 큐에 저장 (HARD_EXAMPLE_DIR)
+    '''
+    global stopped
 
-            conf = float(pred[best]) # 1등 확률
-            margin = float(pred[best] - pred[second]) # 1등과 2등과의 확률값 차이
-            digit = best # 예측 숫자
+    if stopped: # stopped이면, 더이상 판단하지 않음
+        return "STOPPED (show 0 -> home). Press ESC to exit."
+
+    with inst.span("stability"):
+        status_text, send = gate.update(digits, confs, margins, now=frame_t, probs=probs)
+
+    # 숫자는 보이지만 조건 미달 → 버리지 않고 어려운 입력으로 저장 (디스크 쓰기는 별도 스레드)
+    if hard_queue is not None and len(digits) > 0 and (min(confs) < CONF_TH or min(margins) < MARGIN_TH):
+        if hard_queue.put(batch, probs, now=frame_t):
+            inst.count("hard")
+
+    if send is not None:
+        inst.count("send")
+        # 아두이노는 숫자 문자를 하나씩 읽으므로, "371"을 보내면 3 → 7 → 1 순서로 이동
+        if channel is not None:
+            channel.send(send) # 아두이노로 보내기 (큐에 넣고 바로 반환)
+        print(f"[SEND] {send} (decision {gate.latencies[-1]:.2f} s, frame age {frame_age * 1000:.0f} ms)")
+
+        if hard_queue is not None:
+            hard_queue.confirm(send, now=frame_t, since=gate.candidate_start) # 직전에 모은 어려운 입력에 확정 숫자를 라벨로 붙임
+
+        if collect_store is not None and batch is not None:
+            collect_store.append(batch, labels=[int(c) for c in send],
+                                 meta=[{"source": "live", "conf": round(float(c), 4)} for c in confs])
+
+        if STOP_ON_ZERO and send.endswith("0"):
+            stopped = True
+            status_text = "STOPPED (0 confirmed)."
+
+    return status_text
+
+# ---------- 추론 스레드 ----------
+def inference_loop():
+    while not stop_event.is_set():
+        item = frame_queue.get(timeout=0.1)
+        if item is None:
+            if frame_queue.closed:
+                break # 캡처 종료
+            continue
+
+        if startup.mark("first_frame"):
+            print(f"[STARTUP] first frame after {item.t_capture - T_LAUNCH:.3f}s")
+
+        if stopped:
+            binary, boxes, batch, probs, digits, confs, margins = None, [], None, None, [], [], []
+        else:
+            binary, boxes, batch, probs, digits, confs, margins = predict_frame(item.image)
+            if TRACK_ROI:
+                binary = binary.copy() # 추적 버퍼는 다음 프레임에서 다시 쓰이므로 표시용 복사본
+            if len(digits) > 0 and startup.mark("first_prediction"):
+                print(startup.report())
 
-            # 화면에 표시할 문장
-            pred_text = f"Predicted: {digit} (conf={conf:.2f}, margin={margin:.2f})"
+        status_text = update_stability(digits, confs, margins, item.age(), item.t_source, batch, probs)
 
-            # (선택) 모델 입력 28x28 확인 창
-            # preview = (digit_28.reshape(28,28) * 255).astype(np.uint8)
-            # cv2.imshow("Model Input 28x28", preview)
+        if len(digits) == 0:
+            pred_text = "No digit"
+        else:
+            # 여러 자리일 때는 가장 불확실한 숫자의 conf / margin 표시
+            sequence = "".join(str(int(d)) for d in digits)
+            pred_text = f"Predicted: {sequence} (conf={min(confs):.2f}, margin={min(margins):.2f})"
 
-    # ---------- (B) 3.5초 안정성 판단 로직 ----------
-    now = time.time() #현재 시각(초 단위)
+        infer_stats.tick(item.age())
+        inst.observe("e2e_ms", item.age() * 1000.0) # 캡처 → 결정
+        inst.frame_end()
+        result_queue.put((item, binary, boxes, pred_text, status_text))
 
-    if stopped: # stopped이면, 더이상 판단하지 않음
-        status_text = "STOPPED (show 0 -> home). Press ESC to exit."
-    else:
-        # conf + margin 조건을 동시에 만족할 때만 후보로 인정
-        if digit is not None and conf >= CONF_TH and margin >= MARGIN_TH:
-            if candidate_digit is None or digit != candidate_digit:
-                candidate_digit = digit
-                candidate_start = now
-        else:
-            candidate_digit = None #초기화
+    result_queue.close()
 
-        if candidate_digit is not None:
-            stable_for = now - candidate_start # 같은 후보가 유지된 시간
-            status_text = f"Candidate: {candidate_digit} stable {stable_for:.1f}s / {STABLE_SEC:.1f}s"
+capture_thread = CaptureThread(cap, frame_queue, stop_event, capture_stats)
+infer_thread = threading.Thread(target=inference_loop, name="infer", daemon=True)
+capture_thread.start()
+infer_thread.start()
 
-            if stable_for >= STABLE_SEC:
-                # 같은 숫자 중복 전송 방지 + cooldown으로 너무 자주 전송 방지
-                if candidate_digit != confirmed_digit and (now - last_send_time) >= COOLDOWN_SEC:
-                    ser.write((str(candidate_digit) + "\n").encode()) #아두이노로 보내기
-                    print(f"[SEND] {candidate_digit}")
+# ---------- (C) 화면 표시 (메인 스레드) ----------
+while True:
+    result = result_queue.get(timeout=0.1)
+    if result is None:
+        if result_queue.closed:
+            break # 추론 종료 (캡처 끊김)
+        if display.poll_key() == 27:  # ESC
+            break
+        continue
 
-                    confirmed_digit = candidate_digit
-                    last_send_time = now
+    item, binary, boxes, pred_text, status_text = result
+    vis = item.image.copy()
 
-                    if STOP_ON_ZERO and candidate_digit == 0:
-                        stopped = True
-                        status_text = "STOPPED (0 confirmed)."
-        else:
-            status_text = f"Waiting stable digit (conf>={CONF_TH:.2f}, margin>={MARGIN_TH:.2f})"
+    for box in boxes:
+        cv2.rectangle(vis, box[:2], box[2:], (0,255,0), 2)
 
-    # ---------- (C) 화면 표시 ----------
     cv2.putText(vis, pred_text, (10,40),
                 cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,0), 2)
     cv2.putText(vis, status_text, (10,80),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,255,255), 2)
 
-    cv2.imshow("Digit Recognition (Stable)", vis)
-    cv2.imshow("Binary", binary)
+    display_stats.tick(item.age())
+
+    if SHOW_PIPELINE_STATS:
+        stats_text = " | ".join(s.summary() for s in (capture_stats, infer_stats, display_stats))
+        if PREDICT_CACHE:
+            stats_text += f" | hit {engine.cache.hit_rate * 100:.0f}%"
+        cv2.putText(vis, stats_text, (10, vis.shape[0] - 15),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0,255,255), 1)
+
+    inst.draw_hud(vis, origin=(10, 120))
 
-    if cv2.waitKey(1) & 0xFF == 27:  # ESC
+    display.show("Digit Recognition (Stable)", vis)
+    if binary is not None:
+        display.show("Binary", binary)
+
+    if display.poll_key() == 27:  # ESC
         break
 
 # ---------- (D) 종료 처리 ----------
+stop_event.set()
+frame_queue.close()  # BlockingQueue에서 기다리는 put을 깨움
+result_queue.close()
+
+if not startup.has("first_prediction"):
+    print(startup.report())
+capture_thread.join(timeout=1.0)
+infer_thread.join(timeout=1.0)
+
+print("[PIPELINE] " + " | ".join(s.summary() for s in (capture_stats, infer_stats, display_stats)))
+print(f"[PIPELINE] dropped frames: capture->infer {frame_queue.dropped}, infer->display {result_queue.dropped}")
+if TRACK_ROI:
+    print(f"[PIPELINE] roi {tracker.summary()}")
+if PREDICT_CACHE:
+    print(f"[PIPELINE] {engine.cache.summary()}")
+if collect_store is not None:
+    print(f"[COLLECT] {collect_store.summary()}")
+if hard_queue is not None:
+    hard_queue.close() # 남은 입력 저장 + 쓰기 스레드 종료
+    print(f"[COLLECT] {hard_queue.summary()}")
+if inst.enabled:
+    print(inst.summary())
+inst.close() # 로그 닫기 + trace 저장
+
 cap.release()
-cv2.destroyAllWindows()
-ser.close()
\ No newline at end of file
+display.close()
+if channel is not None:
+    channel.close() # 남은 명령(예: 0 = HOME) 전송을 잠시 기다린 뒤 종료
+    print(f"[SERIAL] {channel.summary()}")
@@ -0,0 +1,251 @@
+'''
+digit_preprocess의 Docstring
+
+웹캠 프레임 → CNN 입력(28x28) 전처리 함수 모음
+
+이 코드의 목적:
+- digit_predict_live_stable.py의 전처리 과정을 함수로 분리해서,
+  실시간 인식 / 벤치마크 / 데이터 수집 코드가 똑같은 전처리를 사용하도록 함
+- 가장 큰 숫자 1개만 찾는 모드와, 면적 기준을 넘는 숫자를 모두 찾는 모드(여러 자리 숫자)를 지원
+- 여러 숫자의 ROI를 (N,28,28,1) 배치로 묶어 CNN을 한 번만 호출할 수 있게 함
+
+전처리 단계:
+1. Grayscale → Gaussian Blur → Otsu 이진화(숫자 흰색) → Close / Dilate (binarize)
+2. 외곽선 탐색 → 면적 기준 통과한 박스 (+마진) → 왼쪽부터 정렬 (find_digit_boxes)
+3. 정사각형 패딩 → 질량 중심 정렬 → 바깥 여백 10px → 28x28 → 0~1 정규화 (roi_to_input)
+   → 실시간 경로에서는 같은 변환을 버퍼 재사용 + 한 번의 warpAffine으로 처리 (RoiNormalizer)
+'''
+
+import cv2
+import numpy as np
+
+MIN_AREA = 800      # 이보다 작은 외곽선은 잡음으로 보고 무시
+BOX_MARGIN = 10     # ROI 잘림 방지를 위한 박스 마진(px)
+BORDER = 10         # MNIST처럼 바깥 여백 추가(px)
+MAX_DIGITS = 8      # 여러 자리 모드에서 한 프레임에 읽을 최대 숫자 수
+
+# 전처리 커널(획연결/굵게 만들 때 사용)
+kernel = np.ones((3,3), np.uint8)
+
+
+# =========================
+# 1) 이진화
+# =========================
+def binarize_with_threshold(frame: np.ndarray, threshold=None):
+    '''
+    이진화 결과와 사용한 임계값을 함께 반환 → (binary, threshold)
+
+    - threshold=None : Otsu로 임계값을 자동 계산 (프레임 전체에 사용)
+    - threshold=값   : 주어진 임계값 사용 (ROI 추적 창처럼 숫자가 대부분인 작은 영역에서는
+                      Otsu가 치우치므로, 전체 프레임에서 구한 값을 재사용)
+    '''
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    blur = cv2.GaussianBlur(gray, (5,5), 0)
+
+    # 이진화(배경/숫자 분리)
+    if threshold is None:
+        threshold, binary = cv2.threshold(
+            blur, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU
+        )
+    else:
+        _, binary = cv2.threshold(blur, threshold, 255, cv2.THRESH_BINARY_INV)
+
+    # morphology(끊긴 획 복원)
+    # 7/8/9 특징(가로획/고리) 보존을 위해 연결/굵기 보강
+    # MORPH_CLOSE : 작은 구멍 메우기 + 끊어진 획 연결
+    # dilate : 흰색(숫자)을 약간 두껍게
+    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
+    binary = cv2.dilate(binary, kernel, iterations=1)
+    return binary, threshold
+
+def binarize(frame: np.ndarray, threshold=None) -> np.ndarray:
+    return binarize_with_threshold(frame, threshold)[0]
+
+
+# =========================
+# 2) 숫자 박스 찾기
+# =========================
+def find_digit_boxes(binary: np.ndarray, multi=False, min_area=MIN_AREA, max_digits=MAX_DIGITS):
+    '''
+    숫자 박스 목록 [(x0, y0, x1, y1), ...] 반환 (마진 포함, 영상 밖으로 나가지 않게 자름)
+
+    - multi=False : 가장 큰 외곽선 1개만 (기존 방식)
+    - multi=True  : min_area를 넘는 외곽선 모두, 왼쪽 → 오른쪽 순서
+      (너무 많으면 면적이 큰 max_digits개만 남김)
+    '''
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return []
+
+    if multi:
+        contours = [c for c in contours if cv2.contourArea(c) > min_area]
+        if len(contours) > max_digits:
+            contours = sorted(contours, key=cv2.contourArea, reverse=True)[:max_digits]
+    else:
+        cnt = max(contours, key=cv2.contourArea)
+        contours = [cnt] if cv2.contourArea(cnt) > min_area else []
+
+    h, w = binary.shape
+    boxes = []
+    for cnt in contours:
+        x, y, bw, bh = cv2.boundingRect(cnt) #숫자를 감싸는 사각형
+        boxes.append((
+            max(0, x - BOX_MARGIN),
+            max(0, y - BOX_MARGIN),
+            min(w, x + bw + BOX_MARGIN),
+            min(h, y + bh + BOX_MARGIN),
+        ))
+
+    boxes.sort(key=lambda b: b[0]) # 왼쪽 → 오른쪽 (읽는 순서)
+    return boxes
+
+
+# =========================
+# 3) ROI → 28x28
+# =========================
+# ROI를 정사각형으로 패딩하는 함수
+# 숫자 붙이는 방법 : 박스 기준으로 중앙에 배치
+def make_square(img: np.ndarray) -> np.ndarray:
+    h, w = img.shape
+    size = max(h, w)
+    sq = np.zeros((size, size), dtype=np.uint8)
+    y0 = (size - h) // 2
+    x0 = (size - w) // 2
+    sq[y0:y0+h, x0:x0+w] = img
+    return sq
+
+# ROI를 질량 중심(픽셀 평균 위치) 기준으로 중앙 정렬하는 함수
+'''
+흰색 픽셀(숫자 부분)의 평균 위치를 계산해서
+그 평균이 이미지 중앙으로 오도록 이미지를 '평행이동' 함
+=> 숫자 붙이는 방법 : 숫자 모양 자체 중심으로 중앙에 배치
+'''
+def center_by_mass(img: np.ndarray) -> np.ndarray:
+    ys, xs = np.where(img > 0) # 숫자 픽셀 좌표 모으기
+    if len(xs) == 0 or len(ys) == 0:
+        return img
+
+    # 평균 위치 구하기
+    cy = int(np.mean(ys))
+    cx = int(np.mean(xs))
+
+    # 중앙으로 옮기기 위한 이동량 계산
+    h, w = img.shape
+    shift_y = (h // 2) - cy
+    shift_x = (w // 2) - cx
+
+    # 이미지 이동(빈곳은 검정으로 채움)
+    M = np.float32([[1, 0, shift_x], [0, 1, shift_y]])
+    shifted = cv2.warpAffine(img, M, (w, h), borderValue=0)
+    return shifted
+
+def roi_to_input(roi: np.ndarray) -> np.ndarray:
+    # 이진 ROI 1개 → (28,28,1) float32 (0~1)
+    sq = make_square(roi) # 정사각형으로 패딩
+    sq = center_by_mass(sq) # 질량 중심 중앙 정렬
+
+    # MNIST처럼 바깥 여백을 추가 (도메인 갭 완화)
+    sq = cv2.copyMakeBorder(sq, BORDER, BORDER, BORDER, BORDER, cv2.BORDER_CONSTANT, value=0)
+
+    #28 x 28 리사이즈 + 정규화 => CNN이 요구하는 입력 형태로 변환 완료
+    digit_28 = cv2.resize(sq, (28,28)).astype(np.float32) / 255.0
+    return digit_28.reshape(28,28,1)
+
+def boxes_to_batch(binary: np.ndarray, boxes) -> np.ndarray:
+    # 박스 목록 → (N,28,28,1) 배치 (CNN 한 번 호출용)
+    batch = np.empty((len(boxes), 28, 28, 1), dtype=np.float32)
+    for i, (x0, y0, x1, y1) in enumerate(boxes):
+        batch[i] = roi_to_input(binary[y0:y1, x0:x1])
+    return batch
+
+
+# =========================
+# 3-2) ROI → 28x28 (버퍼 재사용 버전)
+# =========================
+class RoiNormalizer:
+    '''
+    roi_to_input과 같은 변환을 "새 배열 할당 없이" 처리하는 정규화기
+
+    기존 방식은 ROI 1개마다
+    make_square(zeros) → np.where → warpAffine → copyMakeBorder → resize → /255.0(float64)
+    처럼 중간 배열을 5~6개 새로 만들었음
+
+    여기서는
+    1. 질량 중심을 cv2.moments(이진 영상 모멘트)로 ROI에서 바로 계산 (m10/m00, m01/m00)
+    2. "정사각형 패딩 + 중심 이동 + 10px 여백 + 28x28 축소"는 모두 평행이동/확대축소이므로
+       하나의 affine 행렬로 합쳐서 warpAffine 한 번으로 28x28 결과를 바로 만듦
+    3. 결과는 미리 만든 uint8 28x28 버퍼에 쓰고, 미리 만든 float32 (N,28,28,1) 버퍼에
+       1/255을 곱해 바로 모델 입력 형태로 저장
+
+    주의:
+    - normalize_batch가 반환하는 배열은 내부 버퍼의 view → 다음 호출 전에 사용(예측)을 끝내야 함
+    - resize(INTER_LINEAR)와 같은 픽셀 중심 정렬을 쓰므로 결과는 기존 방식과 반올림 오차 수준으로 같음
+      (기존 방식은 중심 이동 때 정사각형 밖으로 밀린 획을 잘라냈지만, 여기서는 10px 여백 안에 남음)
+    '''
+
+    def __init__(self, max_batch=MAX_DIGITS, size=28, border=BORDER):
+        self.size = size
+        self.border = border
+        self._u8 = np.empty((size, size), dtype=np.uint8)        # warpAffine 결과 버퍼
+        self._out = np.empty((max_batch, size, size, 1), dtype=np.float32)  # 모델 입력 버퍼
+        self._M = np.zeros((2, 3), dtype=np.float64)              # affine 행렬 (값만 갱신)
+        self._inv255 = np.float32(1.0 / 255.0)
+
+    def _affine(self, roi):
+        h, w = roi.shape
+        side = max(h, w)
+
+        # make_square : 정사각형 안에서 ROI가 놓이는 위치
+        x0 = (side - w) // 2
+        y0 = (side - h) // 2
+
+        # center_by_mass : 질량 중심을 정사각형 중앙으로 (기존과 같이 int로 버림)
+        m = cv2.moments(roi, binaryImage=True)
+        if m["m00"] > 0:
+            shift_x = side // 2 - (x0 + int(m["m10"] / m["m00"]))
+            shift_y = side // 2 - (y0 + int(m["m01"] / m["m00"]))
+        else:
+            shift_x = shift_y = 0
+
+        # copyMakeBorder + resize : (side + 2*border) 정사각형을 size로 축소
+        scale = self.size / (side + 2 * self.border)
+        offset = 0.5 * scale - 0.5  # resize와 같은 픽셀 중심 정렬
+
+        M = self._M
+        M[0, 0] = M[1, 1] = scale
+        M[0, 2] = (x0 + shift_x + self.border) * scale + offset
+        M[1, 2] = (y0 + shift_y + self.border) * scale + offset
+        return M
+
+    def normalize(self, roi: np.ndarray, out: np.ndarray) -> np.ndarray:
+        # 이진 ROI 1개 → out (size,size) 또는 (size,size,1) float32 버퍼에 0~1 값으로 기록
+        cv2.warpAffine(roi, self._affine(roi), (self.size, self.size), dst=self._u8,
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+        np.multiply(self._u8, self._inv255, out=out.reshape(self.size, self.size))
+        return out
+
+    def normalize_batch(self, binary: np.ndarray, boxes) -> np.ndarray:
+        # 박스 목록 → (N,28,28,1) float32 (내부 버퍼 view)
+        n = len(boxes)
+        if n > len(self._out):
+            self._out = np.empty((n, self.size, self.size, 1), dtype=np.float32)
+        for i, (x0, y0, x1, y1) in enumerate(boxes):
+            self.normalize(binary[y0:y1, x0:x1], self._out[i])
+        return self._out[:n]
+
+
+# =========================
+# 4) 예측 결과 해석 (top2 + margin)
+# =========================
+def top2_margin(probs: np.ndarray):
+    '''
+    probs : (N,10) 확률 → (digits, confs, margins) 각각 길이 N 배열
+    - digits : 1등 숫자
+    - confs : 1등 확률
+    - margins : 1등 - 2등 확률 차이
+    '''
+    top2 = np.sort(probs, axis=1)[:, -2:]
+    digits = np.argmax(probs, axis=1)
+    confs = top2[:, 1]
+    margins = top2[:, 1] - top2[:, 0]
+    return digits, confs, margins
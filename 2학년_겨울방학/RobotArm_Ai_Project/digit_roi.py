@@ -22,8 +22,9 @@ ROI : Region Of Interest (관심영역)
 
 import cv2
 import numpy as np
+from frame_source import open_from_cli
 
-cap = cv2.VideoCapture(0)
+cap, display = open_from_cli(description="숫자 ROI 추출 확인") # 입력(웹캠/영상/합성) + 출력(창/headless)
 
 if not cap.isOpened():
     print("카메라를 열 수 없습니다.")
@@ -108,13 +109,13 @@ while True:
             roi_view = cv2.resize(roi, (200, 200), interpolation=cv2.INTER_NEAREST)
             mnist_view = cv2.resize(digit_28, (280, 280), interpolation=cv2.INTER_NEAREST)
 
-    cv2.imshow("1) Original + bbox", vis)
-    cv2.imshow("2) Binary", binary)
-    cv2.imshow("3) ROI (cropped)", roi_view)
-    cv2.imshow("4) MNIST-like 28x28 (zoomed)", mnist_view)
+    display.show("1) Original + bbox", vis)
+    display.show("2) Binary", binary)
+    display.show("3) ROI (cropped)", roi_view)
+    display.show("4) MNIST-like 28x28 (zoomed)", mnist_view)
 
-    if cv2.waitKey(1) & 0xFF == 27:  # ESC
+    if display.poll_key() == 27:  # ESC
         break
 
 cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+display.close()
\ No newline at end of file
@@ -0,0 +1,254 @@
+'''
+digit_stability의 Docstring
+
+"일정 시간 동안 같은 숫자" 안정성 판단 로직
+
+이 코드의 목적:
+- digit_predict_live_stable.py의 3.5초 안정성 판단을 클래스로 분리해서
+  실시간 인식 / 벤치마크 / 녹화 영상 재생에서 똑같은 판단 로직을 사용하도록 함
+- 현재 시각(now)을 인자로 받을 수 있어서, 녹화 영상의 프레임 시각으로도 판단 가능
+
+판단 규칙 (기존과 동일):
+1. 모든 숫자가 conf >= CONF_TH, margin >= MARGIN_TH 이어야 후보로 인정
+2. 같은 후보가 STABLE_SEC 동안 유지되면 확정
+3. 직전에 확정한 것과 같으면 다시 보내지 않음 + COOLDOWN_SEC 이내에는 보내지 않음
+
+[확률 누적 판단기] (EwmaDecider / BayesDecider)
+- StabilityGate는 3.5초 동안 "모든 프레임"이 조건을 통과해야 해서, 흔들린 프레임 1장에 처음부터 다시 시작함
+- 확률 누적 판단기는 프레임마다의 10개 클래스 확률(probs)을 계속 누적해서,
+  누적된 믿음(belief)이 기준을 넘는 순간 확정 → 깨끗한 입력에서는 훨씬 빨리 확정되고,
+  흔들린 프레임 1장은 믿음을 조금 낮출 뿐 처음부터 다시 시작하지 않음
+  - ewma  : 지수 이동 평균 belief = (1-α)·belief + α·probs, 평균 확률이 conf / margin 기준을 넘으면 확정
+  - bayes : 로그 확률 누적 L = λ·L + τ·log(probs), softmax(L)이 posterior 기준을 넘으면 확정
+            (λ : 오래된 증거를 잊는 비율, τ : 연속 프레임은 서로 독립이 아니므로 증거를 깎는 비율)
+            사후 확률은 conf 0.80짜리 프레임도 몇 장이면 0.999를 넘으므로,
+            프레임 확률의 이동 평균도 ewma와 같은 conf / margin 기준을 넘어야 확정
+            (CONF_TH / MARGIN_TH가 거부하는 입력은 어느 판단기로도 전송되지 않음)
+- 숫자가 사라진 뒤 gap_sec 이상 안 보이면 누적을 초기화
+- 같은 숫자 중복 전송 방지 / 쿨다운 규칙은 StabilityGate와 같음
+- 모든 판단기는 결정 지연(후보가 처음 관찰된 시각 → 확정 시각)을 latencies에 기록
+
+모든 판단기는 같은 update(digits, confs, margins, now=None, probs=None) → (status_text, send) 형태
+→ make_decider("gate" / "ewma" / "bayes", ...)로 골라서 사용
+'''
+
+import time
+
+import numpy as np
+
+
+class StabilityGate:
+    name = "gate"
+
+    def __init__(self, conf_th=0.85, margin_th=0.2, stable_sec=3.5, cooldown_sec=1.0):
+        self.conf_th = conf_th
+        self.margin_th = margin_th
+        self.stable_sec = stable_sec
+        self.cooldown_sec = cooldown_sec
+
+        self.candidate = None       # 지금 "후보로 관찰 중인 숫자" (문자열, 여러 자리면 "371")
+        self.candidate_start = 0.0  # 그 후보가 처음 관찰된 시작 시간
+        self.confirmed = None       # 마지막으로 확정해서 전송한 숫자(중복 전송 방지)
+        self.last_send_time = None  # 마지막 전송 시간(쿨다운용), 아직 보낸 적 없으면 None
+        self.latencies = []         # 확정마다 결정 지연(초) : 후보 시작 → 확정
+
+    def update(self, digits, confs, margins, now=None, probs=None):
+        '''
+        현재 프레임의 예측 결과(왼쪽부터 숫자 / 1등 확률 / 1등-2등 차이)로 상태를 갱신
+        (probs는 다른 판단기와 같은 형태로 호출하기 위한 인자, 여기서는 사용하지 않음)
+
+        반환값 : (status_text, send)
+        - status_text : 화면에 표시할 상태 문장
+        - send : 이번 프레임에 확정되어 전송해야 하는 문자열, 없으면 None
+        '''
+        if now is None:
+            now = time.time() #현재 시각(초 단위)
+
+        # conf + margin 조건을 동시에 만족할 때만 후보로 인정
+        if len(digits) > 0 and min(confs) >= self.conf_th and min(margins) >= self.margin_th:
+            sequence = "".join(str(int(d)) for d in digits)
+            if self.candidate is None or sequence != self.candidate:
+                self.candidate = sequence
+                self.candidate_start = now
+        else:
+            self.candidate = None #초기화
+
+        if self.candidate is None:
+            return f"Waiting stable digit (conf>={self.conf_th:.2f}, margin>={self.margin_th:.2f})", None
+
+        stable_for = now - self.candidate_start # 같은 후보가 유지된 시간
+        status_text = f"Candidate: {self.candidate} stable {stable_for:.1f}s / {self.stable_sec:.1f}s"
+
+        if stable_for < self.stable_sec:
+            return status_text, None
+
+        # 같은 숫자 중복 전송 방지 + cooldown으로 너무 자주 전송 방지
+        if self.candidate != self.confirmed and _cooled_down(self.last_send_time, now, self.cooldown_sec):
+            self.confirmed = self.candidate
+            self.last_send_time = now
+            self.latencies.append(stable_for)
+            return status_text, self.candidate
+
+        return status_text, None
+
+
+# =========================
+# 확률 누적 판단기
+# =========================
+class _BeliefDecider:
+    '''
+    EwmaDecider / BayesDecider 공통 부분
+    - 자식 클래스는 _reset_belief(probs) / _accumulate(probs) / belief() / _passes(belief)만 구현
+    - min_sec : 믿음이 기준을 넘어도 후보가 최소 이 시간은 유지되어야 확정 (한두 프레임짜리 오인식 방지)
+    '''
+
+    def __init__(self, min_sec=0.4, cooldown_sec=1.0, gap_sec=0.3):
+        self.min_sec = min_sec
+        self.cooldown_sec = cooldown_sec
+        self.gap_sec = gap_sec
+
+        self.candidate = None       # 지금 믿음이 가장 큰 숫자 문자열
+        self.candidate_start = 0.0  # 그 후보가 처음 관찰된 시각
+        self.confirmed = None
+        self.last_send_time = None
+        self.last_seen = None       # 마지막으로 숫자가 보인 시각
+        self.latencies = []
+        self._size = 0              # 누적 중인 숫자 개수 (바뀌면 초기화)
+
+    def reset(self):
+        self.candidate = None
+        self.last_seen = None
+        self._size = 0
+
+    def update(self, digits, confs, margins, now=None, probs=None):
+        if now is None:
+            now = time.time()
+
+        if probs is None or len(digits) == 0:
+            # 숫자가 잠깐 안 보이는 것은 허용, gap_sec 이상이면 초기화
+            if self.last_seen is not None and now - self.last_seen > self.gap_sec:
+                self.reset()
+            if self.candidate is None:
+                return f"Waiting digit ({self.name})", None
+            return f"Candidate: {self.candidate} (digit lost)", None
+
+        probs = np.asarray(probs, dtype=np.float64)
+        if self._size != len(probs):
+            self._reset_belief(probs)
+            self._size = len(probs)
+        else:
+            self._accumulate(probs)
+        self.last_seen = now
+
+        belief = self.belief()
+        sequence = "".join(str(int(d)) for d in np.argmax(belief, axis=1))
+        if sequence != self.candidate:
+            self.candidate = sequence
+            self.candidate_start = now
+
+        elapsed = now - self.candidate_start
+        passed, score = self._passes(belief)
+        status_text = f"Candidate: {sequence} belief {score:.3f} ({elapsed:.1f}s, {self.name})"
+
+        if (passed and elapsed >= self.min_sec and sequence != self.confirmed
+                and _cooled_down(self.last_send_time, now, self.cooldown_sec)):
+            self.confirmed = sequence
+            self.last_send_time = now
+            self.latencies.append(elapsed)
+            return status_text, sequence
+        return status_text, None
+
+
+class EwmaDecider(_BeliefDecider):
+    name = "ewma"
+
+    def __init__(self, conf_th=0.85, margin_th=0.2, alpha=0.25, min_sec=0.4, cooldown_sec=1.0, gap_sec=0.3):
+        super().__init__(min_sec, cooldown_sec, gap_sec)
+        self.conf_th = conf_th
+        self.margin_th = margin_th
+        self.alpha = alpha
+        self._avg = None
+
+    def _reset_belief(self, probs):
+        self._avg = probs.copy()
+
+    def _accumulate(self, probs):
+        self._avg += self.alpha * (probs - self._avg)
+
+    def belief(self):
+        return self._avg
+
+    def _passes(self, belief):
+        return _top2_passes(belief, self.conf_th, self.margin_th)
+
+
+class BayesDecider(_BeliefDecider):
+    name = "bayes"
+
+    def __init__(self, conf_th=0.85, margin_th=0.2, posterior_th=0.999, decay=0.9, temperature=0.5,
+                 alpha=0.25, min_sec=0.4, cooldown_sec=1.0, gap_sec=0.3):
+        super().__init__(min_sec, cooldown_sec, gap_sec)
+        self.conf_th = conf_th
+        self.margin_th = margin_th
+        self.posterior_th = posterior_th
+        self.decay = decay
+        self.temperature = temperature
+        self.alpha = alpha
+        self._log = None
+        self._avg = None    # 프레임 확률의 이동 평균 (conf / margin 기준 확인용)
+
+    def _evidence(self, probs):
+        return self.temperature * np.log(np.clip(probs, 1e-6, 1.0))
+
+    def _reset_belief(self, probs):
+        self._log = self._evidence(probs)
+        self._avg = probs.copy()
+
+    def _accumulate(self, probs):
+        self._log *= self.decay
+        self._log += self._evidence(probs)
+        self._avg += self.alpha * (probs - self._avg)
+
+    def belief(self):
+        # 위치별 softmax(L) = 사후 확률
+        z = self._log - self._log.max(axis=1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=1, keepdims=True)
+
+    def _passes(self, belief):
+        # 사후 확률 기준 + 프레임 확률 평균이 같은 숫자로 conf / margin 기준 통과
+        score = float(belief.max(axis=1).min())
+        frames_pass, _ = _top2_passes(self._avg, self.conf_th, self.margin_th)
+        same = np.array_equal(np.argmax(self._avg, axis=1), np.argmax(belief, axis=1))
+        return score >= self.posterior_th and frames_pass and same, score
+
+
+def _top2_passes(probs, conf_th, margin_th):
+    # 모든 숫자 위치에서 (평균) 확률의 1등 >= conf_th, 1등 - 2등 >= margin_th → (통과 여부, 최소 1등 확률)
+    top2 = np.sort(probs, axis=1)[:, -2:]
+    conf = float(top2[:, 1].min())
+    margin = float((top2[:, 1] - top2[:, 0]).min())
+    return conf >= conf_th and margin >= margin_th, conf
+
+
+def _cooled_down(last_send_time, now, cooldown_sec):
+    # 쿨다운이 지났는지 (처음 전송은 항상 허용 → 입력 시각이 0부터 시작해도 첫 확정이 막히지 않음)
+    return last_send_time is None or (now - last_send_time) >= cooldown_sec
+
+
+DECIDERS = ("gate", "ewma", "bayes")
+
+def make_decider(name="gate", conf_th=0.85, margin_th=0.2, stable_sec=3.5, cooldown_sec=1.0):
+    '''
+    이름으로 판단기 생성 (실시간 인식 / 벤치마크 공통)
+    - gate  : 기존 StabilityGate (stable_sec 동안 매 프레임 조건 통과)
+    - ewma  : 평균 확률이 conf_th / margin_th를 넘으면 확정
+    - bayes : 사후 확률이 0.999를 넘고, 프레임 확률 평균이 conf_th / margin_th를 넘으면 확정
+    '''
+    if name == "gate":
+        return StabilityGate(conf_th, margin_th, stable_sec, cooldown_sec)
+    if name == "ewma":
+        return EwmaDecider(conf_th, margin_th, cooldown_sec=cooldown_sec)
+    if name == "bayes":
+        return BayesDecider(conf_th, margin_th, cooldown_sec=cooldown_sec)
+    raise ValueError(f"알 수 없는 판단기: {name} (가능: {', '.join(DECIDERS)})")
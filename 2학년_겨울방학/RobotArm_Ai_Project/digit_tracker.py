@@ -0,0 +1,141 @@
+'''
+digit_tracker의 Docstring
+
+숫자 ROI 추적 : 대부분의 프레임에서 전체 화면 대신 "직전 숫자 주변 창"만 전처리
+
+이 코드의 목적:
+- 숫자가 STABLE_SEC(3.5초) 동안 거의 움직이지 않는데도, 기존에는 매 프레임
+  전체 해상도(640x480)에 Blur → Otsu → Close → Dilate → findContours를 반복했음
+- 직전 숫자 박스를 여유(pad)만큼 넓힌 창 안에서만 같은 전처리를 하고, 박스 좌표를 전체 화면 기준으로 되돌림
+- 창 안에서는 숫자가 영역의 대부분을 차지해 Otsu가 치우치므로,
+  마지막 전체 탐색에서 구한 Otsu 임계값을 그대로 재사용 (digit_preprocess.binarize_with_threshold)
+
+전체 탐색(global)으로 돌아가는 경우:
+1. 첫 프레임 / 직전에 숫자를 못 찾은 경우
+2. 창 안에서 숫자를 못 찾은 경우 (추적 실패 → 같은 프레임에서 바로 전체 탐색)
+3. 찾은 박스가 창 가장자리에 닿은 경우 (숫자가 창 밖으로 움직이는 중)
+4. redetect_every 프레임마다 한 번 (새로 나타난 숫자 / 조명 변화 반영)
+
+주의:
+- MULTI_DIGIT 모드에서 창 밖에 새로 쓴 숫자는 다음 전체 탐색(최대 redetect_every 프레임 뒤)에서 잡힘
+- 반환하는 binary는 내부 버퍼(전체 화면 크기) → 추적 프레임에서는 창 영역만 채워지고 나머지는 0
+'''
+
+import numpy as np
+
+from digit_preprocess import MIN_AREA, binarize_with_threshold, find_digit_boxes
+
+REDETECT_EVERY = 15   # 이 프레임 수마다 한 번은 전체 화면 탐색
+PAD_RATIO = 0.5       # 창 여유 = 박스 크기 × PAD_RATIO
+MIN_PAD = 24          # 창 여유 최소값(px)
+
+
+class RoiTracker:
+    def __init__(self, multi=False, redetect_every=REDETECT_EVERY, pad_ratio=PAD_RATIO,
+                 min_pad=MIN_PAD, min_area=MIN_AREA):
+        self.multi = multi
+        self.redetect_every = redetect_every
+        self.pad_ratio = pad_ratio
+        self.min_pad = min_pad
+        self.min_area = min_area
+
+        self.boxes = []          # 마지막으로 찾은 박스 (전체 화면 좌표)
+        self.threshold = None    # 마지막 전체 탐색의 Otsu 임계값
+        self.mode = None         # 이번 프레임의 탐색 방식 ("global" / "track")
+        self.since_global = 0    # 마지막 전체 탐색 뒤 지난 프레임 수
+
+        self._binary = None      # 전체 화면 크기 binary 버퍼
+        self._window = None      # 버퍼에 마지막으로 채운 창 (x0, y0, x1, y1)
+
+        # 통계
+        self.global_frames = 0
+        self.track_frames = 0
+        self.lost = 0            # 추적 창에서 실패해서 전체 탐색으로 돌아간 횟수
+
+    def reset(self):
+        self.boxes = []
+        self.threshold = None
+
+    # =========================
+    # 탐색
+    # =========================
+    def process(self, frame: np.ndarray):
+        # 프레임 1장 → (binary, boxes)  (boxes는 전체 화면 좌표, 왼쪽 → 오른쪽)
+        if self.boxes and self.threshold is not None and self.since_global < self.redetect_every:
+            window = self._search_window(frame.shape)
+            boxes = self._track(frame, window)
+            if boxes is not None:
+                self.mode = "track"
+                self.since_global += 1
+                self.track_frames += 1
+                self.boxes = boxes
+                return self._binary, boxes
+            self.lost += 1
+
+        return self._global(frame)
+
+    def _global(self, frame):
+        binary, self.threshold = binarize_with_threshold(frame)
+        boxes = find_digit_boxes(binary, multi=self.multi, min_area=self.min_area)
+
+        if self._binary is None or self._binary.shape != binary.shape:
+            self._binary = np.empty_like(binary)
+        self._binary[:] = binary
+        self._window = None
+
+        self.mode = "global"
+        self.since_global = 0
+        self.global_frames += 1
+        self.boxes = boxes
+        return self._binary, boxes
+
+    def _search_window(self, shape):
+        # 모든 박스를 감싸는 사각형 + 여유
+        h, w = shape[:2]
+        x0 = min(b[0] for b in self.boxes)
+        y0 = min(b[1] for b in self.boxes)
+        x1 = max(b[2] for b in self.boxes)
+        y1 = max(b[3] for b in self.boxes)
+        pad_x = max(self.min_pad, int((x1 - x0) * self.pad_ratio))
+        pad_y = max(self.min_pad, int((y1 - y0) * self.pad_ratio))
+        return (max(0, x0 - pad_x), max(0, y0 - pad_y), min(w, x1 + pad_x), min(h, y1 + pad_y))
+
+    def _track(self, frame, window):
+        # 창 안에서만 전처리 → 박스를 찾으면 전체 화면 좌표로 반환, 실패하면 None
+        wx0, wy0, wx1, wy1 = window
+        h, w = frame.shape[:2]
+
+        binary_win, _ = binarize_with_threshold(frame[wy0:wy1, wx0:wx1], self.threshold)
+        boxes = find_digit_boxes(binary_win, multi=self.multi, min_area=self.min_area)
+        if not boxes:
+            return None
+
+        # 창 가장자리에 닿은 박스 : 숫자가 창 밖으로 나가는 중 (화면 가장자리는 제외)
+        ww, wh = wx1 - wx0, wy1 - wy0
+        for bx0, by0, bx1, by1 in boxes:
+            if ((bx0 == 0 and wx0 > 0) or (by0 == 0 and wy0 > 0) or
+                    (bx1 == ww and wx1 < w) or (by1 == wh and wy1 < h)):
+                return None
+
+        # 이전 창 영역만 지우고 새 창을 채움 (전체 버퍼를 매번 지우지 않음)
+        if self._window is None:
+            self._binary[:] = 0
+        else:
+            px0, py0, px1, py1 = self._window
+            self._binary[py0:py1, px0:px1] = 0
+        self._binary[wy0:wy1, wx0:wx1] = binary_win
+        self._window = window
+
+        return [(bx0 + wx0, by0 + wy0, bx1 + wx0, by1 + wy0) for bx0, by0, bx1, by1 in boxes]
+
+    # =========================
+    # 통계
+    # =========================
+    @property
+    def track_ratio(self):
+        total = self.global_frames + self.track_frames
+        return self.track_frames / total if total else 0.0
+
+    def summary(self):
+        return (f"track {self.track_ratio * 100:.0f}% "
+                f"(global {self.global_frames}, track {self.track_frames}, lost {self.lost})")
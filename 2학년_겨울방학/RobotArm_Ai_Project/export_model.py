@@ -0,0 +1,181 @@
+'''
+export_model의 Docstring
+
+학습된 CNN(mnist_cnn.h5)을 배포용 형식으로 변환하고, 형식별 크기 / 정확도 / 지연 시간을 비교
+
+이 코드의 목적:
+- mnist_train.py는 mnist_cnn.h5 하나만 저장하는데, 로봇팔을 움직이는 노트북에서는
+  TensorFlow 전체보다 가벼운 형식이 더 빠르고 설치도 쉬움
+- 아래 형식을 한 번에 만들어 out 폴더에 저장
+  1. saved_model/            : SavedModel (TensorFlow Serving / 다른 언어에서도 사용 가능)
+  2. mnist_cnn_fp32.tflite   : TFLite float32 (변환만, 값은 원본과 같음)
+  3. mnist_cnn_fp16.tflite   : TFLite float16 가중치 (크기 약 1/2)
+  4. mnist_cnn_int8.tflite   : TFLite int8 사후 양자화 (크기 약 1/4, 보정용 학습 데이터 일부로 범위 측정)
+  5. mnist_cnn.npz           : NumPy 백엔드용 가중치 (TensorFlow 없이 실행)
+- 형식마다 파일 크기, MNIST 테스트 정확도, 1장 추론 CPU 지연 시간(p50)을 표로 출력하고 JSON으로 저장
+- digit_predict_live_stable.py --model 에 어떤 결과물 경로든 그대로 넣어서 실행 가능
+
+int8 양자화:
+- 기본값은 "연산은 int8, 입출력은 float32" (실시간 코드 수정 없이 바로 사용)
+- --int8-io : 입출력까지 int8 (inference_engine.TFLiteBackend가 scale / zero_point로 자동 변환)
+- --calib-augment : 보정 데이터에 웹캠 도메인 증강(mnist_augment)을 적용해서
+  실제 웹캠 입력에 가까운 값 범위로 양자화
+
+사용 예:
+    python export_model.py
+    python export_model.py --model mnist_cnn_aug.h5 --out export_aug --calib 1000 --calib-augment
+'''
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from inference_engine import (create_backend, keras_to_layers, load_exported,
+                              load_keras_model, save_numpy_weights)
+
+
+# =========================
+# 1) 변환
+# =========================
+def representative_dataset(x_calib):
+    # int8 보정용 입력 (1장씩, float32 0~1)
+    def gen():
+        for i in range(len(x_calib)):
+            yield [x_calib[i:i + 1]]
+    return gen
+
+def to_tflite(model, mode="fp32", x_calib=None, int8_io=False):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if mode == "fp16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == "int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset(x_calib)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        if int8_io:
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+    return converter.convert()
+
+def save_saved_model(model, path):
+    # Keras 2.13+ / Keras 3 : model.export, 그 이전 : tf.saved_model.save
+    if hasattr(model, "export"):
+        model.export(path)
+    else:
+        tf.saved_model.save(model, path)
+
+def export_all(model, out_dir, x_calib, int8_io=False):
+    # 모든 형식 저장 → {이름: 경로}
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+
+    paths["saved_model"] = os.path.join(out_dir, "saved_model")
+    save_saved_model(model, paths["saved_model"])
+
+    for mode in ("fp32", "fp16", "int8"):
+        path = os.path.join(out_dir, f"mnist_cnn_{mode}.tflite")
+        with open(path, "wb") as f:
+            f.write(to_tflite(model, mode, x_calib, int8_io))
+        paths[f"tflite_{mode}"] = path
+
+    paths["numpy"] = os.path.join(out_dir, "mnist_cnn.npz")
+    save_numpy_weights(keras_to_layers(model), paths["numpy"])
+    return paths
+
+
+# =========================
+# 2) 평가 (크기 / 정확도 / 지연 시간)
+# =========================
+def size_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+def accuracy(engine, x, y, batch=256):
+    correct = 0
+    for i in range(0, len(x), batch):
+        probs = engine.predict(x[i:i + batch])
+        correct += int(np.sum(np.argmax(probs, axis=1) == y[i:i + batch]))
+    return correct / len(x)
+
+def latency_ms(engine, x, runs=200, warmup=20):
+    # 실시간 경로와 같은 1장 입력의 호출당 지연 시간 (p50 / p95, ms)
+    sample = x[:1]
+    for _ in range(warmup):
+        engine.predict(sample)
+    times = []
+    for i in range(runs):
+        sample = x[i % len(x):i % len(x) + 1]
+        start = time.perf_counter()
+        engine.predict(sample)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return float(np.percentile(times, 50)), float(np.percentile(times, 95))
+
+def evaluate(engines, x_test, y_test, runs):
+    report = {}
+    for name, (engine, path) in engines.items():
+        acc = accuracy(engine, x_test, y_test)
+        p50, p95 = latency_ms(engine, x_test, runs)
+        report[name] = {"path": path, "size_bytes": size_bytes(path), "accuracy": acc,
+                        "latency_p50_ms": p50, "latency_p95_ms": p95, "backend": engine.name}
+    return report
+
+def print_report(report):
+    base = report.get("keras_h5", next(iter(report.values())))
+    print(f"{'variant':<14} {'size KB':>9} {'ratio':>6} {'accuracy':>9} {'p50 ms':>8} {'p95 ms':>8}  path")
+    for name, r in report.items():
+        print(f"{name:<14} {r['size_bytes'] / 1024:9.1f} {r['size_bytes'] / base['size_bytes']:6.2f} "
+              f"{r['accuracy']:9.4f} {r['latency_p50_ms']:8.3f} {r['latency_p95_ms']:8.3f}  {r['path']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CNN 모델 변환 (SavedModel / TFLite fp32·fp16·int8 / npz) + 비교")
+    parser.add_argument("--model", default="mnist_cnn.h5", help="변환할 Keras 모델")
+    parser.add_argument("--out", default="export", help="결과 폴더")
+    parser.add_argument("--calib", type=int, default=500, help="int8 보정에 쓸 학습 데이터 수")
+    parser.add_argument("--calib-augment", action="store_true", help="보정 데이터에 웹캠 도메인 증강 적용")
+    parser.add_argument("--int8-io", action="store_true", help="int8 모델의 입출력도 int8로 양자화")
+    parser.add_argument("--runs", type=int, default=200, help="지연 시간 측정 횟수")
+    parser.add_argument("--threads", type=int, default=None, help="TFLite 인터프리터 스레드 수")
+    args = parser.parse_args()
+
+    (x_train, _), (x_test, y_test) = tf.keras.datasets.mnist.load_data()
+    x_test = (x_test.astype(np.float32) / 255.0)[..., np.newaxis]
+
+    rng = np.random.default_rng(0)
+    idx = rng.choice(len(x_train), size=args.calib, replace=False)
+    x_calib = (x_train[idx].astype(np.float32) / 255.0)[..., np.newaxis]
+    if args.calib_augment:
+        from mnist_augment import webcam_like
+        x_calib = webcam_like(tf.constant(x_calib)).numpy()
+
+    model = load_keras_model(args.model)
+    paths = export_all(model, args.out, x_calib, args.int8_io)
+    for name, path in paths.items():
+        print(f"saved {name}: {path}")
+
+    # 원본(.h5)은 tf.function 백엔드로, 나머지는 실시간 코드와 같은 방식(경로)으로 불러와 비교
+    engines = {"keras_h5": (create_backend("tf_function", model=model), args.model)}
+    for name, path in paths.items():
+        engines[name] = (load_exported(path, num_threads=args.threads), path)
+
+    report = evaluate(engines, x_test, y_test, args.runs)
+    print_report(report)
+
+    report_path = os.path.join(args.out, "export_report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"model": args.model, "calib": args.calib, "calib_augment": args.calib_augment,
+                   "int8_io": args.int8_io, "variants": report}, f, indent=2)
+    print(f"saved report: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+'''
+fake_arduino의 Docstring
+
+하드웨어 없이 serial_channel을 확인하기 위한 가짜 아두이노 (pty 가상 시리얼 포트, Linux / macOS)
+
+이 코드의 목적:
+- pty(가상 터미널) 한 쌍을 만들어, 한쪽은 PC 프로그램이 여는 시리얼 포트로,
+  다른 쪽은 robot_arm_control_with_AI.ino와 같은 규칙으로 응답하는 스레드로 사용
+    - 연결되면 "Ready. Send digit 0~9." 출력
+      (pty는 PC가 포트를 연 시점을 알 수 없고 pyserial은 열 때 입력 버퍼를 비우므로,
+       첫 줄을 받을 때까지 READY_EVERY초마다 반복 출력)
+    - "<seq>:<명령>" → 숫자를 이동 큐에 넣고 바로 "ACK <seq>", 같은 seq가 다시 오면 ACK만 보내고 이동하지 않음
+      이동 큐(move_queue개)에 자리가 없으면 "BUSY <seq>"
+    - 이동은 별도 스레드 : 숫자마다 "Move to digit: d" 출력 후 move_sec 동안 이동(대기)
+      (펌웨어의 updateMotion처럼 이동 중에도 다음 명령을 받고 ACK함)
+    - ":"가 없는 줄은 예전 방식처럼 숫자만 읽어서 이동
+    - 0xA5로 시작하면 바이너리 프레임(arm_protocol) : CRC 확인 → 이동 큐 → ACK 프레임 (자리가 없으면 상태 BUSY)
+    - BAUD 요청 : ACK 후 새 속도로 바꾸고, BAUD_FALLBACK_SEC 안에 올바른 프레임이 없으면 9600으로 복귀
+    - PING : ACK 후 마지막 프레임 번호를 지움 (펌웨어의 lastFrameSeq = -1)
+      (PC가 pty에 설정한 속도(termios)와 가짜 보드의 속도가 다르면 받은 바이트를 깨진 것으로 처리)
+- 실제 상황을 흉내내는 옵션
+    - move_sec : 숫자 1개 이동 시간 (기본 0.5초, 실제 팔은 관절 3개를 1도 / 10ms로 옮겨서 0.5~3초)
+    - move_queue : 이동 큐 크기 (작게 주면 BUSY / 다시 보내기 확인)
+    - drop_every=N : N번째 줄마다 받은 것을 무시 (ACK 손실 → 재전송 확인)
+    - unplug() / plug() : 포트가 끊겼다가 다시 연결되는 상황 (재연결 확인)
+- 포트 이름은 plug()할 때마다 바뀌므로, 고정된 심볼릭 링크(link, 기본 /tmp/fake_arduino)를 만들어 둠
+  → SerialChannel(link)로 열면 재연결 후에도 같은 경로 사용
+
+실행하면 채널 전체를 점검 (명령 순서 / 중복 없음 / 재전송 / 재연결 / 프로그램 재시작):
+    python fake_arduino.py
+    python fake_arduino.py --drop-every 3 --commands 20
+    python fake_arduino.py --protocol binary --fast-baud 115200
+    python fake_arduino.py --move-sec 1.0 --move-queue 2 --drop-every 0
+'''
+
+import argparse
+import os
+import select
+import tempfile
+import threading
+import time
+from collections import deque
+
+try:
+    import pty
+    import termios
+    import tty
+except ImportError:  # Windows
+    pty = termios = tty = None
+
+from arm_protocol import (CMD_BATCH, CMD_BAUD, CMD_DIGITS, CMD_PING, MAX_BODY, START, STATUS_BAD,
+                          STATUS_BUSY, STATUS_OK, crc8, encode_ack, parse_batch)
+
+READY_TEXT = "Ready. Send digit 0~9."
+READY_EVERY = 0.2   # 첫 줄을 받기 전까지 Ready 반복 간격(초)
+BOOT_BAUD = 9600
+BAUD_FALLBACK_SEC = 1.0
+MOVE_SEC = 0.5      # 숫자 1개 이동 시간(초)
+MOVE_QUEUE = 32     # 펌웨어 MOVE_QUEUE와 같게
+
+
+class FakeArduino:
+    def __init__(self, link=None, move_sec=MOVE_SEC, drop_every=0, ready_delay=0.05, move_queue=MOVE_QUEUE):
+        if pty is None:
+            raise SystemExit("fake_arduino는 pty가 있는 OS(Linux / macOS)에서만 사용할 수 있습니다")
+        self.link = link or os.path.join(tempfile.gettempdir(), "fake_arduino")
+        self.move_sec = move_sec
+        self.drop_every = drop_every
+        self.ready_delay = ready_delay
+        self.move_queue = move_queue
+
+        self.moves = []          # 실제로 이동한 숫자 순서 (중복 제거 확인용)
+        self.lines = 0           # 받은 줄 / 프레임 수
+        self.dropped = 0         # drop_every로 무시한 줄 / 프레임 수
+        self.crc_errors = 0
+        self.garbled = 0         # 속도가 맞지 않아 버린 바이트 수
+        self.busy = 0            # 이동 큐가 가득 차서 BUSY로 응답한 수
+        self._pending = deque()  # 이동 큐 (아직 움직이지 않은 숫자)
+        self._moving = False
+        self._move_cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self.baud = BOOT_BAUD
+        self._baud_deadline = None   # 속도 변경 후 확인을 기다리는 시각
+        self._last_seq = None    # 마지막으로 처리한 seq (펌웨어의 lastSeq)
+        self._master = self._slave = None
+        self._thread = None
+        self._stop = False
+        self.plug()
+
+    # =========================
+    # 연결 / 분리
+    # =========================
+    def plug(self):
+        # 새 pty를 만들고 link가 그 포트를 가리키게 함 (아두이노를 새로 꽂은 것처럼 lastSeq도 초기화)
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)  # 에코 / 줄바꿈 변환 없이 그대로 전달
+        tmp = self.link + ".tmp"
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        os.symlink(os.ttyname(self._slave), tmp)
+        os.replace(tmp, self.link)
+
+        self._last_seq = None
+        self.baud = BOOT_BAUD    # 리셋되면 원래 속도
+        self._baud_deadline = None
+        self._pending.clear()    # 리셋되면 남은 이동도 사라짐
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, args=(self._master,), name="fake-arduino", daemon=True)
+        self._thread.start()
+        self._mover = threading.Thread(target=self._run_moves, args=(self._master,), name="fake-arduino-move",
+                                       daemon=True)
+        self._mover.start()
+
+    def unplug(self):
+        # 포트를 닫아서 PC 쪽 read / write가 실패하게 함
+        self._stop = True
+        with self._move_cond:
+            self._move_cond.notify_all()
+        self._thread.join(timeout=1.0)
+        self._mover.join(timeout=self.move_sec + 1.0)
+        for fd in (self._master, self._slave):
+            os.close(fd)
+        self._master = self._slave = None
+
+    def wait_idle(self, timeout=None):
+        # 이동 큐가 빌 때까지 대기 (이동이 모두 끝났으면 True)
+        with self._move_cond:
+            return self._move_cond.wait_for(lambda: not self._pending and not self._moving, timeout)
+
+    def close(self):
+        if self._master is not None:
+            self.unplug()
+        if os.path.lexists(self.link):
+            os.remove(self.link)
+
+    # =========================
+    # 펌웨어 흉내
+    # =========================
+    def _run(self, fd):
+        time.sleep(self.ready_delay)  # setup() 시간
+        buf = b""
+        got_line = False
+        next_ready = 0.0
+        while not self._stop:
+            if not got_line and time.perf_counter() >= next_ready:
+                self._println(fd, READY_TEXT)
+                next_ready = time.perf_counter() + READY_EVERY
+            if self._baud_deadline is not None and time.perf_counter() > self._baud_deadline:
+                self.baud, self._baud_deadline = BOOT_BAUD, None  # 새 속도 확인 실패 → 복귀
+            ready, _, _ = select.select([fd], [], [], 0.05)
+            if not ready:
+                continue
+            got_line = True
+            try:
+                data = os.read(fd, 256)
+            except OSError:
+                break
+            if self._host_baud() not in (None, self.baud):
+                self.garbled += len(data)  # 속도가 다르면 실제 보드에서는 깨진 바이트
+                continue
+            buf = self._consume(fd, buf + data)
+
+    def _host_baud(self):
+        # PC가 포트에 설정한 속도 (pty는 실제로 느려지지 않지만 설정값은 확인 가능)
+        speed = termios.tcgetattr(self._slave)[5]
+        for baud in (9600, 19200, 38400, 57600, 115200):
+            if getattr(termios, f"B{baud}", None) == speed:
+                return baud
+        return None
+
+    def _consume(self, fd, buf):
+        # 텍스트 줄과 바이너리 프레임이 섞인 입력 처리 → 남은(미완성) 바이트 반환
+        while buf:
+            if buf[0] == START:
+                if len(buf) < 2:
+                    break
+                n = buf[1]
+                if n < 2 or n > MAX_BODY:
+                    self.crc_errors += 1
+                    buf = buf[1:]
+                    continue
+                if len(buf) < n + 3:
+                    break
+                frame, buf = buf[:n + 3], buf[n + 3:]
+                if crc8(frame[1:n + 2]) != frame[n + 2]:
+                    self.crc_errors += 1
+                    continue
+                self._handle_frame(fd, frame[2], frame[3], frame[4:n + 2])
+            elif b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                self._handle(fd, line.decode(errors="ignore").strip())
+            else:
+                break
+        return buf
+
+    def _lost(self):
+        # drop_every번째 입력은 전송 중에 손실된 것처럼 무시
+        self.lines += 1
+        if self.drop_every and self.lines % self.drop_every == 0:
+            self.dropped += 1
+            return True
+        return False
+
+    def _handle(self, fd, line):
+        if self._lost():
+            return
+
+        if ":" not in line:
+            if not self._queue_moves([int(c) for c in line if c.isdigit()]):
+                self._println(fd, "Busy")
+            return
+
+        seq, payload = line.split(":", 1)
+        if seq != self._last_seq:  # 재전송된 명령이면 이미 큐에 넣음 : ACK만 다시 보냄
+            if not self._queue_moves([int(c) for c in payload if c.isdigit()]):
+                self._println(fd, f"BUSY {seq}")
+                return
+            self._last_seq = seq
+        self._println(fd, f"ACK {seq}")
+
+    def _handle_frame(self, fd, seq, cmd, data):
+        if self._lost():
+            return
+        self._baud_deadline = None  # 새 속도에서 올바른 프레임을 받음
+
+        if cmd == CMD_BAUD:
+            baud = int.from_bytes(data, "little")
+            ok = len(data) == 4 and baud in (9600, 19200, 38400, 57600, 115200)
+            self._write(fd, encode_ack(seq, STATUS_OK if ok else STATUS_BAD))
+            if ok:
+                self.baud = baud
+                self._baud_deadline = time.perf_counter() + BAUD_FALLBACK_SEC
+            return
+        if cmd == CMD_PING:
+            if isinstance(self._last_seq, tuple):
+                self._last_seq = None   # 텍스트 명령 번호(lastSeq)는 그대로
+            self._write(fd, encode_ack(seq))
+            return
+
+        try:
+            items = parse_batch(data) if cmd == CMD_BATCH else [(cmd, data)]
+            if any(c != CMD_DIGITS or any(d > 9 for d in digits) for c, digits in items):
+                raise ValueError
+        except ValueError:
+            self._write(fd, encode_ack(seq, STATUS_BAD))
+            return
+
+        if ("b", seq) != self._last_seq:  # 재전송된 프레임이면 이미 큐에 넣음
+            if not self._queue_moves([d for _, digits in items for d in digits]):
+                self._write(fd, encode_ack(seq, STATUS_BUSY))
+                return
+            self._last_seq = ("b", seq)
+        self._write(fd, encode_ack(seq))
+
+    def _queue_moves(self, digits):
+        # 모두 들어갈 자리가 있을 때만 넣음 (펌웨어 queueDigits)
+        with self._move_cond:
+            if len(self._pending) + len(digits) > self.move_queue:
+                self.busy += 1
+                return False
+            self._pending.extend(digits)
+            self._move_cond.notify_all()
+        return True
+
+    def _run_moves(self, fd):
+        # 펌웨어 updateMotion : 이동하는 동안에도 _run은 계속 받고 ACK함
+        while True:
+            with self._move_cond:
+                self._move_cond.wait_for(lambda: self._pending or self._stop)
+                if self._stop:
+                    return
+                d = self._pending.popleft()
+                self._moving = True
+            self._println(fd, f"Move to digit: {d}")
+            if self.move_sec:
+                time.sleep(self.move_sec)
+            with self._move_cond:
+                self._moving = False
+                if not self._stop:
+                    self.moves.append(str(d))
+                self._move_cond.notify_all()
+
+    def _write(self, fd, data):
+        try:
+            with self._write_lock:
+                os.write(fd, data)
+        except OSError:
+            pass
+
+    def _println(self, fd, text):
+        self._write(fd, (text + "\r\n").encode())  # Serial.println은 \r\n
+
+
+# =========================
+# 채널 점검
+# =========================
+def main():
+    from serial_channel import SerialChannel
+
+    parser = argparse.ArgumentParser(description="가짜 아두이노로 serial_channel 점검")
+    parser.add_argument("--commands", type=int, default=12, help="보낼 명령 수")
+    parser.add_argument("--drop-every", type=int, default=4, help="N번째 줄마다 무시 (0 : 손실 없음)")
+    parser.add_argument("--move-sec", type=float, default=MOVE_SEC, help="숫자 1개 이동 시간(초)")
+    parser.add_argument("--move-queue", type=int, default=MOVE_QUEUE, help="가짜 보드 이동 큐 크기")
+    parser.add_argument("--protocol", default="text", choices=("text", "binary"))
+    parser.add_argument("--fast-baud", type=int, default=None, help="binary 방식에서 협상할 속도 (예: 115200)")
+    parser.add_argument("--unplug-at", type=int, default=6, help="이 번호 명령 직전에 포트 분리 후 재연결 (-1 : 안 함)")
+    parser.add_argument("--restart-at", type=int, default=9,
+                        help="이 번호 명령 직전에 보드는 그대로 두고 채널만 새로 엶 "
+                             "(프로그램 재시작, -1 : 안 함, --fast-baud와 함께 쓰면 안 함)")
+    args = parser.parse_args()
+
+    def open_channel(start_seq=None):
+        return SerialChannel(board.link, ack_timeout=0.2, reconnect_sec=0.2, ready_timeout=1.0,
+                             protocol=args.protocol, fast_baud=args.fast_baud, start_seq=start_seq)
+
+    board = FakeArduino(move_sec=args.move_sec, drop_every=args.drop_every, move_queue=args.move_queue)
+    channel = open_channel()
+    print(f"fake board at {board.link}")
+
+    commands = [str((i * 7) % 10) if i % 3 else f"{i % 10}{(i + 3) % 10}" for i in range(1, args.commands + 1)]
+    start = time.perf_counter()
+    results = []
+    for i, command in enumerate(commands):
+        if i == args.unplug_at:
+            # 이동이 끝난 뒤 분리 (이동 중에 분리하면 보드가 리셋되어 남은 이동은 사라짐)
+            board.wait_idle(timeout=args.move_sec * 40 + 5.0)
+            board.unplug()
+            time.sleep(0.3)
+            board.plug()
+        # fast_baud : 리셋되지 않은 보드는 바꾼 속도에 머물러 있어 새 채널이 9600으로 열 수 없으므로 재시작은 건너뜀
+        if i == args.restart_at and i > 0 and not args.fast_baud:
+            # 보드가 리셋되지 않은 채 프로그램만 다시 켬
+            # binary : 첫 명령 번호가 보드가 마지막으로 실행한 번호와 같아지도록 시작 번호를 고름
+            #          (연결할 때 PING이 번호를 1개 먼저 씀, 연결된 뒤에 보내야 순서가 정해짐)
+            #          → PING이 번호를 지우지 않으면 ACK만 오고 이동 안 함
+            # text : 무작위 시작 번호 (PING 없음)
+            start_seq = None
+            if args.protocol == "binary":
+                start_seq = (seq - 2) % 9999
+            channel.close()
+            channel = open_channel(start_seq)
+            channel.connected.wait(5.0)
+        # send()가 바로 반환하는지 (추론 루프가 멈추지 않는지) 확인
+        t = time.perf_counter()
+        seq = channel.send(command)
+        send_ms = (time.perf_counter() - t) * 1000.0
+        results.append((command, channel.wait(seq, timeout=5.0 + channel.busy_timeout), send_ms))
+
+    ack_elapsed = time.perf_counter() - start
+    board.wait_idle(timeout=args.move_sec * 40 + 5.0)
+    elapsed = time.perf_counter() - start
+    channel.close()
+    board.close()
+
+    expected = [c for command in commands for c in command]
+    print(channel.summary())
+    print(f"board: {board.lines} lines/frames, dropped {board.dropped}, crc errors {board.crc_errors}, "
+          f"garbled {board.garbled} bytes, busy {board.busy}, baud {board.baud}, moves {''.join(board.moves)}")
+    print(f"max send() call {max(r[2] for r in results):.3f} ms, all acked {ack_elapsed:.2f}s, "
+          f"moves done {elapsed:.2f}s")
+    ok = all(r[1] for r in results) and board.moves == expected
+    print("OK" if ok else f"FAIL : expected moves {''.join(expected)}, results {results}")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
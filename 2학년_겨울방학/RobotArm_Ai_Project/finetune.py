@@ -0,0 +1,126 @@
+'''
+finetune의 Docstring
+
+모아 둔 어려운 입력(hard example)으로 mnist_cnn.h5를 이어서 학습 (처음부터 다시 학습하지 않음)
+
+이 코드의 목적:
+- 실시간 인식이 datasets/hard에 저장한 "라벨이 붙은 어려운 입력"으로 기존 모델을 조금 더 학습
+- 어려운 입력만으로 학습하면 MNIST에서 잘 되던 숫자를 잊어버리므로(catastrophic forgetting),
+  MNIST 학습 데이터 일부(replay)를 섞어서 학습
+- 학습률을 낮게(1e-4) 잡고 에포크도 적게 → 기존 가중치에서 조금만 움직임
+- 학습 전 / 후의 MNIST 테스트 정확도와 어려운 입력 정확도를 출력
+  어려운 입력 정확도는 학습에 쓰지 않은 holdout(저장소마다 가장 최근 --holdout 비율)으로 계산
+  (연속 프레임끼리는 거의 같은 입력이므로 무작위가 아니라 저장 순서로 나눔)
+- MNIST 정확도가 max_drop보다 많이 떨어지면 저장하지 않음 (--force로 무시)
+- 기존 모델을 덮어쓸 때는 <모델>.bak으로 백업
+
+사용 예:
+    python finetune.py                                  # datasets/hard → mnist_cnn.h5 갱신
+    python finetune.py --hard datasets/hard datasets/webcam --replay 5000 --epochs 3 --out mnist_cnn_ft.h5
+'''
+
+import argparse
+import os
+import shutil
+
+import numpy as np
+import tensorflow as tf
+
+from dataset_store import DatasetStore, cache_mnist
+from mnist_train import make_dataset
+
+
+def load_labeled(paths, holdout=0.0):
+    '''
+    여러 저장소에서 라벨이 있는 샘플만 모아 ((x uint8, y) 학습용, (x, y) 평가용) 반환
+    - 저장소마다 라벨 있는 샘플의 마지막 holdout 비율을 평가용으로 떼어 둠 (저장 순서 = 수집 순서)
+    '''
+    train, held = ([], []), ([], [])
+    for path in paths:
+        store = DatasetStore(path)
+        keep = store.labels >= 0
+        x, y = store.images[keep], store.labels[keep]
+        n_eval = int(round(len(x) * holdout))
+        cut = len(x) - n_eval
+        train[0].append(x[:cut])
+        train[1].append(y[:cut])
+        held[0].append(x[cut:])
+        held[1].append(y[cut:])
+        print(f"[DATA] {path}: {int(keep.sum())} labeled / {len(store)} (train {cut}, holdout {n_eval})")
+    return _concat(*train), _concat(*held)
+
+def _concat(xs, ys):
+    if not xs:
+        return np.empty((0, 28, 28), np.uint8), np.empty(0, np.int16)
+    return np.concatenate(xs), np.concatenate(ys)
+
+def replay_subset(x, y, n, seed=0):
+    # MNIST 학습 데이터에서 n개를 무작위로 뽑음 (memmap에서 필요한 샘플만 읽음)
+    idx = np.sort(np.random.default_rng(seed).choice(len(x), size=min(n, len(x)), replace=False))
+    return x[idx], y[idx]
+
+def evaluate(model, x, y, batch_size=256):
+    if len(x) == 0:
+        return float("nan")
+    _, acc = model.evaluate(make_dataset(x, y, batch_size, cache=False), verbose=0)
+    return float(acc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="어려운 입력 + MNIST replay로 모델 이어서 학습")
+    parser.add_argument("--model", default="mnist_cnn.h5", help="이어서 학습할 모델")
+    parser.add_argument("--out", default=None, help="저장 경로 (기본 : --model 덮어쓰기, .bak 백업)")
+    parser.add_argument("--hard", nargs="+", default=["datasets/hard"], help="어려운 입력 저장소 폴더")
+    parser.add_argument("--data-root", default="datasets", help="MNIST 캐시 폴더 (dataset_store)")
+    parser.add_argument("--replay", type=int, default=3000, help="섞을 MNIST 학습 샘플 수")
+    parser.add_argument("--hard-repeat", type=int, default=3, help="어려운 입력을 몇 번 반복해 넣을지")
+    parser.add_argument("--holdout", type=float, default=0.2, help="평가용으로 남길 어려운 입력 비율 (최근 것부터)")
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--lr", type=float, default=1e-4)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-drop", type=float, default=0.005, help="허용하는 MNIST 정확도 하락")
+    parser.add_argument("--force", action="store_true", help="정확도가 떨어져도 저장")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    (x_hard, y_hard), (x_eval, y_eval) = load_labeled(args.hard, args.holdout)
+    if len(x_hard) == 0:
+        raise SystemExit("라벨이 붙은 어려운 입력이 없습니다 (digit_predict_live_stable.py의 HARD_EXAMPLE_DIR 확인)")
+
+    train_store, test_store = cache_mnist(args.data_root)
+    x_replay, y_replay = replay_subset(train_store.images, train_store.labels, args.replay, args.seed)
+    x_test, y_test = test_store.images, test_store.labels
+
+    # 어려운 입력은 개수가 적으므로 hard_repeat번 반복해서 replay와 비율을 맞춤
+    x_fit = np.concatenate([x_replay] + [x_hard] * args.hard_repeat)
+    y_fit = np.concatenate([y_replay.astype(np.int16)] + [y_hard] * args.hard_repeat)
+
+    model = tf.keras.models.load_model(args.model, compile=False)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=args.lr),
+                  loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+
+    # hard 정확도는 학습에 쓰지 않은 holdout 기준 (없으면 nan)
+    before = (evaluate(model, x_test, y_test), evaluate(model, x_eval, y_eval))
+    print(f"before : mnist {before[0]:.4f}  hard {before[1]:.4f}")
+
+    tf.keras.utils.set_random_seed(args.seed)
+    train_ds = make_dataset(x_fit, y_fit, args.batch_size, training=True, seed=args.seed)
+    model.fit(train_ds, epochs=args.epochs)
+
+    after = (evaluate(model, x_test, y_test), evaluate(model, x_eval, y_eval))
+    print(f"after  : mnist {after[0]:.4f}  hard {after[1]:.4f}")
+
+    drop = before[0] - after[0]
+    if drop > args.max_drop and not args.force:
+        raise SystemExit(f"MNIST 정확도가 {drop:.4f} 떨어져서 저장하지 않습니다 (--max-drop / --force)")
+
+    out = args.out or args.model
+    if os.path.abspath(out) == os.path.abspath(args.model):
+        shutil.copyfile(args.model, args.model + ".bak")
+        print(f"backup: {args.model}.bak")
+    model.save(out)
+    print(f"Model saved as {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+'''
+frame_pipeline의 Docstring
+
+캡처 / 추론 / 표시 단계를 스레드로 분리하기 위한 도구 모음
+
+이 코드의 목적:
+- 카메라 캡처를 별도 스레드에서 돌려서, 느린 추론(model.predict)이 다음 프레임 캡처를 막지 않도록 함
+- 단계 사이는 "가장 최신 값 1개만 유지하는" 큐(LatestQueue)로 연결
+  → 드라이버 버퍼에 오래된 프레임이 쌓이지 않고, 추론은 항상 가장 최근 프레임을 처리
+- 동영상 / 합성 입력처럼 실시간이 아닌 입력(frame_source의 live=False)은 BlockingQueue로 연결
+  → 캡처가 추론 속도에 맞춰 기다리므로 프레임을 하나도 버리지 않음 (스레드 타이밍과 무관하게 같은 결과)
+- 단계별 FPS와 end-to-end 지연(프레임 캡처 시각 → 결과 사용 시각)을 측정
+
+구성:
+- Frame        : 캡처된 프레임 + 순번(seq) + 캡처 시각(t_capture) + 입력 기준 시각(t_source)
+- LatestQueue  : 크기 1짜리 "덮어쓰기" 큐 (버려진 프레임 수를 함께 기록)
+- BlockingQueue: 가득 차면 put이 기다리는 큐 (LatestQueue와 같은 사용법)
+- StageStats   : 단계별 FPS / 지연 시간 통계 (최근 N개 기준 이동 평균)
+- CaptureThread: cap.read()만 반복하는 캡처 전용 스레드
+'''
+
+import threading
+import time
+from collections import deque
+
+
+# =========================
+# 프레임 묶음
+# =========================
+class Frame:
+    '''
+    캡처된 프레임 1장
+
+    t_capture는 time.perf_counter() 기준 시각이므로,
+    이후 단계에서 perf_counter() - t_capture 로 "이 프레임이 얼마나 오래된 것인지" 계산할 수 있음
+    t_source는 입력이 알려준 프레임 시각(동영상 / 합성 입력의 재생 위치, frame_source의 timestamp)이고,
+    없으면(웹캠) t_capture와 같음 → 안정성 판단처럼 "프레임이 찍힌 시각"이 필요한 곳에 사용
+    '''
+    __slots__ = ("seq", "image", "t_capture", "t_source")
+
+    def __init__(self, seq, image, t_capture, t_source=None):
+        self.seq = seq              # 캡처 순번 (0부터 증가)
+        self.image = image          # BGR 영상 (numpy 배열)
+        self.t_capture = t_capture  # 캡처 시각 (perf_counter)
+        self.t_source = t_capture if t_source is None else t_source  # 입력 기준 시각 (초)
+
+    def age(self, now=None):
+        # 캡처 후 지난 시간(초)
+        if now is None:
+            now = time.perf_counter()
+        return now - self.t_capture
+
+
+# =========================
+# 최신 값 큐 (크기 1)
+# =========================
+class LatestQueue:
+    '''
+    항상 "마지막으로 넣은 값 1개"만 보관하는 큐
+
+    - put : 이전 값이 아직 소비되지 않았다면 덮어쓰고 dropped를 1 증가
+    - get : 새 값이 들어올 때까지 최대 timeout초 대기, 없으면 None 반환
+    - close : 대기 중인 get을 깨워서 파이프라인 종료를 알림
+
+    일반 queue.Queue(maxsize=1)과 달리 put이 절대 막히지 않으므로,
+    캡처 스레드가 느린 추론 때문에 멈추는 일이 없음
+    '''
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self._closed = False
+        self.dropped = 0    # 소비되지 못하고 덮어써진 값 개수
+
+    def put(self, item):
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._has_item and not self._closed:
+                self._cond.wait(timeout)
+            if not self._has_item:
+                return None
+            item = self._item
+            self._item = None
+            self._has_item = False
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+# =========================
+# 모든 값을 전달하는 큐
+# =========================
+class BlockingQueue:
+    '''
+    넣은 값을 하나도 버리지 않는 큐 (LatestQueue와 같은 put / get / close / dropped)
+
+    - put : maxsize개가 차 있으면 자리가 날 때까지 대기 (close 후에는 기다리지 않고 버림)
+    - get : 값이 들어올 때까지 최대 timeout초 대기, 없으면 None 반환
+            close 후에도 남은 값은 모두 꺼낼 수 있음
+    - 동영상 / 합성 입력을 빨리 읽을 때 사용 → 처리 결과가 스레드 타이밍에 따라 달라지지 않음
+    '''
+
+    def __init__(self, maxsize=4):
+        self._cond = threading.Condition()
+        self._items = deque()
+        self._maxsize = maxsize
+        self._closed = False
+        self.dropped = 0    # close 후에 들어와서 버려진 값 개수
+
+    def put(self, item):
+        with self._cond:
+            while len(self._items) >= self._maxsize and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                self.dropped += 1
+                return
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()     # 기다리던 put을 깨움
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+# =========================
+# 단계별 통계
+# =========================
+class StageStats:
+    '''
+    한 단계(capture / infer / display)의 처리 속도와 지연 시간 통계
+
+    - tick(latency) : 한 번 처리할 때마다 호출 (latency는 선택, 초 단위)
+    - fps           : 최근 window개 처리 시각으로 계산한 초당 처리 횟수
+    - latency_ms    : 최근 window개 지연 시간의 평균(ms)
+    '''
+
+    def __init__(self, name, window=30):
+        self.name = name
+        self.count = 0
+        self._times = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def tick(self, latency=None):
+        now = time.perf_counter()
+        with self._lock:
+            self.count += 1
+            self._times.append(now)
+            if latency is not None:
+                self._latencies.append(latency)
+
+    @property
+    def fps(self):
+        with self._lock:
+            if len(self._times) < 2:
+                return 0.0
+            span = self._times[-1] - self._times[0]
+            return (len(self._times) - 1) / span if span > 0 else 0.0
+
+    @property
+    def latency_ms(self):
+        with self._lock:
+            if not self._latencies:
+                return 0.0
+            return 1000.0 * sum(self._latencies) / len(self._latencies)
+
+    def summary(self):
+        text = f"{self.name} {self.fps:5.1f} fps"
+        if self._latencies:
+            text += f" / {self.latency_ms:5.1f} ms"
+        return text
+
+
+# =========================
+# 캡처 전용 스레드
+# =========================
+class CaptureThread(threading.Thread):
+    '''
+    cap.read()만 반복해서 out_queue에 최신 프레임을 넣는 스레드
+
+    - 추론이 느려도 캡처는 카메라 속도대로 계속 진행
+    - 소비되지 못한 프레임은 LatestQueue에서 덮어써지므로 "항상 최신 프레임"만 남음
+      (out_queue가 BlockingQueue면 추론 속도에 맞춰 기다리며 모든 프레임 전달)
+    - 입력에 timestamp가 있으면(frame_source) Frame.t_source로 함께 전달
+    - 프레임을 더 읽을 수 없으면(카메라 끊김, 영상 끝) out_queue를 닫고 종료
+    '''
+
+    def __init__(self, cap, out_queue, stop_event, stats=None):
+        super().__init__(name="capture", daemon=True)
+        self.cap = cap
+        self.out_queue = out_queue
+        self.stop_event = stop_event
+        self.stats = stats
+        self.seq = 0
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                ret, image = self.cap.read()
+                if not ret:
+                    break
+
+                t_capture = time.perf_counter()
+                t_source = getattr(self.cap, "timestamp", None)
+                self.out_queue.put(Frame(self.seq, image, t_capture, t_source))
+                self.seq += 1
+
+                if self.stats is not None:
+                    self.stats.tick()
+        finally:
+            self.out_queue.close()
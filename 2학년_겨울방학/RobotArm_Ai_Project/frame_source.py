@@ -0,0 +1,361 @@
+'''
+frame_source의 Docstring
+
+프레임 입력(Source) / 화면 출력(Sink) 교체용 모듈
+
+이 코드의 목적:
+- 모든 스크립트가 cv2.VideoCapture(0)과 cv2.imshow에 고정되어 있어서,
+  웹캠이 없는 PC(빌드 서버)에서는 실행도, 속도 측정도 할 수 없었음
+- 입력을 웹캠 / 동영상 파일 / 이미지 폴더 / 합성 MNIST 숫자 화면 중에서 고를 수 있게 하고,
+  출력은 창 표시 또는 창 없는(headless) 모드 중에서 고를 수 있게 함
+- 모든 입력은 cv2.VideoCapture와 같은 read() / isOpened() / release()를 제공하므로,
+  기존 코드(cap.read() 루프, frame_pipeline.CaptureThread)를 그대로 사용할 수 있음
+- 동영상 / 이미지 / 합성 입력은 기본적으로 "기다리지 않고" 최대한 빨리 읽으므로
+  녹화 영상을 실시간보다 빠르게 돌려 처리량을 측정할 수 있음 (realtime=True면 원래 FPS로 재생)
+
+[입력 시각 / 실시간 여부]
+- timestamp : 마지막으로 읽은 프레임의 입력 기준 시각(초, 첫 프레임 = 0)
+  동영상은 프레임 번호 / 파일 FPS, 이미지 폴더 / 합성 입력은 프레임 번호 / fps(없으면 30)
+  웹캠은 None → 캡처 시각을 그대로 사용
+  → 최대한 빨리 읽어도 "3.5초 유지" 같은 시간 판단이 실제 재생 속도 기준으로 동작
+- live : 실시간 입력인지 (웹캠, realtime=True)
+  False면 읽는 속도를 소비하는 쪽에 맞춰도 되므로, 프레임을 버리지 말고 모두 처리해야 함
+  (digit_predict_live_stable은 frame_pipeline.BlockingQueue 사용)
+
+입력 지정 문자열 (open_source):
+- "0", "1", "webcam:0"     : 웹캠 번호
+- "video.mp4"              : 동영상 파일
+- "frames/"                : 이미지 폴더 (파일 이름 순서)
+- "synthetic", "synthetic:3,7,371" : 합성 숫자 화면 (쉼표로 구분한 숫자열을 차례대로 표시)
+
+사용 예:
+    python digit_predict_live_stable.py synthetic:3,7,0 --headless
+    python camera_binary.py recorded.mp4 --headless --record out.mp4
+'''
+
+import argparse
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+DEFAULT_FPS = 30.0   # FPS 정보가 없는 입력의 timestamp 계산용
+
+
+# =========================
+# 입력 1 : 웹캠
+# =========================
+class WebcamSource:
+    live = True
+    timestamp = None    # 캡처 시각 사용
+
+    def __init__(self, index=0):
+        self.cap = cv2.VideoCapture(index)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+# =========================
+# 입력 2 : 동영상 파일
+# =========================
+class VideoFileSource:
+    '''
+    동영상 파일을 프레임 단위로 읽음
+    - realtime=False : 기다리지 않고 최대한 빨리 읽음 (처리량 측정용)
+    - realtime=True  : 파일의 FPS에 맞춰 재생 (실제 카메라처럼)
+    - loop=True      : 끝나면 처음부터 다시
+    '''
+
+    def __init__(self, path, realtime=False, loop=False):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.loop = loop
+        self.live = realtime
+        fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap.isOpened() else 0
+        self.fps = fps if fps > 0 else DEFAULT_FPS
+        self.frame_interval = 1.0 / fps if realtime and fps > 0 else 0.0
+        self.frames_read = 0    # 반복 재생해도 계속 증가 (timestamp가 뒤로 가지 않도록)
+        self._next_time = None
+
+    @property
+    def timestamp(self):
+        return (self.frames_read - 1) / self.fps if self.frames_read else None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if ret:
+            self.frames_read += 1
+            self._next_time = _throttle(self._next_time, self.frame_interval)
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+# =========================
+# 입력 3 : 이미지 폴더
+# =========================
+class ImageDirSource:
+    # 폴더 안의 이미지들을 파일 이름 순서대로 읽음 (fps를 주면 그 속도로)
+    def __init__(self, path, fps=None, loop=False):
+        self.files = sorted(
+            f for f in glob.glob(os.path.join(path, "*")) if f.lower().endswith(IMAGE_EXTS)
+        )
+        self.loop = loop
+        self.live = bool(fps)
+        self.fps = fps or DEFAULT_FPS
+        self.index = 0
+        self.frames_read = 0
+        self.frame_interval = 1.0 / fps if fps else 0.0
+        self._next_time = None
+
+    @property
+    def timestamp(self):
+        return (self.frames_read - 1) / self.fps if self.frames_read else None
+
+    def isOpened(self):
+        return len(self.files) > 0
+
+    def read(self):
+        if self.index >= len(self.files):
+            if not self.loop or not self.files:
+                return False, None
+            self.index = 0
+
+        frame = cv2.imread(self.files[self.index], cv2.IMREAD_COLOR)
+        self.index += 1
+        if frame is None:
+            return False, None
+
+        self.frames_read += 1
+        self._next_time = _throttle(self._next_time, self.frame_interval)
+        return True, frame
+
+    def release(self):
+        pass
+
+
+# =========================
+# 입력 4 : 합성 MNIST 숫자 화면
+# =========================
+class SyntheticDigitSource:
+    '''
+    "흰 종이에 검은 펜으로 쓴 숫자"를 웹캠으로 찍은 것처럼 보이는 프레임을 생성
+
+    - sequence의 각 항목(예: "3", "371")을 hold_frames 프레임(기본 150 = 30fps 기준 5초) 동안 보여준 뒤 다음 항목으로
+      (STABLE_SEC 3.5초 + COOLDOWN_SEC 1초보다 길어야 항목마다 확정됨)
+    - 숫자 모양은 MNIST 손글씨(~/.keras/datasets/mnist.npz가 있을 때)를 확대해서 사용하고,
+      없으면 OpenCV 글꼴로 그림
+    - 조명 기울기, 카메라 잡음, 프레임마다 약간의 흔들림을 넣어 실제 영상과 비슷하게 만듦
+    - label : 현재 프레임에 보이는 정답 문자열 (벤치마크 / 회귀 테스트에서 정답 비교용)
+    - loop=False면 sequence를 한 번 다 보여준 뒤 read()가 False를 반환
+    '''
+
+    def __init__(self, sequence=("3", "7", "371", "0"), size=(640, 480), hold_frames=150,
+                 digit_height=160, fps=None, loop=False, seed=0, mnist_path=None):
+        self.sequence = [str(s) for s in sequence]
+        self.width, self.height = size
+        self.hold_frames = hold_frames
+        self.digit_height = digit_height
+        self.loop = loop
+        self.live = bool(fps)
+        self.fps = fps or DEFAULT_FPS
+        self.frame_interval = 1.0 / fps if fps else 0.0
+        self.rng = np.random.default_rng(seed)
+        self.frame_index = 0
+        self.label = None
+        self._next_time = None
+        self._glyphs = {}   # 항목별로 고정된 숫자 모양 (같은 항목 동안 같은 손글씨)
+
+        self._mnist = None
+        mnist_path = mnist_path or os.path.expanduser("~/.keras/datasets/mnist.npz")
+        if os.path.exists(mnist_path):
+            with np.load(mnist_path) as data:
+                self._mnist = (data["x_test"], data["y_test"])
+
+        # 조명 기울기 (왼쪽 위가 밝고 오른쪽 아래가 약간 어두움)
+        gy, gx = np.mgrid[0:self.height, 0:self.width].astype(np.float32)
+        self._paper = 215 - 35 * (gx / self.width + gy / self.height) / 2
+
+    @property
+    def timestamp(self):
+        return (self.frame_index - 1) / self.fps if self.frame_index else None
+
+    def isOpened(self):
+        return len(self.sequence) > 0
+
+    def _glyph(self, digit):
+        # 숫자 하나 → 흰 글씨/검은 배경 uint8 (높이 digit_height)
+        h = self.digit_height
+        if self._mnist is not None:
+            images, labels = self._mnist
+            candidates = np.flatnonzero(labels == digit)
+            img = images[self.rng.choice(candidates)]
+            return cv2.resize(img, (h, h), interpolation=cv2.INTER_CUBIC)
+
+        img = np.zeros((h, int(h * 0.7)), dtype=np.uint8)
+        cv2.putText(img, str(digit), (int(h * 0.05), int(h * 0.85)), cv2.FONT_HERSHEY_SIMPLEX,
+                    h / 32.0, 255, max(3, h // 12))
+        return img
+
+    def _render(self, text):
+        if text not in self._glyphs:
+            self._glyphs[text] = [self._glyph(int(c)) for c in text]
+        glyphs = self._glyphs[text]
+
+        ink = np.zeros((self.height, self.width), dtype=np.float32)
+        total_w = sum(g.shape[1] for g in glyphs) + 40 * (len(glyphs) - 1)
+        jitter_x, jitter_y = self.rng.integers(-4, 5, size=2)
+        x = max(0, (self.width - total_w) // 2 + int(jitter_x))
+        y = max(0, (self.height - self.digit_height) // 2 + int(jitter_y))
+        for g in glyphs:
+            gh, gw = g.shape
+            gw = min(gw, self.width - x)
+            gh = min(gh, self.height - y)
+            if gw <= 0 or gh <= 0:
+                break
+            ink[y:y + gh, x:x + gw] = np.maximum(ink[y:y + gh, x:x + gw], g[:gh, :gw])
+            x += g.shape[1] + 40
+
+        # 종이 밝기에서 잉크만큼 어둡게 + 카메라 잡음
+        gray = self._paper * (1.0 - 0.8 * ink / 255.0)
+        gray += self.rng.normal(0, 4, size=gray.shape).astype(np.float32)
+        gray = cv2.GaussianBlur(np.clip(gray, 0, 255).astype(np.uint8), (3, 3), 0)
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+    def read(self):
+        item = self.frame_index // self.hold_frames
+        if item >= len(self.sequence):
+            if not self.loop:
+                return False, None
+            item %= len(self.sequence)
+
+        self.label = self.sequence[item]
+        frame = self._render(self.label)
+        self.frame_index += 1
+        self._next_time = _throttle(self._next_time, self.frame_interval)
+        return True, frame
+
+    def release(self):
+        pass
+
+
+def _throttle(next_time, interval):
+    # interval(초)마다 한 프레임이 되도록 대기 → 다음 목표 시각 반환 (interval=0이면 대기 없음)
+    if interval <= 0:
+        return None
+    now = time.perf_counter()
+    if next_time is not None and next_time > now:
+        time.sleep(next_time - now)
+        now = next_time
+    return now + interval
+
+
+def open_source(spec="0", realtime=False, loop=False):
+    # 입력 지정 문자열 → 입력 객체 (위 Docstring 참고)
+    spec = str(spec)
+    if spec.isdigit():
+        return WebcamSource(int(spec))
+    if spec.startswith("webcam:"):
+        return WebcamSource(int(spec.split(":", 1)[1]))
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        kwargs = {"fps": 30 if realtime else None, "loop": loop}
+        if ":" in spec:
+            kwargs["sequence"] = spec.split(":", 1)[1].split(",")
+        return SyntheticDigitSource(**kwargs)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, fps=30 if realtime else None, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
+
+
+# =========================
+# 출력 : 창 / headless
+# =========================
+class WindowSink:
+    # 기존과 같이 cv2.imshow로 창에 표시
+    def show(self, name, image):
+        cv2.imshow(name, image)
+
+    def poll_key(self, delay_ms=1):
+        return cv2.waitKey(delay_ms) & 0xFF
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class HeadlessSink:
+    '''
+    창을 띄우지 않는 출력 (빌드 서버 / 처리량 측정용)
+    - record_path를 주면 첫 번째 창 이름으로 들어온 영상을 동영상 파일로 저장
+    - poll_key는 항상 "키 입력 없음"(255)을 반환 → 입력이 끝날 때까지 실행
+    '''
+
+    def __init__(self, record_path=None, fps=30.0):
+        self.record_path = record_path
+        self.fps = fps
+        self.frames = {}    # 창 이름별 표시 횟수
+        self._writer = None
+        self._record_name = None
+
+    def show(self, name, image):
+        self.frames[name] = self.frames.get(name, 0) + 1
+        if self.record_path is None:
+            return
+        if self._record_name is None:
+            self._record_name = name
+        if name != self._record_name:
+            return
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if self._writer is None:
+            h, w = image.shape[:2]
+            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+            self._writer = cv2.VideoWriter(self.record_path, fourcc, self.fps, (w, h))
+        self._writer.write(image)
+
+    def poll_key(self, delay_ms=1):
+        return 255
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.release()
+
+
+# =========================
+# 명령줄 인자
+# =========================
+def add_source_arguments(parser, default="0"):
+    parser.add_argument("source", nargs="?", default=default,
+                        help="입력: 웹캠 번호 / 동영상 파일 / 이미지 폴더 / synthetic[:3,7,371]")
+    parser.add_argument("--headless", action="store_true", help="창을 띄우지 않음")
+    parser.add_argument("--record", default=None, help="headless 모드에서 결과 영상 저장 경로")
+    parser.add_argument("--realtime", action="store_true", help="파일/합성 입력을 원래 FPS로 재생")
+    parser.add_argument("--loop", action="store_true", help="파일/합성 입력을 반복 재생")
+    return parser
+
+def open_from_args(args):
+    # 인자 → (입력, 출력)
+    cap = open_source(args.source, realtime=args.realtime, loop=args.loop)
+    display = HeadlessSink(args.record) if args.headless else WindowSink()
+    return cap, display
+
+def open_from_cli(default="0", description=None):
+    # 간단한 스크립트용 : 명령줄 인자를 읽어 바로 (입력, 출력) 반환
+    parser = add_source_arguments(argparse.ArgumentParser(description=description), default)
+    return open_from_args(parser.parse_args())
@@ -0,0 +1,128 @@
+'''
+hard_examples의 Docstring
+
+실시간 인식의 "어려운 입력(hard example)"을 모아 두는 비동기 저장 큐
+
+이 코드의 목적:
+- 숫자 외곽선은 찾았지만 conf < CONF_TH 또는 margin < MARGIN_TH 라서 버려지던 프레임이,
+  모델이 웹캠 숫자를 잘 모르는 바로 그 입력이므로 추가 학습(finetune.py)에 가장 쓸모 있음
+- 그런 프레임의 28x28 입력과 확률 벡터를 dataset_store 저장소(예: datasets/hard)에 저장
+- 디스크 쓰기는 별도 스레드에서 처리 → 추론 루프는 배열 복사 + 큐에 넣기만 하고 바로 돌아감
+  (큐가 가득 차면 기다리지 않고 버림, 버린 개수는 통계에 표시)
+
+라벨 붙이기:
+- 어려운 입력은 보통 "숫자를 보여주기 시작한 직후"에 생기고, 잠시 뒤 같은 숫자가 안정적으로 확정됨
+- 그래서 바로 저장하지 않고 label_window초 동안 대기시키고,
+  그 사이에 확정(confirm)이 오면 숫자 개수가 같고 확정 숫자와 맞는 입력에만 라벨을 붙여 저장
+  맞는 입력 : 모든 자리에서 확정 숫자가 확률 1, 2등 안에 있거나,
+              확정된 후보가 시작된 뒤(since)에 들어온 입력 (다른 숫자를 보던 때의 입력에 잘못 붙이지 않도록)
+- 나머지와 시간 안에 확정이 없는 입력은 라벨 없이(-1) 저장 (나중에 직접 확인할 수 있게)
+
+사용법:
+    hard = HardExampleQueue("datasets/hard")
+    hard.put(batch, probs)                 # 조건을 통과하지 못한 프레임
+    hard.confirm("3", since=t_start)       # 숫자가 확정되었을 때 (t_start : 확정된 후보의 시작 시각)
+    hard.close()                           # 종료 시 남은 입력 저장 + 스레드 종료
+'''
+
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from dataset_store import DatasetStore
+
+LABEL_WINDOW = 5.0     # 확정을 기다리는 시간(초)
+MIN_INTERVAL = 0.2     # 연속 프레임이 거의 같은 입력을 수십 장 저장하지 않도록 최소 간격(초)
+MAX_QUEUE = 256        # 쓰기 대기열 최대 길이 (넘으면 버림)
+
+
+class HardExampleQueue:
+    def __init__(self, path, label_window=LABEL_WINDOW, min_interval=MIN_INTERVAL, max_queue=MAX_QUEUE):
+        self.store = DatasetStore.open_or_create(path, source="hard_examples")
+        self.label_window = label_window
+        self.min_interval = min_interval
+
+        self._pending = deque()                  # (시각, batch, probs) : 확정 대기 중
+        self._writes = queue.Queue(maxsize=max_queue)
+        self._last_put = None                    # 마지막으로 받은 시각 (입력 시각은 0부터 시작할 수 있음)
+
+        self.captured = 0
+        self.labeled = 0
+        self.dropped = 0
+
+        self._thread = threading.Thread(target=self._writer, name="hard-examples", daemon=True)
+        self._thread.start()
+
+    # =========================
+    # 추론 스레드에서 호출 (빠르게 반환)
+    # =========================
+    def put(self, batch, probs, now=None):
+        now = time.time() if now is None else now
+        if self._last_put is not None and now - self._last_put < self.min_interval:
+            return False
+        self._last_put = now
+
+        # batch는 정규화기 버퍼 view이므로 복사해서 보관
+        self._pending.append((now, np.array(batch, copy=True), np.array(probs, copy=True)))
+        self.captured += 1
+        self._expire(now)
+        return True
+
+    def confirm(self, sequence, now=None, since=None):
+        # 숫자 확정 : 최근 label_window초 안의 대기 입력 중 확정 숫자와 맞는 것에만 라벨을 붙여 저장
+        now = time.time() if now is None else now
+        labels = [int(c) for c in sequence]
+        while self._pending:
+            t, batch, probs = self._pending.popleft()
+            if (now - t <= self.label_window and len(batch) == len(labels)
+                    and (_in_top2(probs, labels) or (since is not None and t >= since))):
+                self._submit(batch, probs, labels, t)
+                self.labeled += len(labels)
+            else:
+                self._submit(batch, probs, None, t)
+
+    def _expire(self, now):
+        # 오래 기다린 입력은 라벨 없이 저장
+        while self._pending and now - self._pending[0][0] > self.label_window:
+            t, batch, probs = self._pending.popleft()
+            self._submit(batch, probs, None, t)
+
+    def _submit(self, batch, probs, labels, t):
+        try:
+            self._writes.put_nowait((batch, probs, labels, t))
+        except queue.Full:
+            self.dropped += len(batch)
+
+    # =========================
+    # 쓰기 스레드
+    # =========================
+    def _writer(self):
+        while True:
+            item = self._writes.get()
+            if item is None:
+                break
+            batch, probs, labels, t = item
+            meta = [{"source": "hard", "captured": round(t, 3),
+                     "pred": int(np.argmax(p)), "probs": [round(float(v), 4) for v in p]} for p in probs]
+            self.store.append(batch, labels=labels, meta=meta)
+
+    def close(self):
+        # 남은 대기 입력은 라벨 없이 저장하고 쓰기 스레드 종료
+        while self._pending:
+            t, batch, probs = self._pending.popleft()
+            self._submit(batch, probs, None, t)
+        self._writes.put(None)
+        self._thread.join(timeout=5.0)
+
+    def summary(self):
+        return (f"hard examples: captured {self.captured} frames, labeled {self.labeled} digits, "
+                f"dropped {self.dropped}, store {len(self.store)}")
+
+
+def _in_top2(probs, labels):
+    # 모든 자리에서 라벨이 확률 1, 2등 안에 있는지
+    top2 = np.argsort(probs, axis=1)[:, -2:]
+    return all(label in row for label, row in zip(labels, top2))
@@ -0,0 +1,403 @@
+'''
+inference_engine의 Docstring
+
+MNIST CNN 추론 백엔드 모음 (model.predict 대체)
+
+이 코드의 목적:
+- 매 프레임 model.predict(1x28x28x1)를 호출하면, Keras가 predict 루프(데이터 어댑터, 콜백 등)를
+  매번 새로 준비하기 때문에 "작은 입력 1장"에 비해 준비 비용이 훨씬 큼
+- 같은 모델(mnist_cnn.h5)을 더 가볍게 실행하는 백엔드를 제공하고,
+  현재 PC(CPU)에서 가장 빠른 백엔드를 자동으로 선택
+
+백엔드 종류 (.h5 모델 기준, export_model.py로 만든 .tflite / SavedModel 폴더 / .npz는 경로로 바로 불러옴):
+- keras      : 기존 방식 model.predict (비교 기준용)
+- tf_function: tf.function으로 컴파일한 직접 호출 model(x, training=False)
+- tflite     : TFLite 인터프리터 (모델을 메모리에서 변환해서 사용)
+- numpy      : Conv2D / MaxPooling2D / Flatten / Dense를 NumPy로 직접 계산
+               (mnist_train.py의 구조 그대로, TensorFlow 없이도 .npz 가중치로 실행 가능)
+
+공통 사용법:
+    engine = load_engine("mnist_cnn.h5")       # backend="auto" : 가장 빠른 백엔드 선택
+    probs = engine.predict(x)                   # x: (N,28,28,1) float32 → (N,10) 확률
+
+TensorFlow는 실제로 필요한 순간에만 import 한다 (numpy 백엔드만 쓸 때는 import 하지 않음).
+'''
+
+import json
+import os
+import time
+
+import numpy as np
+
+BACKENDS = ("tf_function", "tflite", "numpy", "keras")  # auto 선택 시 후보 순서
+
+INPUT_SHAPE = (28, 28, 1)
+
+
+# =========================
+# 공통 도구
+# =========================
+def as_input_batch(x) -> np.ndarray:
+    # 입력을 (N,28,28,1) float32 연속 배열로 맞춤
+    x = np.asarray(x, dtype=np.float32)
+    if x.ndim == 2:
+        x = x[np.newaxis, ..., np.newaxis]
+    elif x.ndim == 3:
+        x = x[..., np.newaxis] if x.shape[-1] != 1 else x[np.newaxis]
+    return np.ascontiguousarray(x)
+
+def load_keras_model(path):
+    import tensorflow as tf
+    return tf.keras.models.load_model(path, compile=False)
+
+
+# =========================
+# 백엔드 1 : Keras model.predict (비교 기준)
+# =========================
+class KerasBackend:
+    name = "keras"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, x) -> np.ndarray:
+        return self.model.predict(as_input_batch(x), verbose=0)
+
+
+# =========================
+# 백엔드 2 : tf.function 직접 호출
+# =========================
+class TFFunctionBackend:
+    '''
+    model(x, training=False)를 tf.function으로 한 번 추적(trace)해두고 재사용
+    - input_signature의 배치 차원을 None으로 두어, 1장 / 여러 장 모두 재추적 없이 실행
+    '''
+    name = "tf_function"
+
+    def __init__(self, model):
+        import tensorflow as tf
+
+        self.model = model
+        self._fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((None,) + INPUT_SHAPE, tf.float32)],
+        )
+
+    def predict(self, x) -> np.ndarray:
+        return self._fn(as_input_batch(x)).numpy()
+
+
+# =========================
+# 백엔드 3 : TFLite 인터프리터
+# =========================
+class TFLiteBackend:
+    '''
+    Keras 모델을 메모리에서 TFLite로 변환하거나, .tflite 파일을 그대로 불러와 실행
+    - 입력 배치 크기가 바뀌면 resize_tensor_input 후 다시 allocate (같은 크기면 재사용)
+    - 입출력이 int8 / uint8로 양자화된 모델(export_model.py --int8-io)은
+      scale / zero_point로 변환해서 넣고 꺼냄 (predict 입출력은 항상 float32)
+    '''
+    name = "tflite"
+
+    def __init__(self, model=None, model_content=None, model_path=None, num_threads=None):
+        import tensorflow as tf
+
+        if model is not None:
+            model_content = tf.lite.TFLiteConverter.from_keras_model(model).convert()
+
+        self.interpreter = tf.lite.Interpreter(
+            model_content=model_content, model_path=model_path, num_threads=num_threads
+        )
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch = int(self._input["shape"][0])
+
+    def predict(self, x) -> np.ndarray:
+        x = as_input_batch(x)
+        if x.shape[0] != self._batch:
+            self.interpreter.resize_tensor_input(self._input["index"], x.shape)
+            self.interpreter.allocate_tensors()
+            self._batch = x.shape[0]
+
+        dtype = self._input["dtype"]
+        if dtype != np.float32:
+            scale, zero_point = self._input["quantization"]
+            info = np.iinfo(dtype)
+            x = np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(dtype)
+
+        self.interpreter.set_tensor(self._input["index"], x)
+        self.interpreter.invoke()
+        y = self.interpreter.get_tensor(self._output["index"])
+
+        if self._output["dtype"] != np.float32:
+            scale, zero_point = self._output["quantization"]
+            y = (y.astype(np.float32) - zero_point) * scale
+        return y
+
+
+# =========================
+# 백엔드 5 : SavedModel (export_model.py 결과 폴더)
+# =========================
+class SavedModelBackend:
+    # tf.saved_model.load로 불러와 serving_default 서명으로 실행
+    name = "saved_model"
+
+    def __init__(self, path):
+        import tensorflow as tf
+
+        self._loaded = tf.saved_model.load(path)  # 서명 함수가 참조하는 객체를 유지
+        self._fn = self._loaded.signatures["serving_default"]
+        self._input_name = list(self._fn.structured_input_signature[1].keys())[0]
+
+    def predict(self, x) -> np.ndarray:
+        out = self._fn(**{self._input_name: as_input_batch(x)})
+        return next(iter(out.values())).numpy()
+
+
+# =========================
+# 백엔드 4 : 순수 NumPy 순전파
+# =========================
+'''
+레이어 목록(layers)은 아래 형태의 dict 리스트
+- {"kind": "conv", "kernel": (kh,kw,C,O), "bias": (O,), "activation": "relu"}
+- {"kind": "pool", "size": 2}
+- {"kind": "flatten"}
+- {"kind": "dense", "kernel": (I,O), "bias": (O,), "activation": "relu" | "softmax"}
+mnist_train.py와 같은 padding='valid', stride 1 구조만 지원 (다르면 ValueError)
+'''
+def _activate(x, activation):
+    if activation == "relu":
+        np.maximum(x, 0, out=x)
+    elif activation == "softmax":
+        x -= x.max(axis=-1, keepdims=True)
+        np.exp(x, out=x)
+        x /= x.sum(axis=-1, keepdims=True)
+    elif activation not in (None, "linear"):
+        raise ValueError(f"지원하지 않는 activation: {activation}")
+    return x
+
+class NumpyBackend:
+    name = "numpy"
+
+    def __init__(self, layers):
+        self.layers = []
+        for layer in layers:
+            layer = dict(layer)
+            if layer["kind"] == "conv":
+                kernel = np.asarray(layer["kernel"], dtype=np.float32)
+                # (kh,kw,C,O) → (C,kh,kw,O) : sliding_window_view의 (C,kh,kw) 축 순서와 맞춤
+                layer["kernel"] = np.ascontiguousarray(kernel.transpose(2, 0, 1, 3))
+                layer["ksize"] = kernel.shape[:2]
+            if "bias" in layer:
+                layer["bias"] = np.asarray(layer["bias"], dtype=np.float32)
+            if layer["kind"] == "dense":
+                layer["kernel"] = np.asarray(layer["kernel"], dtype=np.float32)
+            self.layers.append(layer)
+
+    @classmethod
+    def from_keras(cls, model):
+        return cls(keras_to_layers(model))
+
+    @classmethod
+    def from_npz(cls, path):
+        return cls(load_numpy_weights(path))
+
+    def predict(self, x) -> np.ndarray:
+        x = as_input_batch(x)
+        for layer in self.layers:
+            kind = layer["kind"]
+            if kind == "conv":
+                kh, kw = layer["ksize"]
+                win = np.lib.stride_tricks.sliding_window_view(x, (kh, kw), axis=(1, 2))
+                # win: (N, H-kh+1, W-kw+1, C, kh, kw) → 커널과 (C,kh,kw) 축으로 내적
+                x = np.tensordot(win, layer["kernel"], axes=([3, 4, 5], [0, 1, 2]))
+                x += layer["bias"]
+                x = _activate(x, layer["activation"])
+            elif kind == "pool":
+                s = layer["size"]
+                n, h, w, c = x.shape
+                h, w = h // s, w // s  # valid pooling : 남는 줄은 버림
+                x = x[:, :h * s, :w * s, :].reshape(n, h, s, w, s, c).max(axis=(2, 4))
+            elif kind == "flatten":
+                x = x.reshape(x.shape[0], -1)  # Keras Flatten과 같은 (H,W,C) 순서
+            elif kind == "dense":
+                x = x @ layer["kernel"]
+                x += layer["bias"]
+                x = _activate(x, layer["activation"])
+        return x
+
+
+def keras_to_layers(model):
+    # Keras Sequential 모델 → NumpyBackend 레이어 목록
+    layers = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        cfg = layer.get_config()
+        if kind == "InputLayer":
+            continue
+        if kind == "Conv2D":
+            if cfg["padding"] != "valid" or tuple(cfg["strides"]) != (1, 1):
+                raise ValueError(f"{layer.name}: padding='valid', strides=1 Conv2D만 지원")
+            kernel, bias = layer.get_weights()
+            layers.append({"kind": "conv", "kernel": kernel, "bias": bias,
+                           "activation": cfg["activation"]})
+        elif kind == "MaxPooling2D":
+            if tuple(cfg["pool_size"]) != tuple(cfg["strides"]) or cfg["pool_size"][0] != cfg["pool_size"][1]:
+                raise ValueError(f"{layer.name}: 정사각형, stride=pool_size인 MaxPooling2D만 지원")
+            layers.append({"kind": "pool", "size": int(cfg["pool_size"][0])})
+        elif kind == "Flatten":
+            layers.append({"kind": "flatten"})
+        elif kind == "Dense":
+            kernel, bias = layer.get_weights()
+            layers.append({"kind": "dense", "kernel": kernel, "bias": bias,
+                           "activation": cfg["activation"]})
+        elif kind in ("Dropout",):
+            continue  # 추론 시에는 아무 일도 하지 않음
+        else:
+            raise ValueError(f"NumPy 백엔드가 지원하지 않는 레이어: {kind}")
+    return layers
+
+def save_numpy_weights(layers, path):
+    '''
+    레이어 목록을 .npz로 저장 (TensorFlow 없이 numpy 백엔드로 불러오기 위함)
+    - 가중치 배열은 "{i}_kernel", "{i}_bias" 키로 저장
+    - 레이어 구조(kind, activation 등)는 JSON 문자열로 "spec" 키에 저장
+    '''
+    arrays = {}
+    spec = []
+    for i, layer in enumerate(layers):
+        meta = {k: v for k, v in layer.items() if k not in ("kernel", "bias")}
+        for key in ("kernel", "bias"):
+            if key in layer:
+                arrays[f"{i}_{key}"] = np.asarray(layer[key], dtype=np.float32)
+        spec.append(meta)
+    arrays["spec"] = np.array(json.dumps(spec))
+    np.savez(path, **arrays)
+
+def load_numpy_weights(path):
+    with np.load(path, allow_pickle=False) as data:
+        spec = json.loads(str(data["spec"]))
+        layers = []
+        for i, meta in enumerate(spec):
+            layer = dict(meta)
+            for key in ("kernel", "bias"):
+                if f"{i}_{key}" in data:
+                    layer[key] = data[f"{i}_{key}"]
+            layers.append(layer)
+    return layers
+
+
+# =========================
+# 백엔드 생성 / 자동 선택
+# =========================
+def is_exported_path(model_path):
+    # Keras 모델로 다시 불러올 필요 없이 파일 형식으로 백엔드가 정해지는 경로인지
+    return model_path is not None and (
+        model_path.endswith((".npz", ".tflite"))
+        or os.path.isfile(os.path.join(model_path, "saved_model.pb"))
+    )
+
+def load_exported(model_path, num_threads=None):
+    '''
+    경로 형식으로 백엔드를 바로 생성 (export_model.py 결과물)
+    - .npz          → numpy (TensorFlow 불필요)
+    - .tflite       → tflite (float32 / float16 / int8 모두)
+    - SavedModel 폴더 → saved_model
+    '''
+    if model_path.endswith(".npz"):
+        return NumpyBackend.from_npz(model_path)
+    if model_path.endswith(".tflite"):
+        return TFLiteBackend(model_path=model_path, num_threads=num_threads)
+    return SavedModelBackend(model_path)
+
+def create_backend(name, model=None, model_path=None):
+    '''
+    이름으로 백엔드 생성
+    - model : 이미 불러온 Keras 모델 (없으면 model_path에서 필요할 때 불러옴)
+    - numpy 백엔드는 model_path가 .npz이면 TensorFlow 없이 바로 생성
+    - .tflite / SavedModel 경로는 파일 형식에 맞는 백엔드로 생성 (이름은 무시)
+    '''
+    if model is None and is_exported_path(model_path):
+        return load_exported(model_path)
+
+    if model is None:
+        model = load_keras_model(model_path)
+
+    if name == "keras":
+        return KerasBackend(model)
+    if name == "tf_function":
+        return TFFunctionBackend(model)
+    if name == "tflite":
+        return TFLiteBackend(model=model)
+    if name == "numpy":
+        return NumpyBackend.from_keras(model)
+    raise ValueError(f"알 수 없는 백엔드: {name}")
+
+def time_per_call(backend, x, runs=50, warmup=5):
+    # 1회 호출당 평균 시간(초) (warmup 호출은 제외)
+    for _ in range(warmup):
+        backend.predict(x)
+    start = time.perf_counter()
+    for _ in range(runs):
+        backend.predict(x)
+    return (time.perf_counter() - start) / runs
+
+def load_engine(model_path="mnist_cnn.h5", backend="auto", candidates=BACKENDS, runs=30, verbose=True):
+    '''
+    추론 엔진 불러오기
+
+    - backend="auto" : candidates의 백엔드를 모두 만들어 1장짜리 입력으로 짧게 측정하고,
+      Keras 결과와 값이 일치(최대 오차 1e-3 이하)하는 것 중 가장 빠른 백엔드를 반환
+    - 특정 이름을 주면 그 백엔드를 바로 반환
+    - 만들 수 없는 백엔드(예: TFLite 미설치)는 건너뜀
+    - .npz / .tflite / SavedModel 폴더 경로는 형식에 맞는 백엔드를 바로 반환 (export_model.py 결과물)
+    '''
+    # 변환된 모델(.npz는 TensorFlow 없이 numpy 백엔드)은 비교할 Keras 모델이 없으므로 그대로 사용
+    if is_exported_path(model_path):
+        engine = load_exported(model_path)
+        if verbose:
+            print(f"[ENGINE] {model_path} → {engine.name}")
+        return engine
+
+    if backend != "auto":
+        return create_backend(backend, model_path=model_path)
+
+    model = load_keras_model(model_path)
+    x = np.zeros((1,) + INPUT_SHAPE, dtype=np.float32)
+    x[0, 8:20, 12:16, 0] = 1.0  # 0 입력만으로는 출력 차이를 비교하기 어려우므로 간단한 획 하나
+    reference = model(x, training=False).numpy()
+
+    best, best_time = None, None
+    for name in candidates:
+        try:
+            engine = create_backend(name, model=model)
+            err = float(np.max(np.abs(engine.predict(x) - reference)))
+            if err > 1e-3:
+                if verbose:
+                    print(f"[ENGINE] {name}: 출력 불일치 (max err {err:.2e}) → 제외")
+                continue
+            t = time_per_call(engine, x, runs=runs)
+        except Exception as e:
+            if verbose:
+                print(f"[ENGINE] {name}: 사용 불가 ({e})")
+            continue
+
+        if verbose:
+            print(f"[ENGINE] {name}: {t * 1000:.3f} ms/call")
+        if best_time is None or t < best_time:
+            best, best_time = engine, t
+
+    if best is None:
+        raise RuntimeError(f"사용 가능한 추론 백엔드가 없습니다: {model_path}")
+    if verbose:
+        print(f"[ENGINE] selected: {best.name}")
+    return best
+
+
+if __name__ == "__main__":
+    # mnist_cnn.h5 → mnist_cnn.npz (TensorFlow 없는 PC에서 numpy 백엔드로 실행하기 위함)
+    src = "mnist_cnn.h5"
+    dst = os.path.splitext(src)[0] + ".npz"
+    save_numpy_weights(keras_to_layers(load_keras_model(src)), dst)
+    print(f"Saved NumPy weights: {dst}")
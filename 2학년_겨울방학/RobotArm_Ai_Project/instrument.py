@@ -0,0 +1,262 @@
+'''
+instrument의 Docstring
+
+실시간 루프용 가벼운 계측(Instrumentation) 모듈
+
+이 코드의 목적:
+- 지금까지 실시간 스크립트의 관찰 수단은 print("[SEND] ...")와 화면 글자뿐이어서,
+  한 프레임의 시간이 어디에 쓰이는지 알 수 없었음
+- 이름 붙은 구간(span), 카운터(counter), 값 분포(histogram)를 기록하고
+  1. 화면 HUD (FPS + 구간별 p50/p95 ms + 카운터)
+  2. 프레임 단위 로그 파일 (JSONL 또는 CSV, 크기가 넘치면 .1로 교체하는 rolling 방식)
+  3. Chrome trace 파일 (chrome://tracing 또는 https://ui.perfetto.dev 에서 열기)
+  로 내보냄
+- enabled=False이면 span()은 미리 만들어 둔 빈 객체를 돌려주고 나머지 함수도 바로 반환하므로,
+  계측 코드를 루프에 그대로 두어도 비용이 거의 없음
+
+사용법:
+    inst = Instrument(enabled=True, log_path="metrics.jsonl", trace_path="trace.json")
+    while True:
+        with inst.span("capture"):
+            ret, frame = cap.read()
+        inst.count("frames")
+        inst.observe("conf", 0.93)
+        inst.frame_end()            # 프레임 1장 끝 (FPS 계산 + 로그 1줄)
+        inst.draw_hud(frame)        # 화면 왼쪽 아래에 HUD (cv2 필요)
+    inst.close()                    # 로그 닫기 + trace 저장
+'''
+
+import csv
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class _NullSpan:
+    # 계측이 꺼져 있을 때 돌려주는 빈 span (매번 새로 만들지 않고 하나만 재사용)
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("inst", "name", "start")
+
+    def __init__(self, inst, name):
+        self.inst = inst
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.inst._add_span(self.name, self.start, end)
+        return False
+
+
+class Instrument:
+    '''
+    - enabled     : False면 모든 기록을 건너뜀
+    - log_path    : 프레임 단위 로그 경로 (.jsonl 또는 .csv, None이면 저장 안 함)
+    - log_max_bytes : 로그 파일이 이 크기를 넘으면 "<경로>.1"로 옮기고 새로 시작
+    - trace_path  : close() 때 Chrome trace를 저장할 경로 (None이면 저장 안 함)
+    - window      : 히스토그램 / FPS 계산에 쓰는 최근 값 개수
+    - max_events  : trace에 보관할 최대 이벤트 수 (오래된 것부터 버림)
+    '''
+
+    def __init__(self, enabled=True, log_path=None, log_max_bytes=5_000_000,
+                 trace_path=None, window=300, max_events=200_000):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.log_max_bytes = log_max_bytes
+        self.trace_path = trace_path
+        self.window = window
+
+        self.t0 = time.perf_counter()
+        self.frame = 0
+        self.counters = OrderedDict()
+        self.hists = OrderedDict()          # 이름 → 최근 window개 값 (span은 ms)
+        self._frame_spans = {}              # 이번 프레임의 span별 합계(ms)
+        self._frame_times = deque(maxlen=60)
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._log = None
+        self._csv = None
+
+    # =========================
+    # 기록
+    # =========================
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def _add_span(self, name, start, end):
+        ms = (end - start) * 1000.0
+        with self._lock:
+            self._frame_spans[name] = self._frame_spans.get(name, 0.0) + ms
+            self._hist(name).append(ms)
+            if self.trace_path is not None:
+                self._events.append(("X", name, start, end - start, threading.get_ident()))
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            if self.trace_path is not None:
+                self._events.append(("C", name, time.perf_counter(), self.counters[name], 0))
+
+    def observe(self, name, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._hist(name).append(float(value))
+
+    def _hist(self, name):
+        h = self.hists.get(name)
+        if h is None:
+            h = self.hists[name] = deque(maxlen=self.window)
+        return h
+
+    def frame_end(self):
+        # 프레임 1장이 끝났음을 알림 : FPS 계산 + 로그 1줄 기록
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            self._frame_times.append(now)
+            spans, self._frame_spans = self._frame_spans, {}
+            counters = dict(self.counters)
+            self.frame += 1
+        if self.log_path is not None:
+            self._write_log(now - self.t0, spans, counters)
+
+    # =========================
+    # 통계
+    # =========================
+    @property
+    def fps(self):
+        t = self._frame_times
+        if len(t) < 2 or t[-1] == t[0]:
+            return 0.0
+        return (len(t) - 1) / (t[-1] - t[0])
+
+    def percentile(self, name, q):
+        with self._lock:
+            values = sorted(self.hists.get(name, ()))
+        if not values:
+            return 0.0
+        k = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+        return values[k]
+
+    def hud_lines(self, max_spans=6):
+        lines = [f"FPS {self.fps:5.1f}"]
+        with self._lock:
+            names = list(self.hists.keys())[:max_spans]
+            counters = list(self.counters.items())
+        for name in names:
+            lines.append(f"{name:<10} p50 {self.percentile(name, 50):6.2f}  p95 {self.percentile(name, 95):6.2f}")
+        if counters:
+            lines.append("  ".join(f"{k}={v}" for k, v in counters))
+        return lines
+
+    def draw_hud(self, image, origin=(10, None), scale=0.45):
+        # 화면 왼쪽 아래에 HUD 표시 (반투명 배경 없이 검은 테두리 글자로 단순하게)
+        if not self.enabled:
+            return image
+        import cv2
+
+        lines = self.hud_lines()
+        x = origin[0]
+        y = origin[1] if origin[1] is not None else image.shape[0] - 12 - 16 * (len(lines) - 1)
+        for line in lines:
+            cv2.putText(image, line, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 0), 3)
+            cv2.putText(image, line, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 255, 255), 1)
+            y += 16
+        return image
+
+    def summary(self):
+        # 종료 시 출력용 요약 문자열
+        lines = [f"[INSTRUMENT] frames={self.frame} fps={self.fps:.1f}"]
+        for name in list(self.hists.keys()):
+            lines.append(f"  {name:<14} p50 {self.percentile(name, 50):8.3f}  "
+                         f"p95 {self.percentile(name, 95):8.3f}  p99 {self.percentile(name, 99):8.3f}")
+        for k, v in self.counters.items():
+            lines.append(f"  {k:<14} {v}")
+        return "\n".join(lines)
+
+    # =========================
+    # 내보내기
+    # =========================
+    def _open_log(self):
+        self._log = open(self.log_path, "a", encoding="utf-8", newline="")
+        if self.log_path.endswith(".csv"):
+            self._csv = csv.writer(self._log)
+            if self._log.tell() == 0:
+                self._csv.writerow(["t", "frame", "kind", "name", "value"])
+
+    def _write_log(self, t, spans, counters):
+        '''
+        - .jsonl : 한 줄에 프레임 1개 {"t", "frame", "spans": {이름: ms}, "counters": {...}}
+        - .csv   : 한 줄에 값 1개 (t, frame, kind, name, value) → 새 span 이름이 생겨도 열이 바뀌지 않음
+        '''
+        if self._log is None:
+            self._open_log()
+
+        if self._csv is not None:
+            for name, ms in spans.items():
+                self._csv.writerow([f"{t:.6f}", self.frame, "span", name, f"{ms:.4f}"])
+            for name, value in counters.items():
+                self._csv.writerow([f"{t:.6f}", self.frame, "counter", name, value])
+        else:
+            record = {"t": round(t, 6), "frame": self.frame,
+                      "spans": {k: round(v, 4) for k, v in spans.items()}, "counters": counters}
+            self._log.write(json.dumps(record) + "\n")
+
+        if self._log.tell() > self.log_max_bytes:
+            self._rotate_log()
+
+    def _rotate_log(self):
+        self._log.close()
+        self._log = self._csv = None
+        os.replace(self.log_path, self.log_path + ".1")
+
+    def export_trace(self, path=None):
+        # Chrome trace(JSON) 저장 : span은 "X"(구간), counter는 "C"(값 그래프) 이벤트
+        path = path or self.trace_path
+        if path is None:
+            return None
+        with self._lock:
+            events = list(self._events)
+
+        pid = os.getpid()
+        trace = []
+        for ph, name, start, value, tid in events:
+            ts = (start - self.t0) * 1e6
+            if ph == "X":
+                trace.append({"name": name, "ph": "X", "ts": ts, "dur": value * 1e6,
+                              "pid": pid, "tid": tid})
+            else:
+                trace.append({"name": name, "ph": "C", "ts": ts, "pid": pid,
+                              "args": {name: value}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = self._csv = None
+        if self.enabled and self.trace_path is not None:
+            self.export_trace()
@@ -0,0 +1,177 @@
+'''
+mnist_augment의 Docstring
+
+웹캠 숫자처럼 보이게 만드는 MNIST 학습용 증강(augmentation)
+
+이 코드의 목적:
+- 실시간 인식에서 웹캠 ROI는 Blur → Otsu 이진화 → Close / Dilate → 질량 중심 정렬 → 여백 10px → 28x28
+  과정을 거치는데, 학습은 깨끗한 MNIST로만 해서 두 입력의 모양이 다름(도메인 갭)
+  → conf가 늦게 올라와서 CONF_TH / MARGIN_TH를 높게, 안정 시간을 길게 잡아야 했음
+- 학습 배치에 같은 전처리 과정을 흉내 내는 증강을 적용 (배치 전체를 TensorFlow 연산으로 한 번에 처리)
+- tf.data map(num_parallel_calls)로 실행되므로, 모델이 학습하는 동안 다음 배치의 증강이 병렬로 진행됨
+
+증강 순서 (웹캠 입력이 만들어지는 순서와 같음):
+1. 기하 변환 : 크기 / 회전 / 위치 변화 (종이와 카메라의 거리, 기울어짐)
+2. 2배 확대 → Gaussian Blur (카메라 흐림 + 전처리 Blur)
+3. 임계값 이진화 (Otsu 결과처럼 획이 0/1로 딱 떨어짐, 임계값은 무작위)
+4. 획 굵게 : 3x3 dilate를 0~1 비율로 섞음 (고해상도에서 한 dilate는 28x28에서 1px보다 얇음)
+5. 28x28 축소(area) → 가장자리가 부드러운 이진 숫자 (resize INTER_LINEAR 결과와 비슷)
+6. 질량 중심 정렬 + ±1px 흔들림 (center_by_mass의 int 버림 오차)
+
+사용법:
+    ds = ds.map(normalize).map(augment_batch, num_parallel_calls=tf.data.AUTOTUNE)
+    (mnist_train.py --augment)
+
+    python mnist_augment.py     # 증강 예시 64장을 augment_preview.png로 저장 + 처리량 출력
+'''
+
+import math
+import time
+
+import tensorflow as tf
+
+AUG_PROB = 0.8                  # 배치에서 증강을 적용할 이미지 비율 (나머지는 원본 MNIST)
+SCALE_RANGE = (0.8, 1.15)       # 크기 배율
+ROTATE_DEG = 12.0               # 최대 회전 각도(도)
+SHIFT_PX = 2.0                  # 최대 이동(px)
+BLUR_SIGMA = (0.5, 1.6)         # 2배 확대 영상 기준 Gaussian sigma
+THRESH_RANGE = (0.3, 0.6)       # 이진화 임계값 (0~1)
+THICKEN_RANGE = (0.0, 1.0)      # dilate 결과를 섞는 비율
+CENTER_JITTER = 1.0             # 질량 중심 정렬 후 흔들림(px)
+
+SIZE = 28
+CENTER = (SIZE - 1) / 2.0
+
+
+# =========================
+# 배치 연산 도구 (이미지마다 다른 값을 한 번에 적용)
+# =========================
+def _uniform(n, lo, hi):
+    return tf.random.uniform([n], lo, hi, dtype=tf.float32)
+
+def _affine(x, scale, angle, tx, ty):
+    '''
+    이미지마다 다른 크기 / 회전 / 이동을 한 번에 적용 (x : (B,H,W,1))
+    ImageProjectiveTransform은 "출력 좌표 → 입력 좌표" 행렬을 받으므로 역변환을 넘김
+        p_in = R^T (p_out - c - t) / s + c
+    '''
+    size = tf.cast(tf.shape(x)[1], tf.float32)
+    c = (size - 1.0) / 2.0
+    cos = tf.cos(angle) / scale
+    sin = tf.sin(angle) / scale
+    ox, oy = c + tx, c + ty
+    zeros = tf.zeros_like(scale)
+    transforms = tf.stack([
+        cos, sin, c - cos * ox - sin * oy,
+        -sin, cos, c + sin * ox - cos * oy,
+        zeros, zeros,
+    ], axis=1)
+    return tf.raw_ops.ImageProjectiveTransformV3(
+        images=x, transforms=transforms, output_shape=tf.shape(x)[1:3],
+        fill_value=0.0, interpolation="BILINEAR", fill_mode="CONSTANT")
+
+def _blur(x, sigma, taps=5):
+    # 이미지마다 다른 sigma의 Gaussian Blur : 배치 축을 채널로 옮겨 depthwise conv 한 번으로 계산
+    r = tf.range(taps, dtype=tf.float32) - (taps - 1) / 2.0
+    g = tf.exp(-0.5 * tf.square(r[tf.newaxis, :] / sigma[:, tf.newaxis]))   # (B,taps)
+    g = g / tf.reduce_sum(g, axis=1, keepdims=True)
+    kernel = g[:, :, tf.newaxis] * g[:, tf.newaxis, :]                       # (B,taps,taps)
+    kernel = tf.transpose(kernel, [1, 2, 0])[..., tf.newaxis]                # (taps,taps,B,1)
+
+    xt = tf.transpose(x, [3, 1, 2, 0])                                       # (1,H,W,B)
+    y = tf.nn.depthwise_conv2d(xt, kernel, strides=[1, 1, 1, 1], padding="SAME")
+    return tf.transpose(y, [3, 1, 2, 0])
+
+def _dilate(x):
+    # 3x3 dilate (흰 획을 1px 굵게)
+    return tf.nn.max_pool2d(x, ksize=3, strides=1, padding="SAME")
+
+def _close(x):
+    # MORPH_CLOSE = dilate → erode (작은 구멍 메우기 + 끊어진 획 연결)
+    return -tf.nn.max_pool2d(-_dilate(x), ksize=3, strides=1, padding="SAME")
+
+def _center_by_mass(x, jitter):
+    # 질량 중심을 영상 중앙으로 이동 (+ 흔들림)
+    size = tf.shape(x)[1]
+    coords = tf.range(size, dtype=tf.float32)
+    mass = tf.reduce_sum(x, axis=[1, 2, 3]) + 1e-6
+    cx = tf.reduce_sum(x * coords[tf.newaxis, tf.newaxis, :, tf.newaxis], axis=[1, 2, 3]) / mass
+    cy = tf.reduce_sum(x * coords[tf.newaxis, :, tf.newaxis, tf.newaxis], axis=[1, 2, 3]) / mass
+    c = (tf.cast(size, tf.float32) - 1.0) / 2.0
+
+    n = tf.shape(x)[0]
+    ones = tf.ones([n], dtype=tf.float32)
+    tx = c - cx + _uniform(n, -jitter, jitter)
+    ty = c - cy + _uniform(n, -jitter, jitter)
+    return _affine(x, ones, tf.zeros([n]), tx, ty)
+
+
+# =========================
+# 증강 (tf.data map에서 사용)
+# =========================
+def webcam_like(x):
+    # (B,28,28,1) float32 0~1 → 웹캠 전처리를 거친 것 같은 숫자 (모든 이미지에 적용)
+    n = tf.shape(x)[0]
+
+    # 1. 기하 변환
+    x = _affine(x,
+                _uniform(n, *SCALE_RANGE),
+                _uniform(n, -ROTATE_DEG, ROTATE_DEG) * (math.pi / 180.0),
+                _uniform(n, -SHIFT_PX, SHIFT_PX),
+                _uniform(n, -SHIFT_PX, SHIFT_PX))
+
+    # 2. 2배 확대 → Blur (이진화 / morphology를 28x28보다 세밀하게 하기 위해)
+    big = tf.image.resize(x, [SIZE * 2, SIZE * 2], method="bilinear")
+    big = _blur(big, _uniform(n, *BLUR_SIGMA))
+
+    # 3. 임계값 이진화
+    th = _uniform(n, *THRESH_RANGE)[:, tf.newaxis, tf.newaxis, tf.newaxis]
+    big = tf.cast(big > th, tf.float32)
+
+    # 4. Close + 획 굵게 (dilate 결과를 이미지마다 다른 비율로 섞음)
+    big = _close(big)
+    t = _uniform(n, *THICKEN_RANGE)[:, tf.newaxis, tf.newaxis, tf.newaxis]
+    big = big + t * (_dilate(big) - big)
+
+    # 5. 28x28 축소
+    x = tf.image.resize(big, [SIZE, SIZE], method="area")
+
+    # 6. 질량 중심 정렬
+    x = _center_by_mass(x, CENTER_JITTER)
+    return tf.clip_by_value(x, 0.0, 1.0)
+
+def augment_batch(x, y, prob=AUG_PROB):
+    # (B,28,28,1) 배치 중 prob 비율만 증강, 나머지는 원본 유지 → (x, y)
+    aug = webcam_like(x)
+    mask = tf.random.uniform([tf.shape(x)[0], 1, 1, 1]) < prob
+    return tf.where(mask, aug, x), y
+
+
+# =========================
+# 미리보기 + 처리량
+# =========================
+def save_preview(x, path="augment_preview.png", cols=8):
+    # (N,28,28,1) → cols열 격자 PNG
+    n = (int(x.shape[0]) // cols) * cols
+    grid = tf.reshape(x[:n], [n // cols, cols, SIZE, SIZE])
+    grid = tf.reshape(tf.transpose(grid, [0, 2, 1, 3]), [n // cols * SIZE, cols * SIZE, 1])
+    png = tf.io.encode_png(tf.cast(tf.clip_by_value(grid, 0.0, 1.0) * 255.0, tf.uint8))
+    tf.io.write_file(path, png)
+    return path
+
+
+if __name__ == "__main__":
+    (x_train, _), _ = tf.keras.datasets.mnist.load_data()
+    x = tf.cast(x_train[:64, ..., tf.newaxis], tf.float32) / 255.0
+    print("saved:", save_preview(webcam_like(x)))
+
+    # 배치 256장 증강 처리량 (tf.function으로 그래프 실행, 첫 호출은 제외)
+    fn = tf.function(webcam_like)
+    batch = tf.cast(x_train[:256, ..., tf.newaxis], tf.float32) / 255.0
+    fn(batch)
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(batch).numpy()
+    sec = (time.perf_counter() - start) / runs
+    print(f"augment: {256 / sec:,.0f} samples/sec ({sec * 1000:.1f} ms / batch 256)")
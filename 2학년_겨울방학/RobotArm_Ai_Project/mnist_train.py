@@ -8,71 +8,279 @@ MNIST 손글씨 숫자 인식을 위한 간단한 CNN 학습 코드
 - CNN 구조: Conv2D → MaxPooling → Conv2D → MaxPooling → Flatten → Dense → Dense
 - 학습 후 테스트 정확도를 출력하고, 학습된 모델을 파일로 저장한다.
 
+[tf.data 입력 파이프라인]
+- 기존에는 x_train / 255.0 으로 float64 복사본(60000x28x28 → 약 376MB)을 만든 뒤
+  NumPy 배열을 통째로 model.fit에 넘겼음 (채널 축 추가까지 여러 벌의 복사본이 메모리에 존재)
+- 지금은 데이터셋을 uint8(약 47MB) 그대로 보관하고, 배치 단위로 float32 정규화를 그때그때 계산
+  uint8 → cache → shuffle → batch → map(정규화, 병렬) → prefetch
+- 배치 크기 / shuffle 버퍼 / TensorFlow 스레드 수를 명령줄에서 조절
+- 학습 중 에포크별 처리량(samples/sec)과 종료 시 최대 메모리 사용량(peak RSS)을 출력
+
+[데이터셋 저장소] (--data-root)
+- MNIST를 memory-mapped .npy 저장소(dataset_store)에 한 번만 변환해 두고, 이후에는 압축 해제 / 인터넷 없이 사용
+- --extra webcam : 실시간 인식에서 모은 웹캠 샘플(라벨 있는 것만)을 학습 데이터에 추가
+
+[웹캠 도메인 증강] (--augment)
+- 학습 배치에 실시간 전처리(Blur → 이진화 → Close / Dilate → 질량 중심 정렬)를 흉내 낸 증강을 적용
+  (mnist_augment.augment_batch, tf.data map으로 학습과 병렬 실행)
+- 웹캠 숫자에서 conf가 더 빨리 높아지면 CONF_TH 통과가 빨라져 로봇 명령까지의 시간이 줄어듦
+
+사용 예:
+    python mnist_train.py                                  # 기존과 같은 설정 (epochs=3, batch 32)
+    python mnist_train.py --batch-size 128 --intra-threads 4 --inter-threads 2
+    python mnist_train.py --epochs 5 --out mnist_cnn_v2.h5
+    python mnist_train.py --augment --epochs 6 --out mnist_cnn_aug.h5
+    python mnist_train.py --data-root datasets --extra webcam
 '''
 
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
-# 1. MNIST 데이터 로드
-# MNIST: 28x28 픽셀의 손글씨 숫자 (0~9)
-(x_train, y_train), (x_test, y_test) = tf.keras.datasets.mnist.load_data()
+from dataset_store import DatasetStore, cache_mnist
+from mnist_augment import AUG_PROB, augment_batch
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+
+# =========================
+# 0) CPU 스레드 설정
+# =========================
+def configure_threads(intra=0, inter=0):
+    '''
+    TensorFlow 연산 스레드 수 설정 (0 = TensorFlow 기본값, 보통 CPU 코어 수)
+    - intra : 연산 1개(예: Conv2D)를 나눠서 계산하는 스레드 수
+    - inter : 서로 독립적인 연산을 동시에 실행하는 스레드 수
+    ※ TensorFlow 연산을 처음 실행하기 전에 호출해야 적용됨
+    '''
+    if intra:
+        tf.config.threading.set_intra_op_parallelism_threads(intra)
+    if inter:
+        tf.config.threading.set_inter_op_parallelism_threads(inter)
+
+
+# =========================
+# 1) 데이터 로드 + tf.data 파이프라인
+# =========================
+def load_mnist(val_split=0.1, data_root=None, extra=()):
+    '''
+    MNIST를 uint8 그대로 로드 → (train, val, test) 각각 (x, y)
+    MNIST: 28x28 픽셀의 손글씨 숫자 (0~9)
+    검증 데이터는 기존 validation_split처럼 학습 데이터의 마지막 val_split 비율을 사용
 
-# 2. 정규화 + 차원 추가
-# 픽셀 값 범위: 0~255 -> 0~1로 정규화 (학습 안정화)
-x_train = x_train / 255.0
-x_test  = x_test / 255.0
+    - data_root : dataset_store 저장소 폴더 (MNIST는 memmap으로 바로 열림, 없으면 한 번 변환)
+    - extra     : data_root 안의 추가 데이터셋 이름 (예: "webcam"), 라벨 있는 샘플만 학습 데이터에 추가
+    '''
+    if data_root is None:
+        (x_train, y_train), (x_test, y_test) = tf.keras.datasets.mnist.load_data()
+    else:
+        train_store, test_store = cache_mnist(data_root)
+        x_train, y_train = train_store.images, train_store.labels
+        x_test, y_test = test_store.images, test_store.labels
 
-# CNN 입력은 (height, width, channel) 형태 필요
-# MNIST는 흑백이라 channel=1을 추가 (RGB 였다면, 3 채널)
-x_train = x_train[..., tf.newaxis]
-x_test  = x_test[..., tf.newaxis]
+    n_val = int(len(x_train) * val_split)
+    n_fit = len(x_train) - n_val
+    train = (x_train[:n_fit], y_train[:n_fit])
+    val = (x_train[n_fit:], y_train[n_fit:])
 
-# 3. 간단한 CNN 모델
+    for name in extra:
+        store = DatasetStore(os.path.join(data_root, name))
+        keep = store.labels >= 0
+        train = (np.concatenate([train[0], store.images[keep]]),
+                 np.concatenate([train[1], store.labels[keep]]))
+        print(f"[DATA] +{int(keep.sum())} samples from {store.path}")
+    return train, val, (x_test, y_test)
+
+def normalize(x, y):
+    # 정규화 + 차원 추가
+    # 픽셀 값 범위: 0~255 -> 0~1로 정규화 (학습 안정화), float64 대신 float32로 바로 계산
+    # CNN 입력은 (height, width, channel) 형태 필요
+    # MNIST는 흑백이라 channel=1을 추가 (RGB 였다면, 3 채널)
+    x = tf.cast(x, tf.float32) * (1.0 / 255.0)
+    return x[..., tf.newaxis], y
+
+def make_dataset(x, y, batch_size=32, training=False, shuffle_buffer=0, cache=True,
+                 parallel_calls=AUTOTUNE, seed=None, augment_prob=0.0):
+    '''
+    (uint8 이미지, 라벨) → 배치 단위 (float32 (B,28,28,1), 라벨) tf.data 파이프라인
+
+    - cache          : uint8 원본을 첫 에포크에 메모리에 보관 (정규화 전이라 float32보다 4배 작음)
+    - shuffle_buffer : 0이면 데이터 전체 크기 (training=True일 때만 섞음)
+    - 정규화는 batch 뒤에 적용 → 샘플 1개씩이 아니라 배치 단위로 한 번에 계산
+    - augment_prob   : 0보다 크면 배치의 이 비율만큼 웹캠 도메인 증강 적용 (training=True일 때만)
+    - prefetch       : GPU/CPU가 학습하는 동안 다음 배치를 미리 준비
+    '''
+    ds = tf.data.Dataset.from_tensor_slices((x, y))
+    if cache:
+        ds = ds.cache()
+    if training:
+        ds = ds.shuffle(shuffle_buffer or len(x), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size)
+    ds = ds.map(normalize, num_parallel_calls=parallel_calls, deterministic=not training)
+    if training and augment_prob > 0:
+        ds = ds.map(lambda bx, by: augment_batch(bx, by, augment_prob),
+                    num_parallel_calls=parallel_calls, deterministic=False)
+    return ds.prefetch(AUTOTUNE)
+
+
+# =========================
+# 2) 간단한 CNN 모델
+# =========================
 '''
 Conv2D (특징 추출): 이미지 위를 작은 필터가 훑으며 선, 곡선 같은 특징을 찾아냄
 
 MaxPooling2D (정보 압축): 중요한 특징만 남기고 이미지 크기를 줄임
 -> 연산량을 줄이고 사소한 위치 변화에 강해짐
 
-Flatten (데이터 펼치기): 2차원 특징 지도(Feature Map)를 1차원 긴 줄로 쭉 핌 
+Flatten (데이터 펼치기): 2차원 특징 지도(Feature Map)를 1차원 긴 줄로 쭉 핌
 -> 이제 '그림'이 아니라 '수치 데이터'가 되어 판단(Dense) 단계로 넘어감
 
 Dense (판단): 펼쳐진 데이터를 보고 최종 결론을 내립니다.
 
 마지막 Dense(10, activation='softmax')는 0부터 9까지 각 숫자일 확률 10개를 출력하며, 합은 항상 1(100%)이 됨.
 '''
-model = models.Sequential([
-    layers.Conv2D(16, (3,3), activation='relu', input_shape=(28,28,1)),
-    layers.MaxPooling2D((2,2)),
-    layers.Conv2D(32, (3,3), activation='relu'),
-    layers.MaxPooling2D((2,2)),
-    layers.Flatten(),
-    layers.Dense(64, activation='relu'),
-    layers.Dense(10, activation='softmax')
-])
-
-# 4. 컴파일(학습 방법 설정)
-# optimizer: Adam (가중치 업데이트 방법. 즉 학습방법)
-# loss: sparse_categorical_crossentropy (예측과 정답의 차이를 수치화)(채점표)
-# metrics: accuracy (학습 중에 성능을 확인하는 지표)
-
-model.compile(
-    optimizer='adam',
-    loss='sparse_categorical_crossentropy',
-    metrics=['accuracy']
-)
-
-# 5. 학습
-# epochs=3 -> 전체 데이터셋을 3번 반복 학습
-# validation_split=0.1 -> 학습 데이터의 10%를 검증용으로 사용
-model.fit(x_train, y_train, epochs=3, validation_split=0.1)
-
-# 6. 테스트
-# 학습하지 않은 테스트 데이터로 모델 성능 평가
-test_loss, test_acc = model.evaluate(x_test, y_test)
-print("Test accuracy:", test_acc)
-
-# 7. 모델 저장
-# 학습된 모델을 파일로 저장 (HDF5 형식)
-model.save("mnist_cnn.h5")
-print("Model saved as mnist_cnn.h5")
\ No newline at end of file
+def build_model(filters=(16, 32), dense=64):
+    '''
+    filters : Conv2D 블록별 필터 수 (길이 = Conv2D → MaxPooling 블록 수, 기본값은 기존 구조 16 → 32)
+    dense   : 중간 Dense 유닛 수 (0이면 Flatten 뒤에 바로 출력층)
+    '''
+    model = models.Sequential([layers.Input(shape=(28,28,1))])
+    for f in filters:
+        model.add(layers.Conv2D(f, (3,3), activation='relu'))
+        model.add(layers.MaxPooling2D((2,2)))
+    model.add(layers.Flatten())
+    if dense:
+        model.add(layers.Dense(dense, activation='relu'))
+    model.add(layers.Dense(10, activation='softmax'))
+
+    # 컴파일(학습 방법 설정)
+    # optimizer: Adam (가중치 업데이트 방법. 즉 학습방법)
+    # loss: sparse_categorical_crossentropy (예측과 정답의 차이를 수치화)(채점표)
+    # metrics: accuracy (학습 중에 성능을 확인하는 지표)
+    model.compile(
+        optimizer='adam',
+        loss='sparse_categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    return model
+
+
+# =========================
+# 3) 처리량 / 메모리 측정
+# =========================
+class ThroughputCallback(tf.keras.callbacks.Callback):
+    # 에포크마다 학습 처리량(samples/sec) 출력 (검증 시간은 제외)
+    def __init__(self, num_samples):
+        super().__init__()
+        self.num_samples = num_samples
+        self.rates = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_test_begin(self, logs=None):
+        # fit 안의 검증은 에포크 학습이 끝난 뒤 시작 → 여기까지를 학습 시간으로 봄
+        self._train_sec = time.perf_counter() - self._start
+
+    def on_epoch_end(self, epoch, logs=None):
+        sec = getattr(self, "_train_sec", None) or (time.perf_counter() - self._start)
+        self._train_sec = None
+        rate = self.num_samples / sec
+        self.rates.append(rate)
+        print(f"  [THROUGHPUT] epoch {epoch + 1}: {rate:,.0f} samples/sec ({sec:.1f}s)")
+
+def peak_memory_mb():
+    '''
+    프로세스 최대 메모리 사용량(MB), 알 수 없으면 None
+    - Linux / macOS : resource.getrusage의 ru_maxrss (Linux는 KB, macOS는 byte 단위)
+    - Windows       : psutil의 peak_wset (psutil이 설치된 경우)
+    '''
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+# =========================
+# 4) 학습 → 테스트 → 저장
+# =========================
+def train(args):
+    configure_threads(args.intra_threads, args.inter_threads)
+
+    (x_fit, y_fit), (x_val, y_val), (x_test, y_test) = load_mnist(args.val_split, args.data_root, args.extra)
+    train_ds = make_dataset(x_fit, y_fit, args.batch_size, training=True,
+                            shuffle_buffer=args.shuffle_buffer, cache=not args.no_cache,
+                            parallel_calls=args.parallel_calls, seed=args.seed,
+                            augment_prob=args.augment_prob if args.augment else 0.0)
+    val_ds = make_dataset(x_val, y_val, args.batch_size, cache=not args.no_cache)
+    test_ds = make_dataset(x_test, y_test, args.batch_size, cache=False)
+
+    model = build_model()
+
+    # 학습
+    # epochs=3 -> 전체 데이터셋을 3번 반복 학습
+    # 학습 데이터의 10%를 검증용으로 사용 (load_mnist에서 분리)
+    throughput = ThroughputCallback(len(x_fit))
+    start = time.perf_counter()
+    model.fit(train_ds, epochs=args.epochs, validation_data=val_ds, callbacks=[throughput])
+    total_sec = time.perf_counter() - start
+
+    # 테스트
+    # 학습하지 않은 테스트 데이터로 모델 성능 평가
+    test_loss, test_acc = model.evaluate(test_ds)
+    print("Test accuracy:", test_acc)
+
+    # 처리량 / 메모리 요약
+    mean_rate = sum(throughput.rates) / len(throughput.rates)
+    print(f"[TRAIN] batch={args.batch_size} augment={args.augment_prob if args.augment else 0} intra={args.intra_threads or 'auto'} "
+          f"inter={args.inter_threads or 'auto'} : {mean_rate:,.0f} samples/sec "
+          f"(fit total {total_sec:.1f}s)")
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"[TRAIN] peak memory: {peak:.0f} MB")
+
+    # 모델 저장
+    # 학습된 모델을 파일로 저장 (HDF5 형식)
+    model.save(args.out)
+    print(f"Model saved as {args.out}")
+    return model, test_acc
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MNIST CNN 학습 (tf.data 입력 파이프라인)")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--val-split", type=float, default=0.1, help="검증용 학습 데이터 비율")
+    parser.add_argument("--shuffle-buffer", type=int, default=0, help="0 : 데이터 전체 크기")
+    parser.add_argument("--no-cache", action="store_true", help="uint8 데이터 cache() 끄기")
+    parser.add_argument("--parallel-calls", type=int, default=AUTOTUNE,
+                        help="정규화 map 병렬 수 (기본 : AUTOTUNE)")
+    parser.add_argument("--intra-threads", type=int, default=0, help="연산 내부 스레드 수 (0 : 자동)")
+    parser.add_argument("--inter-threads", type=int, default=0, help="연산 간 스레드 수 (0 : 자동)")
+    parser.add_argument("--augment", action="store_true", help="웹캠 도메인 증강 사용 (mnist_augment)")
+    parser.add_argument("--augment-prob", type=float, default=AUG_PROB, help="배치 중 증강 비율")
+    parser.add_argument("--data-root", default=None, help="dataset_store 저장소 폴더 (예: datasets)")
+    parser.add_argument("--extra", nargs="*", default=[], help="추가 학습 데이터셋 이름 (--data-root 안)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default="mnist_cnn.h5", help="저장할 모델 경로")
+    args = parser.parse_args(argv)
+    if args.extra and args.data_root is None:
+        parser.error("--extra는 --data-root와 함께 사용해야 합니다")
+    return args
+
+
+if __name__ == "__main__":
+    train(parse_args())
@@ -0,0 +1,122 @@
+'''
+prediction_cache의 Docstring
+
+ROI가 거의 같으면 CNN 예측을 건너뛰는 예측 캐시
+
+이 코드의 목적:
+- 숫자를 3.5초 동안 보여주는 동안, 거의 같은 28x28 입력으로 CNN을 100번 가까이 다시 실행했음
+- 정규화된 28x28 입력을 7x7 블록 평균(저해상도 지문, fingerprint)으로 줄이고,
+  최근 지문들과 비교해서 평균 차이가 tolerance 이하이면 저장해 둔 확률 벡터를 그대로 사용
+- 최근에 쓴 것만 size개 보관 (LRU : 가장 오래 안 쓴 항목부터 삭제)
+- 적중률(hit rate)과 "건너뛴 예측 시간"(추정값)을 통계로 제공
+
+사용법 (엔진과 똑같이 predict만 호출):
+    engine = CachedEngine(load_engine("mnist_cnn.h5"))
+    probs = engine.predict(batch)      # (N,28,28,1) → (N,10), 바뀐 ROI만 실제로 예측
+    print(engine.cache.summary())      # hit 93% (saved 412 ms)
+
+주의:
+- tolerance를 너무 크게 잡으면, 숫자가 바뀌었는데도 이전 결과를 쓸 수 있음
+  (기본값 0.03 = 7x7 지문 픽셀 평균 밝기 차이 3%)
+'''
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+CACHE_SIZE = 32        # 보관할 최대 항목 수
+TOLERANCE = 0.03       # 지문 평균 절대 차이(0~1)가 이 이하이면 같은 입력으로 봄
+GRID = 7               # 지문 크기 (28x28 → 7x7, 4x4 블록 평균)
+
+
+def fingerprint(x: np.ndarray, grid=GRID) -> np.ndarray:
+    # (28,28) 또는 (28,28,1) 0~1 입력 → (grid*grid,) float32 블록 평균
+    img = x.reshape(x.shape[0], x.shape[1])
+    block = img.shape[0] // grid
+    return img.reshape(grid, block, grid, block).mean(axis=(1, 3), dtype=np.float32).ravel()
+
+
+class PredictionCache:
+    def __init__(self, size=CACHE_SIZE, tolerance=TOLERANCE, grid=GRID):
+        self.size = size
+        self.tolerance = tolerance
+        self.grid = grid
+        self.entries = OrderedDict()   # 지문 bytes → (지문, 확률 벡터), 뒤쪽일수록 최근 사용
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_sec = 0.0           # 건너뛴 예측 시간 추정 (적중 수 × 입력 1장 평균 예측 시간)
+        self._sec_per_item = 0.0       # 실제 예측의 입력 1장당 평균 시간 (이동 평균)
+
+    def lookup(self, fp):
+        # 가장 가까운 항목의 확률 벡터, 없으면 None
+        key = fp.tobytes()
+        entry = self.entries.get(key)
+        if entry is None and self.entries:
+            keys = list(self.entries.keys())
+            fps = np.stack([e[0] for e in self.entries.values()])
+            diff = np.abs(fps - fp).mean(axis=1)
+            best = int(np.argmin(diff))
+            if diff[best] <= self.tolerance:
+                key = keys[best]
+                entry = self.entries[key]
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.saved_sec += self._sec_per_item
+        return entry[1]
+
+    def store(self, fp, probs):
+        self.entries[fp.tobytes()] = (fp, np.array(probs, copy=True))
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def record_predict_time(self, seconds, count):
+        per_item = seconds / count
+        if self._sec_per_item == 0.0:
+            self._sec_per_item = per_item
+        else:
+            self._sec_per_item += 0.1 * (per_item - self._sec_per_item)
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        return f"cache hit {self.hit_rate * 100:.0f}% ({self.hits}/{self.hits + self.misses}, saved {self.saved_sec * 1000:.0f} ms)"
+
+
+class CachedEngine:
+    '''
+    추론 엔진(inference_engine)을 감싸서 캐시에 없는 입력만 실제로 예측
+    - 배치 안에서 일부만 바뀌면 바뀐 입력만 모아서 한 번 예측
+    '''
+
+    def __init__(self, engine, size=CACHE_SIZE, tolerance=TOLERANCE):
+        self.engine = engine
+        self.name = f"{engine.name}+cache"
+        self.cache = PredictionCache(size, tolerance)
+
+    def predict(self, x) -> np.ndarray:
+        n = len(x)
+        fps = [fingerprint(x[i], self.cache.grid) for i in range(n)]
+        probs = [self.cache.lookup(fp) for fp in fps]
+
+        miss = [i for i in range(n) if probs[i] is None]
+        if miss:
+            start = time.perf_counter()
+            fresh = self.engine.predict(x if len(miss) == n else x[miss])
+            self.cache.record_predict_time(time.perf_counter() - start, len(miss))
+            for j, i in enumerate(miss):
+                probs[i] = fresh[j]
+                self.cache.store(fps[i], fresh[j])
+
+        return np.stack(probs)
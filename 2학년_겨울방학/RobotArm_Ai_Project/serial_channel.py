@@ -0,0 +1,431 @@
+'''
+serial_channel의 Docstring
+
+아두이노 명령 전송 채널 (백그라운드 스레드 + 명령 큐 + ACK / 재전송 / 재연결)
+
+이 코드의 목적:
+- 기존에는 추론 루프에서 ser.write()를 직접 호출하고 응답은 읽지 않았음
+  → 9600 baud에서 쓰기가 밀리거나 USB가 빠지면 추론 루프가 멈추고, 명령이 전달됐는지 알 수 없음
+- send()는 명령을 큐에 넣고 바로 반환 (추론 루프는 시리얼 I/O를 기다리지 않음)
+- 별도 스레드가 큐의 명령을 순서대로 보내고, 아두이노의 ACK를 기다림
+  ACK가 ack_timeout 안에 오지 않으면 retries번까지 같은 번호로 다시 보냄
+- 포트가 끊기면(USB 분리 등) 보내던 명령을 큐 맨 앞에 남겨두고, reconnect_sec마다 다시 연결 시도
+  → 다시 연결되면 "Ready"를 기다린 뒤 이어서 전송
+- port="auto" : 연결할 때마다 USB 장치 목록에서 아두이노 포트를 찾음 (find_arduino_port)
+  → COM 번호가 바뀌거나 다시 꽂아서 번호가 달라져도 그대로 동작
+
+프로토콜 (ArduinoCode/robot_arm_control_with_AI.ino는 두 방식 모두 지원):
+- protocol="text" (한 줄 = 명령 1개)
+    PC → 아두이노 : "<seq>:<명령>\\n"   예) "12:371\\n"
+    아두이노 → PC : "ACK <seq>"          명령을 이동 큐에 넣자마자 응답 (이동이 끝난 것이 아님)
+                    "BUSY <seq>"         이동 큐가 가득 참 → busy_wait 뒤 같은 seq로 다시 보냄
+- protocol="binary" (arm_protocol : 시작 바이트 + 길이 + 번호 + 명령 + 데이터 + CRC8)
+    - 큐에 여러 명령이 쌓여 있으면 max_batch개까지 BATCH 프레임 1개로 보내고 ACK도 1번만 받음
+    - fast_baud를 주면 연결 직후 baud(9600)에서 BAUD 명령으로 속도 변경을 요청하고,
+      새 속도에서 PING에 ACK가 오면 그 속도를 사용 (실패하면 baud로 되돌아감, 아두이노도 1초 뒤 복귀)
+    - 바이너리 방식에서는 아두이노의 텍스트 로그("Move to digit" 등)는 읽고 버림
+    - 연결(재연결)할 때마다 첫 명령 전에 PING을 보냄 → 아두이노는 PING을 받으면 lastFrameSeq를 지움
+- 같은 seq가 다시 오면(ACK가 늦어서 재전송된 경우) 아두이노는 ACK만 다시 보내고 이동은 하지 않음
+- 아두이노는 이동 중에도 loop()에서 계속 읽고 ACK함 (이동은 millis()로 나눠서 진행)
+  → ACK 대기 시간(ack_timeout)은 이동 시간과 관계없이 선로 / 처리 시간만 생각하면 됨
+- BUSY(바이너리 : ACK 상태 STATUS_BUSY)는 재전송 횟수(retries)에 넣지 않고 busy_timeout까지 기다림
+  (숫자가 많이 쌓였을 때 "ACK 없음"으로 실패 처리되지 않도록)
+- seq는 1~9999를 돌아가며 사용, 바이너리 프레임에는 seq의 하위 8비트(0~255)만 들어감
+  보드가 리셋되지 않은 채 프로그램만 다시 켜면 첫 명령 번호가 보드가 마지막으로 실행한 번호와 같을 수 있음
+  → 같으면 "이미 받은 명령"으로 ACK만 오고 팔은 움직이지 않음
+  · binary : 연결할 때마다 PING으로 아두이노의 마지막 번호를 지우므로 겹치지 않음
+  · text : PING이 없으므로 시작 번호를 무작위로 골라서 겹칠 확률만 1/9999로 줄임
+  · 끊길 때 보내던 프레임은 PING 뒤 같은 번호로 다시 보냄 → 보드가 리셋되지 않았고 이미 큐에 넣었다면
+    한 번 더 실행될 수 있음 (같은 숫자 위치로 다시 이동, 명령이 사라지는 것보다 안전)
+- ":"가 없는 줄은 예전처럼 숫자 문자만 읽어서 이동 (serial_test.py 이전 방식과 호환)
+
+사용법:
+    channel = SerialChannel("auto", protocol="binary", fast_baud=115200)
+    seq = channel.send("371")          # 바로 반환 (큐가 가득 차면 None)
+    channel.wait(seq, timeout=2.0)     # 필요할 때만 : True(ACK) / False(실패) / None(시간 초과)
+    channel.close()                    # 남은 명령을 잠시 기다린 뒤 종료
+
+하드웨어 없이 확인 : python fake_arduino.py (pty 가상 포트로 아두이노 흉내)
+처리량 / 왕복 시간 측정 : python bench_serial.py
+'''
+
+import random
+import statistics
+import threading
+import time
+from collections import deque
+
+import serial
+
+from arm_protocol import (CMD_ACK, CMD_PING, STATUS_BUSY, STATUS_OK, FrameDecoder, batch_fits, encode,
+                          encode_baud, encode_commands)
+from startup import wait_for_board
+
+BAUD = 9600
+ACK_TIMEOUT = 0.5      # ACK 대기 시간(초)
+RETRIES = 3            # ACK가 없을 때 다시 보내는 횟수
+RECONNECT_SEC = 1.0    # 연결 실패 / 끊김 후 다시 연결을 시도하는 간격(초)
+READY_TIMEOUT = 3.0    # 연결 직후 "Ready" 최대 대기 시간(초)
+MAX_QUEUE = 16         # 보내지 못한 명령 최대 개수 (넘으면 send()가 버리고 None 반환)
+MAX_BATCH = 8          # 바이너리 방식에서 프레임 1개에 묶는 최대 명령 수
+BAUD_FALLBACK_SEC = 1.0  # 속도 변경 실패 시 아두이노가 원래 속도로 돌아가는 시간(초)
+READ_TIMEOUT = 0.05    # readline 1회 최대 대기 (스레드가 stop / 새 명령에 빨리 반응하도록 짧게)
+IDLE_WAIT = 0.02       # 보낼 명령이 없을 때 대기 간격
+BUSY_WAIT = 0.2        # BUSY를 받은 뒤 다시 보내기까지 대기(초)
+BUSY_TIMEOUT = 30.0    # BUSY가 계속되면 이 시간(초) 뒤 실패 처리
+
+BUSY = "busy"          # _wait_ack 결과 : 아두이노 이동 큐가 가득 참
+
+# USB-시리얼 칩 VID → 이름 (정품 아두이노 / 호환 보드에 많이 쓰이는 칩)
+ARDUINO_USB_IDS = {
+    0x2341: "Arduino",
+    0x2A03: "Arduino",
+    0x1A86: "CH340",
+    0x10C4: "CP210x",
+    0x0403: "FTDI",
+}
+
+
+# =========================
+# 포트 찾기
+# =========================
+def list_arduino_ports():
+    '''
+    아두이노로 보이는 포트 목록 [(장치 이름, 설명), ...] (정품 아두이노 VID 먼저)
+    '''
+    from serial.tools import list_ports
+
+    found = []
+    for p in list_ports.comports():
+        desc = p.description or ""
+        if p.vid in ARDUINO_USB_IDS or "arduino" in desc.lower():
+            rank = 0 if ARDUINO_USB_IDS.get(p.vid) == "Arduino" or "arduino" in desc.lower() else 1
+            found.append((rank, p.device, desc))
+    return [(device, desc) for _, device, desc in sorted(found)]
+
+def find_arduino_port():
+    # 가장 그럴듯한 아두이노 포트 1개, 없으면 None
+    ports = list_arduino_ports()
+    return ports[0][0] if ports else None
+
+
+class SerialChannel:
+    def __init__(self, port, baud=BAUD, ack_timeout=ACK_TIMEOUT, retries=RETRIES,
+                 reconnect_sec=RECONNECT_SEC, ready_timeout=READY_TIMEOUT, max_queue=MAX_QUEUE,
+                 on_line=None, protocol="text", fast_baud=None, max_batch=MAX_BATCH,
+                 busy_wait=BUSY_WAIT, busy_timeout=BUSY_TIMEOUT, start_seq=None):
+        '''
+        port     : 포트 이름 또는 "auto" (연결할 때마다 find_arduino_port)
+        on_line  : ACK가 아닌 줄(예: "Move to digit: 3")을 받을 때 호출할 함수 (기본 : 무시, text 방식만)
+                   ※ 채널 스레드에서 호출되므로 오래 걸리는 일은 하지 말 것
+        protocol : "text" / "binary"
+        fast_baud: binary 방식에서 연결 후 협상할 속도 (None : baud 그대로)
+        start_seq: 첫 seq 바로 앞 번호 (None : 무작위, 점검용으로 번호 겹침을 만들 때 사용)
+        '''
+        if protocol not in ("text", "binary"):
+            raise ValueError(f"알 수 없는 protocol: {protocol} (text / binary)")
+        self.port = port
+        self.baud = baud
+        self.ack_timeout = ack_timeout
+        self.retries = retries
+        self.reconnect_sec = reconnect_sec
+        self.ready_timeout = ready_timeout
+        self.max_queue = max_queue
+        self.on_line = on_line
+        self.protocol = protocol
+        self.fast_baud = fast_baud if protocol == "binary" else None
+        self.max_batch = max_batch if protocol == "binary" else 1
+        self.busy_wait = busy_wait
+        self.busy_timeout = busy_timeout
+
+        self._ser = None
+        self._decoder = FrameDecoder()
+        self._queue = deque()        # (seq, 명령) : 맨 앞이 지금 보내는 명령
+        self._inflight = []          # 보내는 중인 명령 묶음 (끊겼다가 다시 연결돼도 같은 묶음 / seq로 재전송)
+        self._results = {}           # seq → True(ACK) / False(재전송 모두 실패)
+        self._cond = threading.Condition()
+        self._stop = False
+        self._seq = random.randint(1, 9999) if start_seq is None else start_seq
+        self.connected = threading.Event()
+        self._ever_connected = False
+        self.device = None           # 실제로 연결된 포트 이름 (auto일 때 확인용)
+        self.active_baud = None      # 지금 사용 중인 속도
+
+        # 통계
+        self.sent = 0                # 보낸 프레임 / 줄 수 (재전송 포함)
+        self.bytes_sent = 0
+        self.acked = 0               # ACK를 받은 명령 수
+        self.resent = 0
+        self.failed = 0
+        self.busy = 0                # BUSY 응답 수 (아두이노 이동 큐가 가득 차서 다시 보낸 횟수)
+        self.dropped = 0
+        self.reconnects = 0
+        self._rtts = deque(maxlen=500)   # 전송 → ACK 왕복 시간(초)
+
+        self._thread = threading.Thread(target=self._run, name="serial-channel", daemon=True)
+        self._thread.start()
+
+    # =========================
+    # 추론 루프에서 호출 (바로 반환)
+    # =========================
+    def send(self, command):
+        if self.protocol == "binary" and not batch_fits([str(command)]):
+            raise ValueError(f"명령이 너무 깁니다 (바이너리 프레임 1개 초과): {command}")
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                return None
+            seq = self._next_seq()
+            self._queue.append((seq, str(command)))
+            self._cond.notify_all()
+        return seq
+
+    def wait(self, seq, timeout=None):
+        # seq 명령의 결과 : True(ACK) / False(실패) / None(timeout까지 결과 없음)
+        with self._cond:
+            self._cond.wait_for(lambda: seq in self._results or self._stop, timeout)
+            return self._results.get(seq)
+
+    def pending(self):
+        with self._cond:
+            return len(self._queue)
+
+    def _next_seq(self):
+        # self._cond 안에서 호출
+        self._seq = self._seq % 9999 + 1
+        return self._seq
+
+    # =========================
+    # 채널 스레드
+    # =========================
+    def _run(self):
+        while not self._stop:
+            if self._ser is None and not self._connect():
+                self._sleep(self.reconnect_sec)
+                continue
+
+            with self._cond:
+                items = self._inflight or self._take_batch()
+                self._inflight = items
+            try:
+                if not items:
+                    # 보낼 명령이 없으면 보드 로그만 읽음
+                    if self._ser.in_waiting:
+                        self._read_idle()
+                    else:
+                        with self._cond:
+                            self._cond.wait(IDLE_WAIT)
+                    continue
+                ok = self._deliver(items)
+            except (serial.SerialException, OSError) as e:
+                # 보내던 명령은 큐에 그대로 두고, 다시 연결되면 같은 seq로 재전송
+                self._disconnect(e)
+                continue
+
+            with self._cond:
+                self._inflight = []
+                for seq, _ in items:
+                    self._queue.popleft()
+                    self._results[seq] = ok
+                while len(self._results) > 256:
+                    self._results.pop(next(iter(self._results)))
+                self._cond.notify_all()
+
+    def _take_batch(self):
+        # 큐 앞에서부터 프레임 1개에 담을 명령들 (text 방식은 항상 1개)
+        items = []
+        for item in self._queue:
+            if len(items) >= self.max_batch or (items and not batch_fits([c for _, c in items] + [item[1]])):
+                break
+            items.append(item)
+        return items
+
+    def _connect(self):
+        device = find_arduino_port() if self.port == "auto" else self.port
+        if device is None:
+            return False
+        try:
+            ser = serial.Serial(device, self.baud, timeout=READ_TIMEOUT, write_timeout=1.0)
+        except (serial.SerialException, OSError):
+            return False
+        if not wait_for_board(ser, timeout=self.ready_timeout):
+            print(f"[SERIAL] no Ready from {device} within {self.ready_timeout:.1f}s, continuing")
+        ser.timeout = READ_TIMEOUT
+        self._ser = ser
+        self.device = device
+        self.active_baud = self.baud
+        self._decoder = FrameDecoder()
+
+        try:
+            if self.fast_baud and self.fast_baud != self.baud:
+                self._negotiate_baud(self.fast_baud)
+            if self.protocol == "binary":
+                self._sync()
+        except (serial.SerialException, OSError) as e:
+            self._disconnect(e)
+            return False
+
+        if self._ever_connected:
+            self.reconnects += 1
+            print(f"[SERIAL] reconnected to {device}")
+        self._ever_connected = True
+        self.connected.set()
+        return True
+
+    def _negotiate_baud(self, baud):
+        # 1) 지금 속도로 BAUD 요청 → ACK  2) 새 속도로 바꾸고 PING → ACK 이면 성공
+        with self._cond:
+            seq = self._next_seq()
+        self._write(encode_baud(seq, baud))
+        if self._wait_ack(seq, time.perf_counter() + self.ack_timeout) is not True:
+            print(f"[SERIAL] board did not accept {baud} baud, staying at {self.active_baud}")
+            return False
+
+        self._ser.flush()
+        self._ser.baudrate = baud
+        for _ in range(self.retries + 1):
+            with self._cond:
+                seq = self._next_seq()
+            self._write(encode(seq, CMD_PING))
+            if self._wait_ack(seq, time.perf_counter() + self.ack_timeout) is True:
+                self.active_baud = baud
+                print(f"[SERIAL] {self.device} switched to {baud} baud")
+                return True
+
+        # 새 속도에서 응답이 없으면 원래 속도로 (아두이노도 BAUD_FALLBACK_SEC 뒤 복귀)
+        self._ser.baudrate = self.baud
+        time.sleep(BAUD_FALLBACK_SEC)
+        self._ser.reset_input_buffer()
+        print(f"[SERIAL] no reply at {baud} baud, back to {self.baud}")
+        return False
+
+    def _sync(self):
+        # 첫 명령 전에 PING → ACK : 아두이노가 이전 연결의 마지막 프레임 번호(lastFrameSeq)를 지움
+        for _ in range(self.retries + 1):
+            with self._cond:
+                seq = self._next_seq()
+            self._write(encode(seq, CMD_PING))
+            if self._wait_ack(seq, time.perf_counter() + self.ack_timeout) is True:
+                return True
+        print(f"[SERIAL] no reply to PING from {self.device}, continuing")
+        return False
+
+    def _disconnect(self, error):
+        print(f"[SERIAL] {self.device or self.port} lost ({error}), retrying every {self.reconnect_sec:.1f}s")
+        self.connected.clear()
+        try:
+            self._ser.close()
+        except (serial.SerialException, OSError):
+            pass
+        self._ser = None
+
+    def _encode(self, items):
+        if self.protocol == "binary":
+            return encode_commands(items[0][0], [c for _, c in items])
+        seq, command = items[0]
+        return f"{seq}:{command}\n".encode()
+
+    def _deliver(self, items):
+        # 프레임 1개(명령 1개 또는 BATCH) 전송 + ACK 대기, ACK가 없으면 retries번 재전송
+        # BUSY는 재전송 횟수에 넣지 않고 busy_wait마다 다시 보냄 (busy_timeout까지)
+        seq = items[0][0]
+        frame = self._encode(items)
+        commands = " ".join(c for _, c in items)
+        attempt = 0
+        busy_deadline = None
+        while not self._stop:
+            start = time.perf_counter()
+            self._write(frame)
+            reply = self._wait_ack(seq, start + self.ack_timeout)
+            if reply is True:
+                self.acked += len(items)
+                self._rtts.append(time.perf_counter() - start)
+                return True
+            if reply == BUSY:
+                self.busy += 1
+                if busy_deadline is None:
+                    busy_deadline = start + self.busy_timeout
+                if time.perf_counter() >= busy_deadline:
+                    print(f"[SERIAL] board busy for #{seq} '{commands}' over {self.busy_timeout:.0f}s")
+                    break
+                self._sleep(self.busy_wait)
+                continue
+            attempt += 1
+            if attempt > self.retries:
+                print(f"[SERIAL] no ACK for #{seq} '{commands}' after {self.retries + 1} tries")
+                break
+            self.resent += 1
+        self.failed += len(items)
+        return False
+
+    def _write(self, frame):
+        self._ser.write(frame)
+        self.sent += 1
+        self.bytes_sent += len(frame)
+
+    def _wait_ack(self, seq, deadline):
+        # True(ACK) / BUSY / False(잘못된 명령 또는 시간 초과)
+        while time.perf_counter() < deadline and not self._stop:
+            if self.protocol == "binary":
+                data = self._ser.read(max(1, self._ser.in_waiting))
+                for ack_seq, cmd, payload in self._decoder.feed(data):
+                    # 늦게 온 이전 ACK는 무시
+                    if cmd == CMD_ACK and payload[:1] == bytes((seq & 0xFF,)):
+                        if payload[1:2] == bytes((STATUS_BUSY,)):
+                            return BUSY
+                        return payload[1:2] == bytes((STATUS_OK,))
+            else:
+                line = self._read_line()
+                if line == f"ACK {seq}":
+                    return True
+                if line == f"BUSY {seq}":
+                    return BUSY
+                if not line.startswith(("ACK ", "BUSY ")):
+                    self._handle_line(line)
+        return False
+
+    def _read_idle(self):
+        if self.protocol == "binary":
+            self._decoder.feed(self._ser.read(self._ser.in_waiting))
+        else:
+            self._handle_line(self._read_line())
+
+    def _read_line(self):
+        return self._ser.readline().decode(errors="ignore").strip()
+
+    def _handle_line(self, line):
+        if line and self.on_line is not None:
+            self.on_line(line)
+
+    def _sleep(self, sec):
+        with self._cond:
+            self._cond.wait_for(lambda: self._stop, sec)
+
+    # =========================
+    # 종료 / 통계
+    # =========================
+    def close(self, flush_timeout=2.0):
+        # 남은 명령(예: 0 = HOME)이 전송될 때까지 잠시 기다린 뒤 종료
+        with self._cond:
+            self._cond.wait_for(lambda: not self._queue or not self.connected.is_set(), flush_timeout)
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+        if self._ser is not None:
+            self._ser.close()
+            self._ser = None
+
+    def rtt_ms(self):
+        # ACK 왕복 시간 (p50, p95) ms, 기록이 없으면 None
+        if not self._rtts:
+            return None
+        rtts = sorted(self._rtts)
+        return rtts[len(rtts) // 2] * 1000.0, rtts[min(len(rtts) - 1, int(len(rtts) * 0.95))] * 1000.0
+
+    def summary(self):
+        rtt = f", ack rtt p50 {statistics.median(self._rtts) * 1000:.1f} ms" if self._rtts else ""
+        crc = f", crc errors {self._decoder.crc_errors}" if self.protocol == "binary" else ""
+        return (f"serial {self.device or self.port} ({self.protocol}, {self.active_baud} baud): "
+                f"acked {self.acked}, resent {self.resent}, busy {self.busy}, failed {self.failed}, "
+                f"dropped {self.dropped}, "
+                f"reconnects {self.reconnects}, pending {self.pending()}, {self.bytes_sent} bytes{crc}{rtt}")
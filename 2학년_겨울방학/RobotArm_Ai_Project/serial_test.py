@@ -2,29 +2,44 @@
 serial_test의 Docstring
 
 코드 간단 설명 :
-Python에서 COM7 포트를 통해 Arduino와 연결하고, 
+Python에서 Arduino 포트(기본 : 자동 탐색)를 통해 연결하고,
 사용자가 입력한 숫자를 시리얼 통신으로 보내는 간단한 테스트 프로그램
+
+- 직접 ser.write()하지 않고 serial_channel.SerialChannel로 보냄
+  → 아두이노가 "ACK"로 받았다고 응답했는지 확인하고, 응답이 없으면 자동으로 다시 보냄
+- 하드웨어 없이 : python fake_arduino.py 로 만든 가짜 포트를 --port로 지정
+- --list : 아두이노로 보이는 포트 목록만 출력
 '''
 
-import serial   # PySerial 라이브러리 불러오기 (시리얼 통신을 위한 모듈)
-import time     # 시간 지연을 주기 위한 모듈
+import argparse # 포트 선택
+
+from serial_channel import SerialChannel, list_arduino_ports # 백그라운드 전송 + ACK / 재전송 / 재연결
+
+parser = argparse.ArgumentParser(description="아두이노 숫자 전송 테스트")
+parser.add_argument("--port", default="auto", help="아두이노 포트 (auto, COM7, /dev/ttyACM0, /tmp/fake_arduino)")
+parser.add_argument("--protocol", default="text", choices=("text", "binary"), help="전송 방식")
+parser.add_argument("--list", action="store_true", help="아두이노 포트 목록만 출력")
+args = parser.parse_args()
+
+if args.list:
+    for device, desc in list_arduino_ports():
+        print(device, "-", desc)
+    raise SystemExit
 
 # 포트 설정
-ser = serial.Serial("COM7", 9600, timeout=1)
-# "COM7" : 연결된 장치(예: Arduino)가 사용하는 포트 번호
+channel = SerialChannel(args.port, 9600, protocol=args.protocol, on_line=lambda line: print("Arduino:", line))
+# "auto" : 연결된 장치(예: Arduino)의 포트를 USB 장치 목록에서 찾음 (직접 "COM7"처럼 지정도 가능)
 # 9600   : 통신 속도, Arduino 코드에서도 동일하게 맞춰야 함
-# timeout=1 : 데이터 수신 시 최대 1초까지 대기
+# on_line : 아두이노가 보낸 ACK 이외의 줄(예: "Move to digit: 3")을 출력 (text 방식)
 
 '''
-* Arduino가 연결 직후 자동 리셋되므로 준비될 때까지 2초 대기*
+* Arduino가 연결 직후 자동 리셋되므로 준비될 때까지 대기*
 만약 바로 데이터를 보내면, Arduino가 아직 초기화 중이라서
-데이터를 제대로 받지 못할 수 있음. 
-따라서 Arduino가 부팅을 끝내고 
-준비된 상태에서 데이터를 받을 수 있도록 함.
+데이터를 제대로 받지 못할 수 있음.
+채널 스레드가 "Ready" 응답을 받을 때까지 기다린 뒤 전송을 시작하므로
+여기서는 고정 시간 대기(time.sleep(2))가 필요 없음.
 '''
 
-time.sleep(2)
-
 # 무한 루프: 사용자 입력을 받아서 Arduino로 전송
 while True:
     # 사용자로부터 숫자(0~9) 또는 'q' 입력 받기
@@ -33,13 +48,16 @@ while True:
     if digit == 'q':
         break  # 'q' 입력 시 루프 종료
 
-    ser.write((digit + "\n").encode())
-    # 입력한 숫자를 문자열로 만든 뒤, 줄바꿈("\n")을 붙여서 전송
-    # .encode() : 문자열을 바이트 데이터로 변환 (시리얼 통신은 바이트 단위로 전송됨)
+    seq = channel.send(digit)
+    # 명령을 전송 큐에 넣고 바로 반환 (실제 전송 / ACK 대기는 채널 스레드에서)
+
+    acked = channel.wait(seq, timeout=5.0)
+    # 테스트용이므로 결과를 기다림 : True(ACK) / False(재전송 모두 실패) / None(아직 연결 안 됨)
 
-    print("Sent:", digit)
+    print("Sent:", digit, "(ACK)" if acked else "(no ACK)")
     # 전송한 데이터를 콘솔에 출력 (확인용)
 
 # 루프 종료 후 포트 닫기
-ser.close()
-# 시리얼 포트를 닫아 자원 해제 (다른 프로그램이 포트를 사용할 수 있도록 반납)
\ No newline at end of file
+channel.close()
+print(channel.summary())
+# 시리얼 포트를 닫아 자원 해제 (다른 프로그램이 포트를 사용할 수 있도록 반납)
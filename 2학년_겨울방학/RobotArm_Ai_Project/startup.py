@@ -0,0 +1,119 @@
+'''
+startup의 Docstring
+
+실시간 인식 프로그램의 시작 시간 단축 도구
+
+이 코드의 목적:
+- 카메라 열기 / 모델 로드 / 시리얼 연결은 서로 관계가 없으므로, 순서대로 하지 않고 동시에(스레드) 진행
+- 아두이노 리셋 대기를 고정된 time.sleep(2) 대신,
+  보드가 실제로 "Ready" 메시지를 보내는 순간 끝나도록 함 (wait_for_board)
+- 각 단계가 언제 시작/종료되었는지 기록해서,
+  "프로그램 시작 → 첫 예측"까지 걸린 시간을 단계별로 출력 (StartupTimer)
+'''
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# =========================
+# 시작 시간 측정
+# =========================
+class StartupTimer:
+    '''
+    프로그램 시작 시각(t0)을 기준으로 각 단계의 시작/종료 시각을 기록
+
+    - phase(name)  : with 문으로 감싼 구간의 시작/종료를 기록
+    - mark(name)   : 한 시점만 기록 (예: first_frame, first_prediction)
+    - run_parallel : 여러 작업을 동시에 실행하고 각각을 단계로 기록
+    - report()     : 단계별 [시작 ~ 종료] (소요 시간) 표 문자열
+    '''
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.phases = []        # (이름, 시작, 종료) : t0 기준 초
+        self._marks = set()
+        self._lock = threading.Lock()
+
+    def _now(self):
+        return time.perf_counter() - self.t0
+
+    def _add(self, name, start, end):
+        with self._lock:
+            self.phases.append((name, start, end))
+
+    def phase(self, name):
+        timer = self
+
+        class _Phase:
+            def __enter__(self):
+                self.start = timer._now()
+                return self
+
+            def __exit__(self, *exc):
+                timer._add(name, self.start, timer._now())
+                return False
+
+        return _Phase()
+
+    def mark(self, name):
+        # 같은 이름은 처음 한 번만 기록, 처음 기록했으면 True
+        with self._lock:
+            if name in self._marks:
+                return False
+            self._marks.add(name)
+        now = self._now()
+        self._add(name, now, now)
+        return True
+
+    def has(self, name):
+        return name in self._marks
+
+    def run_parallel(self, tasks):
+        '''
+        tasks : {이름: 인자 없는 함수} → {이름: 반환값}
+        하나라도 예외가 나면 모든 작업이 끝난 뒤 첫 번째 예외를 다시 발생
+        '''
+        def timed(name, fn):
+            with self.phase(name):
+                return fn()
+
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="startup") as pool:
+            futures = {name: pool.submit(timed, name, fn) for name, fn in tasks.items()}
+
+        return {name: f.result() for name, f in futures.items()}
+
+    def report(self, title="STARTUP"):
+        lines = [f"[{title}] time since launch (s)"]
+        for name, start, end in sorted(self.phases, key=lambda p: (p[2], p[1])):
+            if end == start:
+                lines.append(f"  {name:<18} @ {end:6.3f}")
+            else:
+                lines.append(f"  {name:<18} {start:6.3f} ~ {end:6.3f}  ({(end - start) * 1000:7.1f} ms)")
+        return "\n".join(lines)
+
+
+# =========================
+# 아두이노 준비 대기
+# =========================
+def wait_for_board(ser, ready_text="Ready", timeout=3.0):
+    '''
+    포트를 열면 아두이노가 리셋되고, setup()이 끝나면 "Ready. ..." 한 줄을 보냄
+    그 줄이 들어오는 순간 바로 반환 (고정 2초 대기 대신)
+
+    - 반환값 : 보드가 응답했으면 True, timeout까지 응답이 없으면 False
+      (예전 펌웨어처럼 Ready를 보내지 않는 경우에도 timeout 후에는 그대로 진행)
+    - 기다리는 동안만 ser.timeout을 0.1초로 줄여서, readline 때문에 timeout을 크게 넘기지 않도록 함
+    '''
+    old_timeout = ser.timeout
+    ser.timeout = 0.1   # 짧게 나눠 읽어서 deadline을 넘기지 않도록
+    try:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            line = ser.readline().decode(errors="ignore").strip()
+            if ready_text in line:
+                ser.reset_input_buffer()
+                return True
+        return False
+    finally:
+        ser.timeout = old_timeout
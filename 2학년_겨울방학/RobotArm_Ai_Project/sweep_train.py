@@ -0,0 +1,170 @@
+'''
+sweep_train의 Docstring
+
+CNN 구조 / 에포크 조합 학습 스윕 + 정확도·지연 시간 파레토(Pareto) 표
+
+이 코드의 목적:
+- mnist_train.py의 구조(Conv 16 → 32, Dense 64)와 epochs=3은 한 번 정한 값이라,
+  더 작고 빠른 모델로도 충분한지 알 수 없었음
+- Conv 필터 수(폭) / Conv 블록 수(깊이) / Dense 크기 / 에포크 수의 모든 조합을 학습하고
+  조합마다 테스트 정확도, 파라미터 수, 1장 추론 지연 시간을 기록
+- 학습은 프로세스 풀로 CPU 코어에 나눠서 동시에 진행 (워커마다 TensorFlow 스레드 수 고정)
+  → 워커들이 같은 코어를 두고 경쟁하지 않도록 workers × threads ≤ CPU 코어 수로 맞춤
+- 지연 시간은 학습이 모두 끝난 뒤 한 모델씩 순서대로 측정 (학습 중인 다른 워커의 영향 제거)
+- 파레토 표 : "정확도가 더 높으면서 더 빠른 모델"이 없는 조합만 표시 (*)
+  --min-acc 를 주면 그 정확도를 넘는 모델 중 가장 빠른 것을 추천
+
+사용 예:
+    python sweep_train.py
+    python sweep_train.py --convs 8,16 16,32 32,64 16,32,64 --dense 0 32 64 --epochs 1 3 --threads 2
+    python sweep_train.py --min-acc 0.985 --latency-backend tflite
+'''
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# =========================
+# 1) 조합 만들기
+# =========================
+def parse_filters(text):
+    # "16,32" → (16, 32)
+    return tuple(int(v) for v in text.split(","))
+
+def config_name(filters, dense, epochs):
+    return f"c{'-'.join(map(str, filters))}_d{dense}_e{epochs}"
+
+def make_grid(convs, denses, epochs):
+    grid = []
+    for filters, dense, ep in itertools.product(convs, denses, epochs):
+        if len(filters) > 3:
+            # 28 → 26 → 13 → 11 → 5 → 3 → 1 : 3x3 Conv + 2x2 Pool 블록은 최대 3개
+            raise SystemExit(f"Conv 블록은 최대 3개까지 가능합니다: {filters}")
+        grid.append({"name": config_name(filters, dense, ep), "filters": list(filters),
+                     "dense": dense, "epochs": ep})
+    return grid
+
+
+# =========================
+# 2) 워커 (프로세스마다 실행)
+# =========================
+def init_worker(threads):
+    # TensorFlow 연산 전에 스레드 수 고정 (워커끼리 코어 경쟁 방지)
+    from mnist_train import configure_threads
+    configure_threads(intra=threads, inter=1)
+
+def train_config(config, out_dir, batch_size, seed):
+    '''
+    조합 1개 학습 → 결과 dict (모델은 out_dir/<name>.h5로 저장, 지연 시간은 나중에 측정)
+    '''
+    import tensorflow as tf
+    from mnist_train import build_model, load_mnist, make_dataset
+
+    tf.keras.utils.set_random_seed(seed)
+    (x_fit, y_fit), (x_val, y_val), (x_test, y_test) = load_mnist()
+    train_ds = make_dataset(x_fit, y_fit, batch_size, training=True, seed=seed)
+    test_ds = make_dataset(x_test, y_test, batch_size, cache=False)
+
+    model = build_model(config["filters"], config["dense"])
+    start = time.perf_counter()
+    model.fit(train_ds, epochs=config["epochs"], verbose=0)
+    train_sec = time.perf_counter() - start
+    _, test_acc = model.evaluate(test_ds, verbose=0)
+
+    path = os.path.join(out_dir, config["name"] + ".h5")
+    model.save(path)
+    return dict(config, path=path, params=int(model.count_params()), accuracy=float(test_acc),
+                train_sec=train_sec, samples_per_sec=len(x_fit) * config["epochs"] / train_sec)
+
+
+# =========================
+# 3) 지연 시간 / 파레토
+# =========================
+def measure_latency(results, backend, runs):
+    # 학습이 모두 끝난 뒤 한 모델씩 1장 입력 지연 시간 측정 (ms)
+    import numpy as np
+    from inference_engine import create_backend, time_per_call
+
+    x = np.zeros((1, 28, 28, 1), dtype=np.float32)
+    x[0, 8:20, 12:16, 0] = 1.0
+    for r in results:
+        engine = create_backend(backend, model_path=r["path"])
+        r["latency_ms"] = time_per_call(engine, x, runs=runs) * 1000.0
+        r["latency_backend"] = engine.name
+
+def mark_pareto(results):
+    # 다른 조합보다 "정확도 ≥ 그리고 지연 ≤ (하나는 엄격히)"인 조합이 없으면 파레토
+    for r in results:
+        r["pareto"] = not any(
+            o is not r and o["accuracy"] >= r["accuracy"] and o["latency_ms"] <= r["latency_ms"]
+            and (o["accuracy"] > r["accuracy"] or o["latency_ms"] < r["latency_ms"])
+            for o in results
+        )
+
+def print_table(results, min_acc=None):
+    print(f"{'':1} {'config':<22} {'params':>8} {'accuracy':>9} {'latency ms':>11} {'train s':>8} {'samples/s':>10}")
+    for r in sorted(results, key=lambda r: r["latency_ms"]):
+        mark = "*" if r["pareto"] else " "
+        print(f"{mark:1} {r['name']:<22} {r['params']:>8,} {r['accuracy']:9.4f} {r['latency_ms']:11.3f} "
+              f"{r['train_sec']:8.1f} {r['samples_per_sec']:10,.0f}")
+    print("* : Pareto (이보다 정확하면서 빠른 조합이 없음)")
+
+    if min_acc is not None:
+        ok = [r for r in results if r["accuracy"] >= min_acc]
+        if ok:
+            best = min(ok, key=lambda r: r["latency_ms"])
+            print(f"fastest with accuracy >= {min_acc}: {best['name']} "
+                  f"({best['accuracy']:.4f}, {best['latency_ms']:.3f} ms) → {best['path']}")
+        else:
+            print(f"accuracy >= {min_acc} 인 조합이 없습니다")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MNIST CNN 구조 / 에포크 스윕")
+    parser.add_argument("--convs", nargs="+", type=parse_filters, default=[(8, 16), (16, 32), (32, 64)],
+                        help="Conv 블록별 필터 수 목록 (예: 8,16 16,32 16,32,64)")
+    parser.add_argument("--dense", nargs="+", type=int, default=[32, 64], help="Dense 유닛 수 목록 (0 : 없음)")
+    parser.add_argument("--epochs", nargs="+", type=int, default=[1, 3], help="에포크 수 목록")
+    parser.add_argument("--threads", type=int, default=1, help="워커 1개의 TensorFlow 스레드 수")
+    parser.add_argument("--workers", type=int, default=0, help="동시 학습 수 (0 : CPU 코어 수 / threads)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-backend", default="tf_function", help="지연 시간 측정 백엔드 (tf_function / tflite / numpy)")
+    parser.add_argument("--runs", type=int, default=200, help="지연 시간 측정 횟수")
+    parser.add_argument("--min-acc", type=float, default=None, help="이 정확도를 넘는 가장 빠른 모델 추천")
+    parser.add_argument("--out", default="sweep", help="모델 / 결과 저장 폴더")
+    args = parser.parse_args()
+
+    grid = make_grid(args.convs, args.dense, args.epochs)
+    workers = args.workers or max(1, (os.cpu_count() or 1) // args.threads)
+    os.makedirs(args.out, exist_ok=True)
+    print(f"{len(grid)} configs, {workers} workers x {args.threads} threads")
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(args.threads,)) as pool:
+        futures = {pool.submit(train_config, c, args.out, args.batch_size, args.seed): c for c in grid}
+        for future in as_completed(futures):
+            r = future.result()
+            results.append(r)
+            print(f"  [{len(results)}/{len(grid)}] {r['name']}: acc {r['accuracy']:.4f} "
+                  f"({r['train_sec']:.1f}s)")
+    print(f"sweep wall time: {time.perf_counter() - start:.1f}s")
+
+    measure_latency(results, args.latency_backend, args.runs)
+    mark_pareto(results)
+    print_table(results, args.min_acc)
+
+    path = os.path.join(args.out, "sweep_results.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"args": dict(vars(args), convs=[list(c) for c in args.convs]),
+                   "results": sorted(results, key=lambda r: r["latency_ms"])}, f, indent=2)
+    print(f"saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
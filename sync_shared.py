@@ -0,0 +1,77 @@
+'''
+sync_shared의 Docstring
+
+여러 프로젝트 폴더가 같이 쓰는 모듈을 원본 1개에서 복사해 맞추는 도구
+
+이 코드의 목적:
+- instrument.py / bench_stats.py / frame_source.py는 폴더마다 따로 실행하므로(폴더째로 드론 / 아두이노 PC에 복사)
+  각 폴더에 같은 파일이 있어야 하는데, 복사본을 손으로 고치다 보니 내용이 조금씩 달라졌음
+- 원본은 2학년_겨울방학/RobotArm_Ai_Project 에만 두고, 나머지 폴더의 파일은 이 스크립트로 생성
+  · 생성된 파일 맨 위에 "자동 생성 파일, 원본을 고칠 것" 주석을 붙임
+  · 줄바꿈은 대상 폴더에 맞춤 (2학년2학기는 CRLF)
+- --check : 복사본이 원본과 다르면 목록을 출력하고 종료 코드 1 (커밋 전 확인용)
+
+사용 예:
+    python sync_shared.py          # 원본을 고친 뒤 복사본 갱신
+    python sync_shared.py --check  # 다른 복사본이 있으면 실패
+'''
+
+import argparse
+import os
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join("2학년_겨울방학", "RobotArm_Ai_Project")   # 원본 폴더
+
+# 파일 이름 → [(복사할 폴더, 줄바꿈)]
+SHARED = {
+    "instrument.py": [(os.path.join("2학년_겨울방학", "DroneGestureProject"), "\n"),
+                      ("2학년2학기", "\r\n")],
+    "bench_stats.py": [(os.path.join("2학년_겨울방학", "DroneGestureProject"), "\n")],
+    "frame_source.py": [(os.path.join("2학년_겨울방학", "DroneGestureProject"), "\n")],
+}
+
+HEADER = "# 자동 생성 파일 : 원본은 {source} (python sync_shared.py로 갱신, 여기서 직접 고치지 말 것)\n"
+
+
+def render(name, newline):
+    # 원본 + 머리 주석 → 대상 폴더에 쓸 내용
+    source = os.path.join(SOURCE_DIR, name)
+    with open(os.path.join(ROOT, source), encoding="utf-8", newline="") as f:
+        text = f.read().replace("\r\n", "\n")
+    text = HEADER.format(source=source.replace(os.sep, "/")) + text
+    return text.replace("\n", newline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 모듈 복사본을 원본과 맞춤")
+    parser.add_argument("--check", action="store_true", help="복사본이 원본과 다르면 종료 코드 1 (파일은 고치지 않음)")
+    args = parser.parse_args()
+
+    stale = []
+    for name, targets in SHARED.items():
+        for folder, newline in targets:
+            path = os.path.join(ROOT, folder, name)
+            expected = render(name, newline)
+            current = None
+            if os.path.exists(path):
+                with open(path, encoding="utf-8", newline="") as f:
+                    current = f.read()
+            if current == expected:
+                continue
+            stale.append(os.path.join(folder, name))
+            if not args.check:
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    f.write(expected)
+                print(f"updated {os.path.join(folder, name)}")
+
+    if args.check and stale:
+        print("원본과 다른 복사본 (python sync_shared.py로 갱신) :")
+        for path in stale:
+            print(f"  {path}")
+        raise SystemExit(1)
+    if not stale:
+        print("OK")
+
+
+if __name__ == "__main__":
+    main()